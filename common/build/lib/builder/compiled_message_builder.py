@@ -0,0 +1,189 @@
+"""A module that defines a MessageBuilder that compiles its Mustache template into Python render functions."""
+import functools
+import html
+from typing import Callable, List, Optional
+
+from pystache import common as pystache_common
+from pystache import context as pystache_context
+from pystache import parser as pystache_parser
+
+import utilities.integration_adaptors_logger as log
+from builder import pystache_message_builder
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+_Render = Callable[[List[object], List[str]], None]
+
+
+class _GenericRenderingRequired(Exception):
+    """Raised when a value needs pystache behaviour that the compiled render functions do not implement."""
+    pass
+
+
+class CompiledMessageBuilder(pystache_message_builder.PystacheMessageBuilder):
+    """A PystacheMessageBuilder that compiles its template into specialised render functions once, when it is created.
+
+    The template is parsed by pystache, so whitespace handling is unchanged. Each tag in the parse tree is then turned
+    into a Python closure. Variable names are split up front, and values are looked up directly on the context stack.
+    Missing tags still raise a MessageGenerationError. Templates or values that use Mustache features these functions
+    do not implement, such as partials, lambdas or byte strings, are rendered by pystache instead. The output is the
+    same either way.
+    """
+
+    def __init__(self, template_dir, template_file):
+        """Create a new CompiledMessageBuilder that uses the specified template file.
+
+        :param template_dir: The directory to load template files from
+        :param template_file: The template file to populate with values.
+        """
+        super().__init__(template_dir, template_file)
+        self._compiled_render = _compile_template(self._parsed_template)
+        if self._compiled_render is None:
+            logger.warning('{TemplateFile} uses unsupported Mustache features, it will be rendered by pystache',
+                           fparams={'TemplateFile': template_file})
+
+    def _render_parts(self, message_dictionary):
+        if self._compiled_render is None:
+            return super()._render_parts(message_dictionary)
+
+        parts = []
+        try:
+            self._compiled_render([message_dictionary] if message_dictionary is not None else [], parts)
+        except _GenericRenderingRequired:
+            return super()._render_parts(message_dictionary)
+        return parts
+
+
+@functools.lru_cache(maxsize=None)
+def get_message_builder(template_dir: str, template_file: str) -> CompiledMessageBuilder:
+    """Get the message builder for the given template, loading and compiling the template on first use only.
+
+    :param template_dir: The directory to load template files from
+    :param template_file: The template file to populate with values.
+    :return: A message builder shared by all callers using the same template.
+    """
+    return CompiledMessageBuilder(template_dir, template_file)
+
+
+def _compile_template(parsed_template) -> Optional[_Render]:
+    try:
+        return _compile_nodes(parsed_template._parse_tree)
+    except _GenericRenderingRequired:
+        return None
+
+
+def _compile_nodes(nodes) -> _Render:
+    parts = []
+    for node in nodes:
+        if isinstance(node, str):
+            # Merge neighbouring static text so that it is joined once, at compile time
+            if parts and isinstance(parts[-1], str):
+                parts[-1] += node
+            else:
+                parts.append(node)
+        elif isinstance(node, (pystache_parser._CommentNode, pystache_parser._ChangeNode)):
+            continue
+        elif isinstance(node, pystache_parser._EscapeNode):
+            parts.append(_compile_variable(node.key, escape=True))
+        elif isinstance(node, pystache_parser._LiteralNode):
+            parts.append(_compile_variable(node.key, escape=False))
+        elif isinstance(node, pystache_parser._SectionNode):
+            parts.append(_compile_section(node.key, _compile_nodes(node.parsed._parse_tree)))
+        elif isinstance(node, pystache_parser._InvertedNode):
+            parts.append(_compile_inverted_section(node.key, _compile_nodes(node.parsed_section._parse_tree)))
+        else:
+            raise _GenericRenderingRequired()
+
+    def render(stack, out):
+        for part in parts:
+            if part.__class__ is str:
+                out.append(part)
+            else:
+                part(stack, out)
+
+    return render
+
+
+def _compile_lookup(name: str) -> Callable[[List[object]], object]:
+    """Compile a (possibly dotted) name into a function that resolves it against a context stack, following the rules
+    of pystache's ContextStack.get with missing tags treated as errors."""
+    if name == '.':
+        def lookup_top(stack):
+            if not stack:
+                raise pystache_context.KeyNotFoundError('.', 'empty context stack')
+            return stack[-1]
+
+        return lookup_top
+
+    first_part, *other_parts = name.split('.')
+    get_value = pystache_context._get_value
+    not_found = pystache_context._NOT_FOUND
+
+    def lookup(stack):
+        for item in reversed(stack):
+            value = get_value(item, first_part)
+            if value is not not_found:
+                break
+        else:
+            raise pystache_context.KeyNotFoundError(name, 'first part')
+
+        for part in other_parts:
+            value = get_value(value, part)
+            if value is not_found:
+                raise pystache_context.KeyNotFoundError(name, 'missing %s' % repr(part))
+        return value
+
+    return lookup
+
+
+def _compile_variable(name: str, escape: bool) -> _Render:
+    lookup = _compile_lookup(name)
+
+    def render_variable(stack, out):
+        value = lookup(stack)
+        if value.__class__ is not str:
+            if callable(value) or pystache_common.is_string(value):
+                raise _GenericRenderingRequired()
+            value = str(value)
+        # Unescaped values, such as message payloads, are passed through as they are rather than copied
+        out.append(html.escape(value, quote=True) if escape else value)
+
+    return render_variable
+
+
+def _compile_section(name: str, render_section: _Render) -> _Render:
+    lookup = _compile_lookup(name)
+
+    def render(stack, out):
+        data = lookup(stack)
+        if not data:
+            return
+
+        if pystache_common.is_string(data) or isinstance(data, dict):
+            values = [data]
+        else:
+            try:
+                iter(data)
+            except TypeError:
+                values = [data]
+            else:
+                values = data
+
+        for value in values:
+            if callable(value):
+                raise _GenericRenderingRequired()
+            stack.append(value)
+            render_section(stack, out)
+            stack.pop()
+
+    return render
+
+
+def _compile_inverted_section(name: str, render_section: _Render) -> _Render:
+    lookup = _compile_lookup(name)
+
+    def render(stack, out):
+        if not lookup(stack):
+            render_section(stack, out)
+
+    return render
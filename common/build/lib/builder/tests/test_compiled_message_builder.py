@@ -0,0 +1,77 @@
+import os
+from unittest import TestCase
+
+from builder import compiled_message_builder, pystache_message_builder
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+TEMPLATE_FILENAME = "sections"
+
+VALUES = {
+    'attribute': 'quote " and <angle>',
+    'text': "Tom & Jerry's <b>",
+    'number': 42,
+    'nested': {'inner': {'value': 'deep'}},
+    'flag': True,
+    'items': [
+        {'id': 1, 'text': 'first', 'optional': 'yes'},
+        {'id': 2, 'text': 'second', 'optional': None},
+    ],
+    'names': ['alice', 'bob'],
+}
+
+
+class TestCompiledMessageBuilder(TestCase):
+    def setUp(self):
+        self.builder = compiled_message_builder.CompiledMessageBuilder(TEMPLATES_DIR, TEMPLATE_FILENAME)
+        self.pystache_builder = pystache_message_builder.PystacheMessageBuilder(TEMPLATES_DIR, TEMPLATE_FILENAME)
+
+    def test_template_is_compiled(self):
+        self.assertIsNotNone(self.builder._compiled_render)
+
+    def test_output_is_identical_to_pystache(self):
+        variations = {
+            'all values': VALUES,
+            'false flag and empty lists': dict(VALUES, flag=False, items=[], names=[]),
+            'section over a single dict': dict(VALUES, items={'id': 3, 'text': 'only', 'optional': 'no'}),
+            'none values': dict(VALUES, text=None, number=None),
+        }
+        for description, values in variations.items():
+            with self.subTest(description):
+                self.assertEqual(self.pystache_builder.build_message(values), self.builder.build_message(values))
+
+    def test_build_message_parts_passes_unescaped_values_through(self):
+        text = 'a large payload'
+        values = dict(VALUES, text=text)
+
+        parts = self.builder.build_message_parts(values)
+
+        self.assertEqual(self.pystache_builder.build_message(values), ''.join(parts))
+        self.assertTrue(any(part is text for part in parts))
+
+    def test_build_message_errors_on_missing_tag(self):
+        for missing_key in ['text', 'flag', 'items']:
+            with self.subTest(missing_key):
+                values = dict(VALUES)
+                del values[missing_key]
+
+                with self.assertRaisesRegex(pystache_message_builder.MessageGenerationError,
+                                            f'Failed to find key:{missing_key}'):
+                    self.builder.build_message(values)
+
+    def test_build_message_errors_on_missing_dotted_tag(self):
+        values = dict(VALUES, nested={'inner': {}})
+
+        with self.assertRaisesRegex(pystache_message_builder.MessageGenerationError,
+                                    'Failed to find key:nested.inner.value'):
+            self.builder.build_message(values)
+
+    def test_values_needing_pystache_are_rendered_by_pystache(self):
+        values = dict(VALUES, text=lambda: 'from a lambda', number=b'bytes')
+
+        self.assertEqual(self.pystache_builder.build_message(values), self.builder.build_message(values))
+
+    def test_get_message_builder_caches_builders(self):
+        builder = compiled_message_builder.get_message_builder(TEMPLATES_DIR, TEMPLATE_FILENAME)
+
+        self.assertIs(builder, compiled_message_builder.get_message_builder(TEMPLATES_DIR, TEMPLATE_FILENAME))
+        self.assertIsInstance(builder, compiled_message_builder.CompiledMessageBuilder)
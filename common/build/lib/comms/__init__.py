@@ -0,0 +1 @@
+"""Modules related to common communications functionality."""
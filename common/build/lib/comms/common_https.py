@@ -0,0 +1,161 @@
+import functools
+import ssl
+from typing import Dict, Optional, Union
+
+from tornado import httpclient, simple_httpclient
+
+from comms.http_body import HttpBody
+
+from utilities import integration_adaptors_logger as log
+import logging
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+HTTP_CLIENT_CURL = 'CURL'
+HTTP_CLIENT_SIMPLE = 'SIMPLE'
+HTTP_CLIENT_TYPES = [HTTP_CLIENT_CURL, HTTP_CLIENT_SIMPLE]
+
+
+def configure_http_client(client_type: str = HTTP_CLIENT_CURL, max_clients: int = 10,
+                          connect_timeout: Optional[float] = None, request_timeout: Optional[float] = None) -> None:
+    """Configure the Tornado HTTP client shared by all requests made through :class:`CommonHttps`.
+
+    With the curl client, every curl handle shares one connection cache, TLS session cache and DNS cache, and TCP
+    keep-alive is enabled. Connections to the same endpoint are therefore reused across requests, whichever handle
+    makes them. With the simple client, which does not keep connections alive (or support proxies), an SSLContext is
+    built once for each combination of certificates and reused for every request.
+
+    :param client_type: One of `HTTP_CLIENT_TYPES`.
+    :param max_clients: The maximum number of requests that may be in progress at once. Further requests are queued.
+    :param connect_timeout: The default timeout (in seconds) for establishing a connection. None uses Tornado's default.
+    :param request_timeout: The default timeout (in seconds) for a whole request. None uses Tornado's default.
+    """
+    if client_type not in HTTP_CLIENT_TYPES:
+        raise ValueError(f'HTTP client type must be one of {HTTP_CLIENT_TYPES}')
+
+    defaults = {}
+    if connect_timeout is not None:
+        defaults['connect_timeout'] = connect_timeout
+    if request_timeout is not None:
+        defaults['request_timeout'] = request_timeout
+
+    if client_type == HTTP_CLIENT_CURL:
+        defaults['prepare_curl_callback'] = _prepare_curl
+        httpclient.AsyncHTTPClient.configure('tornado.curl_httpclient.CurlAsyncHTTPClient', max_clients=max_clients,
+                                             defaults=defaults)
+    else:
+        httpclient.AsyncHTTPClient.configure(None, max_clients=max_clients, defaults=defaults)
+
+    CommonHttps.use_shared_ssl_context = client_type == HTTP_CLIENT_SIMPLE
+    logger.info('Configured {client_type} HTTP client with {max_clients}',
+                fparams={'client_type': client_type, 'max_clients': max_clients})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_curl_share():
+    import pycurl
+
+    curl_share = pycurl.CurlShare()
+    curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+    curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+    # Sharing the connection cache needs libcurl 7.57+. Without it, each handle still keeps its own connections alive
+    if hasattr(pycurl, 'LOCK_DATA_CONNECT'):
+        curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+    return curl_share
+
+
+def _prepare_curl(curl) -> None:
+    import pycurl
+
+    curl.setopt(pycurl.SHARE, _get_curl_share())
+    curl.setopt(pycurl.TCP_KEEPALIVE, 1)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ssl_context(client_cert: Optional[str], client_key: Optional[str], ca_certs: Optional[str],
+                     validate_cert: bool) -> ssl.SSLContext:
+    ssl_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=ca_certs)
+    if client_cert:
+        ssl_context.load_cert_chain(client_cert, client_key)
+    if not validate_cert:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+def _get_http_body_options(body: HttpBody, headers: Dict[str, str]):
+    # Only the simple client can write a body in pieces. The curl client is given the body as a single bytes object
+    if not issubclass(httpclient.AsyncHTTPClient.configured_class(), simple_httpclient.SimpleAsyncHTTPClient):
+        return {'body': body.to_bytes()}, headers
+
+    # Setting the length up front stops Tornado falling back to a chunked transfer encoding
+    headers = dict(headers)
+    headers['Content-Length'] = str(len(body))
+    return {'body_producer': body.write_to}, headers
+
+
+class CommonHttps(object):
+
+    use_shared_ssl_context = False
+
+    @staticmethod
+    async def make_request(url: str, method: str, headers: Dict[str, str], body: Union[str, HttpBody],
+                           client_cert: str = None,
+                           client_key: str = None, ca_certs: str = None, validate_cert: bool = True,
+                           http_proxy_host: str = None, http_proxy_port: int = None,
+                           raise_error_response: bool = True):
+        """Send a HTTPS request and return it's response.
+        :param url: A string containing the endpoint to send the request to.
+        :param method: A string containing the HTTP method to send the request as.
+        :param headers: A dictionary containing key value pairs for the details of the HTTP header.
+        :param body: A string containing the message to send to the endpoint, or a HttpBody. Where the configured
+        HTTP client supports it, a HttpBody is written to the connection a part at a time.
+        :param client_cert: A string containing the full path of the client certificate file.
+        :param client_key: A string containing the full path of the client private key file.
+        :param ca_certs: A string containing the full path of the certificate authority certificate file.
+        :param validate_cert: Whether the server's certificate should be validated or not.
+        :param http_proxy_host The hostname of the HTTP proxy to be used.
+        :param http_proxy_port The port of the HTTP proxy to be used.
+        :param raise_error_response: Return an error response
+        """
+
+        logger.info("Request {method} to {url} using {proxy_host} and {proxy_port}",
+                    fparams={
+                        "method": method,
+                        "url": url,
+                        "proxy_host": http_proxy_host,
+                        "proxy_port": http_proxy_port
+                    })
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Request {headers}", fparams={"headers": headers})
+            logger.debug("Request {body}", fparams={"body": body})
+
+        if not validate_cert:
+            logger.warning("Server certificate validation has been disabled.")
+
+        ssl_options = {}
+        if CommonHttps.use_shared_ssl_context:
+            ssl_options['ssl_options'] = _get_ssl_context(client_cert, client_key, ca_certs, validate_cert)
+
+        body_options = {'body': body}
+        if isinstance(body, HttpBody):
+            body_options, headers = _get_http_body_options(body, headers)
+
+        response = await httpclient.AsyncHTTPClient().fetch(url,
+                                                            raise_error=raise_error_response,
+                                                            method=method,
+                                                            headers=headers,
+                                                            client_cert=client_cert,
+                                                            client_key=client_key,
+                                                            ca_certs=ca_certs,
+                                                            validate_cert=validate_cert,
+                                                            proxy_host=http_proxy_host,
+                                                            proxy_port=http_proxy_port,
+                                                            **body_options,
+                                                            **ssl_options)
+
+        logger.info("Response {code}", fparams={"code": response.code})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Response {body}", fparams={"body": response.body.decode() if response.body else ''})
+
+        return response
@@ -0,0 +1,59 @@
+"""This module defines a HTTP request body that is built from, and sent as, a sequence of parts."""
+from typing import Awaitable, Callable, Iterator, Optional, Sequence, Union
+
+ENCODING = 'utf-8'
+
+
+class HttpBody(object):
+    """A HTTP request body made up of a sequence of string or bytes parts, such as the pieces of a rendered message
+    template. Large parts, like message payloads, are not copied into one combined string. Instead each part is encoded
+    just before it is written to the connection, and the size of the body is worked out without building it."""
+
+    def __init__(self, parts: Sequence[Union[str, bytes]]):
+        """
+        :param parts: The parts which, concatenated, make up the body. String parts are encoded as UTF-8.
+        """
+        self._parts = parts
+        self._size: Optional[int] = None
+
+    def __len__(self) -> int:
+        """The size of the encoded body, in bytes."""
+        if self._size is None:
+            self._size = sum(_encoded_length(part) for part in self._parts)
+        return self._size
+
+    def __str__(self) -> str:
+        return ''.join(part if isinstance(part, str) else bytes(part).decode(ENCODING) for part in self._parts)
+
+    def chunks(self) -> Iterator[Union[bytes, memoryview]]:
+        """Encode the body one part at a time.
+
+        :return: An iterator over the encoded parts of the body.
+        """
+        for part in self._parts:
+            if not part:
+                continue
+            yield part.encode(ENCODING) if isinstance(part, str) else memoryview(part)
+
+    def to_bytes(self) -> bytes:
+        """Encode the whole body into a single bytes object, for HTTP clients which cannot send a body in pieces.
+
+        :return: The encoded body.
+        """
+        return b''.join(self.chunks())
+
+    async def write_to(self, write: Callable[[bytes], Awaitable[None]]) -> None:
+        """Write the body to a connection one part at a time. Suitable for use as a Tornado `body_producer`.
+
+        :param write: The function used to write each encoded part to the connection.
+        """
+        for chunk in self.chunks():
+            await write(chunk)
+
+
+def _encoded_length(part: Union[str, bytes]) -> int:
+    if not isinstance(part, str):
+        return len(part)
+    if part.isascii():
+        return len(part)
+    return len(part.encode(ENCODING))
@@ -0,0 +1,10 @@
+class HttpHeaders:
+    CONTENT_TYPE = "Content-Type"
+    CONTENT_LENGTH = "Content-Length"
+    CORRELATION_ID = "Correlation-Id"
+    MESSAGE_ID = "Message-Id"
+    INTERACTION_ID = "Interaction-Id"
+    INBOUND_MESSAGE_ID = "Inbound-Message-Id"
+    FROM_ASID = "from-asid"
+    WAIT_FOR_RESPONSE = "wait-for-response"
+    ODS_CODE = "ods-code"
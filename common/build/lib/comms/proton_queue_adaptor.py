@@ -0,0 +1,838 @@
+"""Module for Proton specific queue adaptor functionality. """
+import asyncio
+import itertools
+import json
+import queue as queue_module
+import threading
+import proton.handlers
+import proton.reactor
+from typing import Dict, Any, List, Optional, Tuple
+
+from tornado.ioloop import IOLoop
+
+import comms.queue_adaptor
+import utilities.integration_adaptors_logger as log
+import utilities.message_utilities as message_utilities
+from exceptions import MaxRetriesExceeded
+from proton import Message
+from retry.retriable_action import RetriableAction
+from utilities import metrics, timing
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+MESSAGES_SENT = metrics.counter('queue_messages_sent_total',
+                                'The number of messages put onto queues, by result (sent or failed)',
+                                ['queue', 'result'])
+SEND_DURATION = metrics.histogram('queue_send_duration_seconds',
+                                  'The time taken to put a message, or a batch of messages, onto a queue, including '
+                                  'retries',
+                                  ['queue'])
+
+
+class MessageSendingError(RuntimeError):
+    """An error occurred whilst sending a message to the Message Queue"""
+    pass
+
+
+class EarlyDisconnectError(RuntimeError):
+    """The connection to the Message Queue ended before sending of the message had been done."""
+    pass
+
+
+class ProtonQueueAdaptor(comms.queue_adaptor.QueueAdaptor):
+    """Proton implementation of a queue adaptor."""
+
+    def __init__(self, urls: List[str], queue: str, username, password, max_retries=0, retry_delay=0,
+                 ttl_in_seconds=0, get_message_callback: (object, None) = None, use_sender_pool: bool = False,
+                 sender_links_per_connection: int = 1, settlement_timeout: float = 30, batch_max_size: int = 1,
+                 batch_max_delay: float = 0) -> None:
+        """
+        Construct a Proton implementation of a :class:`QueueAdaptor <comms.queue_adaptor.QueueAdaptor>`.
+        The kwargs provided should contain the following information:
+          * host: The host of the Message Queue to be interacted with.
+          * username: The username to use to connect to the Message Queue.
+          * password The password to use to connect to the Message Queue.
+          * use_sender_pool: Whether to send messages over long-lived connections (see
+            :class:`ProtonSenderPool <comms.proton_queue_adaptor.ProtonSenderPool>`) rather than opening a new
+            connection for every message.
+          * sender_links_per_connection: The number of sender links to open on each pooled connection.
+          * settlement_timeout: The time (in seconds) to wait for a pooled send to be settled by the broker.
+          * batch_max_size: The maximum number of messages passed to :meth:`send_async` that are sent together as a
+            single batch. A value of 1 disables batching, so that each message is sent as soon as it is received.
+          * batch_max_delay: The maximum time (in seconds) a message passed to :meth:`send_async` waits for a batch
+            to fill up before the batch is sent.
+        :param kwargs: The key word arguments required for this constructor.
+        """
+        super().__init__()
+        self.urls = urls
+        self.queue = queue
+        self.username = username
+        self.password = password
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.ttl_in_seconds = ttl_in_seconds
+        self.get_message_callback = get_message_callback
+        self.batch_max_size = batch_max_size
+        self.batch_max_delay = batch_max_delay
+
+        if self.urls is None or not isinstance(urls, List) or len(urls) == 0:
+            raise ValueError("Invalid urls %s", urls)
+        if queue is None or len(queue.strip()) == 0:
+            raise ValueError("Invalid queue name %s", queue)
+
+        self._sender_pool = ProtonSenderPool(urls, queue, username, password, sender_links_per_connection,
+                                             settlement_timeout) if use_sender_pool else None
+        self._batch = []
+        self._batch_flush_handle = None
+
+        logger.info('Initialized proton queue adaptor for {urls} with {max_retries}, {retry_delay} and {use_sender_pool}',
+                    fparams={'urls': self.urls, 'max_retries': max_retries, 'retry_delay': retry_delay,
+                             'use_sender_pool': use_sender_pool})
+
+    async def start(self) -> None:
+        """Opens the pooled broker connections, if this adaptor has been configured to use a sender pool."""
+        if self._sender_pool:
+            self._sender_pool.start()
+
+    async def close(self) -> None:
+        """Closes the pooled broker connections, if this adaptor has been configured to use a sender pool."""
+        if self._sender_pool:
+            await IOLoop.current().run_in_executor(None, self._sender_pool.stop)
+
+    async def send_async(self, message: dict, properties: Dict[str, Any] = None) -> None:
+        """Builds and asynchronously sends a message to the host defined when this adaptor was constructed. Raises an
+        exception to indicate that the message could not be sent successfully.
+
+        :param message: The message body to send. This will be serialised as JSON.
+        :param properties: Optional application properties to send with the message.
+        """
+        logger.info('Sending message asynchronously.')
+        payload = self.__construct_message(message, properties=properties)
+        if self.batch_max_size > 1:
+            await self.__add_to_batch(payload)
+            return
+
+        try:
+            await self.__send_with_retries(payload)
+        except MaxRetriesExceeded as e:
+            raise MessageSendingError() from e
+
+    async def send_many_async(self, messages: List[Tuple[dict, Optional[Dict[str, Any]]]]) -> None:
+        """Builds and asynchronously sends a batch of messages over a single link to the host defined when this adaptor
+        was constructed. Messages are sent as link credit allows and their settlements are collected together. Raises
+        an exception to indicate that any of the messages could not be sent successfully.
+
+        :param messages: The messages to send, as pairs of a message body (which will be serialised as JSON) and
+        optional application properties.
+        """
+        logger.info('Sending {count} messages asynchronously.', fparams={'count': len(messages)})
+        payloads = [self.__construct_message(message, properties=properties) for message, properties in messages]
+        try:
+            await self.__send_many_with_retries(payloads)
+        except MaxRetriesExceeded as e:
+            raise MessageSendingError() from e
+
+    def wait_for_messages(self):
+        # for url in self.urls:
+        if not self.get_message_callback:
+            raise EarlyDisconnectError('No callback specified for message retrieving')
+        messaging_handler = ProtonMessageReceiver(self.urls[0], self.queue, self.get_message_callback)
+        proton.reactor.Container(messaging_handler).run()
+
+    def __construct_message(self, message: dict, properties: Dict[str, Any] = None) -> proton.Message:
+        """
+        Build a message with a generated uuid, and specified message body.
+        :param message: The message body to be wrapped.
+        :param properties: Optional application properties to send with the message.
+        :return: The Message in the correct format with generated uuid.
+        """
+        message_id = message_utilities.get_uuid()
+        logger.info('Constructing message with {id} and {applicationProperties}',
+                    fparams={'id': message_id, 'applicationProperties': properties})
+        return proton.Message(id=message_id,
+                              content_type='application/json',
+                              body=json.dumps(message),
+                              properties=properties,
+                              ttl=self.ttl_in_seconds)
+
+    async def __add_to_batch(self, message: proton.Message) -> None:
+        """
+        Adds a message to the batch currently being collected and waits until the batch it is part of has been sent.
+        The batch is sent once it reaches the maximum batch size or after the maximum batch delay, whichever is first.
+        :param message: message to send
+        """
+        future = asyncio.get_event_loop().create_future()
+        self._batch.append((message, future))
+        if len(self._batch) >= self.batch_max_size:
+            self.__flush_batch()
+        elif self._batch_flush_handle is None:
+            self._batch_flush_handle = asyncio.get_event_loop().call_later(self.batch_max_delay, self.__flush_batch)
+        await future
+
+    def __flush_batch(self) -> None:
+        if self._batch_flush_handle:
+            self._batch_flush_handle.cancel()
+            self._batch_flush_handle = None
+        batch, self._batch = self._batch, []
+        asyncio.ensure_future(self.__send_batch(batch))
+
+    async def __send_batch(self, batch: List[Tuple[proton.Message, asyncio.Future]]) -> None:
+        """
+        Sends a batch of messages collected from calls to :meth:`send_async` and completes the future of each message
+        according to whether that message was sent.
+        :param batch: the messages to send, paired with the futures awaited by their callers
+        """
+        unsent = [message for message, _ in batch]
+        error = None
+        try:
+            await self.__send_many_with_retries(unsent)
+        except MaxRetriesExceeded as e:
+            error = e
+
+        unsent_ids = {id(message) for message in unsent}
+        for message, future in batch:
+            if future.done():
+                continue
+            if error and id(message) in unsent_ids:
+                exception = MessageSendingError()
+                exception.__cause__ = error
+                future.set_exception(exception)
+            else:
+                future.set_result(None)
+
+    async def __try_sending_to_all_in_sequence(self, message: proton.Message) -> None:
+        """
+        Sends message to ONE of available brokers trying each in sequence. Raises exception if none succeeds.
+        :param message: message to send
+        """
+        exception = None
+        for url in self.urls:
+            try:
+                logger.info("Trying to send message to {url} {queue}", fparams={'url': url, 'queue': self.queue})
+                if self._sender_pool:
+                    await self._sender_pool.send(url, message)
+                else:
+                    messaging_handler = ProtonMessagingHandler(url, self.queue, self.username, self.password, message)
+                    await IOLoop.current().run_in_executor(None, proton.reactor.Container(messaging_handler).run)
+            except EarlyDisconnectError as e:
+                logger.warning("Failed to send message to '%s", url)
+                exception = e
+            else:
+                exception = None
+                break
+        if exception:
+            logger.warning("Failed to send message to any of '%s", self.urls)
+            raise exception
+
+    async def __try_sending_many_to_all_in_sequence(self, messages: List[proton.Message]) -> None:
+        """
+        Sends a batch of messages to the available brokers trying each in sequence, with any messages not settled by
+        one broker being sent to the next. Raises exception if any message could not be sent to any broker. Messages
+        which have been sent are removed from the given list, so that only those still unsent are retried.
+        :param messages: messages to send
+        """
+        for url in self.urls:
+            logger.info("Trying to send {count} messages to {url} {queue}",
+                        fparams={'count': len(messages), 'url': url, 'queue': self.queue})
+            if self._sender_pool:
+                unsettled, rejected = await self._sender_pool.send_many(url, messages)
+            else:
+                unsettled, rejected = await self.__send_many_over_new_connection(url, messages)
+            messages[:] = unsettled + rejected
+            if rejected:
+                logger.warning("{count} messages rejected by '{url}'", fparams={'count': len(rejected), 'url': url})
+                raise MessageSendingError()
+            if not messages:
+                return
+            logger.warning("Failed to send {count} messages to '{url}'", fparams={'count': len(messages), 'url': url})
+
+        logger.warning("Failed to send messages to any of '%s", self.urls)
+        raise EarlyDisconnectError()
+
+    async def __send_many_over_new_connection(self, url: str, messages: List[proton.Message]) \
+            -> Tuple[List[proton.Message], List[proton.Message]]:
+        messaging_handler = ProtonBatchMessagingHandler(url, self.queue, self.username, self.password, messages)
+        try:
+            await IOLoop.current().run_in_executor(None, proton.reactor.Container(messaging_handler).run)
+        except EarlyDisconnectError:
+            pass
+        return messaging_handler.unsettled_messages, messaging_handler.rejected_messages
+
+    async def __send_many_with_retries(self, messages: List[proton.Message]) -> None:
+        """
+        Sends a batch of messages, to the host defined when this adaptor was constructed, retrying any that could not
+        be sent. On return, or if an exception is raised, the given list holds the messages that remain unsent.
+        :param messages: The messages to be sent.
+        """
+        count = len(messages)
+        stopwatch = timing.Stopwatch()
+        stopwatch.start_timer()
+        result = await RetriableAction(
+            lambda: self.__try_sending_many_to_all_in_sequence(messages),
+            self.max_retries,
+            self.retry_delay) \
+            .with_retriable_exception_check(lambda ex: isinstance(ex, EarlyDisconnectError)) \
+            .execute()
+        SEND_DURATION.observe(stopwatch.stop_timer(), queue=self.queue)
+        MESSAGES_SENT.inc(count - len(messages), queue=self.queue, result='sent')
+        MESSAGES_SENT.inc(len(messages), queue=self.queue, result='failed')
+
+        if not result.is_successful:
+            logger.error("Exceeded the maximum number of retries, {max_retries} retries, when putting "
+                         "{count} messages onto inbound queue",
+                         fparams={"max_retries": self.max_retries, "count": len(messages)})
+            raise MaxRetriesExceeded('The max number of retries to put messages onto the inbound queue has '
+                                     'been exceeded') from result.exception
+
+    async def __send_with_retries(self, message: proton.Message) -> None:
+        """
+        Performs a synchronous send of a message, to the host defined when this adaptor was constructed.
+        :param message: The message to be sent.
+        """
+        stopwatch = timing.Stopwatch()
+        stopwatch.start_timer()
+        result = await RetriableAction(
+            lambda: self.__try_sending_to_all_in_sequence(message),
+            self.max_retries,
+            self.retry_delay) \
+            .with_retriable_exception_check(lambda ex: isinstance(ex, EarlyDisconnectError)) \
+            .execute()
+        SEND_DURATION.observe(stopwatch.stop_timer(), queue=self.queue)
+        MESSAGES_SENT.inc(queue=self.queue, result='sent' if result.is_successful else 'failed')
+
+        if not result.is_successful:
+            logger.error("Exceeded the maximum number of retries, {max_retries} retries, when putting "
+                         "message onto inbound queue",
+                         fparams={"max_retries": self.max_retries})
+            raise MaxRetriesExceeded('The max number of retries to put a message onto the inbound queue has '
+                                     'been exceeded') from result.exception
+
+
+class ProtonMessagingHandler(proton.handlers.MessagingHandler):
+    """Implementation of a Proton MessagingHandler which will send a single message. Note that this class will raise
+    an exception to indicate that a message could not be sent successfully."""
+
+    def __init__(self, url: str, queue: str, username: str, password: str, message: proton.Message) -> None:
+        """
+        Constructs a MessagingHandler which will send a specified message to a specified host.
+        :param url: The host to send the message to.
+        :param username: The username to login to the host with.
+        :param password: The password to login to the host with.
+        :param message: The message to be sent to the host.
+        """
+        super().__init__()
+        self._url = url
+        self._queue = queue
+        self._username = username
+        self._password = password
+        self._message = message
+        self._sent = False
+
+    def on_start(self, event: proton.Event) -> None:
+        """Called when this messaging handler is started.
+
+        :param event: The start event.
+        """
+        logger.info('Establishing connection to {url} for sending messages.', fparams={'url': self._url})
+        conn = event.container.connect(url=self._url, user=self._username, password=self._password, reconnect=False)
+        event.container.create_sender(conn, target=self._queue)
+
+    def on_sendable(self, event: proton.Event) -> None:
+        """Called when the link is ready for sending messages.
+
+        :param event: The sendable event.
+        """
+        if event.sender.credit:
+            if not self._sent:
+                event.sender.send(self._message)
+                logger.info('Message sent to {url}.', fparams={'url': event.connection.connected_address})
+                self._sent = True
+        else:
+            logger.error('Failed to send message as no available credit.')
+            raise MessageSendingError()
+
+    def on_accepted(self, event: proton.Event) -> None:
+        """Called when the outgoing message is accepted by the remote peer.
+
+        :param event: The accepted event.
+        """
+        logger.info('Message received by {url}.', fparams={'url': event.connection.connected_address})
+        event.connection.close()
+
+    def on_disconnected(self, event: proton.Event) -> None:
+        """Called when the socket is disconnected.
+
+        :param event: The disconnect event.
+        """
+        logger.info('Disconnected from {url}.', fparams={'url': event.connection.connected_address})
+        if not self._sent:
+            logger.error('Disconnected before message could be sent.')
+            raise EarlyDisconnectError()
+
+    def on_rejected(self, event: proton.Event) -> None:
+        """Called when the outgoing message is rejected by the remote peer.
+
+        :param event:
+        :return:
+        """
+        logger.warning('Message rejected by {url}.', fparams={'url': self._url})
+        self._sent = False
+
+    def on_transport_error(self, event: proton.Event) -> None:
+        """Called when an error is encountered with the transport over which the AMQP connection is established.
+
+        :param event: The transport error event.
+        """
+        logger.error("There was an error with the transport used for the connection to {url}.",
+                     fparams={'url': event.connection.connected_address})
+        super().on_transport_error(event)
+        raise EarlyDisconnectError()
+
+    def on_connection_error(self, event: proton.Event) -> None:
+        """Called when the peer closes the connection with an error condition.
+
+        :param event: The connection error event.
+        """
+        logger.error("{url} closed the connection with an error. {remote_condition}",
+                     fparams={'url': event.connection.connected_address, 'remote_condition': event.context.remote_condition})
+        super().on_connection_error(event)
+        raise EarlyDisconnectError()
+
+    def on_session_error(self, event: proton.Event) -> None:
+        """Called when the peer closes the session with an error condition.
+
+        :param event: The session error event.
+        """
+        logger.error("{url} closed the session with an error. {remote_condition}",
+                     fparams={'url': event.connection.connected_address, 'remote_condition': event.context.remote_condition})
+        super().on_session_error(event)
+        raise EarlyDisconnectError()
+
+    def on_link_error(self, event: proton.Event) -> None:
+        """Called when the peer closes the link with an error condition.
+
+        :param event: The link error event.
+        """
+        logger.error("{url} closed the link with an error. {remote_condition}",
+                     fparams={'url': event.connection.connected_address, 'remote_condition': event.context.remote_condition})
+        super().on_link_error(event)
+        raise EarlyDisconnectError()
+
+
+class ProtonBatchMessagingHandler(proton.handlers.MessagingHandler):
+    """Implementation of a Proton MessagingHandler which will send a batch of messages over a single link, sending as
+    many as the link credit allows and closing the connection once all of them have been settled. Note that this class
+    will raise an exception if the connection is lost before all messages have been settled; the messages which were
+    not settled are then available from `unsettled_messages`."""
+
+    def __init__(self, url: str, queue: str, username: str, password: str, messages: List[proton.Message]) -> None:
+        """
+        Constructs a MessagingHandler which will send the specified messages to a specified host.
+        :param url: The host to send the messages to.
+        :param username: The username to login to the host with.
+        :param password: The password to login to the host with.
+        :param messages: The messages to be sent to the host.
+        """
+        super().__init__()
+        self._url = url
+        self._queue = queue
+        self._username = username
+        self._password = password
+        self._messages = messages
+        self._next_index = 0
+        self._in_flight = {}
+        self._released = []
+        self.rejected_messages = []
+
+    @property
+    def unsettled_messages(self) -> List[proton.Message]:
+        """The messages which have not been accepted or rejected by the host, including any not yet sent."""
+        return list(self._in_flight.values()) + self._released + self._messages[self._next_index:]
+
+    def on_start(self, event: proton.Event) -> None:
+        """Called when this messaging handler is started.
+
+        :param event: The start event.
+        """
+        logger.info('Establishing connection to {url} for sending {count} messages.',
+                    fparams={'url': self._url, 'count': len(self._messages)})
+        conn = event.container.connect(url=self._url, user=self._username, password=self._password, reconnect=False)
+        event.container.create_sender(conn, target=self._queue)
+
+    def on_sendable(self, event: proton.Event) -> None:
+        """Called when the link has been given credit and so is ready for sending messages.
+
+        :param event: The sendable event.
+        """
+        while event.sender.credit and self._next_index < len(self._messages):
+            message = self._messages[self._next_index]
+            self._in_flight[event.sender.send(message)] = message
+            self._next_index += 1
+
+    def on_accepted(self, event: proton.Event) -> None:
+        """Called when an outgoing message is accepted by the remote peer.
+
+        :param event: The accepted event.
+        """
+        self._settle(event)
+
+    def on_rejected(self, event: proton.Event) -> None:
+        """Called when an outgoing message is rejected by the remote peer.
+
+        :param event: The rejected event.
+        """
+        logger.warning('Message rejected by {url}.', fparams={'url': self._url})
+        self.rejected_messages.append(self._in_flight[event.delivery])
+        self._settle(event)
+
+    def on_released(self, event: proton.Event) -> None:
+        """Called when an outgoing message is released by the remote peer, so is left unsettled to be sent again.
+
+        :param event: The released event.
+        """
+        logger.warning('Message released by {url}.', fparams={'url': self._url})
+        self._released.append(self._in_flight[event.delivery])
+        self._settle(event)
+
+    def on_disconnected(self, event: proton.Event) -> None:
+        """Called when the socket is disconnected.
+
+        :param event: The disconnect event.
+        """
+        logger.info('Disconnected from {url}.', fparams={'url': self._url})
+        if self.unsettled_messages:
+            logger.error('Disconnected before {count} messages could be sent.',
+                         fparams={'count': len(self.unsettled_messages)})
+            raise EarlyDisconnectError()
+
+    def on_transport_error(self, event: proton.Event) -> None:
+        """Called when an error is encountered with the transport over which the AMQP connection is established.
+
+        :param event: The transport error event.
+        """
+        logger.error("There was an error with the transport used for the connection to {url}.",
+                     fparams={'url': self._url})
+        super().on_transport_error(event)
+        raise EarlyDisconnectError()
+
+    def _settle(self, event: proton.Event) -> None:
+        self._in_flight.pop(event.delivery, None)
+        if not self._in_flight and self._next_index == len(self._messages):
+            logger.info('Finished sending {count} messages to {url}.',
+                        fparams={'count': len(self._messages), 'url': self._url})
+            event.connection.close()
+
+
+class ProtonSenderPool(object):
+    """A pool of long-lived connections and sender links to a set of brokers, with one reactor thread per broker url.
+
+    Messages are handed to the reactor thread of the chosen broker through a thread-safe queue and each send returns
+    a future which is completed once the broker has settled the message. A connection which drops is re-established
+    in the background, while sends to it fail fast so that the caller can fail over to another broker.
+    """
+
+    def __init__(self, urls: List[str], queue: str, username: str, password: str, links_per_connection: int = 1,
+                 settlement_timeout: float = 30) -> None:
+        """
+        :param urls: The urls of the brokers to connect to.
+        :param queue: The name of the queue to send messages to.
+        :param username: The username to login to the brokers with.
+        :param password: The password to login to the brokers with.
+        :param links_per_connection: The number of sender links to open on each connection.
+        :param settlement_timeout: The time (in seconds) to wait for a message to be settled by the broker.
+        """
+        self.settlement_timeout = settlement_timeout
+        self._connections = {url: ProtonSenderConnection(url, queue, username, password, links_per_connection)
+                             for url in urls}
+        self._started = False
+
+    def start(self) -> None:
+        """Starts the reactor thread of each broker connection in this pool."""
+        if self._started:
+            return
+        for connection in self._connections.values():
+            connection.start()
+        self._started = True
+
+    def stop(self) -> None:
+        """Closes each broker connection in this pool and waits for its reactor thread to finish."""
+        if not self._started:
+            return
+        for connection in self._connections.values():
+            connection.stop()
+        self._started = False
+
+    async def send(self, url: str, message: proton.Message) -> None:
+        """Sends a message to the broker with the given url, waiting until the broker has settled it.
+
+        :param url: The url of the broker to send the message to.
+        :param message: The message to send.
+        :raises EarlyDisconnectError: if the broker is unavailable or the connection to it is lost before the message
+        is settled.
+        :raises MessageSendingError: if the broker rejects the message.
+        """
+        unsettled, rejected = await self.send_many(url, [message])
+        if rejected:
+            raise MessageSendingError()
+        if unsettled:
+            raise EarlyDisconnectError()
+
+    async def send_many(self, url: str, messages: List[proton.Message]) \
+            -> Tuple[List[proton.Message], List[proton.Message]]:
+        """Sends a batch of messages to the broker with the given url, waiting until the broker has settled them all or
+        the settlement timeout has passed.
+
+        :param url: The url of the broker to send the messages to.
+        :param messages: The messages to send.
+        :return: The messages which were not settled by the broker (because it is unavailable, the connection to it was
+        lost or the settlement timeout passed), and the messages which were rejected by the broker.
+        """
+        self.start()
+        futures = self._connections[url].send_many(messages)
+        done, not_done = await asyncio.wait(futures, timeout=self.settlement_timeout)
+        if not_done:
+            logger.error('{count} messages were not settled by {url} within {timeout} seconds.',
+                         fparams={'count': len(not_done), 'url': url, 'timeout': self.settlement_timeout})
+
+        unsettled = []
+        rejected = []
+        for message, future in zip(messages, futures):
+            if future in not_done:
+                future.cancel()
+                unsettled.append(message)
+            elif isinstance(future.exception(), EarlyDisconnectError):
+                unsettled.append(message)
+            elif future.exception():
+                rejected.append(message)
+        return unsettled, rejected
+
+
+class ProtonSenderConnection(object):
+    """A long-lived connection to a single broker, owned by its own reactor thread."""
+
+    def __init__(self, url: str, queue: str, username: str, password: str, links_per_connection: int = 1) -> None:
+        """
+        :param url: The url of the broker to connect to.
+        :param queue: The name of the queue to send messages to.
+        :param username: The username to login to the broker with.
+        :param password: The password to login to the broker with.
+        :param links_per_connection: The number of sender links to open on the connection.
+        """
+        self.url = url
+        self._pending = queue_module.Queue()
+        self._injector = None
+        self._handler = ProtonSenderPoolHandler(url, queue, username, password, links_per_connection, self._pending)
+        self._thread = None
+
+    @property
+    def is_available(self) -> bool:
+        """Whether messages can currently be sent to this broker. A connection which is still being established is
+        treated as available, with messages waiting until its links have been given credit."""
+        return not self._handler.disconnected
+
+    def start(self) -> None:
+        """Starts the reactor thread which owns this connection."""
+        self._injector = proton.reactor.EventInjector()
+        container = proton.reactor.Container(self._handler)
+        container.selectable(self._injector)
+        self._thread = threading.Thread(target=container.run, name=f'proton-sender-{self.url}', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Asks the reactor thread to close the connection and waits for it to finish."""
+        self._injector.trigger(proton.reactor.ApplicationEvent(ProtonSenderPoolHandler.STOP_EVENT))
+        self._injector.close()
+        self._thread.join()
+
+    def send_many(self, messages: List[proton.Message]) -> List[asyncio.Future]:
+        """Hands a batch of messages to the reactor thread to be sent, waking it up once for the whole batch.
+
+        :param messages: The messages to send.
+        :return: A future for each message which is completed once the broker has settled that message.
+        """
+        loop = asyncio.get_event_loop()
+        futures = [loop.create_future() for _ in messages]
+        if not self.is_available:
+            logger.warning('Pooled connection to {url} is currently disconnected.', fparams={'url': self.url})
+            for future in futures:
+                future.set_exception(EarlyDisconnectError())
+            return futures
+
+        for message, future in zip(messages, futures):
+            self._pending.put((message, future, loop))
+        self._injector.trigger(proton.reactor.ApplicationEvent(ProtonSenderPoolHandler.SEND_EVENT))
+        return futures
+
+
+class ProtonSenderPoolHandler(proton.handlers.MessagingHandler):
+    """Implementation of a Proton MessagingHandler which keeps a connection and a set of sender links open, and sends
+    messages taken from a queue over whichever link has credit. Every method of this class runs on the reactor
+    thread; results are passed back to the waiting futures on their own event loops."""
+
+    SEND_EVENT = 'pending_messages'
+    STOP_EVENT = 'stop_sender'
+
+    def __init__(self, url: str, queue: str, username: str, password: str, links_per_connection: int,
+                 pending: queue_module.Queue) -> None:
+        super().__init__()
+        self._url = url
+        self._queue = queue
+        self._username = username
+        self._password = password
+        self._links_per_connection = links_per_connection
+        self._pending = pending
+        self._container = None
+        self._connection = None
+        self._senders = []
+        self._next_senders = None
+        self._in_flight = {}
+        self.disconnected = False
+
+    def on_start(self, event: proton.Event) -> None:
+        """Called when the reactor thread is started. Opens the connection and its sender links.
+
+        :param event: The start event.
+        """
+        logger.info('Establishing pooled connection to {url} for sending messages.', fparams={'url': self._url})
+        self._container = event.container
+        self._connection = event.container.connect(url=self._url, user=self._username, password=self._password)
+        self._senders = [event.container.create_sender(self._connection, target=self._queue,
+                                                       name=f'{self._queue}-sender-{index}')
+                         for index in range(self._links_per_connection)]
+        self._next_senders = itertools.cycle(self._senders)
+
+    def on_link_opened(self, event: proton.Event) -> None:
+        """Called when a sender link has been opened by the remote peer.
+
+        :param event: The link opened event.
+        """
+        logger.info('Pooled connection to {url} is ready for sending messages.', fparams={'url': self._url})
+        self.disconnected = False
+
+    def on_pending_messages(self, event: proton.Event) -> None:
+        """Called when messages have been queued for sending by another thread.
+
+        :param event: The application event.
+        """
+        self._send_pending_messages()
+
+    def on_sendable(self, event: proton.Event) -> None:
+        """Called when a link has been given credit and so is ready for sending messages.
+
+        :param event: The sendable event.
+        """
+        self._send_pending_messages()
+
+    def on_accepted(self, event: proton.Event) -> None:
+        """Called when an outgoing message is accepted by the remote peer.
+
+        :param event: The accepted event.
+        """
+        self._complete(event.delivery, None)
+
+    def on_rejected(self, event: proton.Event) -> None:
+        """Called when an outgoing message is rejected by the remote peer.
+
+        :param event: The rejected event.
+        """
+        logger.warning('Message rejected by {url}.', fparams={'url': self._url})
+        self._complete(event.delivery, MessageSendingError())
+
+    def on_released(self, event: proton.Event) -> None:
+        """Called when an outgoing message is released by the remote peer, so may be sent again.
+
+        :param event: The released event.
+        """
+        logger.warning('Message released by {url}.', fparams={'url': self._url})
+        self._complete(event.delivery, EarlyDisconnectError())
+
+    def on_disconnected(self, event: proton.Event) -> None:
+        """Called when the socket is disconnected. Fails any unsettled or waiting messages, which the caller may send to
+        another broker while the connection is re-established in the background.
+
+        :param event: The disconnect event.
+        """
+        logger.warning('Pooled connection to {url} disconnected.', fparams={'url': self._url})
+        self.disconnected = True
+        self._fail_all_messages(EarlyDisconnectError())
+
+    def on_stop_sender(self, event: proton.Event) -> None:
+        """Called when the owner of this connection has asked for it to be closed.
+
+        :param event: The application event.
+        """
+        logger.info('Closing pooled connection to {url}.', fparams={'url': self._url})
+        self.disconnected = True
+        self._fail_all_messages(EarlyDisconnectError())
+        if self._connection:
+            self._connection.close()
+        self._container.stop()
+
+    def on_transport_error(self, event: proton.Event) -> None:
+        """Called when an error is encountered with the transport over which the AMQP connection is established.
+
+        :param event: The transport error event.
+        """
+        logger.error("There was an error with the transport used for the pooled connection to {url}.",
+                     fparams={'url': self._url})
+        super().on_transport_error(event)
+
+    def _send_pending_messages(self) -> None:
+        while not self._pending.empty():
+            sender = self._sender_with_credit()
+            if sender is None:
+                return
+
+            message, future, loop = self._pending.get_nowait()
+            if future.cancelled():
+                continue
+
+            delivery = sender.send(message)
+            self._in_flight[delivery] = (future, loop)
+
+    def _sender_with_credit(self) -> Optional[proton.Sender]:
+        for _ in range(len(self._senders)):
+            sender = next(self._next_senders)
+            if sender.credit:
+                return sender
+        return None
+
+    def _fail_all_messages(self, exception: Exception) -> None:
+        for delivery in list(self._in_flight):
+            self._complete(delivery, exception)
+        while not self._pending.empty():
+            _, future, loop = self._pending.get_nowait()
+            loop.call_soon_threadsafe(_complete_future, future, exception)
+
+    def _complete(self, delivery: proton.Delivery, exception: Optional[Exception]) -> None:
+        future_and_loop = self._in_flight.pop(delivery, None)
+        if future_and_loop:
+            future, loop = future_and_loop
+            loop.call_soon_threadsafe(_complete_future, future, exception)
+
+
+def _complete_future(future: asyncio.Future, exception: Optional[Exception]) -> None:
+    if future.done():
+        return
+    if exception:
+        future.set_exception(exception)
+    else:
+        future.set_result(None)
+
+
+class ProtonMessageReceiver(proton.handlers.MessagingHandler):
+
+    def __init__(self, url, queue, callback):
+        super(ProtonMessageReceiver, self).__init__()
+        self.url = url
+        self.queue = queue
+        self.callback = callback
+
+    def on_start(self, event):
+        conn = event.container.connect(self.url)
+        # tested for queue with durability = transient
+        event.container.create_receiver(conn, self.queue)
+
+    def on_message(self, event):
+        message = event.message
+        self.callback(message)
@@ -0,0 +1,43 @@
+"""Module for generic queue adaptor functionality"""
+import abc
+from typing import Dict, Any, List, Optional, Tuple
+
+
+class QueueAdaptor(abc.ABC):
+    """Interface for a message queue adaptor."""
+
+    @abc.abstractmethod
+    async def send_async(self, message: dict, properties: Dict[str, Any] = None) -> None:
+        """
+        Sends a message which awaits using the async flow.
+        :param message: The message content to send. This will be serialised as JSON.
+        :param properties: Optional additional properties to send with the message.
+        """
+        pass
+
+    async def send_many_async(self, messages: List[Tuple[dict, Optional[Dict[str, Any]]]]) -> None:
+        """
+        Sends a batch of messages which awaits using the async flow. Implementations able to send several messages
+        in one round trip should override this; by default each message is sent in turn.
+        :param messages: The messages to send, as pairs of message content (which will be serialised as JSON) and
+        optional additional properties.
+        """
+        for message, properties in messages:
+            await self.send_async(message, properties=properties)
+
+    @abc.abstractmethod
+    def wait_for_messages(self):
+        pass
+
+    async def start(self) -> None:
+        """
+        Opens any long-lived connections used by this adaptor. Expected to be called once at application start up,
+        before the adaptor is used. Adaptors that do not hold long-lived connections need not override this.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Releases any long-lived connections opened by this adaptor. Expected to be called once at application shutdown.
+        """
+        pass
@@ -0,0 +1 @@
+"""Modules related to testing the comms functionality."""
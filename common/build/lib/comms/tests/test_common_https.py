@@ -0,0 +1,163 @@
+import ssl
+import sys
+from unittest import TestCase
+from unittest.mock import patch, Mock, MagicMock
+
+from tornado import httpclient, simple_httpclient
+
+from comms import common_https
+from comms.common_https import CommonHttps
+from comms.http_body import HttpBody
+from utilities.test_utilities import async_test, awaitable
+
+URL = "ABC.ABC"
+METHOD = "GET"
+HEADERS = {"a": "1"}
+BODY = "hello"
+CLIENT_CERT = "client.cert"
+CLIENT_KEY = "client.key"
+CA_CERTS = "ca.certs"
+HTTP_PROXY_HOST = "http_proxy"
+HTTP_PROXY_PORT = 3128
+
+
+class TestCommonHttps(TestCase):
+
+    @async_test
+    async def test_make_request(self):
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch:
+            return_value = Mock()
+            mock_fetch.return_value = awaitable(return_value)
+
+            actual_response = await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=BODY,
+                                                             client_cert=CLIENT_CERT, client_key=CLIENT_KEY,
+                                                             ca_certs=CA_CERTS, validate_cert=False,
+                                                             http_proxy_host=HTTP_PROXY_HOST,
+                                                             http_proxy_port=HTTP_PROXY_PORT)
+
+            mock_fetch.assert_called_with(URL,
+                                          raise_error=True,
+                                          method=METHOD,
+                                          body=BODY,
+                                          headers=HEADERS,
+                                          client_cert=CLIENT_CERT,
+                                          client_key=CLIENT_KEY,
+                                          ca_certs=CA_CERTS,
+                                          validate_cert=False,
+                                          proxy_host=HTTP_PROXY_HOST,
+                                          proxy_port=HTTP_PROXY_PORT)
+
+            self.assertIs(actual_response, return_value, "Expected content should be returned.")
+
+    @async_test
+    async def test_make_request_defaults(self):
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch:
+            return_value = Mock()
+            mock_fetch.return_value = awaitable(return_value)
+
+            actual_response = await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=BODY)
+
+            mock_fetch.assert_called_with(URL,
+                                          raise_error=True,
+                                          method=METHOD,
+                                          body=BODY,
+                                          headers=HEADERS,
+                                          client_cert=None,
+                                          client_key=None,
+                                          ca_certs=None,
+                                          validate_cert=True,
+                                          proxy_host=None,
+                                          proxy_port=None)
+
+            self.assertIs(actual_response, return_value, "Expected content should be returned.")
+
+    @async_test
+    async def test_make_request_writes_http_body_in_parts_with_simple_client(self):
+        body = HttpBody(['hello ', 'world'])
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch, \
+                patch.object(httpclient.AsyncHTTPClient, "configured_class",
+                             return_value=simple_httpclient.SimpleAsyncHTTPClient):
+            mock_fetch.return_value = awaitable(Mock())
+
+            await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=body)
+
+        fetch_kwargs = mock_fetch.call_args[1]
+        self.assertNotIn('body', fetch_kwargs)
+        self.assertEqual(body.write_to, fetch_kwargs['body_producer'])
+        self.assertEqual({'a': '1', 'Content-Length': '11'}, fetch_kwargs['headers'])
+        self.assertEqual({'a': '1'}, HEADERS)
+
+    @async_test
+    async def test_make_request_joins_http_body_with_other_clients(self):
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch, \
+                patch.object(httpclient.AsyncHTTPClient, "configured_class", return_value=Mock):
+            mock_fetch.return_value = awaitable(Mock())
+
+            await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=HttpBody(['hello ', 'world']))
+
+        fetch_kwargs = mock_fetch.call_args[1]
+        self.assertEqual(b'hello world', fetch_kwargs['body'])
+        self.assertNotIn('body_producer', fetch_kwargs)
+        self.assertEqual(HEADERS, fetch_kwargs['headers'])
+
+
+class TestConfigureHttpClient(TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch.object(httpclient.AsyncHTTPClient, "configure")
+        self.mock_configure = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, CommonHttps, "use_shared_ssl_context", False)
+
+    def test_configure_curl_client(self):
+        common_https.configure_http_client(common_https.HTTP_CLIENT_CURL, max_clients=20, request_timeout=5)
+
+        self.mock_configure.assert_called_once_with('tornado.curl_httpclient.CurlAsyncHTTPClient', max_clients=20,
+                                                    defaults={'request_timeout': 5,
+                                                              'prepare_curl_callback': common_https._prepare_curl})
+        self.assertFalse(CommonHttps.use_shared_ssl_context)
+
+    def test_configure_simple_client(self):
+        common_https.configure_http_client(common_https.HTTP_CLIENT_SIMPLE, max_clients=20, connect_timeout=5)
+
+        self.mock_configure.assert_called_once_with(None, max_clients=20, defaults={'connect_timeout': 5})
+        self.assertTrue(CommonHttps.use_shared_ssl_context)
+
+    def test_configure_unknown_client(self):
+        with self.assertRaises(ValueError):
+            common_https.configure_http_client('UNKNOWN')
+
+        self.mock_configure.assert_not_called()
+
+    def test_curl_handles_share_connections_and_keep_them_alive(self):
+        mock_pycurl = MagicMock()
+        mock_curl = Mock()
+        common_https._get_curl_share.cache_clear()
+        self.addCleanup(common_https._get_curl_share.cache_clear)
+
+        with patch.dict(sys.modules, {'pycurl': mock_pycurl}):
+            common_https._prepare_curl(mock_curl)
+            common_https._prepare_curl(mock_curl)
+
+        mock_pycurl.CurlShare.assert_called_once()
+        mock_curl.setopt.assert_any_call(mock_pycurl.SHARE, mock_pycurl.CurlShare.return_value)
+        mock_curl.setopt.assert_any_call(mock_pycurl.TCP_KEEPALIVE, 1)
+        mock_pycurl.CurlShare.return_value.setopt.assert_any_call(mock_pycurl.SH_SHARE,
+                                                                  mock_pycurl.LOCK_DATA_CONNECT)
+        mock_pycurl.CurlShare.return_value.setopt.assert_any_call(mock_pycurl.SH_SHARE,
+                                                                  mock_pycurl.LOCK_DATA_SSL_SESSION)
+
+    @async_test
+    async def test_simple_client_reuses_ssl_context(self):
+        common_https.configure_http_client(common_https.HTTP_CLIENT_SIMPLE)
+
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch:
+            mock_fetch.side_effect = lambda *args, **kwargs: awaitable(Mock())
+
+            await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=BODY, validate_cert=False)
+            await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=BODY, validate_cert=False)
+
+        first_ssl_options = mock_fetch.call_args_list[0][1]['ssl_options']
+        self.assertIsInstance(first_ssl_options, ssl.SSLContext)
+        self.assertEqual(ssl.CERT_NONE, first_ssl_options.verify_mode)
+        self.assertIs(first_ssl_options, mock_fetch.call_args_list[1][1]['ssl_options'])
@@ -0,0 +1,654 @@
+"""Module for testing the Proton queue adaptor functionality."""
+import asyncio
+import queue
+import unittest.mock
+
+import comms.proton_queue_adaptor
+import utilities.test_utilities
+
+TEST_UUID = "TEST UUID"
+TEST_MESSAGE = {'test': 'message'}
+# Hardcoded serialisation as we use json.dumps in the code being tested, so want to avoid testing code with itself
+TEST_MESSAGE_SERIALISED = '{"test": "message"}'
+TEST_PROPERTIES = {'test-property-name': 'test-property-value'}
+TEST_PROTON_MESSAGE = unittest.mock.Mock()
+TEST_QUEUE_SINGLE_URL = ["URL"]
+TEST_QUEUE_MULTIPLE_URLS = ["URL_1", "URL_2"]
+TEST_QUEUE_NAME = "TEST QUEUE NAME"
+TEST_QUEUE_USERNAME = "TEST QUEUE USERNAME"
+TEST_QUEUE_PASSWORD = "TEST QUEUE PASSWORD"
+TEST_EXCEPTION = Exception()
+TEST_SIDE_EFFECT = unittest.mock.Mock(side_effect=TEST_EXCEPTION)
+TEST_TTL = 100
+
+
+@unittest.mock.patch('utilities.message_utilities.get_uuid', new=lambda: TEST_UUID)
+class TestProtonQueueAdaptor(unittest.TestCase):
+    """Class to contain tests for the ProtonQueueAdaptor functionality."""
+
+    def setUp(self) -> None:
+        """Prepare standard mocks and service for unit testing."""
+        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor.proton.reactor, "Container")
+        self.mock_container = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = comms.proton_queue_adaptor.ProtonQueueAdaptor(
+            urls=TEST_QUEUE_SINGLE_URL,
+            queue=TEST_QUEUE_NAME,
+            username=TEST_QUEUE_USERNAME,
+            password=TEST_QUEUE_PASSWORD,
+            ttl_in_seconds=TEST_TTL)
+
+    def test_value_error_is_raised_when_broker_urls_are_invalid(self) -> None:
+        test_data = [
+            {"queue": TEST_QUEUE_NAME, "urls": None},
+            {"queue": TEST_QUEUE_NAME, "urls": ""},
+            {"queue": TEST_QUEUE_NAME, "urls": " "},
+            {"urls": TEST_QUEUE_SINGLE_URL, "queue": None},
+            {"urls": TEST_QUEUE_SINGLE_URL, "queue": ""},
+            {"urls": TEST_QUEUE_SINGLE_URL, "queue": " "}
+        ]
+
+        for data in test_data:
+            self.assertRaises(
+                ValueError,
+                comms.proton_queue_adaptor.ProtonQueueAdaptor,
+                **data, username=None, password=None)
+
+    # TESTING SEND ASYNC METHOD
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_success(self):
+        """Test happy path of send_async."""
+        awaitable = self.service.send_async(TEST_MESSAGE)
+        self.assertFalse(self.mock_container.return_value.run.called)
+
+        await awaitable
+
+        self.assert_proton_called_correctly()
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_with_properties_success(self):
+        """Test happy path of send_async."""
+        awaitable = self.service.send_async(TEST_MESSAGE, properties=TEST_PROPERTIES)
+        self.assertFalse(self.mock_container.return_value.run.called)
+
+        await awaitable
+
+        self.assert_proton_called_correctly(properties=TEST_PROPERTIES)
+
+    def assert_proton_called_correctly(self, properties=None):
+        self.assertTrue(self.mock_container.return_value.run.called)
+        proton_messaging_handler = self.mock_container.call_args[0][0]
+        self.assertEqual(TEST_QUEUE_SINGLE_URL[0], proton_messaging_handler._url)
+        self.assertEqual(TEST_QUEUE_NAME, proton_messaging_handler._queue)
+        self.assertEqual(TEST_QUEUE_USERNAME, proton_messaging_handler._username)
+        self.assertEqual(TEST_QUEUE_PASSWORD, proton_messaging_handler._password)
+        self.assertEqual(TEST_MESSAGE_SERIALISED, proton_messaging_handler._message.body)
+        self.assertEqual(TEST_UUID, proton_messaging_handler._message.id)
+        self.assertEqual(TEST_TTL, proton_messaging_handler._message.ttl)
+        self.assertEqual(properties, proton_messaging_handler._message.properties)
+
+
+@unittest.mock.patch('utilities.message_utilities.get_uuid', new=lambda: TEST_UUID)
+class TestProtonQueueAdaptorRetries(unittest.TestCase):
+    """Class to contain tests for the ProtonQueueAdaptor retry functionality."""
+
+    def setUp(self) -> None:
+        """Prepare standard mocks and service for unit testing."""
+        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor.proton.reactor, "Container")
+        self.mock_container = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = comms.proton_queue_adaptor.ProtonQueueAdaptor(
+            urls=TEST_QUEUE_MULTIPLE_URLS,
+            queue=TEST_QUEUE_NAME,
+            username=TEST_QUEUE_USERNAME,
+            password=TEST_QUEUE_PASSWORD,
+            max_retries=1,
+            retry_delay=0)
+
+    # TESTING SEND ASYNC METHOD
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_when_first_url_succeeds(self):
+        """Test happy path of send_async."""
+        awaitable = self.service.send_async(TEST_MESSAGE)
+        self.assertFalse(self.mock_container.return_value.run.called)
+
+        self.mock_container.return_value.run.side_effect = [
+            None,
+            comms.proton_queue_adaptor.EarlyDisconnectError()
+        ]
+
+        await awaitable
+
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=0, call_count=1)
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_when_first_url_fails(self):
+        """Test happy path of send_async."""
+        awaitable = self.service.send_async(TEST_MESSAGE)
+        self.assertFalse(self.mock_container.return_value.run.called)
+
+        self.mock_container.return_value.run.side_effect = [
+            comms.proton_queue_adaptor.EarlyDisconnectError(),
+            None
+        ]
+
+        await awaitable
+
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=0, call_count=2)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=1, call_count=2)
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_when_second_both_urls_fail_once(self):
+        """Test happy path of send_async."""
+        awaitable = self.service.send_async(TEST_MESSAGE)
+        self.assertFalse(self.mock_container.return_value.run.called)
+
+        side_effects = [
+            comms.proton_queue_adaptor.EarlyDisconnectError(),
+            comms.proton_queue_adaptor.EarlyDisconnectError(),
+            None
+        ]
+        self.mock_container.return_value.run.side_effect = side_effects
+
+        await awaitable
+
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=0, call_count=len(side_effects))
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=1, call_count=len(side_effects))
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=2, call_count=len(side_effects))
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_when_second_both_urls_fail_twice(self):
+        """Test happy path of send_async."""
+        awaitable = self.service.send_async(TEST_MESSAGE)
+        self.assertFalse(self.mock_container.return_value.run.called)
+
+        self.mock_container.return_value.run.side_effect = [comms.proton_queue_adaptor.EarlyDisconnectError() for _ in range(4)]
+
+        with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
+            await awaitable
+
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=0, call_count=4)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=1, call_count=4)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[0], call_index=2, call_count=4)
+        self.assert_proton_called_correctly(TEST_QUEUE_MULTIPLE_URLS[1], call_index=3, call_count=4)
+
+    def assert_proton_called_correctly(self, url, call_index, call_count):
+        self.assertTrue(self.mock_container.return_value.run.called)
+        self.assertEqual(self.mock_container.return_value.run.call_count, call_count)
+        url_index = TEST_QUEUE_MULTIPLE_URLS.index(url)
+        proton_messaging_handler = self.mock_container.call_args_list[call_index][0][0]
+        self.assertEqual(TEST_QUEUE_MULTIPLE_URLS[url_index], proton_messaging_handler._url)
+        self.assertEqual(TEST_QUEUE_NAME, proton_messaging_handler._queue)
+        self.assertEqual(TEST_QUEUE_USERNAME, proton_messaging_handler._username)
+        self.assertEqual(TEST_QUEUE_PASSWORD, proton_messaging_handler._password)
+        self.assertEqual(TEST_MESSAGE_SERIALISED, proton_messaging_handler._message.body)
+        self.assertEqual(TEST_UUID, proton_messaging_handler._message.id)
+
+
+class TestProtonMessagingHandler(unittest.TestCase):
+    """Class to contain tests for the ProtonMessagingHandler functionality."""
+
+    def setUp(self) -> None:
+        """Prepare service for testing."""
+        self.handler = comms.proton_queue_adaptor.ProtonMessagingHandler(
+            TEST_QUEUE_SINGLE_URL[0], TEST_QUEUE_NAME, TEST_QUEUE_USERNAME, TEST_QUEUE_PASSWORD, TEST_PROTON_MESSAGE)
+
+    # TESTING STARTUP METHOD
+    def test_on_start_success(self):
+        """Test happy path of on_start."""
+        mock_event = unittest.mock.MagicMock()
+
+        conn_mock = unittest.mock.MagicMock()
+        mock_event.container.connect.return_value = conn_mock
+
+        self.handler.on_start(mock_event)
+
+        mock_event.container.connect.assert_called_once_with(
+            url=TEST_QUEUE_SINGLE_URL[0],
+            user=TEST_QUEUE_USERNAME,
+            password=TEST_QUEUE_PASSWORD,
+            reconnect=False)
+        mock_event.container.create_sender.assert_called_once_with(conn_mock, target=TEST_QUEUE_NAME)
+
+    def test_on_start_error(self):
+        """Test error condition when creating a message sender."""
+        mock_event = unittest.mock.MagicMock()
+        mock_event.container.create_sender.side_effect = TEST_SIDE_EFFECT
+
+        with self.assertRaises(Exception) as ex:
+            self.handler.on_start(mock_event)
+
+        self.assertIs(ex.exception, TEST_EXCEPTION)
+        self.assertTrue(mock_event.container.create_sender.called)
+
+    # TESTING SENDABLE METHOD
+    def test_on_sendable_success(self):
+        """Test happy path for on_sendable."""
+        mock_event = unittest.mock.MagicMock()
+        mock_event.sender.credit = True
+        self.handler._sent = False
+
+        self.handler.on_sendable(mock_event)
+
+        self.assertTrue(mock_event.sender.send.called)
+        self.assertTrue(self.handler._sent)
+
+    def test_on_sendable_already_sent(self):
+        """Test on_sendable when message has already been sent (and not rejected)."""
+        mock_event = unittest.mock.MagicMock()
+        mock_event.sender.credit = True
+        self.handler._sent = True
+
+        self.handler.on_sendable(mock_event)
+
+        self.assertFalse(mock_event.sender.send.called)
+        self.assertTrue(self.handler._sent)
+
+    def test_on_sendable_no_credit(self):
+        """Test unhappy path when on_sendable is invoked but there is no sending credit."""
+        mock_event = unittest.mock.MagicMock()
+        mock_event.sender.credit = False
+        self.handler._sent = False
+
+        with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
+            self.handler.on_sendable(mock_event)
+
+        self.assertFalse(mock_event.sender.send.called)
+        self.assertFalse(self.handler._sent)
+
+    def test_on_sendable_error(self):
+        """Test unhappy path where performing the send action raises an exception."""
+        mock_event = unittest.mock.MagicMock()
+        mock_event.sender.credit = True
+        mock_event.sender.send.side_effect = TEST_SIDE_EFFECT
+        self.handler._sent = False
+
+        with self.assertRaises(Exception) as ex:
+            self.handler.on_sendable(mock_event)
+
+        self.assertIs(ex.exception, TEST_EXCEPTION)
+        self.assertTrue(mock_event.sender.send.called)
+        self.assertFalse(self.handler._sent)
+
+    # TESTING ACCEPTED METHOD
+    def test_on_accepted_success(self):
+        """Test happy path for on_accepted."""
+        mock_event = unittest.mock.MagicMock()
+
+        self.handler.on_accepted(mock_event)
+
+        self.assertTrue(mock_event.connection.close.called)
+
+    def test_on_accepted_error(self):
+        """Test unhappy path when attempting to close the connection raises an exception."""
+        mock_event = unittest.mock.MagicMock()
+        mock_event.connection.close.side_effect = TEST_SIDE_EFFECT
+
+        with self.assertRaises(Exception) as ex:
+            self.handler.on_accepted(mock_event)
+
+        self.assertIs(ex.exception, TEST_EXCEPTION)
+
+    # TESTING DISCONNECT METHOD
+    def test_on_disconnected_success(self):
+        """Test happy path for disconnecting from the host."""
+        mock_event = unittest.mock.MagicMock()
+        self.handler._sent = True
+
+        self.handler.on_disconnected(mock_event)
+
+    def test_on_disconnected_early(self):
+        """Test unhappy path when disconnecting from the host occurs too early."""
+        mock_event = unittest.mock.MagicMock()
+
+        with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
+            self.handler.on_disconnected(mock_event)
+
+    # TESTING REJECTED METHOD
+    def test_on_rejected(self):
+        """Test happy path allowing for a message to be rejected by the host (and ultimately re-submitted)."""
+        mock_event = unittest.mock.MagicMock()
+        self.handler._sent = True
+
+        self.handler.on_rejected(mock_event)
+
+        self.assertFalse(self.handler._sent)
+
+    # TESTING ERROR HANDLING METHODS
+    def test_should_raise_exception_on_error(self):
+        error_handling_methods = [
+            self.handler.on_transport_error,
+            self.handler.on_connection_error,
+            self.handler.on_session_error,
+            self.handler.on_link_error
+        ]
+
+        for error_handling_method in error_handling_methods:
+            with self.subTest(error_handling_method.__name__):
+                mock_event = unittest.mock.MagicMock()
+
+                with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
+                    error_handling_method(mock_event)
+
+
+@unittest.mock.patch('utilities.message_utilities.get_uuid', new=lambda: TEST_UUID)
+class TestProtonQueueAdaptorSenderPool(unittest.TestCase):
+    """Class to contain tests for the ProtonQueueAdaptor sender pool functionality."""
+
+    def setUp(self) -> None:
+        """Prepare standard mocks and service for unit testing."""
+        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor, "ProtonSenderPool")
+        self.mock_pool_class = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.mock_pool = self.mock_pool_class.return_value
+        self.service = comms.proton_queue_adaptor.ProtonQueueAdaptor(
+            urls=TEST_QUEUE_MULTIPLE_URLS,
+            queue=TEST_QUEUE_NAME,
+            username=TEST_QUEUE_USERNAME,
+            password=TEST_QUEUE_PASSWORD,
+            max_retries=1,
+            retry_delay=0,
+            use_sender_pool=True)
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_uses_sender_pool(self):
+        self.mock_pool.send.return_value = utilities.test_utilities.awaitable(None)
+
+        await self.service.send_async(TEST_MESSAGE)
+
+        self.mock_pool.send.assert_called_once()
+        url, message = self.mock_pool.send.call_args[0]
+        self.assertEqual(TEST_QUEUE_MULTIPLE_URLS[0], url)
+        self.assertEqual(TEST_MESSAGE_SERIALISED, message.body)
+        self.assertEqual(TEST_UUID, message.id)
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_fails_over_to_next_url_in_pool(self):
+        self.mock_pool.send.side_effect = [
+            utilities.test_utilities.awaitable_exception(comms.proton_queue_adaptor.EarlyDisconnectError()),
+            utilities.test_utilities.awaitable(None)
+        ]
+
+        await self.service.send_async(TEST_MESSAGE)
+
+        self.assertEqual([TEST_QUEUE_MULTIPLE_URLS[0], TEST_QUEUE_MULTIPLE_URLS[1]],
+                         [call[0][0] for call in self.mock_pool.send.call_args_list])
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_raises_error_when_all_pooled_urls_fail(self):
+        self.mock_pool.send.side_effect = \
+            lambda url, message: utilities.test_utilities.awaitable_exception(
+                comms.proton_queue_adaptor.EarlyDisconnectError())
+
+        with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
+            await self.service.send_async(TEST_MESSAGE)
+
+        self.assertEqual(4, self.mock_pool.send.call_count)
+
+    @utilities.test_utilities.async_test
+    async def test_start_and_close_manage_sender_pool(self):
+        await self.service.start()
+        self.mock_pool.start.assert_called_once()
+
+        await self.service.close()
+        self.mock_pool.stop.assert_called_once()
+
+
+class TestProtonSenderPoolHandler(unittest.TestCase):
+    """Class to contain tests for the ProtonSenderPoolHandler functionality."""
+
+    def setUp(self) -> None:
+        """Prepare service for testing."""
+        self.pending = queue.Queue()
+        self.handler = comms.proton_queue_adaptor.ProtonSenderPoolHandler(
+            TEST_QUEUE_SINGLE_URL[0], TEST_QUEUE_NAME, TEST_QUEUE_USERNAME, TEST_QUEUE_PASSWORD, 2, self.pending)
+        self.mock_event = unittest.mock.MagicMock()
+        self.senders = [unittest.mock.MagicMock(), unittest.mock.MagicMock()]
+        self.deliveries = []
+        for sender in self.senders:
+            sender.send.side_effect = self._send
+        self.mock_event.container.create_sender.side_effect = self.senders
+        self.handler.on_start(self.mock_event)
+
+    def _send(self, message):
+        delivery = unittest.mock.MagicMock()
+        self.deliveries.append(delivery)
+        return delivery
+
+    def test_on_start_opens_connection_and_sender_links(self):
+        self.mock_event.container.connect.assert_called_once_with(
+            url=TEST_QUEUE_SINGLE_URL[0],
+            user=TEST_QUEUE_USERNAME,
+            password=TEST_QUEUE_PASSWORD)
+        self.assertEqual(2, self.mock_event.container.create_sender.call_count)
+        for call in self.mock_event.container.create_sender.call_args_list:
+            self.assertEqual(TEST_QUEUE_NAME, call[1]['target'])
+
+    @utilities.test_utilities.async_test
+    async def test_pending_messages_are_sent_round_robin_and_completed_on_accept(self):
+        loop = asyncio.get_event_loop()
+        futures = [loop.create_future() for _ in range(3)]
+        for future in futures:
+            self.pending.put((TEST_PROTON_MESSAGE, future, loop))
+
+        self.handler.on_pending_messages(self.mock_event)
+
+        self.assertEqual(2, self.senders[0].send.call_count)
+        self.assertEqual(1, self.senders[1].send.call_count)
+
+        for delivery in self.deliveries:
+            self.mock_event.delivery = delivery
+            self.handler.on_accepted(self.mock_event)
+
+        await asyncio.gather(*futures)
+
+    @utilities.test_utilities.async_test
+    async def test_messages_wait_for_credit(self):
+        for sender in self.senders:
+            sender.credit = 0
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending.put((TEST_PROTON_MESSAGE, future, loop))
+
+        self.handler.on_pending_messages(self.mock_event)
+
+        self.assertFalse(self.pending.empty())
+        self.senders[1].credit = 1
+
+        self.handler.on_sendable(self.mock_event)
+
+        self.assertTrue(self.pending.empty())
+        self.senders[1].send.assert_called_once_with(TEST_PROTON_MESSAGE)
+
+    @utilities.test_utilities.async_test
+    async def test_rejected_message_fails_future(self):
+        loop = asyncio.get_event_loop()
+        future = loop.create_future()
+        self.pending.put((TEST_PROTON_MESSAGE, future, loop))
+        self.handler.on_pending_messages(self.mock_event)
+
+        self.mock_event.delivery = self.deliveries[0]
+        self.handler.on_rejected(self.mock_event)
+
+        with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
+            await future
+
+    @utilities.test_utilities.async_test
+    async def test_disconnect_fails_in_flight_and_pending_messages(self):
+        for sender in self.senders:
+            sender.credit = 1
+        self.senders[1].credit = 0
+        loop = asyncio.get_event_loop()
+        in_flight = loop.create_future()
+        self.pending.put((TEST_PROTON_MESSAGE, in_flight, loop))
+        self.handler.on_pending_messages(self.mock_event)
+        self.senders[0].credit = 0
+        pending = loop.create_future()
+        self.pending.put((TEST_PROTON_MESSAGE, pending, loop))
+        self.handler.on_pending_messages(self.mock_event)
+
+        self.handler.on_disconnected(self.mock_event)
+
+        self.assertTrue(self.handler.disconnected)
+        for future in [in_flight, pending]:
+            with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
+                await future
+
+        self.handler.on_link_opened(self.mock_event)
+
+        self.assertFalse(self.handler.disconnected)
+
+
+@unittest.mock.patch('utilities.message_utilities.get_uuid', new=lambda: TEST_UUID)
+class TestProtonQueueAdaptorSendMany(unittest.TestCase):
+    """Class to contain tests for the ProtonQueueAdaptor batch sending functionality."""
+
+    def setUp(self) -> None:
+        """Prepare standard mocks and service for unit testing."""
+        patcher = unittest.mock.patch.object(comms.proton_queue_adaptor, "ProtonSenderPool")
+        self.mock_pool = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.service = comms.proton_queue_adaptor.ProtonQueueAdaptor(
+            urls=TEST_QUEUE_MULTIPLE_URLS,
+            queue=TEST_QUEUE_NAME,
+            username=TEST_QUEUE_USERNAME,
+            password=TEST_QUEUE_PASSWORD,
+            max_retries=1,
+            retry_delay=0,
+            use_sender_pool=True)
+
+    def _record_send_many(self, sent_batches):
+        def send_many(url, messages):
+            sent_batches.append((url, list(messages)))
+            return utilities.test_utilities.awaitable(([], []))
+
+        self.mock_pool.send_many.side_effect = send_many
+
+    @utilities.test_utilities.async_test
+    async def test_send_many_async_sends_all_messages_in_one_batch(self):
+        sent_batches = []
+        self._record_send_many(sent_batches)
+
+        await self.service.send_many_async([(TEST_MESSAGE, TEST_PROPERTIES), (TEST_MESSAGE, None)])
+
+        self.assertEqual(1, len(sent_batches))
+        url, messages = sent_batches[0]
+        self.assertEqual(TEST_QUEUE_MULTIPLE_URLS[0], url)
+        self.assertEqual([TEST_MESSAGE_SERIALISED, TEST_MESSAGE_SERIALISED], [message.body for message in messages])
+        self.assertEqual([TEST_PROPERTIES, None], [message.properties for message in messages])
+
+    @utilities.test_utilities.async_test
+    async def test_send_many_async_sends_only_unsettled_messages_to_next_url(self):
+        sent_batches = []
+
+        def send_many(url, messages):
+            sent_batches.append((url, list(messages)))
+            return utilities.test_utilities.awaitable((messages[1:], []) if len(sent_batches) == 1 else ([], []))
+
+        self.mock_pool.send_many.side_effect = send_many
+
+        await self.service.send_many_async([({'n': 1}, None), ({'n': 2}, None), ({'n': 3}, None)])
+
+        self.assertEqual(2, len(sent_batches))
+        self.assertEqual(TEST_QUEUE_MULTIPLE_URLS[1], sent_batches[1][0])
+        self.assertEqual(['{"n": 2}', '{"n": 3}'], [message.body for message in sent_batches[1][1]])
+
+    @utilities.test_utilities.async_test
+    async def test_send_many_async_raises_error_when_message_rejected(self):
+        self.mock_pool.send_many.side_effect = \
+            lambda url, messages: utilities.test_utilities.awaitable(([], messages[:1]))
+
+        with self.assertRaises(comms.proton_queue_adaptor.MessageSendingError):
+            await self.service.send_many_async([(TEST_MESSAGE, None)])
+
+        self.mock_pool.send_many.assert_called_once()
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_batches_messages_up_to_max_size(self):
+        self.service.batch_max_size = 3
+        self.service.batch_max_delay = 60
+        sent_batches = []
+        self._record_send_many(sent_batches)
+
+        await asyncio.gather(*[self.service.send_async({'n': i}) for i in range(3)])
+
+        self.assertEqual(1, len(sent_batches))
+        self.assertEqual(3, len(sent_batches[0][1]))
+        self.mock_pool.send.assert_not_called()
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_sends_partial_batch_after_max_delay(self):
+        self.service.batch_max_size = 10
+        self.service.batch_max_delay = 0.01
+        sent_batches = []
+        self._record_send_many(sent_batches)
+
+        await asyncio.gather(*[self.service.send_async({'n': i}) for i in range(2)])
+
+        self.assertEqual(1, len(sent_batches))
+        self.assertEqual(2, len(sent_batches[0][1]))
+
+    @utilities.test_utilities.async_test
+    async def test_send_async_batch_only_fails_unsent_messages(self):
+        self.service.batch_max_size = 2
+        self.service.batch_max_delay = 60
+        self.mock_pool.send_many.side_effect = \
+            lambda url, messages: utilities.test_utilities.awaitable(([message for message in messages
+                                                                       if message.body == '{"n": 1}'], []))
+
+        results = await asyncio.gather(*[self.service.send_async({'n': i}) for i in range(2)], return_exceptions=True)
+
+        self.assertIsNone(results[0])
+        self.assertIsInstance(results[1], comms.proton_queue_adaptor.MessageSendingError)
+
+
+class TestProtonBatchMessagingHandler(unittest.TestCase):
+    """Class to contain tests for the ProtonBatchMessagingHandler functionality."""
+
+    def setUp(self) -> None:
+        """Prepare service for testing."""
+        self.messages = [unittest.mock.Mock(), unittest.mock.Mock(), unittest.mock.Mock()]
+        self.handler = comms.proton_queue_adaptor.ProtonBatchMessagingHandler(
+            TEST_QUEUE_SINGLE_URL[0], TEST_QUEUE_NAME, TEST_QUEUE_USERNAME, TEST_QUEUE_PASSWORD, self.messages)
+        self.mock_event = unittest.mock.MagicMock()
+        self.mock_event.sender.send.side_effect = lambda message: unittest.mock.Mock()
+
+    def test_on_sendable_sends_as_many_messages_as_credit_allows(self):
+        type(self.mock_event.sender).credit = unittest.mock.PropertyMock(side_effect=[1, 1, 0])
+
+        self.handler.on_sendable(self.mock_event)
+
+        self.assertEqual(2, self.mock_event.sender.send.call_count)
+        self.assertEqual(self.messages, self.handler.unsettled_messages)
+
+    def test_connection_closed_once_all_messages_settled(self):
+        self.mock_event.sender.credit = 10
+        self.handler.on_sendable(self.mock_event)
+        deliveries = list(self.handler._in_flight)
+
+        self.mock_event.delivery = deliveries[0]
+        self.handler.on_accepted(self.mock_event)
+        self.mock_event.delivery = deliveries[1]
+        self.handler.on_rejected(self.mock_event)
+        self.assertFalse(self.mock_event.connection.close.called)
+
+        self.mock_event.delivery = deliveries[2]
+        self.handler.on_accepted(self.mock_event)
+
+        self.assertTrue(self.mock_event.connection.close.called)
+        self.assertEqual([], self.handler.unsettled_messages)
+        self.assertEqual([self.messages[1]], self.handler.rejected_messages)
+        self.handler.on_disconnected(self.mock_event)
+
+    def test_disconnect_before_all_messages_settled(self):
+        self.mock_event.sender.credit = 10
+        self.handler.on_sendable(self.mock_event)
+        self.mock_event.delivery = list(self.handler._in_flight)[0]
+        self.handler.on_accepted(self.mock_event)
+
+        with self.assertRaises(comms.proton_queue_adaptor.EarlyDisconnectError):
+            self.handler.on_disconnected(self.mock_event)
+
+        self.assertEqual(self.messages[1:], self.handler.unsettled_messages)
@@ -0,0 +1,23 @@
+import tornado.testing
+from tornado.web import Application
+
+from handlers import metrics_handler
+from utilities import metrics
+
+
+class TestMetricsHandler(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self) -> Application:
+        self.registry = metrics.MetricsRegistry()
+        return tornado.web.Application([(r'/metrics', metrics_handler.MetricsHandler, dict(registry=self.registry))])
+
+    def test_get(self):
+        self.registry.counter('requests_total', 'The number of requests').inc()
+
+        response = self.fetch('/metrics', method='GET')
+
+        self.assertEqual(200, response.code)
+        self.assertEqual('text/plain; version=0.0.4; charset=utf-8', response.headers['Content-Type'])
+        self.assertEqual('# HELP requests_total The number of requests\n'
+                         '# TYPE requests_total counter\n'
+                         'requests_total 1\n',
+                         response.body.decode())
@@ -0,0 +1,154 @@
+"""This module selects the event loop implementation the services run on, and monitors how long their event loop is
+kept from running callbacks, such as by a blocking call."""
+import asyncio
+import asyncio.events
+import contextvars
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+import utilities.integration_adaptors_logger as log
+from utilities import config, metrics
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+EVENT_LOOP_ASYNCIO = 'asyncio'
+EVENT_LOOP_UVLOOP = 'uvloop'
+EVENT_LOOP_TYPES = [EVENT_LOOP_ASYNCIO, EVENT_LOOP_UVLOOP]
+
+# Lag is usually well under a millisecond, so the buckets start lower than those for request durations
+LAG_BUCKETS = (0.001, 0.0025) + metrics.DEFAULT_BUCKETS
+LOOP_LAG = metrics.histogram('event_loop_lag_seconds',
+                             'The time a callback waited to be run by the event loop, sampled periodically',
+                             buckets=LAG_BUCKETS)
+
+# The code of the method the default event loop runs each callback (or step of a task) with, whose handle holds the
+# context, and so the MDC values, the callback runs in
+_HANDLE_RUN_CODE = asyncio.events.Handle._run.__code__
+
+
+def configure_event_loop() -> None:
+    """Select the event loop implementation named by the EVENT_LOOP config value. Must be called before an event loop
+    is created.
+
+    `asyncio` (the default) uses the event loop built into Python. `uvloop` uses the optional uvloop package, which
+    must be installed separately, whose event loop is built on libuv and runs callbacks and socket I/O with less
+    overhead.
+    """
+    loop_type = config.get_config('EVENT_LOOP', default=EVENT_LOOP_ASYNCIO).lower()
+    if loop_type not in EVENT_LOOP_TYPES:
+        raise ValueError(f'EVENT_LOOP must be one of {EVENT_LOOP_TYPES}, not {loop_type}')
+
+    if loop_type == EVENT_LOOP_UVLOOP:
+        try:
+            import uvloop
+        except ImportError as e:
+            raise ImportError('EVENT_LOOP is uvloop, but the optional uvloop package is not installed') from e
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info('Using {event_loop} event loop', fparams={'event_loop': loop_type})
+
+
+class LoopLagMonitor(object):
+    """Samples the event loop's lag from a separate thread, and reports when the event loop is blocked.
+
+    Every sample interval, a callback is scheduled on the event loop, and the time it waits to be run is recorded in
+    the `event_loop_lag_seconds` metric. If it has not been run by the time the warning threshold is reached, a warning
+    is logged naming the call the event loop is blocked in, with the MDC values of the message being handled when it
+    was made.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, sample_interval: float, warning_threshold: float):
+        """
+        :param loop: The event loop to monitor.
+        :param sample_interval: The time (in seconds) between samples.
+        :param warning_threshold: The lag (in seconds) beyond which a warning is logged.
+        """
+        self.loop = loop
+        self.sample_interval = sample_interval
+        self.warning_threshold = warning_threshold
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start sampling. Must be called from the thread that runs the event loop."""
+        self._loop_thread_id = threading.get_ident()
+        self._thread = threading.Thread(target=self._sample, name='LoopLagMonitor', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self) -> None:
+        while not self._stopped.wait(self.sample_interval):
+            run = threading.Event()
+            try:
+                self.loop.call_soon_threadsafe(self._record_lag, time.perf_counter(), run)
+            except RuntimeError:
+                # The event loop has been closed
+                return
+
+            if run.wait(self.warning_threshold):
+                continue
+            self._report_blocked()
+            while not run.wait(self.sample_interval):
+                if self._stopped.is_set():
+                    return
+
+    @staticmethod
+    def _record_lag(scheduled_at: float, run: threading.Event) -> None:
+        LOOP_LAG.observe(time.perf_counter() - scheduled_at)
+        run.set()
+
+    def _report_blocked(self) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return
+        stack = ''.join(traceback.format_stack(frame))
+        context = _find_callback_context(frame)
+
+        def log_warning():
+            logger.warning('Event loop blocked for more than {warning_threshold} seconds in {stack}',
+                           fparams={'warning_threshold': self.warning_threshold, 'stack': stack})
+
+        if context is None:
+            log_warning()
+        else:
+            # The context is still entered on the event loop's thread, so a copy of it is run here
+            context.copy().run(log_warning)
+
+
+def _find_callback_context(frame) -> Optional[contextvars.Context]:
+    """
+    :return: The context of the callback the event loop is running, from its handle in the event loop's stack. None if
+    there is no such handle, such as with an event loop whose handles are not written in Python.
+    """
+    while frame is not None:
+        if frame.f_code is _HANDLE_RUN_CODE:
+            return getattr(frame.f_locals.get('self'), '_context', None)
+        frame = frame.f_back
+    return None
+
+
+def start_loop_lag_monitor() -> Optional[LoopLagMonitor]:
+    """Start monitoring the current thread's event loop, as configured by the EVENT_LOOP_LAG_SAMPLE_INTERVAL and
+    EVENT_LOOP_LAG_WARNING_THRESHOLD config values.
+
+    :return: The monitor, to be stopped once the event loop has stopped. None if monitoring is disabled.
+    """
+    sample_interval = float(config.get_config('EVENT_LOOP_LAG_SAMPLE_INTERVAL', default='1'))
+    if sample_interval <= 0:
+        logger.info('Event loop lag monitoring disabled')
+        return None
+
+    warning_threshold = float(config.get_config('EVENT_LOOP_LAG_WARNING_THRESHOLD', default='0.1'))
+    logger.info('Monitoring event loop lag every {sample_interval} seconds with {warning_threshold}',
+                fparams={'sample_interval': sample_interval, 'warning_threshold': warning_threshold})
+    monitor = LoopLagMonitor(asyncio.get_event_loop(), sample_interval, warning_threshold)
+    monitor.start()
+    return monitor
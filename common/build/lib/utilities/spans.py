@@ -0,0 +1,121 @@
+"""This module records how long each stage of handling a message (route lookups, serialisation, transmission, state
+store writes and so on) takes.
+
+The handling of a message is wrapped in a `message_trace`, and each stage within it in a `span`:
+
+    with spans.message_trace():
+        with spans.span('serialisation'):
+            ...
+
+The time taken by each stage is recorded in the `message_stage_duration_seconds` metric and, when the trace ends,
+logged as one summary record for the message. Traces are held in a context variable, in the same way as the `mdc`
+tracking ids, so the summary record carries the message's tracking ids and a span only needs the current trace, rather
+than having it passed down to it. Spans outside of a trace are only recorded in the metric.
+"""
+import contextvars
+import inspect
+import time
+from functools import wraps
+from typing import Dict, Optional
+
+import utilities.integration_adaptors_logger as log
+from utilities import metrics
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+STAGE_DURATION = metrics.histogram('message_stage_duration_seconds',
+                                   'The time taken by each stage of handling a message',
+                                   ['stage'])
+
+TOTAL = 'Total'
+
+
+class MessageTrace(object):
+    """The time taken by each stage of handling a single message."""
+
+    def __init__(self):
+        self.start_time = time.perf_counter()
+        self.durations: Dict[str, float] = {}
+        self.counts: Dict[str, int] = {}
+
+    def add(self, stage: str, duration: float) -> None:
+        """Add the time taken by a stage. A stage that happens more than once (such as a state store write) is totalled.
+
+        :param stage: The name of the stage.
+        :param duration: The time taken, in seconds.
+        """
+        self.durations[stage] = self.durations.get(stage, 0.0) + duration
+        self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    def log_summary(self) -> None:
+        """Log the time taken by each stage, and by the message as a whole, as a single record."""
+        fparams = {TOTAL: round(time.perf_counter() - self.start_time, 3)}
+        for stage, duration in self.durations.items():
+            fparams[stage] = round(duration, 3)
+            if self.counts[stage] > 1:
+                fparams[f'{stage}_count'] = self.counts[stage]
+
+        message = 'Message stage durations in seconds: ' + ' '.join('{' + name + '}' for name in fparams)
+        logger.info(message, fparams=fparams)
+
+
+_current_trace: contextvars.ContextVar[Optional[MessageTrace]] = contextvars.ContextVar('message_trace',
+                                                                                       default=None)
+
+
+def current_trace() -> Optional[MessageTrace]:
+    """The trace of the message currently being handled, if any."""
+    return _current_trace.get()
+
+
+class message_trace(object):
+    """A context manager that traces the stages of handling a message, and logs a summary of them when it exits."""
+
+    def __enter__(self) -> MessageTrace:
+        self._trace = MessageTrace()
+        self._token = _current_trace.set(self._trace)
+        return self._trace
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        _current_trace.reset(self._token)
+        self._trace.log_summary()
+        return False
+
+
+class span(object):
+    """Records the time taken by a stage of handling a message. Can be used as a context manager, or as a decorator of
+    functions or coroutine functions."""
+
+    def __init__(self, stage: str):
+        """
+        :param stage: The name of the stage, such as 'serialisation'.
+        """
+        self.stage = stage
+
+    def __enter__(self):
+        self._start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter() - self._start_time
+        STAGE_DURATION.observe(duration, stage=self.stage)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add(self.stage, duration)
+        return False
+
+    def __call__(self, func):
+        stage = self.stage
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def invoke_in_span(*args, **kwargs):
+                with span(stage):
+                    return await func(*args, **kwargs)
+        else:
+            @wraps(func)
+            def invoke_in_span(*args, **kwargs):
+                with span(stage):
+                    return func(*args, **kwargs)
+
+        return invoke_in_span
@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from utilities import metrics
+
+
+class TestMetricsRegistry(TestCase):
+
+    def setUp(self) -> None:
+        self.registry = metrics.MetricsRegistry()
+
+    def test_counter(self):
+        counter = self.registry.counter('requests_total', 'The number of requests', ['handler'])
+
+        counter.inc(handler='a')
+        counter.inc(2, handler='a')
+        counter.inc(handler='b')
+
+        self.assertEqual(3, counter.get(handler='a'))
+        self.assertEqual(1, counter.get(handler='b'))
+        self.assertEqual(0, counter.get(handler='c'))
+
+    def test_counter_cannot_be_decremented(self):
+        counter = self.registry.counter('requests_total', 'The number of requests')
+
+        with self.assertRaises(ValueError):
+            counter.inc(-1)
+
+    def test_gauge(self):
+        gauge = self.registry.gauge('in_progress', 'The number of requests in progress')
+
+        gauge.inc(3)
+        gauge.dec()
+        self.assertEqual(2, gauge.get())
+
+        gauge.set(7)
+        self.assertEqual(7, gauge.get())
+
+    def test_histogram(self):
+        histogram = self.registry.histogram('duration_seconds', 'Durations', ['handler'], buckets=[0.1, 1])
+
+        for value in [0.05, 0.1, 0.5, 5]:
+            histogram.observe(value, handler='a')
+
+        self.assertEqual(4, histogram.get_count(handler='a'))
+        self.assertAlmostEqual(5.65, histogram.get_sum(handler='a'))
+        self.assertEqual(0, histogram.get_count(handler='b'))
+
+    def test_metrics_must_be_given_their_labels(self):
+        counter = self.registry.counter('requests_total', 'The number of requests', ['handler'])
+
+        for labels in [{}, {'method': 'get'}, {'handler': 'a', 'method': 'get'}]:
+            with self.subTest(labels=labels):
+                with self.assertRaises(ValueError):
+                    counter.inc(**labels)
+
+    def test_metrics_are_registered_once(self):
+        counter = self.registry.counter('requests_total', 'The number of requests', ['handler'])
+
+        self.assertIs(counter, self.registry.counter('requests_total', 'The number of requests', ['handler']))
+        with self.subTest('Different type'):
+            with self.assertRaises(ValueError):
+                self.registry.gauge('requests_total', 'The number of requests', ['handler'])
+        with self.subTest('Different labels'):
+            with self.assertRaises(ValueError):
+                self.registry.counter('requests_total', 'The number of requests', ['method'])
+
+    def test_render(self):
+        counter = self.registry.counter('requests_total', 'The number of requests', ['handler'])
+        gauge = self.registry.gauge('in_progress', 'The number of requests in progress')
+        histogram = self.registry.histogram('duration_seconds', 'Durations', ['handler'], buckets=[0.1, 1])
+        counter.inc(handler='a "quoted"\\name')
+        gauge.set(2.5)
+        for value in [0.05, 0.5, 5]:
+            histogram.observe(value, handler='a')
+
+        self.assertEqual('# HELP requests_total The number of requests\n'
+                         '# TYPE requests_total counter\n'
+                         'requests_total{handler="a \\"quoted\\"\\\\name"} 1\n'
+                         '# HELP in_progress The number of requests in progress\n'
+                         '# TYPE in_progress gauge\n'
+                         'in_progress 2.5\n'
+                         '# HELP duration_seconds Durations\n'
+                         '# TYPE duration_seconds histogram\n'
+                         'duration_seconds_bucket{handler="a",le="0.1"} 1\n'
+                         'duration_seconds_bucket{handler="a",le="1"} 2\n'
+                         'duration_seconds_bucket{handler="a",le="+Inf"} 3\n'
+                         'duration_seconds_sum{handler="a"} 5.55\n'
+                         'duration_seconds_count{handler="a"} 3\n',
+                         self.registry.render())
+
+    def test_render_empty_registry(self):
+        self.assertEqual('', self.registry.render())
+
+    def test_clear(self):
+        counter = self.registry.counter('requests_total', 'The number of requests')
+        counter.inc()
+
+        self.registry.clear()
+
+        self.assertEqual(0, counter.get())
@@ -0,0 +1,95 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from utilities import mdc, metrics, spans
+from utilities.test_utilities import async_test
+
+
+class TestSpans(TestCase):
+
+    def setUp(self) -> None:
+        metrics.REGISTRY.clear()
+
+    @patch('time.perf_counter')
+    def test_span_records_stage_duration(self, time_mock):
+        time_mock.side_effect = [1.0, 1.5]
+
+        with spans.span('serialisation'):
+            pass
+
+        self.assertEqual(1, spans.STAGE_DURATION.get_count(stage='serialisation'))
+        self.assertEqual(0.5, spans.STAGE_DURATION.get_sum(stage='serialisation'))
+
+    @patch('time.perf_counter')
+    def test_span_records_duration_when_stage_fails(self, time_mock):
+        time_mock.side_effect = [1.0, 3.0]
+
+        with self.assertRaises(ValueError):
+            with spans.span('transmission'):
+                raise ValueError()
+
+        self.assertEqual(2.0, spans.STAGE_DURATION.get_sum(stage='transmission'))
+
+    @async_test
+    async def test_span_as_decorator(self):
+        @spans.span('lookup')
+        async def lookup():
+            return 'result'
+
+        @spans.span('serialisation')
+        def serialise():
+            return 'message'
+
+        self.assertEqual('result', await lookup())
+        self.assertEqual('message', serialise())
+        self.assertEqual(1, spans.STAGE_DURATION.get_count(stage='lookup'))
+        self.assertEqual(1, spans.STAGE_DURATION.get_count(stage='serialisation'))
+
+    @patch.object(spans, 'logger')
+    @patch('time.perf_counter')
+    def test_message_trace_logs_summary(self, time_mock, log_mock):
+        time_mock.side_effect = [0.0, 1.0, 1.25, 2.0, 2.5, 3.0, 3.25, 4.0]
+
+        with spans.message_trace() as trace:
+            with spans.span('endpoint_lookup'):
+                pass
+            with spans.span('work_description_write'):
+                pass
+            with spans.span('work_description_write'):
+                pass
+
+        self.assertIsNone(spans.current_trace())
+        self.assertEqual(2, trace.counts['work_description_write'])
+        log_mock.info.assert_called_once_with(
+            'Message stage durations in seconds: {Total} {endpoint_lookup} {work_description_write} '
+            '{work_description_write_count}',
+            fparams={'Total': 4.0, 'endpoint_lookup': 0.25, 'work_description_write': 0.75,
+                     'work_description_write_count': 2})
+
+    @patch.object(spans, 'logger')
+    def test_message_trace_logs_summary_when_handling_fails(self, log_mock):
+        with self.assertRaises(ValueError):
+            with spans.message_trace():
+                raise ValueError()
+
+        log_mock.info.assert_called_once()
+
+    def test_span_outside_of_trace_is_only_recorded_in_metric(self):
+        with spans.span('serialisation'):
+            pass
+
+        self.assertIsNone(spans.current_trace())
+        self.assertEqual(1, spans.STAGE_DURATION.get_count(stage='serialisation'))
+
+    @patch.object(spans, 'logger')
+    def test_summary_is_logged_with_tracking_ids(self, log_mock):
+        captured_ids = []
+        log_mock.info.side_effect = lambda *args, **kwargs: captured_ids.append(mdc.message_id.get())
+        token = mdc.message_id.set('message-id')
+        try:
+            with spans.message_trace():
+                pass
+        finally:
+            mdc.message_id.reset(token)
+
+        self.assertEqual(['message-id'], captured_ids)
@@ -0,0 +1,171 @@
+import os
+import pathlib
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import textwrap
+from unittest import TestCase
+from unittest.mock import patch, Mock
+
+import tornado.gen
+import tornado.httpclient
+import tornado.locks
+import tornado.web
+from tornado.testing import AsyncHTTPTestCase, gen_test
+
+import utilities
+from utilities import timing, workers
+
+SOURCE_DIR = pathlib.Path(utilities.__file__).resolve().parent.parent
+PROCESS_TIMEOUT = 30
+
+
+def _run_script(script: str, *args: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, '-c', textwrap.dedent(script), *args], stdout=subprocess.PIPE,
+                            universal_newlines=True, env={**os.environ, 'PYTHONPATH': str(SOURCE_DIR)})
+
+
+def _get_free_port() -> int:
+    with socket.socket() as free_socket:
+        free_socket.bind(('localhost', 0))
+        return free_socket.getsockname()[1]
+
+
+class TestGetWorkerCount(TestCase):
+
+    @patch('utilities.config.config', new={})
+    def test_defaults_to_one_worker(self):
+        self.assertEqual(1, workers.get_worker_count('WORKERS'))
+
+    @patch('utilities.config.config', new={'WORKERS': '4'})
+    def test_configured_worker_count(self):
+        self.assertEqual(4, workers.get_worker_count('WORKERS'))
+
+    @patch('os.cpu_count', return_value=8)
+    @patch('utilities.config.config', new={'WORKERS': 'auto'})
+    def test_auto_runs_one_worker_per_cpu(self, cpu_count_mock):
+        self.assertEqual(8, workers.get_worker_count('WORKERS'))
+
+    @patch('utilities.config.config', new={'WORKERS': '0'})
+    def test_invalid_worker_count(self):
+        with self.assertRaises(ValueError):
+            workers.get_worker_count('WORKERS')
+
+
+class TestForkWorkers(TestCase):
+
+    @patch('os.fork')
+    def test_one_worker_is_not_forked(self, fork_mock):
+        self.assertIsNone(workers.fork_workers(1, 1))
+        fork_mock.assert_not_called()
+
+    def test_each_worker_returns_its_id(self):
+        process = _run_script('''
+            import sys
+            from utilities import workers
+            sys.stdout.write(f'{workers.fork_workers(3, 1)}\\n')
+        ''')
+        output, _ = process.communicate(timeout=PROCESS_TIMEOUT)
+
+        self.assertEqual(0, process.returncode)
+        self.assertEqual(['0', '1', '2'], sorted(output.split()))
+
+    def test_failed_workers_are_restarted(self):
+        with tempfile.TemporaryDirectory() as marker_dir:
+            process = _run_script('''
+                import os
+                import pathlib
+                import sys
+                from utilities import workers
+                worker_id = workers.fork_workers(2, 1)
+                marker = pathlib.Path(sys.argv[1]) / str(worker_id)
+                if not marker.exists():
+                    marker.touch()
+                    os._exit(1)
+                sys.stdout.write(f'{worker_id}\\n')
+            ''', marker_dir)
+            output, _ = process.communicate(timeout=PROCESS_TIMEOUT)
+
+        self.assertEqual(0, process.returncode)
+        self.assertEqual(['0', '1'], sorted(output.split()))
+
+    def test_workers_share_port_and_shut_down_on_signal(self):
+        process = _run_script('''
+            import sys
+            import tornado.httpserver
+            import tornado.ioloop
+            import tornado.web
+            from utilities import workers
+            worker_id = workers.fork_workers(2, 1)
+            server = tornado.httpserver.HTTPServer(tornado.web.Application([]))
+            workers.listen(server, int(sys.argv[1]))
+            workers.shut_down_on_signal([server], 1)
+            sys.stdout.write(f'started {worker_id}\\n')
+            sys.stdout.flush()
+            tornado.ioloop.IOLoop.current().start()
+            sys.stdout.write(f'stopped {worker_id}\\n')
+        ''', str(_get_free_port()))
+        try:
+            started = [process.stdout.readline().split() for _ in range(2)]
+            process.send_signal(signal.SIGTERM)
+            output, _ = process.communicate(timeout=PROCESS_TIMEOUT)
+        finally:
+            process.kill()
+
+        self.assertEqual([['started', '0'], ['started', '1']], sorted(started))
+        self.assertEqual(0, process.returncode)
+        self.assertEqual(['stopped 0', 'stopped 1'], sorted(output.splitlines()))
+
+
+class SlowRequestHandler(tornado.web.RequestHandler):
+
+    def initialize(self, release: tornado.locks.Event):
+        self.release = release
+
+    @timing.time_request
+    async def get(self):
+        await self.release.wait()
+        self.write('finished')
+
+
+class TestShutDown(AsyncHTTPTestCase):
+
+    def get_app(self):
+        self.release = tornado.locks.Event()
+        return tornado.web.Application([(r'/', SlowRequestHandler, dict(release=self.release))])
+
+    @gen_test
+    async def test_requests_in_progress_finish_before_loop_is_stopped(self):
+        io_loop = Mock()
+        response_future = self.http_client.fetch(self.get_url('/'))
+        while timing.REQUESTS_IN_PROGRESS.get() == 0:
+            await tornado.gen.sleep(0.01)
+
+        shut_down_future = tornado.gen.convert_yielded(workers.shut_down(io_loop, [self.http_server], 10))
+        await tornado.gen.sleep(0.2)
+        io_loop.stop.assert_not_called()
+
+        self.release.set()
+        response = await response_future
+        await shut_down_future
+
+        self.assertEqual(b'finished', response.body)
+        io_loop.stop.assert_called_once()
+
+    @gen_test
+    async def test_loop_is_stopped_after_timeout(self):
+        io_loop = Mock()
+        response_future = self.http_client.fetch(self.get_url('/'))
+        while timing.REQUESTS_IN_PROGRESS.get() == 0:
+            await tornado.gen.sleep(0.01)
+
+        await workers.shut_down(io_loop, [self.http_server], 0.2)
+
+        io_loop.stop.assert_called_once()
+        with self.assertRaises(tornado.httpclient.HTTPClientError):
+            await response_future
+        self.release.set()
+        while timing.REQUESTS_IN_PROGRESS.get() > 0:
+            await tornado.gen.sleep(0.01)
@@ -0,0 +1,156 @@
+import datetime
+import inspect
+import time
+from functools import wraps
+from typing import Optional
+
+import tornado.web
+
+import utilities.integration_adaptors_logger as log
+from utilities import metrics
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+FUNCTION_DURATION = metrics.histogram('function_duration_seconds',
+                                      'The time taken to execute functions timed with time_function',
+                                      ['function'])
+REQUEST_DURATION = metrics.histogram('http_request_duration_seconds',
+                                     'The time taken to handle HTTP requests timed with time_request',
+                                     ['handler', 'method', 'status'])
+REQUESTS_IN_PROGRESS = metrics.gauge('http_requests_in_progress',
+                                     'The number of HTTP requests timed with time_request that are being handled')
+
+
+class Stopwatch(object):
+
+    start_time = None
+
+    def start_timer(self):
+        self.start_time = time.perf_counter()
+
+    def stop_timer(self):
+        end_time = time.perf_counter()
+        diff = end_time - self.start_time
+        return diff
+
+
+def _begin_stopwatch():
+    stopwatch = Stopwatch()
+    stopwatch.start_timer()
+    return stopwatch
+
+
+def _log_time(duration, func_name):
+    duration = round(duration, 3)
+    logger.info('{FuncName} took {Duration} seconds', fparams={'FuncName': func_name, 'Duration': duration})
+
+
+def _log_tornado_time(duration, handler, func_name):
+    duration = round(duration, 3)
+    logger.info('{FuncName} from {Handler} took {Duration} seconds',
+                fparams={'FuncName': func_name, 'Handler': handler, 'Duration': duration})
+
+
+def _get_function_name(func) -> str:
+    # The qualified name includes the class a method belongs to, so that e.g. the same method of different workflows
+    # is told apart
+    return func.__qualname__.replace('.<locals>', '')
+
+
+def _get_response_status(handler, error: Optional[Exception]) -> int:
+    if error is None:
+        return handler.get_status()
+    if isinstance(error, tornado.web.HTTPError):
+        return error.status_code
+    return 500
+
+
+def time_function(func):
+    """
+    A method decorator that logs the time taken to execute a given method, and records it in the
+    `function_duration_seconds` metric
+    """
+    qualified_name = _get_function_name(func)
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def invoke_method_with_timer(*args, **kwargs):
+            stopwatch = _begin_stopwatch()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                duration = stopwatch.stop_timer()
+                FUNCTION_DURATION.observe(duration, function=qualified_name)
+                _log_time(duration, func.__name__)
+    else:
+        @wraps(func)
+        def invoke_method_with_timer(*args, **kwargs):
+            stopwatch = _begin_stopwatch()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = stopwatch.stop_timer()
+                FUNCTION_DURATION.observe(duration, function=qualified_name)
+                _log_time(duration, func.__name__)
+
+    return invoke_method_with_timer
+
+
+def time_request(func):
+    """
+    A method to be used with tornado end points to extract their calling details and time their execution, this
+    mainly holds as a placeholder if any extra data is required from the call. The time taken is recorded in the
+    `http_request_duration_seconds` metric, along with the response status, and the requests being handled are counted
+    in the `http_requests_in_progress` metric
+    """
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def method_wrapper(*args, **kwargs):
+            handler = args[0]
+            stopwatch = _begin_stopwatch()
+            error = None
+            REQUESTS_IN_PROGRESS.inc()
+
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                REQUESTS_IN_PROGRESS.dec()
+                duration = stopwatch.stop_timer()
+                handler_name = handler.__class__.__name__
+                method = handler.request.method.lower()
+                REQUEST_DURATION.observe(duration, handler=handler_name, method=method,
+                                         status=_get_response_status(handler, error))
+                _log_tornado_time(duration, handler_name, method)
+
+        return method_wrapper
+    else:
+        @wraps(func)
+        def method_wrapper(*args, **kwargs):
+            handler = args[0]
+            stopwatch = _begin_stopwatch()
+            error = None
+            REQUESTS_IN_PROGRESS.inc()
+
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                error = e
+                raise
+            finally:
+                REQUESTS_IN_PROGRESS.dec()
+                duration = stopwatch.stop_timer()
+                handler_name = handler.__class__.__name__
+                method = handler.request.method.lower()
+                REQUEST_DURATION.observe(duration, handler=handler_name, method=method,
+                                         status=_get_response_status(handler, error))
+                _log_tornado_time(duration, handler_name, method)
+
+    return method_wrapper
+
+
+def get_time() -> str:
+    """Returns UTC time in the appropriate format """
+    return datetime.datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
@@ -0,0 +1,255 @@
+"""This module runs a Tornado service in one or more worker processes, and shuts its servers down gracefully.
+
+With more than one worker, the service's process forks the workers before any event loop, connection or client has
+been created. Each worker then creates its own persistence adaptors, queue adaptors and HTTP clients, and binds its own
+listening sockets with SO_REUSEPORT, so that the kernel spreads new connections across the workers. The process that
+forked them only supervises the workers: it restarts any that fail, and passes on SIGTERM and SIGINT so that each
+worker stops accepting connections and finishes the requests it is handling before it exits.
+"""
+import os
+import random
+import signal
+import socket
+import sys
+import time
+from typing import Dict, List, Optional
+
+import tornado.gen
+import tornado.httpserver
+import tornado.ioloop
+import tornado.netutil
+
+import utilities.integration_adaptors_logger as log
+from utilities import config, timing
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+WORKERS_AUTO = 'auto'
+DEFAULT_SHUTDOWN_TIMEOUT = 20
+
+# The number of times failed workers are restarted before the service gives up and exits
+MAX_RESTARTS = 100
+
+# How long the supervising process waits, beyond the shutdown timeout, before killing workers that have not exited
+_KILL_GRACE_PERIOD = 5
+_POLL_INTERVAL = 0.1
+
+_worker_id: Optional[int] = None
+
+
+def get_worker_count(config_key: str) -> int:
+    """
+    :param config_key: The config value holding the number of worker processes to run. The value `auto` runs one
+    worker for each CPU.
+    :return: The number of worker processes to run. Defaults to 1.
+    """
+    value = config.get_config(config_key, default='1').strip()
+    worker_count = (os.cpu_count() or 1) if value.lower() == WORKERS_AUTO else int(value)
+    if worker_count < 1:
+        raise ValueError(f'{config_key} must be a positive number of workers or {WORKERS_AUTO}, not {value}')
+    return worker_count
+
+
+def get_shutdown_timeout() -> float:
+    """
+    :return: How long (in seconds) servers wait for the requests in progress to finish when shutting down.
+    """
+    return float(config.get_config('SERVER_SHUTDOWN_TIMEOUT', default=str(DEFAULT_SHUTDOWN_TIMEOUT)))
+
+
+def get_worker_id() -> Optional[int]:
+    """
+    :return: The ID (from 0) of this worker process, or None if this process was not forked by `fork_workers`.
+    """
+    return _worker_id
+
+
+def fork_workers(worker_count: int, shutdown_timeout: float) -> Optional[int]:
+    """Fork worker processes, which return from this function, and supervise them until they have all exited.
+
+    This must be called before any event loop, connection or client is created, as they cannot be shared with the
+    forked processes. The supervising process never returns from this function: it exits once all of its workers have
+    exited. Workers that exit with an error, or are killed, are restarted unless the service is shutting down.
+
+    :param worker_count: The number of worker processes to fork. If 1, no processes are forked and this process serves
+    requests itself.
+    :param shutdown_timeout: How long (in seconds) workers are given to shut down once signalled to, before they are
+    killed.
+    :return: The ID (from 0) of the worker, in each worker process, or None if no processes were forked.
+    """
+    if worker_count == 1:
+        return None
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        raise ValueError('Running more than one worker process needs SO_REUSEPORT, which this platform does not have')
+
+    supervisor = _Supervisor(worker_count, shutdown_timeout)
+    worker_id = supervisor.run()
+    if worker_id is None:
+        sys.exit(supervisor.exit_code)
+    return worker_id
+
+
+def bind_sockets(port: int) -> List[socket.socket]:
+    """Bind the listening sockets for a port. In a worker process, the sockets are bound with SO_REUSEPORT so that the
+    port can be shared with the other workers.
+
+    :param port: The port to listen on.
+    :return: The bound sockets, one for each address the port is bound on.
+    """
+    return tornado.netutil.bind_sockets(port, reuse_port=_worker_id is not None)
+
+
+def listen(server: tornado.httpserver.HTTPServer, port: int) -> None:
+    """Start a server listening on a port, in place of `server.listen(port)`, so that the port can be shared by worker
+    processes.
+
+    :param server: The server to start.
+    :param port: The port to listen on.
+    """
+    server.add_sockets(bind_sockets(port))
+
+
+def shut_down_on_signal(servers: List[tornado.httpserver.HTTPServer], shutdown_timeout: float) -> None:
+    """Shut the current event loop's servers down gracefully when this process receives SIGTERM or SIGINT.
+
+    The servers stop accepting connections, requests timed with `time_request` that are in progress are given up to
+    the shutdown timeout to finish, then the remaining connections are closed and the event loop is stopped.
+
+    :param servers: The servers to stop.
+    :param shutdown_timeout: How long (in seconds) to wait for the requests in progress to finish.
+    """
+    io_loop = tornado.ioloop.IOLoop.current()
+    shutting_down = False
+
+    def on_signal(signal_number, frame):
+        nonlocal shutting_down
+        if not shutting_down:
+            shutting_down = True
+            io_loop.add_callback_from_signal(shut_down, io_loop, servers, shutdown_timeout)
+
+    signal.signal(signal.SIGTERM, on_signal)
+    signal.signal(signal.SIGINT, on_signal)
+
+
+async def shut_down(io_loop: tornado.ioloop.IOLoop, servers: List[tornado.httpserver.HTTPServer],
+                    shutdown_timeout: float) -> None:
+    """Stop servers accepting connections, wait for the requests in progress to finish and stop the event loop.
+
+    :param io_loop: The event loop to stop.
+    :param servers: The servers to stop.
+    :param shutdown_timeout: How long (in seconds) to wait for the requests in progress to finish.
+    """
+    logger.info('Shutting down. Waiting up to {shutdown_timeout} seconds for {requests_in_progress} requests',
+                fparams={'shutdown_timeout': shutdown_timeout,
+                         'requests_in_progress': timing.REQUESTS_IN_PROGRESS.get()})
+    for server in servers:
+        server.stop()
+
+    deadline = time.monotonic() + shutdown_timeout
+    while timing.REQUESTS_IN_PROGRESS.get() > 0 and time.monotonic() < deadline:
+        await tornado.gen.sleep(_POLL_INTERVAL)
+
+    requests_in_progress = timing.REQUESTS_IN_PROGRESS.get()
+    if requests_in_progress > 0:
+        logger.warning('Shutdown timeout reached with {requests_in_progress} requests still in progress',
+                       fparams={'requests_in_progress': requests_in_progress})
+
+    # Keep-alive connections are left open by stopping a server, so are closed here
+    for server in servers:
+        await server.close_all_connections()
+    io_loop.stop()
+
+
+class _Supervisor(object):
+
+    def __init__(self, worker_count: int, shutdown_timeout: float):
+        self.worker_count = worker_count
+        self.shutdown_timeout = shutdown_timeout
+        self.exit_code = 0
+        self._workers: Dict[int, int] = {}
+        self._restarts = 0
+        self._kill_at: Optional[float] = None
+
+    def run(self) -> Optional[int]:
+        """
+        :return: The ID of the worker, in each worker process. None in this process, once all the workers have exited.
+        """
+        logger.info('Starting {worker_count} worker processes', fparams={'worker_count': self.worker_count})
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+
+        for worker_id in range(self.worker_count):
+            if self._start_worker(worker_id):
+                return worker_id
+
+        while self._workers:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                self._kill_workers_after_timeout()
+                time.sleep(_POLL_INTERVAL)
+                continue
+
+            worker_id = self._workers.pop(pid, None)
+            if worker_id is None:
+                continue
+            if self._kill_at is not None or (os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0):
+                logger.info('Worker {worker_id} exited with {exit_status}',
+                            fparams={'worker_id': worker_id, 'exit_status': status})
+                continue
+
+            logger.error('Worker {worker_id} failed with {exit_status}',
+                         fparams={'worker_id': worker_id, 'exit_status': status})
+            self._restarts += 1
+            if self._restarts > MAX_RESTARTS:
+                logger.critical('Workers have failed {restarts} times. Shutting down',
+                                fparams={'restarts': self._restarts})
+                self.exit_code = 1
+                self._shut_down()
+            elif self._start_worker(worker_id):
+                return worker_id
+
+        logger.info('All worker processes have exited')
+        return None
+
+    def _start_worker(self, worker_id: int) -> bool:
+        """
+        :return: True in the worker process, False in this one.
+        """
+        pid = os.fork()
+        if pid == 0:
+            global _worker_id
+            _worker_id = worker_id
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            # Otherwise every worker would generate the same sequence of random numbers
+            random.seed()
+            log.reconfigure_logging_after_fork()
+            return True
+
+        logger.info('Started worker {worker_id} as process {pid}', fparams={'worker_id': worker_id, 'pid': pid})
+        self._workers[pid] = worker_id
+        return False
+
+    def _on_signal(self, signal_number, frame) -> None:
+        self._shut_down()
+
+    def _shut_down(self) -> None:
+        if self._kill_at is not None:
+            return
+        logger.info('Stopping {worker_count} worker processes', fparams={'worker_count': len(self._workers)})
+        self._kill_at = time.monotonic() + self.shutdown_timeout + _KILL_GRACE_PERIOD
+        self._signal_workers(signal.SIGTERM)
+
+    def _kill_workers_after_timeout(self) -> None:
+        if self._kill_at is not None and time.monotonic() > self._kill_at:
+            logger.warning('Killing {worker_count} worker processes that did not shut down in time',
+                           fparams={'worker_count': len(self._workers)})
+            self._signal_workers(signal.SIGKILL)
+            self._kill_at = float('inf')
+
+    def _signal_workers(self, signal_number: int) -> None:
+        for pid in self._workers:
+            try:
+                os.kill(pid, signal_number)
+            except ProcessLookupError:
+                pass
@@ -30,14 +30,26 @@ class PystacheMessageBuilder(object):
         :param message_dictionary: The dictionary of values to use when populating the template.
         :return: A string containing a message suitable for sending to a remote MHS.
         """
+        return ''.join(self.build_message_parts(message_dictionary))
+
+    def build_message_parts(self, message_dictionary):
+        """Build a message by populating a Mustache template with values from the provided dictionary, without joining
+        the pieces of the message together. Large values, such as payloads, are returned as they are rather than being
+        copied into a single string.
+        :param message_dictionary: The dictionary of values to use when populating the template.
+        :return: A list of strings which, concatenated, make up the message.
+        """
         try:
-            return self._renderer.render(self._parsed_template, message_dictionary)
+            return self._render_parts(message_dictionary)
         except pystache_context.KeyNotFoundError as e:
             logger.error('Failed to find {Key} when generating message from {TemplateFile} . {ErrorMessage}',
                          fparams={'Key': e.key, 'TemplateFile': self.template_file, 'ErrorMessage': e})
             raise MessageGenerationError(f'Failed to find key:{e.key} when generating message from'
                                          f' template file:{self.template_file}') from e
 
+    def _render_parts(self, message_dictionary):
+        return [self._renderer.render(self._parsed_template, message_dictionary)]
+
 
 class MessageGenerationError(Exception):
     """
@@ -1,17 +1,182 @@
-from typing import Dict
+import functools
+import ssl
+import sys
+import weakref
+from typing import Dict, Iterator, Optional, Union
 
-from tornado import httpclient
+from tornado import httpclient, simple_httpclient
+
+from comms.http_body import HttpBody
 
 from utilities import integration_adaptors_logger as log
 import logging
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
+HTTP_CLIENT_CURL = 'CURL'
+HTTP_CLIENT_SIMPLE = 'SIMPLE'
+HTTP_CLIENT_TYPES = [HTTP_CLIENT_CURL, HTTP_CLIENT_SIMPLE]
+
+# The curl handles which have been given the shared caches. Tornado reuses its handles from one request to the next, and
+# a handle cannot be given the shared caches again
+_shared_curls = weakref.WeakSet()
+
+
+def configure_http_client(client_type: str = HTTP_CLIENT_CURL, max_clients: int = 10,
+                          connect_timeout: Optional[float] = None, request_timeout: Optional[float] = None) -> None:
+    """Configure the Tornado HTTP client shared by all requests made through :class:`CommonHttps`.
+
+    With the curl client, every curl handle shares one connection cache, TLS session cache and DNS cache, and TCP
+    keep-alive is enabled. Connections to the same endpoint are therefore reused across requests, whichever handle
+    makes them. The simple client opens a new connection for every request (there is no keep-alive) and does not support
+    proxies, so is only suitable where requests are made directly to their endpoint. With it, an SSLContext is built
+    once for each combination of certificates and reused for every request.
+
+    :param client_type: One of `HTTP_CLIENT_TYPES`.
+    :param max_clients: The maximum number of requests that may be in progress at once. Further requests are queued.
+    :param connect_timeout: The default timeout (in seconds) for establishing a connection. None uses Tornado's default.
+    :param request_timeout: The default timeout (in seconds) for a whole request. None uses Tornado's default.
+    """
+    if client_type not in HTTP_CLIENT_TYPES:
+        raise ValueError(f'HTTP client type must be one of {HTTP_CLIENT_TYPES}')
+
+    defaults = {}
+    if connect_timeout is not None:
+        defaults['connect_timeout'] = connect_timeout
+    if request_timeout is not None:
+        defaults['request_timeout'] = request_timeout
+
+    if client_type == HTTP_CLIENT_CURL:
+        defaults['prepare_curl_callback'] = _prepare_curl
+        httpclient.AsyncHTTPClient.configure('tornado.curl_httpclient.CurlAsyncHTTPClient', max_clients=max_clients,
+                                             defaults=defaults)
+    else:
+        httpclient.AsyncHTTPClient.configure(_SharedSslContextHTTPClient, max_clients=max_clients, defaults=defaults)
+
+    logger.info('Configured {client_type} HTTP client with {max_clients}',
+                fparams={'client_type': client_type, 'max_clients': max_clients})
+
+
+@functools.lru_cache(maxsize=None)
+def _get_curl_share():
+    import pycurl
+
+    curl_share = pycurl.CurlShare()
+    curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_SSL_SESSION)
+    curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_DNS)
+    # Sharing the connection cache needs libcurl 7.57+. Without it, each handle still keeps its own connections alive
+    if hasattr(pycurl, 'LOCK_DATA_CONNECT'):
+        curl_share.setopt(pycurl.SH_SHARE, pycurl.LOCK_DATA_CONNECT)
+    return curl_share
+
+
+def _prepare_curl(curl) -> None:
+    import pycurl
+
+    if curl not in _shared_curls:
+        curl.setopt(pycurl.SHARE, _get_curl_share())
+        curl.setopt(pycurl.TCP_KEEPALIVE, 1)
+        _shared_curls.add(curl)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_ssl_context(client_cert: Optional[str], client_key: Optional[str], ca_certs: Optional[str],
+                     validate_cert: bool) -> ssl.SSLContext:
+    ssl_context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH, cafile=ca_certs)
+    if client_cert:
+        ssl_context.load_cert_chain(client_cert, client_key)
+    if not validate_cert:
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_NONE
+    return ssl_context
+
+
+class _SharedSslContextHTTPClient(simple_httpclient.SimpleAsyncHTTPClient):
+    """A simple HTTP client which gives each request a shared SSLContext for its certificates, rather than one built
+    for that request alone."""
+
+    def fetch_impl(self, request, callback) -> None:
+        # The request is wrapped in a proxy which fills in the client's defaults. Its ssl_options are set on the
+        # wrapped request, so that the certificates given to the request are still read through the proxy
+        if request.ssl_options is None and request.url.lower().startswith('https:'):
+            request.request.ssl_options = _get_ssl_context(request.client_cert, request.client_key, request.ca_certs,
+                                                           request.validate_cert)
+        super().fetch_impl(request, callback)
+
+
+class _CurlBodyReader(object):
+    """Reads a HttpBody a part at a time, as curl asks for it, so that the body is not joined into a single bytes
+    object."""
+
+    def __init__(self, body: HttpBody):
+        self._body = body
+        self.restart()
+
+    def restart(self) -> None:
+        self._chunks: Iterator[Union[bytes, memoryview]] = self._body.chunks()
+        self._chunk = memoryview(b'')
+
+    def read(self, size: int) -> bytes:
+        """A curl READFUNCTION.
+
+        :param size: The maximum number of bytes curl will accept.
+        :return: Up to `size` bytes of the body, or no bytes once all of it has been read.
+        """
+        while not self._chunk:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return b''
+            self._chunk = memoryview(chunk)
+        data, self._chunk = self._chunk[:size], self._chunk[size:]
+        return data.tobytes()
+
+    def ioctl(self, command: int) -> None:
+        """A curl IOCTLFUNCTION, which rewinds the body when curl needs to send it again, such as after a redirect."""
+        import pycurl
+
+        if command == pycurl.IOCMD_RESTARTREAD:
+            self.restart()
+
+
+def _stream_curl_body(body: HttpBody, method: str, curl) -> None:
+    import pycurl
+
+    _prepare_curl(curl)
+    # Replaces the reader Tornado sets up over the (empty) request body. The size must be set explicitly, as Tornado
+    # sets it from that same empty body
+    reader = _CurlBodyReader(body)
+    curl.setopt(pycurl.READFUNCTION, reader.read)
+    curl.setopt(pycurl.IOCTLFUNCTION, reader.ioctl)
+    if method == 'POST':
+        curl.setopt(pycurl.POSTFIELDSIZE, len(body))
+    else:
+        curl.setopt(pycurl.INFILESIZE, len(body))
+
+
+def _get_http_body_options(body: HttpBody, method: str, headers: Dict[str, str]):
+    client_class = httpclient.AsyncHTTPClient.configured_class()
+    if issubclass(client_class, simple_httpclient.SimpleAsyncHTTPClient):
+        # Setting the length up front stops Tornado falling back to a chunked transfer encoding
+        headers = dict(headers)
+        headers['Content-Length'] = str(len(body))
+        return {'body_producer': body.write_to}, headers
+
+    # The curl client module is only loaded (and so only importable, as it needs pycurl) if it has been configured
+    curl_httpclient = sys.modules.get('tornado.curl_httpclient')
+    if curl_httpclient and issubclass(client_class, curl_httpclient.CurlAsyncHTTPClient):
+        # curl reads the body through a callback, given a part at a time. This callback replaces the configured
+        # default, so it also applies that
+        return {'body': b'', 'prepare_curl_callback': functools.partial(_stream_curl_body, body, method)}, headers
+
+    # Any other client is given the body as a single bytes object
+    return {'body': body.to_bytes()}, headers
+
 
 class CommonHttps(object):
 
     @staticmethod
-    async def make_request(url: str, method: str, headers: Dict[str, str], body: str, client_cert: str = None,
+    async def make_request(url: str, method: str, headers: Dict[str, str], body: Union[str, HttpBody],
+                           client_cert: str = None,
                            client_key: str = None, ca_certs: str = None, validate_cert: bool = True,
                            http_proxy_host: str = None, http_proxy_port: int = None,
                            raise_error_response: bool = True):
@@ -19,7 +184,8 @@ class CommonHttps(object):
         :param url: A string containing the endpoint to send the request to.
         :param method: A string containing the HTTP method to send the request as.
         :param headers: A dictionary containing key value pairs for the details of the HTTP header.
-        :param body: A string containing the message to send to the endpoint.
+        :param body: A string containing the message to send to the endpoint, or a HttpBody. With the simple and curl
+        HTTP clients, a HttpBody is written to the connection a part at a time.
         :param client_cert: A string containing the full path of the client certificate file.
         :param client_key: A string containing the full path of the client private key file.
         :param ca_certs: A string containing the full path of the certificate authority certificate file.
@@ -43,17 +209,21 @@ class CommonHttps(object):
         if not validate_cert:
             logger.warning("Server certificate validation has been disabled.")
 
+        body_options = {'body': body}
+        if isinstance(body, HttpBody):
+            body_options, headers = _get_http_body_options(body, method, headers)
+
         response = await httpclient.AsyncHTTPClient().fetch(url,
                                                             raise_error=raise_error_response,
                                                             method=method,
-                                                            body=body,
                                                             headers=headers,
                                                             client_cert=client_cert,
                                                             client_key=client_key,
                                                             ca_certs=ca_certs,
                                                             validate_cert=validate_cert,
                                                             proxy_host=http_proxy_host,
-                                                            proxy_port=http_proxy_port)
+                                                            proxy_port=http_proxy_port,
+                                                            **body_options)
 
         logger.info("Response {code}", fparams={"code": response.code})
         if logger.isEnabledFor(logging.DEBUG):
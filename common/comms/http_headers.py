@@ -1,5 +1,6 @@
 class HttpHeaders:
     CONTENT_TYPE = "Content-Type"
+    CONTENT_LENGTH = "Content-Length"
     CORRELATION_ID = "Correlation-Id"
     MESSAGE_ID = "Message-Id"
     INTERACTION_ID = "Interaction-Id"
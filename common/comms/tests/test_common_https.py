@@ -1,9 +1,14 @@
+import ssl
+import sys
+import types
 from unittest import TestCase
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, MagicMock
 
-from tornado import httpclient
+from tornado import httpclient, simple_httpclient
 
+from comms import common_https
 from comms.common_https import CommonHttps
+from comms.http_body import HttpBody
 from utilities.test_utilities import async_test, awaitable
 
 URL = "ABC.ABC"
@@ -66,3 +71,146 @@ class TestCommonHttps(TestCase):
                                           proxy_port=None)
 
             self.assertIs(actual_response, return_value, "Expected content should be returned.")
+
+    @async_test
+    async def test_make_request_writes_http_body_in_parts_with_simple_client(self):
+        body = HttpBody(['hello ', 'world'])
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch, \
+                patch.object(httpclient.AsyncHTTPClient, "configured_class",
+                             return_value=simple_httpclient.SimpleAsyncHTTPClient):
+            mock_fetch.return_value = awaitable(Mock())
+
+            await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=body)
+
+        fetch_kwargs = mock_fetch.call_args[1]
+        self.assertNotIn('body', fetch_kwargs)
+        self.assertEqual(body.write_to, fetch_kwargs['body_producer'])
+        self.assertEqual({'a': '1', 'Content-Length': '11'}, fetch_kwargs['headers'])
+        self.assertEqual({'a': '1'}, HEADERS)
+
+    @async_test
+    async def test_make_request_joins_http_body_with_other_clients(self):
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch, \
+                patch.object(httpclient.AsyncHTTPClient, "configured_class", return_value=Mock):
+            mock_fetch.return_value = awaitable(Mock())
+
+            await CommonHttps.make_request(url=URL, method=METHOD, headers=HEADERS, body=HttpBody(['hello ', 'world']))
+
+        fetch_kwargs = mock_fetch.call_args[1]
+        self.assertEqual(b'hello world', fetch_kwargs['body'])
+        self.assertNotIn('body_producer', fetch_kwargs)
+        self.assertEqual(HEADERS, fetch_kwargs['headers'])
+
+
+    @async_test
+    async def test_make_request_streams_http_body_with_curl_client(self):
+        curl_httpclient = types.ModuleType('tornado.curl_httpclient')
+        curl_httpclient.CurlAsyncHTTPClient = type('CurlAsyncHTTPClient', (), {})
+        body = HttpBody(['hello ', b'world'])
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch, \
+                patch.dict(sys.modules, {'tornado.curl_httpclient': curl_httpclient}), \
+                patch.object(httpclient.AsyncHTTPClient, "configured_class",
+                             return_value=curl_httpclient.CurlAsyncHTTPClient):
+            mock_fetch.return_value = awaitable(Mock())
+
+            await CommonHttps.make_request(url=URL, method='POST', headers=HEADERS, body=body)
+
+        fetch_kwargs = mock_fetch.call_args[1]
+        self.assertEqual(b'', fetch_kwargs['body'])
+        self.assertEqual(HEADERS, fetch_kwargs['headers'])
+
+        mock_pycurl = MagicMock()
+        options = {}
+        mock_curl = Mock()
+        mock_curl.setopt.side_effect = options.__setitem__
+        with patch.dict(sys.modules, {'pycurl': mock_pycurl}), patch.object(common_https, '_prepare_curl') as prepare:
+            fetch_kwargs['prepare_curl_callback'](mock_curl)
+            read = options[mock_pycurl.READFUNCTION]
+            self.assertEqual([b'hel', b'lo ', b'wor', b'ld', b''], [read(3) for _ in range(5)])
+
+            options[mock_pycurl.IOCTLFUNCTION](mock_pycurl.IOCMD_RESTARTREAD)
+            self.assertEqual(b'hello ', read(100))
+
+        prepare.assert_called_once_with(mock_curl)
+        self.assertEqual(11, options[mock_pycurl.POSTFIELDSIZE])
+
+
+class TestConfigureHttpClient(TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch.object(httpclient.AsyncHTTPClient, "configure")
+        self.mock_configure = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_configure_curl_client(self):
+        common_https.configure_http_client(common_https.HTTP_CLIENT_CURL, max_clients=20, request_timeout=5)
+
+        self.mock_configure.assert_called_once_with('tornado.curl_httpclient.CurlAsyncHTTPClient', max_clients=20,
+                                                    defaults={'request_timeout': 5,
+                                                              'prepare_curl_callback': common_https._prepare_curl})
+
+    def test_configure_simple_client(self):
+        common_https.configure_http_client(common_https.HTTP_CLIENT_SIMPLE, max_clients=20, connect_timeout=5)
+
+        self.mock_configure.assert_called_once_with(common_https._SharedSslContextHTTPClient, max_clients=20,
+                                                    defaults={'connect_timeout': 5})
+
+    def test_configure_unknown_client(self):
+        with self.assertRaises(ValueError):
+            common_https.configure_http_client('UNKNOWN')
+
+        self.mock_configure.assert_not_called()
+
+    def test_curl_handles_share_connections_and_keep_them_alive(self):
+        mock_pycurl = MagicMock()
+        mock_curl = Mock()
+        common_https._get_curl_share.cache_clear()
+        self.addCleanup(common_https._get_curl_share.cache_clear)
+
+        with patch.dict(sys.modules, {'pycurl': mock_pycurl}):
+            common_https._prepare_curl(mock_curl)
+            common_https._prepare_curl(mock_curl)
+
+        mock_pycurl.CurlShare.assert_called_once()
+        # The handle is reused for the second request, and a handle can only be given the share once
+        mock_curl.setopt.assert_any_call(mock_pycurl.SHARE, mock_pycurl.CurlShare.return_value)
+        self.assertEqual(1, [call[0][0] for call in mock_curl.setopt.call_args_list].count(mock_pycurl.SHARE))
+        mock_curl.setopt.assert_any_call(mock_pycurl.TCP_KEEPALIVE, 1)
+        mock_pycurl.CurlShare.return_value.setopt.assert_any_call(mock_pycurl.SH_SHARE,
+                                                                  mock_pycurl.LOCK_DATA_CONNECT)
+        mock_pycurl.CurlShare.return_value.setopt.assert_any_call(mock_pycurl.SH_SHARE,
+                                                                  mock_pycurl.LOCK_DATA_SSL_SESSION)
+
+    @async_test
+    async def test_simple_client_reuses_ssl_context(self):
+        client = common_https._SharedSslContextHTTPClient(force_instance=True)
+        self.addCleanup(client.close)
+        requests = [httpclient._RequestProxy(httpclient.HTTPRequest('https://' + URL, validate_cert=False),
+                                             client.defaults)
+                    for _ in range(2)]
+
+        with patch.object(simple_httpclient.SimpleAsyncHTTPClient, "fetch_impl") as mock_fetch_impl:
+            for request in requests:
+                client.fetch_impl(request, Mock())
+
+        self.assertEqual(2, mock_fetch_impl.call_count)
+        first_ssl_options = requests[0].ssl_options
+        self.assertIsInstance(first_ssl_options, ssl.SSLContext)
+        self.assertEqual(ssl.CERT_NONE, first_ssl_options.verify_mode)
+        self.assertIs(first_ssl_options, requests[1].ssl_options)
+
+    @async_test
+    async def test_simple_client_leaves_given_ssl_options_and_plain_http_requests(self):
+        client = common_https._SharedSslContextHTTPClient(force_instance=True)
+        self.addCleanup(client.close)
+        ssl_context = ssl.create_default_context()
+        https_request = httpclient._RequestProxy(httpclient.HTTPRequest('https://' + URL, ssl_options=ssl_context),
+                                                 client.defaults)
+        http_request = httpclient._RequestProxy(httpclient.HTTPRequest('http://' + URL), client.defaults)
+
+        with patch.object(simple_httpclient.SimpleAsyncHTTPClient, "fetch_impl"):
+            client.fetch_impl(https_request, Mock())
+            client.fetch_impl(http_request, Mock())
+
+        self.assertIs(ssl_context, https_request.ssl_options)
+        self.assertIsNone(http_request.ssl_options)
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from comms.http_body import HttpBody
+from utilities.test_utilities import async_test
+
+PARTS = ['ascii text, ', 'non-ascii text: £€, ', b'some bytes', '']
+
+
+class TestHttpBody(TestCase):
+
+    def test_len_is_encoded_size(self):
+        body = HttpBody(PARTS)
+
+        self.assertEqual(len(''.join(PARTS[:2]).encode() + PARTS[2]), len(body))
+
+    def test_to_bytes(self):
+        body = HttpBody(PARTS)
+
+        self.assertEqual(''.join(PARTS[:2]).encode() + PARTS[2], body.to_bytes())
+
+    def test_str(self):
+        body = HttpBody(PARTS)
+
+        self.assertEqual(''.join(PARTS[:2]) + 'some bytes', str(body))
+
+    def test_chunks_skip_empty_parts_and_do_not_copy_bytes(self):
+        chunks = list(HttpBody(PARTS).chunks())
+
+        self.assertEqual(3, len(chunks))
+        self.assertIs(PARTS[2], chunks[2].obj)
+
+    @async_test
+    async def test_write_to_writes_each_part(self):
+        written = []
+
+        async def write(chunk):
+            written.append(bytes(chunk))
+
+        await HttpBody(PARTS).write_to(write)
+
+        self.assertEqual([PARTS[0].encode(), PARTS[1].encode(), PARTS[2]], written)
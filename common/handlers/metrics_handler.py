@@ -0,0 +1,35 @@
+import tornado.web
+
+from utilities import metrics
+
+
+class MetricsHandler(tornado.web.RequestHandler):
+    """
+    A Tornado request handler that returns the application's metrics in the Prometheus text exposition format, for
+    collection by a monitoring system.
+    """
+
+    def initialize(self, registry: metrics.MetricsRegistry = metrics.REGISTRY):
+        """
+        :param registry: The registry of metrics to return. Defaults to the application's registry.
+        """
+        self.registry = registry
+
+    async def get(self):
+        """
+        ---
+        summary: Metrics endpoint
+        description: >-
+          This endpoint returns the metrics (request latencies, database calls, retries and so on) recorded by this
+          service since it started, in the Prometheus text exposition format.
+        operationId: getMetrics
+        responses:
+          200:
+            description: The metrics recorded by this service.
+            content:
+              text/plain:
+                schema:
+                  type: string
+        """
+        self.set_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.write(self.registry.render())
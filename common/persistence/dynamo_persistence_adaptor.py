@@ -2,13 +2,14 @@
 import contextlib
 
 import aioboto3
+from aiobotocore.config import AioConfig
 from boto3.dynamodb.conditions import Attr
 from botocore.exceptions import ClientError
 
 import utilities.integration_adaptors_logger as log
 from persistence import persistence_adaptor
 from persistence.persistence_adaptor import retriable, RecordCreationError, RecordUpdateError, RecordRetrievalError, \
-    RecordDeletionError, validate_data_has_no_primary_key_field, DuplicatePrimaryKeyError
+    RecordDeletionError, validate_data_has_no_primary_key_field, DuplicatePrimaryKeyError, RecordVersionConflictError
 from utilities import config
 
 logger = log.IntegrationAdaptorsLogger(__name__)
@@ -35,6 +36,38 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
 
         self.endpoint_url = config.get_config('DB_ENDPOINT_URL', None)
         self.region_name = config.get_config('CLOUD_REGION', 'eu-west-2')
+        self.client_config = AioConfig(
+            max_pool_connections=int(config.get_config('DB_MAX_POOL_CONNECTIONS', '10')),
+            connector_args={'keepalive_timeout': float(config.get_config('DB_KEEPALIVE_TIMEOUT', '12'))})
+
+        self._resource_stack = None
+        self._dynamo_resource = None
+
+    async def start(self):
+        """
+        Opens the long-lived DynamoDB resource shared by all operations on this adaptor, so that the session,
+        HTTP connection pool and TLS connections are reused between calls rather than set up for every call.
+        """
+        if self._dynamo_resource is not None:
+            return
+
+        logger.info('Opening pooled connection to DynamoDB for table {table}', fparams={'table': self.table_name})
+        stack = contextlib.AsyncExitStack()
+        self._dynamo_resource = await stack.enter_async_context(self.__create_dynamo_resource())
+        self._resource_stack = stack
+
+    async def close(self):
+        """
+        Closes the shared DynamoDB resource opened by :meth:`start`, releasing its pooled connections.
+        """
+        if self._resource_stack is None:
+            return
+
+        logger.info('Closing pooled connection to DynamoDB for table {table}', fparams={'table': self.table_name})
+        stack = self._resource_stack
+        self._resource_stack = None
+        self._dynamo_resource = None
+        await stack.aclose()
 
     @validate_data_has_no_primary_key_field(primary_key=_KEY)
     @retriable
@@ -86,6 +119,62 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         except Exception as e:
             raise RecordUpdateError from e
 
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    async def update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        """Updates an item only if it is still at the expected version, incrementing its version in the same write.
+        The item is not returned, so DynamoDB does not read it back.
+
+        :param key: The key used to identify the item.
+        :param data: The fields to set on the item.
+        :param version_field: The name of the field holding the item's version number.
+        :param expected_version: The version the item must be at. None expects an existing item with no version field.
+        :return: The new version of the item.
+        """
+        if version_field in data:
+            raise ValueError(f"Data must not have field named '{version_field}' as it's used as the version field")
+
+        return await self._update_versioned(key, data, version_field, expected_version)
+
+    @retriable
+    async def _update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        logger.info('Updating data for {key} at {version} in table {table}',
+                    fparams={'key': key, 'version': expected_version, 'table': self.table_name})
+
+        new_version = (expected_version or 0) + 1
+        attribute_names = {'#version': version_field}
+        attribute_values = {':new_version': new_version}
+        assignments = ['#version = :new_version']
+        for index, (field, value) in enumerate(data.items()):
+            attribute_names[f'#field{index}'] = field
+            attribute_values[f':value{index}'] = value
+            assignments.append(f'#field{index} = :value{index}')
+
+        if expected_version is None:
+            attribute_names['#key'] = _KEY
+            condition = 'attribute_exists(#key) AND attribute_not_exists(#version)'
+        else:
+            attribute_values[':expected_version'] = expected_version
+            condition = '#version = :expected_version'
+
+        try:
+            async with self.__get_dynamo_resource() as dynamo:
+                table = await dynamo.Table(self.table_name)
+                await table.update_item(
+                    Key={_KEY: key},
+                    UpdateExpression='SET ' + ', '.join(assignments),
+                    ConditionExpression=condition,
+                    ExpressionAttributeNames=attribute_names,
+                    ExpressionAttributeValues=attribute_values,
+                    ReturnValues='NONE')
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                raise RecordVersionConflictError(f'{key} is not at version {expected_version}') from e
+            raise RecordUpdateError from e
+        except Exception as e:
+            raise RecordUpdateError from e
+
+        return new_version
+
     @retriable
     async def get(self, key: str, strongly_consistent_read: bool = False):
         """
@@ -136,11 +225,19 @@ class DynamoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
     @contextlib.asynccontextmanager
     async def __get_dynamo_resource(self):
         """
-        Creates a connection to the table referenced by this instance.
-        :return: The table to be used by this instance.
+        Provides a connection to DynamoDB. The shared resource opened by :meth:`start` is used if available,
+        otherwise a connection is established for the duration of this call only.
+        :return: The DynamoDB resource to be used by this instance.
         """
-        async with aioboto3.resource('dynamodb',
-                                     region_name=self.region_name,
-                                     endpoint_url=self.endpoint_url) as dynamo_resource:
-            logger.info('Establishing connection to DynamoDB')
-            yield dynamo_resource
+        if self._dynamo_resource is not None:
+            yield self._dynamo_resource
+        else:
+            async with self.__create_dynamo_resource() as dynamo_resource:
+                yield dynamo_resource
+
+    def __create_dynamo_resource(self):
+        logger.info('Establishing connection to DynamoDB')
+        return aioboto3.resource('dynamodb',
+                                 region_name=self.region_name,
+                                 endpoint_url=self.endpoint_url,
+                                 config=self.client_config)
@@ -0,0 +1,130 @@
+"""Module containing functionality for an in-memory implementation of a persistence adaptor."""
+import copy
+from typing import Dict
+
+import utilities.integration_adaptors_logger as log
+from persistence import persistence_adaptor
+from persistence.persistence_adaptor import retriable, validate_data_has_no_primary_key_field, \
+    DuplicatePrimaryKeyError, RecordVersionConflictError
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+_KEY = "key"
+
+# The items in each table, by table name. Tables are shared by all adaptors in this process, as they would be for
+# adaptors connected to the same database.
+_tables: Dict[str, Dict[str, dict]] = {}
+
+
+class InMemoryPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
+    """Class responsible for persisting items into a dictionary held in this process.
+
+    Items are lost when the process exits and are not shared with other processes, so this adaptor is for benchmarks,
+    tests and running a service on its own, rather than for production. Items are copied in and out of the dictionary,
+    as they would be to and from a database, so callers cannot change stored items without updating them.
+    """
+
+    def __init__(self, table_name: str, max_retries: int = 0, retry_delay: float = 0):
+        """
+        Constructs an in-memory version of a
+        :class:`PersistenceAdaptor <mhs.common.state.persistence_adaptor.PersistenceAdaptor>`.
+        :param table_name: Table name to be used in this adaptor.
+        :param max_retries: The number of max retries object should make if there is an error
+        :param retry_delay: The delay between retries
+        """
+        self.table_name = table_name
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+        self._items = _tables.setdefault(table_name, {})
+
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    @retriable
+    async def add(self, key: str, data: dict):
+        """Add an item to a specified table, using a provided key.
+
+        :param key: The key under which to store the data in persistence.
+        :param data: The item to store in persistence.
+        """
+        logger.info('Adding data for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
+
+        if key in self._items:
+            raise DuplicatePrimaryKeyError
+        self._items[key] = copy.deepcopy(data)
+
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    @retriable
+    async def update(self, key: str, data: dict):
+        """Updates an item in a specified table, using a provided key. The item is created if it does not exist.
+
+        :param key: The key used to identify the item.
+        :param data: The item to update in persistence.
+        :return: The item after it has been updated.
+        """
+        logger.info('Updating data for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
+
+        item = self._items.setdefault(key, {})
+        item.update(copy.deepcopy(data))
+        return copy.deepcopy(item)
+
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    async def update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        """Updates an item only if it is still at the expected version, incrementing its version in the same write.
+
+        :param key: The key used to identify the item.
+        :param data: The fields to set on the item.
+        :param version_field: The name of the field holding the item's version number.
+        :param expected_version: The version the item must be at. None expects an existing item with no version field.
+        :return: The new version of the item.
+        """
+        if version_field in data:
+            raise ValueError(f"Data must not have field named '{version_field}' as it's used as the version field")
+
+        return await self._update_versioned(key, data, version_field, expected_version)
+
+    @retriable
+    async def _update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        logger.info('Updating data for {key} at {version} in table {table}',
+                    fparams={'key': key, 'version': expected_version, 'table': self.table_name})
+
+        item = self._items.get(key)
+        if item is None or item.get(version_field) != expected_version:
+            raise RecordVersionConflictError(f'{key} is not at version {expected_version}')
+
+        new_version = (expected_version or 0) + 1
+        item.update(copy.deepcopy(data))
+        item[version_field] = new_version
+        return new_version
+
+    @retriable
+    async def get(self, key: str, **kwargs):
+        """
+        Retrieves an item from a specified table with a given key.
+        :param key: The key which identifies the item to get.
+        :return: The item from the specified table with the given key. (None if no item found)
+        """
+        logger.info('Getting record for {key} from table {table}', fparams={'key': key, 'table': self.table_name})
+
+        item = self._items.get(key)
+        if item is None:
+            logger.info('No item found for record: {key} in table {table}',
+                        fparams={'key': key, 'table': self.table_name})
+            return None
+        return copy.deepcopy(item)
+
+    @retriable
+    async def delete(self, key: str):
+        """
+        Removes an item from a table given it's key.
+        :param key: The key of the item to delete.
+        :return: The instance of the item which has been deleted from persistence. (None if no item found)
+        """
+        logger.info('Deleting record for {key} from table {table}', fparams={'key': key, 'table': self.table_name})
+
+        item = self._items.pop(key, None)
+        if item is None:
+            logger.info('No values found for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
+        return item
+
+    def clear(self) -> None:
+        """Removes all items from this adaptor's table."""
+        self._items.clear()
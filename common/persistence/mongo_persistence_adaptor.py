@@ -9,7 +9,7 @@ from pymongo.errors import DuplicateKeyError
 import utilities.integration_adaptors_logger as log
 from persistence import persistence_adaptor
 from persistence.persistence_adaptor import retriable, RecordCreationError, RecordUpdateError, RecordRetrievalError, \
-    RecordDeletionError, validate_data_has_no_primary_key_field, DuplicatePrimaryKeyError
+    RecordDeletionError, validate_data_has_no_primary_key_field, DuplicatePrimaryKeyError, RecordVersionConflictError
 from utilities import config
 
 logger = log.IntegrationAdaptorsLogger(__name__)
@@ -36,9 +36,16 @@ class MongoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         self.retry_delay = retry_delay
         self.max_retries = max_retries
 
-        client = self._build_client()
-        
-        self.collection = client[_DB_NAME][table_name]
+        self.client = self._build_client()
+
+        self.collection = self.client[_DB_NAME][table_name]
+
+    async def close(self):
+        """
+        Closes the connections held by the MongoDB client of this adaptor.
+        """
+        logger.info('Closing connection to MongoDB for table {table}', fparams={'table': self.table_name})
+        self.client.close()
 
     @staticmethod
     def _build_client():
@@ -94,6 +101,40 @@ class MongoPersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
         except Exception as e:
             raise RecordUpdateError from e
 
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    async def update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        """Updates an item only if it is still at the expected version, incrementing its version in the same write.
+        The updated document is not returned.
+
+        :param key: The key used to identify the item.
+        :param data: The fields to set on the item.
+        :param version_field: The name of the field holding the item's version number.
+        :param expected_version: The version the item must be at. None expects an existing item with no version field.
+        :return: The new version of the item.
+        """
+        if version_field in data:
+            raise ValueError(f"Data must not have field named '{version_field}' as it's used as the version field")
+
+        return await self._update_versioned(key, data, version_field, expected_version)
+
+    @retriable
+    async def _update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        logger.info('Updating data for {key} at {version} in table {table}',
+                    fparams={'key': key, 'version': expected_version, 'table': self.table_name})
+
+        new_version = (expected_version or 0) + 1
+        try:
+            # A filter on None also matches documents without the field
+            result = await self.collection.update_one(
+                {_KEY: key, version_field: expected_version},
+                {'$set': {**data, version_field: new_version}})
+        except Exception as e:
+            raise RecordUpdateError from e
+
+        if result.matched_count == 0:
+            raise RecordVersionConflictError(f'{key} is not at version {expected_version}')
+        return new_version
+
     @retriable
     async def get(self, key: str, **kwargs):
         """
@@ -6,15 +6,21 @@ from typing import Optional
 import copy
 from exceptions import MaxRetriesExceeded
 from retry.retriable_action import RetriableAction
+from utilities import metrics, timing
 
 DATA_VALIDATION_ERROR_MESSAGE = "Data must not have field named '{}' as it's used " \
                                  "as primary key and is explicitly set as this function argument"
 
+DB_CALL_DURATION = metrics.histogram('persistence_call_duration_seconds',
+                                     'The time taken by calls to the persistence store, including any retries, by '
+                                     'result (success or error)',
+                                     ['adaptor', 'operation', 'result'])
+
 
 def validate_data_has_no_primary_key_field(primary_key: str):
     def decorator(function):
         async def wrapper(*args, **kwargs):
-            _, _, data = args
+            data = args[2]
             if primary_key in data:
                 raise ValueError(DATA_VALIDATION_ERROR_MESSAGE.format(primary_key))
             return await function(*args, **kwargs)
@@ -23,11 +29,22 @@ def validate_data_has_no_primary_key_field(primary_key: str):
 
 
 def retriable(func):
+    operation = func.__name__.lstrip('_')
+
     async def inner(*args, **kwargs):
         self = args[0]
         if hasattr(self, 'max_retries') and hasattr(self, 'retry_delay'):
-            result = await RetriableAction(func, int(self.max_retries), int(self.retry_delay)).execute(*args, **kwargs)
+            stopwatch = timing.Stopwatch()
+            stopwatch.start_timer()
+            result = await RetriableAction(func, int(self.max_retries), float(self.retry_delay)) \
+                .with_retriable_exception_check(lambda e: not isinstance(e, RecordVersionConflictError)) \
+                .execute(*args, **kwargs)
+            DB_CALL_DURATION.observe(stopwatch.stop_timer(), adaptor=type(self).__name__, operation=operation,
+                                     result='success' if result.is_successful else 'error')
             if not result.is_successful:
+                if isinstance(result.exception, RecordVersionConflictError):
+                    # Retrying cannot resolve a version conflict, the caller must re-read the record
+                    raise result.exception
                 raise MaxRetriesExceeded("Max number of retries exceeded when performing DB call") from result.exception
             return result.result
         else:
@@ -60,6 +77,11 @@ class RecordUpdateError(RuntimeError):
     pass
 
 
+class RecordVersionConflictError(RuntimeError):
+    """Error occurred when a versioned update found the record missing or at a different version than expected."""
+    pass
+
+
 class PersistenceAdaptor(abc.ABC):
     """An adaptor that provides a common interface to a specific item type in a database."""
 
@@ -77,6 +99,20 @@ class PersistenceAdaptor(abc.ABC):
     async def update(self, key: str, data: dict):
         pass
 
+    @abc.abstractmethod
+    async def update_versioned(self, key: str, data: dict, version_field: str, expected_version: Optional[int]) -> int:
+        """Updates an item only if it is still at the expected version, incrementing its version in the same write.
+        Unlike :meth:`update`, the updated item is not read back.
+
+        :param key: The key used to identify the item.
+        :param data: The fields to set on the item. Must not include the version field.
+        :param version_field: The name of the field holding the item's version number.
+        :param expected_version: The version the item must be at. None expects an existing item with no version field.
+        :return: The new version of the item.
+        :raises RecordVersionConflictError: if the item does not exist or is not at the expected version.
+        """
+        pass
+
     @abc.abstractmethod
     async def get(self, key: str) -> Optional[dict]:
         """
@@ -95,6 +131,19 @@ class PersistenceAdaptor(abc.ABC):
         """
         pass
 
+    async def start(self) -> None:
+        """
+        Opens any long-lived connections used by this adaptor. Expected to be called once at application start up,
+        before the adaptor is used. Adaptors that do not hold long-lived connections need not override this.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Releases any long-lived connections opened by this adaptor. Expected to be called once at application shutdown.
+        """
+        pass
+
     @staticmethod
     def add_primary_key_field(primary_key_field, key, data):
         item = copy.deepcopy(data)
@@ -1,17 +1,23 @@
 import utilities.config as config
 import utilities.integration_adaptors_logger as log
 from persistence.dynamo_persistence_adaptor import DynamoPersistenceAdaptor
+from persistence.in_memory_persistence_adaptor import InMemoryPersistenceAdaptor
 from persistence.mongo_persistence_adaptor import MongoPersistenceAdaptor
 from persistence.persistence_adaptor import PersistenceAdaptor
+from persistence.sqlite_persistence_adaptor import SqlitePersistenceAdaptor
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
 DYNAMO_DB = 'dynamodb'
 MONGO_DB = 'mongodb'
+SQLITE = 'sqlite'
+MEMORY = 'memory'
 
 PERSISTENCE_ADAPTOR_TYPES = {
     DYNAMO_DB: DynamoPersistenceAdaptor,
     MONGO_DB: MongoPersistenceAdaptor,
+    SQLITE: SqlitePersistenceAdaptor,
+    MEMORY: InMemoryPersistenceAdaptor,
 }
 
 
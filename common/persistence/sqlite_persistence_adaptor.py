@@ -0,0 +1,226 @@
+"""Module containing functionality for a SQLite implementation of a persistence adaptor."""
+import json
+import sqlite3
+from typing import Optional
+
+import utilities.integration_adaptors_logger as log
+from persistence import persistence_adaptor
+from persistence.persistence_adaptor import retriable, RecordCreationError, RecordUpdateError, RecordRetrievalError, \
+    RecordDeletionError, validate_data_has_no_primary_key_field, DuplicatePrimaryKeyError, RecordVersionConflictError
+from utilities import config
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+_KEY = "key"
+
+DEFAULT_DB_FILE_PATH = 'mhs-state.db'
+_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# How long a call waits for another process holding the database's write lock before failing. The wait blocks the event
+# loop, so is kept short: a failed call is retried by @retriable, which waits between attempts without blocking
+_BUSY_TIMEOUT_MILLISECONDS = 5
+# How long opening the database waits for the write lock, for example while other workers are creating their tables.
+# This is only done once per adaptor, so may block for longer
+_OPEN_BUSY_TIMEOUT_SECONDS = 1
+
+
+class SqlitePersistenceAdaptor(persistence_adaptor.PersistenceAdaptor):
+    """Class responsible for persisting items into a SQLite database file, for services deployed on a single node.
+
+    The database is opened in write-ahead log (WAL) mode, so a write appends to the log without rewriting the database
+    and reads are never blocked by writes. Each call is made on the calling thread, as a local write takes
+    microseconds, far less than handing it to another thread would. The database can be shared by several processes on
+    the same node, but not across a network file system. A write that finds another process writing fails after a few
+    milliseconds, and is retried according to the adaptor's max_retries and retry_delay.
+    """
+
+    def __init__(self, table_name: str, max_retries: int, retry_delay: float):
+        """
+        Constructs a SQLite version of a
+        :class:`PersistenceAdaptor <mhs.common.state.persistence_adaptor.PersistenceAdaptor>`.
+        The kwargs provided should contain the following information:
+          * table_name: The name of the table in the database file containing required items.
+          * max_retries: The number of max retries object should make if there is an error accessing the DB
+          * retry_delay: The delay between retries
+        :param table_name: Table name to be used in this adaptor.
+        """
+        self.table_name = table_name
+        self.retry_delay = retry_delay
+        self.max_retries = max_retries
+
+        self.db_file_path = config.get_config('DB_FILE_PATH', default=DEFAULT_DB_FILE_PATH)
+        self.synchronous = config.get_config('DB_SQLITE_SYNCHRONOUS', default='NORMAL').upper()
+        if self.synchronous not in _SYNCHRONOUS_MODES:
+            raise ValueError(f'DB_SQLITE_SYNCHRONOUS must be one of {_SYNCHRONOUS_MODES}, not {self.synchronous}')
+
+        self._quoted_table_name = '"' + table_name.replace('"', '""') + '"'
+        self._connection: Optional[sqlite3.Connection] = None
+
+    async def start(self):
+        """
+        Opens the database file, creating it and this adaptor's table if they do not exist. If the adaptor is not
+        started, the file is opened when the adaptor is first used.
+        """
+        self.__get_connection()
+
+    async def close(self):
+        """
+        Closes the database file opened by this adaptor.
+        """
+        if self._connection is None:
+            return
+
+        logger.info('Closing SQLite database {path} for table {table}',
+                    fparams={'path': self.db_file_path, 'table': self.table_name})
+        connection = self._connection
+        self._connection = None
+        connection.close()
+
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    @retriable
+    async def add(self, key: str, data: dict):
+        """Add an item to a specified table, using a provided key.
+
+        :param key: The key under which to store the data in persistence.
+        :param data: The item to store in persistence.
+        """
+        logger.info('Adding data for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
+
+        try:
+            connection = self.__get_connection()
+            with connection:
+                connection.execute(f'INSERT INTO {self._quoted_table_name} (key, data) VALUES (?, ?)',
+                                   (key, json.dumps(data)))
+        except sqlite3.IntegrityError:
+            raise DuplicatePrimaryKeyError
+        except Exception as e:
+            raise RecordCreationError from e
+
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    @retriable
+    async def update(self, key: str, data: dict):
+        """Updates an item in a specified table, using a provided key. The item is created if it does not exist.
+
+        :param key: The key used to identify the item.
+        :param data: The item to update in persistence.
+        :return: The item after it has been updated.
+        """
+        logger.info('Updating data for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
+
+        try:
+            with self.__write_transaction() as connection:
+                item = self.__select(connection, key) or {}
+                item.update(data)
+                connection.execute(f'INSERT OR REPLACE INTO {self._quoted_table_name} (key, data) VALUES (?, ?)',
+                                   (key, json.dumps(item)))
+            return item
+        except Exception as e:
+            raise RecordUpdateError from e
+
+    @validate_data_has_no_primary_key_field(primary_key=_KEY)
+    async def update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        """Updates an item only if it is still at the expected version, incrementing its version in the same write.
+
+        :param key: The key used to identify the item.
+        :param data: The fields to set on the item.
+        :param version_field: The name of the field holding the item's version number.
+        :param expected_version: The version the item must be at. None expects an existing item with no version field.
+        :return: The new version of the item.
+        """
+        if version_field in data:
+            raise ValueError(f"Data must not have field named '{version_field}' as it's used as the version field")
+
+        return await self._update_versioned(key, data, version_field, expected_version)
+
+    @retriable
+    async def _update_versioned(self, key: str, data: dict, version_field: str, expected_version):
+        logger.info('Updating data for {key} at {version} in table {table}',
+                    fparams={'key': key, 'version': expected_version, 'table': self.table_name})
+
+        new_version = (expected_version or 0) + 1
+        try:
+            with self.__write_transaction() as connection:
+                item = self.__select(connection, key)
+                if item is None or item.get(version_field) != expected_version:
+                    raise RecordVersionConflictError(f'{key} is not at version {expected_version}')
+
+                item.update(data)
+                item[version_field] = new_version
+                connection.execute(f'UPDATE {self._quoted_table_name} SET data = ? WHERE key = ?',
+                                   (json.dumps(item), key))
+        except RecordVersionConflictError:
+            raise
+        except Exception as e:
+            raise RecordUpdateError from e
+
+        return new_version
+
+    @retriable
+    async def get(self, key: str, **kwargs):
+        """
+        Retrieves an item from a specified table with a given key. Reads are always strongly consistent.
+        :param key: The key which identifies the item to get.
+        :return: The item from the specified table with the given key. (None if no item found)
+        """
+        logger.info('Getting record for {key} from table {table}', fparams={'key': key, 'table': self.table_name})
+        try:
+            item = self.__select(self.__get_connection(), key)
+        except Exception as e:
+            raise RecordRetrievalError from e
+
+        if item is None:
+            logger.info('No item found for record: {key} in table {table}',
+                        fparams={'key': key, 'table': self.table_name})
+        return item
+
+    @retriable
+    async def delete(self, key: str):
+        """
+        Removes an item from a table given it's key.
+        :param key: The key of the item to delete.
+        :return: The instance of the item which has been deleted from persistence. (None if no item found)
+        """
+        logger.info('Deleting record for {key} from table {table}', fparams={'key': key, 'table': self.table_name})
+        try:
+            with self.__write_transaction() as connection:
+                item = self.__select(connection, key)
+                if item is not None:
+                    connection.execute(f'DELETE FROM {self._quoted_table_name} WHERE key = ?', (key,))
+        except Exception as e:
+            raise RecordDeletionError from e
+
+        if item is None:
+            logger.info('No values found for {key} in table {table}', fparams={'key': key, 'table': self.table_name})
+        return item
+
+    def __select(self, connection: sqlite3.Connection, key: str) -> Optional[dict]:
+        row = connection.execute(f'SELECT data FROM {self._quoted_table_name} WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row is not None else None
+
+    def __write_transaction(self):
+        """
+        Begins a transaction that takes the database's write lock straight away, so that an item read in the
+        transaction cannot be changed by another process before it is written back. The transaction is committed when
+        the returned context exits, or rolled back if it exits with an exception.
+        """
+        connection = self.__get_connection()
+        connection.execute('BEGIN IMMEDIATE')
+        return connection
+
+    def __get_connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            logger.info('Opening SQLite database {path} for table {table}',
+                        fparams={'path': self.db_file_path, 'table': self.table_name})
+            # Transactions are begun explicitly, rather than by the sqlite3 module before each write
+            connection = sqlite3.connect(self.db_file_path, timeout=_OPEN_BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            try:
+                connection.execute('PRAGMA journal_mode=WAL')
+                connection.execute(f'PRAGMA synchronous={self.synchronous}')
+                connection.execute(f'CREATE TABLE IF NOT EXISTS {self._quoted_table_name} '
+                                   f'(key TEXT PRIMARY KEY NOT NULL, data TEXT NOT NULL)')
+                connection.execute(f'PRAGMA busy_timeout={_BUSY_TIMEOUT_MILLISECONDS}')
+            except Exception:
+                connection.close()
+                raise
+            self._connection = connection
+        return self._connection
@@ -0,0 +1,145 @@
+from unittest import TestCase
+from unittest.mock import patch, MagicMock
+
+from botocore.exceptions import ClientError
+
+from persistence import persistence_adaptor
+from persistence.dynamo_persistence_adaptor import DynamoPersistenceAdaptor
+from persistence.persistence_adaptor import RecordVersionConflictError
+from utilities.test_utilities import async_test, awaitable, awaitable_exception
+
+TABLE_NAME = 'test_table'
+KEY = 'test_key'
+ITEM = {'key': KEY, 'data': 'value'}
+
+
+class FakeResourceContext:
+    def __init__(self, resource):
+        self.resource = resource
+        self.exit_count = 0
+
+    async def __aenter__(self):
+        return self.resource
+
+    async def __aexit__(self, *args):
+        self.exit_count += 1
+        return False
+
+
+class TestDynamoPersistenceAdaptor(TestCase):
+
+    def setUp(self) -> None:
+        patcher = patch('persistence.dynamo_persistence_adaptor.aioboto3')
+        self.mock_aioboto3 = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.mock_resource = MagicMock()
+        self.mock_table = MagicMock()
+        self.mock_table.get_item.side_effect = lambda **kwargs: awaitable({'Item': dict(ITEM)})
+        self.mock_resource.Table.side_effect = lambda table_name: awaitable(self.mock_table)
+
+        self.resource_context = FakeResourceContext(self.mock_resource)
+        self.mock_aioboto3.resource.return_value = self.resource_context
+
+        self.adaptor = DynamoPersistenceAdaptor(table_name=TABLE_NAME, max_retries=0, retry_delay=0)
+
+    @async_test
+    async def test_get_without_start_opens_resource_per_call(self):
+        await self.adaptor.get(KEY)
+        await self.adaptor.get(KEY)
+
+        self.assertEqual(2, self.mock_aioboto3.resource.call_count)
+        self.assertEqual(2, self.resource_context.exit_count)
+
+    @async_test
+    async def test_calls_are_timed_in_metrics(self):
+        labels = {'adaptor': 'DynamoPersistenceAdaptor', 'operation': 'get', 'result': 'success'}
+        count_before = persistence_adaptor.DB_CALL_DURATION.get_count(**labels)
+
+        await self.adaptor.get(KEY)
+
+        self.assertEqual(count_before + 1, persistence_adaptor.DB_CALL_DURATION.get_count(**labels))
+
+    @async_test
+    async def test_started_adaptor_reuses_single_resource(self):
+        await self.adaptor.start()
+
+        self.assertEqual({'data': 'value'}, await self.adaptor.get(KEY))
+        self.assertEqual({'data': 'value'}, await self.adaptor.get(KEY))
+
+        self.mock_aioboto3.resource.assert_called_once()
+        self.assertEqual(0, self.resource_context.exit_count)
+
+        await self.adaptor.close()
+
+        self.assertEqual(1, self.resource_context.exit_count)
+
+    @async_test
+    async def test_start_is_idempotent(self):
+        await self.adaptor.start()
+        await self.adaptor.start()
+
+        self.mock_aioboto3.resource.assert_called_once()
+
+        await self.adaptor.close()
+        await self.adaptor.close()
+
+        self.assertEqual(1, self.resource_context.exit_count)
+
+    @async_test
+    async def test_resource_is_configured_with_connection_pool(self):
+        with patch('persistence.dynamo_persistence_adaptor.config.get_config',
+                   side_effect=lambda key, default=None: {'DB_MAX_POOL_CONNECTIONS': '25',
+                                                          'DB_KEEPALIVE_TIMEOUT': '30'}.get(key, default)):
+            adaptor = DynamoPersistenceAdaptor(table_name=TABLE_NAME, max_retries=0, retry_delay=0)
+
+        await adaptor.start()
+
+        client_config = self.mock_aioboto3.resource.call_args[1]['config']
+        self.assertEqual(25, client_config.max_pool_connections)
+        self.assertEqual(30, client_config.connector_args['keepalive_timeout'])
+
+        await adaptor.close()
+
+    @async_test
+    async def test_update_versioned_is_conditional_on_expected_version(self):
+        self.mock_table.update_item.side_effect = lambda **kwargs: awaitable({})
+
+        new_version = await self.adaptor.update_versioned(KEY, {'data': 'new value'}, 'version', 3)
+
+        self.assertEqual(4, new_version)
+        self.mock_table.update_item.assert_called_once_with(
+            Key={'key': KEY},
+            UpdateExpression='SET #version = :new_version, #field0 = :value0',
+            ConditionExpression='#version = :expected_version',
+            ExpressionAttributeNames={'#version': 'version', '#field0': 'data'},
+            ExpressionAttributeValues={':new_version': 4, ':value0': 'new value', ':expected_version': 3},
+            ReturnValues='NONE')
+
+    @async_test
+    async def test_update_versioned_of_unversioned_item_requires_item_to_exist(self):
+        self.mock_table.update_item.side_effect = lambda **kwargs: awaitable({})
+
+        new_version = await self.adaptor.update_versioned(KEY, {'data': 'new value'}, 'version', None)
+
+        self.assertEqual(1, new_version)
+        update_kwargs = self.mock_table.update_item.call_args[1]
+        self.assertEqual('attribute_exists(#key) AND attribute_not_exists(#version)',
+                         update_kwargs['ConditionExpression'])
+        self.assertEqual('key', update_kwargs['ExpressionAttributeNames']['#key'])
+
+    @async_test
+    async def test_update_versioned_raises_conflict_without_retrying(self):
+        adaptor = DynamoPersistenceAdaptor(table_name=TABLE_NAME, max_retries=3, retry_delay=0)
+        conflict = ClientError({'Error': {'Code': 'ConditionalCheckFailedException'}}, 'UpdateItem')
+        self.mock_table.update_item.side_effect = lambda **kwargs: awaitable_exception(conflict)
+
+        with self.assertRaises(RecordVersionConflictError):
+            await adaptor.update_versioned(KEY, {'data': 'new value'}, 'version', 3)
+
+        self.mock_table.update_item.assert_called_once()
+
+    @async_test
+    async def test_update_versioned_rejects_version_field_in_data(self):
+        with self.assertRaises(ValueError):
+            await self.adaptor.update_versioned(KEY, {'version': 5}, 'version', 3)
@@ -0,0 +1,106 @@
+from unittest import TestCase
+
+from exceptions import MaxRetriesExceeded
+from persistence.in_memory_persistence_adaptor import InMemoryPersistenceAdaptor
+from persistence.persistence_adaptor import DuplicatePrimaryKeyError, RecordVersionConflictError
+from utilities.test_utilities import async_test
+
+TABLE_NAME = 'test_table'
+KEY = 'test_key'
+DATA = {'data': 'value'}
+
+
+class TestInMemoryPersistenceAdaptor(TestCase):
+
+    def setUp(self) -> None:
+        self.adaptor = InMemoryPersistenceAdaptor(table_name=TABLE_NAME, max_retries=0, retry_delay=0)
+        self.addCleanup(self.adaptor.clear)
+
+    @async_test
+    async def test_add_and_get(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_get_missing_item_returns_none(self):
+        self.assertIsNone(await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_add_duplicate_key_raises_error(self):
+        await self.adaptor.add(KEY, DATA)
+
+        with self.assertRaises(MaxRetriesExceeded) as raised:
+            await self.adaptor.add(KEY, {'data': 'other value'})
+
+        self.assertIsInstance(raised.exception.__cause__, DuplicatePrimaryKeyError)
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_add_data_with_primary_key_field_raises_error(self):
+        with self.assertRaises(ValueError):
+            await self.adaptor.add(KEY, {'key': 'value'})
+
+    @async_test
+    async def test_update_returns_updated_item(self):
+        await self.adaptor.add(KEY, {'data': 'value', 'other': 'other value'})
+
+        updated = await self.adaptor.update(KEY, {'data': 'new value'})
+
+        self.assertEqual({'data': 'new value', 'other': 'other value'}, updated)
+        self.assertEqual(updated, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_creates_missing_item(self):
+        self.assertEqual(DATA, await self.adaptor.update(KEY, DATA))
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_versioned(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(1, await self.adaptor.update_versioned(KEY, {'data': 'v1'}, 'version', None))
+        self.assertEqual(2, await self.adaptor.update_versioned(KEY, {'data': 'v2'}, 'version', 1))
+
+        self.assertEqual({'data': 'v2', 'version': 2}, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_versioned_at_wrong_version_raises_conflict(self):
+        await self.adaptor.add(KEY, DATA)
+        await self.adaptor.update_versioned(KEY, {'data': 'v1'}, 'version', None)
+
+        with self.assertRaises(RecordVersionConflictError):
+            await self.adaptor.update_versioned(KEY, {'data': 'v2'}, 'version', None)
+
+        self.assertEqual({'data': 'v1', 'version': 1}, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_versioned_missing_item_raises_conflict(self):
+        with self.assertRaises(RecordVersionConflictError):
+            await self.adaptor.update_versioned(KEY, DATA, 'version', None)
+
+    @async_test
+    async def test_delete_returns_deleted_item(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(DATA, await self.adaptor.delete(KEY))
+        self.assertIsNone(await self.adaptor.get(KEY))
+        self.assertIsNone(await self.adaptor.delete(KEY))
+
+    @async_test
+    async def test_stored_items_are_copies(self):
+        data = {'data': ['value']}
+        await self.adaptor.add(KEY, data)
+        data['data'].append('changed before get')
+
+        item = await self.adaptor.get(KEY)
+        item['data'].append('changed after get')
+
+        self.assertEqual({'data': ['value']}, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_adaptors_for_same_table_share_items(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(DATA, await InMemoryPersistenceAdaptor(TABLE_NAME).get(KEY))
+        self.assertIsNone(await InMemoryPersistenceAdaptor('other_table').get(KEY))
@@ -3,9 +3,11 @@ from unittest import TestCase
 from unittest.mock import patch
 
 from persistence.dynamo_persistence_adaptor import DynamoPersistenceAdaptor
+from persistence.in_memory_persistence_adaptor import InMemoryPersistenceAdaptor
 import persistence.persistence_adaptor_factory as factory
 from persistence.mongo_persistence_adaptor import MongoPersistenceAdaptor
 from persistence.persistence_adaptor import PersistenceAdaptor
+from persistence.sqlite_persistence_adaptor import SqlitePersistenceAdaptor
 
 
 class FakePersistenceAdaptor(PersistenceAdaptor):
@@ -19,6 +21,9 @@ class FakePersistenceAdaptor(PersistenceAdaptor):
     async def update(self, key: str, data: dict):
         pass
 
+    async def update_versioned(self, key: str, data: dict, version_field: str, expected_version: Optional[int]) -> int:
+        pass
+
     async def get(self, key: str) -> Optional[dict]:
         pass
 
@@ -33,6 +38,8 @@ class TestPersistenceAdaptorFactory(TestCase):
         # add real adaptors below to match those defined in mhs_common.state.persistence_adaptor_factory
         'dynamodb': DynamoPersistenceAdaptor,
         'mongodb': MongoPersistenceAdaptor,
+        'sqlite': SqlitePersistenceAdaptor,
+        'memory': InMemoryPersistenceAdaptor,
     }
 
     def setUp(self) -> None:
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from exceptions import MaxRetriesExceeded
+from persistence.persistence_adaptor import DuplicatePrimaryKeyError, RecordVersionConflictError
+from persistence.sqlite_persistence_adaptor import SqlitePersistenceAdaptor
+from utilities.test_utilities import async_test
+
+TABLE_NAME = 'test_table'
+KEY = 'test_key'
+DATA = {'data': 'value', 'number': 1, 'nested': {'list': [1, 'two']}}
+
+
+class TestSqlitePersistenceAdaptor(TestCase):
+
+    def setUp(self) -> None:
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.db_file_path = os.path.join(temporary_directory.name, 'state.db')
+
+        patcher = patch('persistence.sqlite_persistence_adaptor.config')
+        mock_config = patcher.start()
+        self.addCleanup(patcher.stop)
+        mock_config.get_config.side_effect = \
+            lambda key, default=None: self.db_file_path if key == 'DB_FILE_PATH' else default
+
+        self.adaptor = self._create_adaptor()
+
+    def _create_adaptor(self, table_name=TABLE_NAME, max_retries=0, retry_delay=0):
+        adaptor = SqlitePersistenceAdaptor(table_name=table_name, max_retries=max_retries, retry_delay=retry_delay)
+        self.addCleanup(async_test(adaptor.close))
+        return adaptor
+
+    @async_test
+    async def test_add_and_get(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_get_missing_item_returns_none(self):
+        self.assertIsNone(await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_add_duplicate_key_raises_error(self):
+        await self.adaptor.add(KEY, DATA)
+
+        with self.assertRaises(MaxRetriesExceeded) as raised:
+            await self.adaptor.add(KEY, {'data': 'other value'})
+
+        self.assertIsInstance(raised.exception.__cause__, DuplicatePrimaryKeyError)
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_add_data_with_primary_key_field_raises_error(self):
+        with self.assertRaises(ValueError):
+            await self.adaptor.add(KEY, {'key': 'value'})
+
+    @async_test
+    async def test_update_returns_updated_item(self):
+        await self.adaptor.add(KEY, {'data': 'value', 'other': 'other value'})
+
+        updated = await self.adaptor.update(KEY, {'data': 'new value'})
+
+        self.assertEqual({'data': 'new value', 'other': 'other value'}, updated)
+        self.assertEqual(updated, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_creates_missing_item(self):
+        self.assertEqual(DATA, await self.adaptor.update(KEY, DATA))
+        self.assertEqual(DATA, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_versioned(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(1, await self.adaptor.update_versioned(KEY, {'data': 'v1'}, 'version', None))
+        self.assertEqual(2, await self.adaptor.update_versioned(KEY, {'data': 'v2'}, 'version', 1))
+
+        self.assertEqual({**DATA, 'data': 'v2', 'version': 2}, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_versioned_at_wrong_version_raises_conflict(self):
+        await self.adaptor.add(KEY, DATA)
+        await self.adaptor.update_versioned(KEY, {'data': 'v1'}, 'version', None)
+
+        with self.assertRaises(RecordVersionConflictError):
+            await self.adaptor.update_versioned(KEY, {'data': 'v2'}, 'version', None)
+
+        self.assertEqual({**DATA, 'data': 'v1', 'version': 1}, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_update_versioned_missing_item_raises_conflict(self):
+        with self.assertRaises(RecordVersionConflictError):
+            await self.adaptor.update_versioned(KEY, DATA, 'version', None)
+
+    @async_test
+    async def test_delete_returns_deleted_item(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertEqual(DATA, await self.adaptor.delete(KEY))
+        self.assertIsNone(await self.adaptor.get(KEY))
+        self.assertIsNone(await self.adaptor.delete(KEY))
+
+    @async_test
+    async def test_items_are_kept_when_database_is_reopened(self):
+        await self.adaptor.add(KEY, DATA)
+        await self.adaptor.close()
+
+        self.assertEqual(DATA, await self._create_adaptor().get(KEY))
+
+    @async_test
+    async def test_adaptors_for_same_file_see_each_others_writes(self):
+        other_adaptor = self._create_adaptor()
+        await self.adaptor.add(KEY, DATA)
+        await other_adaptor.update_versioned(KEY, {'data': 'v1'}, 'version', None)
+
+        with self.assertRaises(RecordVersionConflictError):
+            await self.adaptor.update_versioned(KEY, {'data': 'v1'}, 'version', None)
+
+    @async_test
+    async def test_write_waits_for_other_adaptor_to_release_lock_without_blocking(self):
+        await self.adaptor.start()
+        await self.adaptor.add(KEY, DATA)
+        other_adaptor = self._create_adaptor(max_retries=50, retry_delay=0.01)
+        await other_adaptor.start()
+
+        # The other adaptor's update can only succeed if the event loop is free to release the lock while it waits
+        self.adaptor._connection.execute('BEGIN IMMEDIATE')
+        asyncio.get_event_loop().call_later(0.1, self.adaptor._connection.execute, 'COMMIT')
+        start_time = time.monotonic()
+        updated_item = await other_adaptor.update(KEY, {'data': 'updated'})
+
+        self.assertEqual('updated', updated_item['data'])
+        self.assertLess(time.monotonic() - start_time, 0.5)
+        self.assertEqual(updated_item, await self.adaptor.get(KEY))
+
+    @async_test
+    async def test_write_fails_quickly_while_other_adaptor_holds_lock(self):
+        await self.adaptor.start()
+        other_adaptor = self._create_adaptor(max_retries=2, retry_delay=0)
+        await other_adaptor.start()
+
+        self.adaptor._connection.execute('BEGIN IMMEDIATE')
+        self.addCleanup(self.adaptor._connection.execute, 'ROLLBACK')
+        start_time = time.monotonic()
+        with self.assertRaises(MaxRetriesExceeded):
+            await other_adaptor.add(KEY, DATA)
+
+        self.assertLess(time.monotonic() - start_time, 0.5)
+
+    @async_test
+    async def test_tables_are_separate(self):
+        await self.adaptor.add(KEY, DATA)
+
+        self.assertIsNone(await self._create_adaptor('other_table').get(KEY))
+
+    @async_test
+    async def test_database_is_in_wal_mode(self):
+        await self.adaptor.start()
+
+        with sqlite3.connect(self.db_file_path) as connection:
+            self.assertEqual('wal', connection.execute('PRAGMA journal_mode').fetchone()[0])
+
+    def test_invalid_synchronous_mode_raises_error(self):
+        with patch('persistence.sqlite_persistence_adaptor.config') as mock_config:
+            mock_config.get_config.side_effect = \
+                lambda key, default=None: 'SOMETIMES' if key == 'DB_SQLITE_SYNCHRONOUS' else default
+
+            with self.assertRaises(ValueError):
+                SqlitePersistenceAdaptor(table_name=TABLE_NAME, max_retries=0, retry_delay=0)
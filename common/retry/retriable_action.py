@@ -4,9 +4,16 @@ import asyncio
 from typing import Callable, Awaitable
 
 import utilities.integration_adaptors_logger as log
+from utilities import metrics, spans
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
+RETRIES = metrics.counter('retriable_action_retries_total', 'The number of times actions have been retried',
+                          ['action'])
+RETRIES_EXHAUSTED = metrics.counter('retriable_action_retries_exhausted_total',
+                                    'The number of times actions have failed after their maximum number of retries',
+                                    ['action'])
+
 
 class RetriableAction(object):
     """Responsible for retrying an action a configurable number of times with a configurable delay"""
@@ -63,17 +70,21 @@ class RetriableAction(object):
         result = await self._execute_action(*args, **kwargs)
 
         if self._retry_required(result):
+            action_name = self._get_action_name()
             for i in range(self.retries):
                 logger.info("Sleeping for {delay} seconds before retrying {action}.",
                             fparams={"delay": self.delay, "action": self.action})
-                await asyncio.sleep(self.delay)
+                with spans.span('retry_delay'):
+                    await asyncio.sleep(self.delay)
 
+                RETRIES.inc(action=action_name)
                 result = await self._execute_action(*args, **kwargs)
 
                 if not self._retry_required(result):
                     break
 
                 if i == self.retries - 1:
+                    RETRIES_EXHAUSTED.inc(action=action_name)
                     logger.error("Maximum number of retries performed. {action} has failed.",
                                  fparams={"action": self.action})
 
@@ -114,6 +125,10 @@ class RetriableAction(object):
     def _exception_is_retriable(self, exception: Exception) -> bool:
         return self.retriable_exception_check(exception)
 
+    def _get_action_name(self) -> str:
+        name = getattr(self.action, '__qualname__', type(self.action).__qualname__)
+        return name.replace('.<locals>', '')
+
 
 class RetriableActionResult(object):
     """Represents the result of executing a RetriableAction.
@@ -55,6 +55,19 @@ class TestRetriableAction(unittest.TestCase):
         self.assertEqual(1 + DEFAULT_RETRIES, self.mock_action.call_count,
                          f"The action should be executed once and then retried {DEFAULT_RETRIES} times.")
 
+    @test_utilities.async_test
+    async def test_should_count_retries_in_metrics(self):
+        async def action():
+            raise Exception()
+        action_name = 'TestRetriableAction.test_should_count_retries_in_metrics.action'
+        retries_before = retriable_action.RETRIES.get(action=action_name)
+        exhausted_before = retriable_action.RETRIES_EXHAUSTED.get(action=action_name)
+
+        await retriable_action.RetriableAction(action, retries=DEFAULT_RETRIES, delay=0).execute()
+
+        self.assertEqual(retries_before + DEFAULT_RETRIES, retriable_action.RETRIES.get(action=action_name))
+        self.assertEqual(exhausted_before + 1, retriable_action.RETRIES_EXHAUSTED.get(action=action_name))
+
     @test_utilities.async_test
     async def test_should_try_once_if_retries_set_to_zero(self):
         self.mock_action.side_effect = Exception
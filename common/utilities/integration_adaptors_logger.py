@@ -1,11 +1,16 @@
+import atexit
 import datetime as dt
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 from logging import LogRecord
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 
 from utilities import config
 from utilities import mdc
+from utilities.string_utilities import str2bool
 
 AUDIT = 25
 LOG_FORMAT_STRING = "[%(asctime)sZ] | %(levelname)s | %(process)d | %(interaction_id)s | %(message_id)s " \
@@ -13,6 +18,7 @@ LOG_FORMAT_STRING = "[%(asctime)sZ] | %(levelname)s | %(process)d | %(interactio
 
 _project_name = None
 _log_format = LOG_FORMAT_STRING
+_queue_listener: Optional[logging.handlers.QueueListener] = None
 
 
 def _check_for_insecure_log_level(log_level: str):
@@ -35,26 +41,45 @@ class IntegrationAdaptorsLogger(logging.LoggerAdapter):
         super().__init__(logging.getLogger(name), extra=None)
 
     def log(self, level: int, msg: Any, *args: Any, **kwargs: Any) -> None:
-        msg = self._format_using_custom_params(msg, kwargs)
+        # Checked before anything else is done, so that messages below the log level cost next to nothing
+        if not self.isEnabledFor(level):
+            return
+        fparams = kwargs.pop("fparams", None)
+        if fparams is not None:
+            msg = FormattedMessage(msg, fparams)
         super().log(level, msg, *args, **kwargs)
 
     def audit(self, msg: str, *args: Any, **kwargs: Any) -> None:
         if self.isEnabledFor(AUDIT):
             self.log(AUDIT, msg, *args, **kwargs)
 
-    def _format_using_custom_params(self, msg: str, kwargs: dict) -> str:
-        if "fparams" in kwargs:
-            msg = self._formatted_string(msg, kwargs["fparams"])
-            del kwargs["fparams"]
-        return msg
 
-    def _format_values_in_map(self, dict_values: dict) -> dict:
+class FormattedMessage(object):
+    """
+    A log message populated with a dictionary of values. The message is only formatted when it is converted to a
+    string, which the logging framework does only if a handler actually emits the record.
+    """
+
+    def __init__(self, message: str, dict_values: dict):
+        self.message = message
+        self.dict_values = dict_values
+
+    def __str__(self) -> str:
+        return self.message.format(**self._format_values_in_map())
+
+    def get_params(self) -> Dict[str, str]:
+        """
+        The values the message is populated with, converted to strings
+        """
+        return {key.replace(' ', ''): str(value) for key, value in self.dict_values.items()}
+
+    def _format_values_in_map(self) -> dict:
         """
         Replaces the values in the map with key=value so that the key in a string can be replaced with the correct
         log format, also surrounds the value with quotes if it contains spaces and removes spaces from the key
         """
         new_map = {}
-        for key, value in dict_values.items():
+        for key, value in self.dict_values.items():
             value = str(value)
             if ' ' in value:
                 value = f'"{value}"'
@@ -62,12 +87,20 @@ class IntegrationAdaptorsLogger(logging.LoggerAdapter):
             new_map[key] = f"{key.replace(' ', '')}={value}"
         return new_map
 
-    def _formatted_string(self, message: str, dict_values: dict) -> str:
-        """
-        Populates the string with the correctly formatted dictionary values
-        """
-        formatted_values = self._format_values_in_map(dict_values)
-        return message.format(**formatted_values)
+
+def _add_mdc_values(record: LogRecord) -> None:
+    """
+    Adds the current MDC values to the record, unless they were added when it was queued on another thread
+    """
+    if not hasattr(record, 'correlation_id'):
+        record.message_id = mdc.message_id.get()
+        record.correlation_id = mdc.correlation_id.get()
+        record.inbound_message_id = mdc.inbound_message_id.get()
+        record.interaction_id = mdc.interaction_id.get()
+
+
+def _get_name(record: LogRecord) -> str:
+    return f'{_project_name}.{record.name}' if _project_name else record.name
 
 
 class CustomFormatter(logging.Formatter):
@@ -75,12 +108,9 @@ class CustomFormatter(logging.Formatter):
         super().__init__(fmt=_log_format, datefmt='%Y-%m-%dT%H:%M:%S.%f')
 
     def format(self, record: LogRecord) -> str:
-        record.message_id = mdc.message_id.get()
-        record.correlation_id = mdc.correlation_id.get()
-        record.inbound_message_id = mdc.inbound_message_id.get()
-        record.interaction_id = mdc.interaction_id.get()
+        _add_mdc_values(record)
 
-        record.name = f'{_project_name}.{record.name}' if _project_name else record.name
+        record.name = _get_name(record)
 
         return super().format(record)
 
@@ -91,13 +121,77 @@ class CustomFormatter(logging.Formatter):
         return s
 
 
+class JsonFormatter(CustomFormatter):
+    """
+    Formats each record as a single line JSON object. The values a message was populated with are also included
+    separately, under `params`, so that they can be searched on without parsing the message.
+    """
+
+    def format(self, record: LogRecord) -> str:
+        _add_mdc_values(record)
+
+        entry = {
+            'time': self.formatTime(record, self.datefmt) + 'Z',
+            'level': record.levelname,
+            'process': record.process,
+            'interaction_id': record.interaction_id,
+            'message_id': record.message_id,
+            'correlation_id': record.correlation_id,
+            'inbound_message_id': record.inbound_message_id,
+            'name': _get_name(record),
+            'message': record.getMessage()
+        }
+
+        params = getattr(record, 'params', None)
+        if params is None and isinstance(record.msg, FormattedMessage):
+            params = record.msg.get_params()
+        if params:
+            entry['params'] = params
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        if record.stack_info:
+            entry['stack_info'] = record.stack_info
+
+        return json.dumps(entry, default=str)
+
+
+class MdcQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queues records to be formatted and written on a separate thread by a `QueueListener`. Only the work that must be
+    done on the logging thread happens here: the message is populated, as its values may change once the call to log
+    returns, and the MDC values, which are specific to the logging thread, are added to the record.
+    """
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        _add_mdc_values(record)
+        if isinstance(record.msg, FormattedMessage):
+            record.params = record.msg.get_params()
+
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def _stop_queue_listener():
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        _queue_listener = None
+
+
 def configure_logging(project_name: str = None):
     """
     A general method to load the overall config of the system, specifically it modifies the root handler to output
     to stdout and sets the default log levels and format. This is expected to be called once at the start of a
     application.
     """
-    global _project_name, _log_format
+    global _project_name, _log_format, _queue_listener
     _project_name = project_name
     _log_format = config.get_config("LOG_FORMAT", default=LOG_FORMAT_STRING)
 
@@ -107,10 +201,37 @@ def configure_logging(project_name: str = None):
     logger.setLevel(log_level)
     handler = logging.StreamHandler(sys.stdout)
 
-    formatter = CustomFormatter()
+    # All config is read before the root logger's handlers are removed, as reading config logs through the root logger,
+    # which would otherwise be given a default handler while it has none
+    use_json = str2bool(config.get_config('LOG_JSON', default=str(False)))
+    use_queue = str2bool(config.get_config('LOG_USE_QUEUE', default=str(False)))
 
-    handler.setFormatter(formatter)
+    handler.setFormatter(JsonFormatter() if use_json else CustomFormatter())
     logger.handlers = []
+
+    _stop_queue_listener()
+    if use_queue:
+        # Records are written to stdout by a separate thread, so that writes never block the thread that logged them
+        log_queue = queue.SimpleQueue()
+        _queue_listener = logging.handlers.QueueListener(log_queue, handler)
+        _queue_listener.start()
+        handler = MdcQueueHandler(log_queue)
+
     logger.addHandler(handler)
 
     _check_for_insecure_log_level(log_level)
+
+
+def reconfigure_logging_after_fork():
+    """
+    Configures logging again in a process forked from one that had configured it, as the thread that writes queued log
+    records is not copied into the forked process.
+    """
+    global _queue_listener
+    if _queue_listener is not None:
+        # The listener's thread is not running in this process, so there is nothing to stop
+        _queue_listener = None
+        configure_logging(_project_name)
+
+
+atexit.register(_stop_queue_listener)
@@ -0,0 +1,246 @@
+"""This module defines an in-process registry of metrics (counters, gauges and histograms) which can be rendered in the
+Prometheus text exposition format.
+
+Metrics are created once, usually at module level, and updated as the application runs:
+
+    REQUESTS = metrics.counter('requests_total', 'The number of requests received', ['handler'])
+    REQUESTS.inc(handler='InboundHandler')
+
+Metrics are updated from the thread running the application's event loop, so no locking is done.
+"""
+import bisect
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Bucket upper bounds (in seconds) suitable for the latencies of requests, database calls and the like
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_LabelValues = Tuple[str, ...]
+
+
+class _Metric(object):
+    type_name = None
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        """
+        :param name: The name of the metric.
+        :param description: A description of what the metric measures.
+        :param label_names: The names of the labels each value of the metric is recorded against.
+        """
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values = {}
+
+    def _label_values(self, labels: Dict[str, object]) -> _LabelValues:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f'Metric {self.name} expects labels {self.label_names} but got {tuple(labels)}')
+        try:
+            return tuple(str(labels[name]) for name in self.label_names)
+        except KeyError as e:
+            raise ValueError(f'Metric {self.name} expects labels {self.label_names} but got {tuple(labels)}') from e
+
+    def _samples(self) -> Iterable[Tuple[str, _LabelValues, Tuple[Tuple[str, str], ...], float]]:
+        """
+        :return: The samples of this metric, as tuples of a name suffix, the label values, any extra labels and the
+        value.
+        """
+        for label_values, value in self._values.items():
+            yield '', label_values, (), value
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {_escape_help(self.description)}', f'# TYPE {self.name} {self.type_name}']
+        for suffix, label_values, extra_labels, value in self._samples():
+            labels = list(zip(self.label_names, label_values)) + list(extra_labels)
+            rendered_labels = ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+            lines.append(f'{self.name}{suffix}{{{rendered_labels}}} {_format_value(value)}' if labels
+                         else f'{self.name}{suffix} {_format_value(value)}')
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only goes up, such as the number of requests received."""
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if amount < 0:
+            raise ValueError('Counters can only be incremented by non-negative amounts')
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, such as the number of requests in progress."""
+    type_name = 'gauge'
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._label_values(labels)] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._label_values(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._label_values(labels), 0)
+
+
+class _HistogramValue(object):
+
+    def __init__(self, bucket_count: int):
+        self.bucket_counts = [0] * bucket_count
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    """Counts observed values, such as request latencies, in a fixed set of buckets so that percentiles can be
+    estimated."""
+    type_name = 'histogram'
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        :param buckets: The upper bounds of the histogram's buckets, in increasing order. A bucket for all values
+        (+Inf) is always added.
+        """
+        super().__init__(name, description, label_names)
+        if list(buckets) != sorted(buckets):
+            raise ValueError('Histogram buckets must be in increasing order')
+        self.buckets = tuple(bucket for bucket in buckets if bucket != math.inf)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._label_values(labels)
+        histogram_value = self._values.get(key)
+        if histogram_value is None:
+            histogram_value = self._values[key] = _HistogramValue(len(self.buckets))
+
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            histogram_value.bucket_counts[index] += 1
+        histogram_value.sum += value
+        histogram_value.count += 1
+
+    def get_count(self, **labels) -> int:
+        histogram_value = self._values.get(self._label_values(labels))
+        return histogram_value.count if histogram_value else 0
+
+    def get_sum(self, **labels) -> float:
+        histogram_value = self._values.get(self._label_values(labels))
+        return histogram_value.sum if histogram_value else 0.0
+
+    def _samples(self):
+        for label_values, histogram_value in self._values.items():
+            # Bucket counts are only totalled up to each bound when they are rendered, rather than on every observation
+            cumulative_count = 0
+            for bound, bucket_count in zip(self.buckets, histogram_value.bucket_counts):
+                cumulative_count += bucket_count
+                yield '_bucket', label_values, (('le', _format_value(bound)),), cumulative_count
+            yield '_bucket', label_values, (('le', '+Inf'),), histogram_value.count
+            yield '_sum', label_values, (), histogram_value.sum
+            yield '_count', label_values, (), histogram_value.count
+
+
+class MetricsRegistry(object):
+    """Holds a set of metrics, by name, and renders them all together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        """Get the counter with the given name, creating it if it does not yet exist.
+
+        :param name: The name of the counter.
+        :param description: A description of what the counter measures.
+        :param label_names: The names of the labels each value of the counter is recorded against.
+        :return: The counter.
+        """
+        return self._get_or_create(Counter, name, description, label_names)
+
+    def gauge(self, name: str, description: str, label_names: Sequence[str] = ()) -> Gauge:
+        """Get the gauge with the given name, creating it if it does not yet exist.
+
+        :param name: The name of the gauge.
+        :param description: A description of what the gauge measures.
+        :param label_names: The names of the labels each value of the gauge is recorded against.
+        :return: The gauge.
+        """
+        return self._get_or_create(Gauge, name, description, label_names)
+
+    def histogram(self, name: str, description: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Get the histogram with the given name, creating it if it does not yet exist.
+
+        :param name: The name of the histogram.
+        :param description: A description of what the histogram measures.
+        :param label_names: The names of the labels each value of the histogram is recorded against.
+        :param buckets: The upper bounds of the histogram's buckets, in increasing order.
+        :return: The histogram.
+        """
+        return self._get_or_create(Histogram, name, description, label_names, buckets=buckets)
+
+    def render(self) -> str:
+        """Render all the metrics in this registry in the Prometheus text exposition format.
+
+        :return: The rendered metrics.
+        """
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def clear(self) -> None:
+        """Reset the values of all the metrics in this registry."""
+        for metric in self._metrics.values():
+            metric._values.clear()
+
+    def _get_or_create(self, metric_type, name: str, description: str, label_names: Sequence[str], **kwargs):
+        metric = self._metrics.get(name)
+        if metric is None:
+            metric = self._metrics[name] = metric_type(name, description, label_names, **kwargs)
+        elif type(metric) is not metric_type or metric.label_names != tuple(label_names):
+            raise ValueError(f'Metric {name} is already registered as a {metric.type_name} with labels '
+                             f'{metric.label_names}')
+        return metric
+
+
+# The registry used by the application, which is rendered by the /metrics endpoint of each service
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+    """Get the counter with the given name from the application's registry, creating it if it does not yet exist."""
+    return REGISTRY.counter(name, description, label_names)
+
+
+def gauge(name: str, description: str, label_names: Sequence[str] = ()) -> Gauge:
+    """Get the gauge with the given name from the application's registry, creating it if it does not yet exist."""
+    return REGISTRY.gauge(name, description, label_names)
+
+
+def histogram(name: str, description: str, label_names: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    """Get the histogram with the given name from the application's registry, creating it if it does not yet
+    exist."""
+    return REGISTRY.histogram(name, description, label_names, buckets)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import time
+import types
+from unittest import TestCase
+from unittest.mock import patch
+
+from utilities import event_loop, mdc
+from utilities.test_utilities import async_test
+
+SAMPLE_INTERVAL = 0.02
+WARNING_THRESHOLD = 0.1
+
+
+class TestConfigureEventLoop(TestCase):
+
+    def tearDown(self) -> None:
+        asyncio.set_event_loop_policy(None)
+
+    @patch('utilities.config.config', new={})
+    @patch('asyncio.set_event_loop_policy')
+    def test_defaults_to_asyncio_event_loop(self, set_policy_mock):
+        event_loop.configure_event_loop()
+
+        set_policy_mock.assert_not_called()
+
+    @patch('utilities.config.config', new={'EVENT_LOOP': 'uvloop'})
+    def test_uvloop_event_loop(self):
+        policy = asyncio.DefaultEventLoopPolicy()
+        uvloop = types.ModuleType('uvloop')
+        uvloop.EventLoopPolicy = lambda: policy
+
+        with patch.dict(sys.modules, {'uvloop': uvloop}):
+            event_loop.configure_event_loop()
+
+        self.assertIs(policy, asyncio.get_event_loop_policy())
+
+    @patch('utilities.config.config', new={'EVENT_LOOP': 'uvloop'})
+    def test_uvloop_event_loop_not_installed(self):
+        with patch.dict(sys.modules, {'uvloop': None}):
+            with self.assertRaises(ImportError):
+                event_loop.configure_event_loop()
+
+    @patch('utilities.config.config', new={'EVENT_LOOP': 'unknown'})
+    def test_unknown_event_loop(self):
+        with self.assertRaises(ValueError):
+            event_loop.configure_event_loop()
+
+
+class TestLoopLagMonitor(TestCase):
+
+    @async_test
+    async def test_lag_is_recorded_in_metrics(self):
+        count_before = event_loop.LOOP_LAG.get_count()
+        monitor = event_loop.LoopLagMonitor(asyncio.get_event_loop(), SAMPLE_INTERVAL, WARNING_THRESHOLD)
+
+        monitor.start()
+        await asyncio.sleep(SAMPLE_INTERVAL * 5)
+        monitor.stop()
+
+        self.assertGreater(event_loop.LOOP_LAG.get_count(), count_before)
+
+    @patch.object(event_loop, 'logger')
+    @async_test
+    async def test_blocking_call_is_reported_with_mdc_values(self, log_mock):
+        logged_message_ids = []
+        log_mock.warning.side_effect = lambda *args, **kwargs: logged_message_ids.append(mdc.message_id.get())
+        monitor = event_loop.LoopLagMonitor(asyncio.get_event_loop(), SAMPLE_INTERVAL, WARNING_THRESHOLD)
+
+        async def handle_message():
+            mdc.message_id.set('blocking message')
+            time.sleep(WARNING_THRESHOLD * 3)
+
+        monitor.start()
+        await asyncio.sleep(SAMPLE_INTERVAL * 2)
+        await asyncio.get_event_loop().create_task(handle_message())
+        await asyncio.sleep(SAMPLE_INTERVAL * 2)
+        monitor.stop()
+
+        self.assertEqual(['blocking message'], logged_message_ids)
+        stack = log_mock.warning.call_args[1]['fparams']['stack']
+        self.assertIn('handle_message', stack)
+
+    @patch.object(event_loop, 'logger')
+    @async_test
+    async def test_no_warning_without_blocking_call(self, log_mock):
+        monitor = event_loop.LoopLagMonitor(asyncio.get_event_loop(), SAMPLE_INTERVAL, WARNING_THRESHOLD)
+
+        monitor.start()
+        await asyncio.sleep(SAMPLE_INTERVAL * 5)
+        monitor.stop()
+
+        log_mock.warning.assert_not_called()
+
+
+class TestStartLoopLagMonitor(TestCase):
+
+    @patch('utilities.config.config', new={'EVENT_LOOP_LAG_SAMPLE_INTERVAL': '0'})
+    def test_monitoring_can_be_disabled(self):
+        self.assertIsNone(event_loop.start_loop_lag_monitor())
+
+    @patch('utilities.config.config', new={})
+    @async_test
+    async def test_monitor_is_started_by_default(self):
+        monitor = event_loop.start_loop_lag_monitor()
+        try:
+            self.assertEqual(1, monitor.sample_interval)
+            self.assertEqual(0.1, monitor.warning_threshold)
+        finally:
+            monitor.stop()
@@ -113,6 +113,23 @@ class TestTimeUtilities(TestCase):
                                              fparams={'FuncName': 'var_parameters_async', 'Duration': 5})
             self.assertEqual("whew1three4", res)
 
+    @patch('utilities.timing.Stopwatch.stop_timer')
+    @async_test
+    async def test_function_duration_recorded_in_metrics(self, time_mock):
+        time_mock.return_value = 5
+        for method, name in [(self.default_method, 'TestTimeUtilities.default_method'),
+                             (self.default_method_async, 'TestTimeUtilities.default_method_async')]:
+            with self.subTest(name):
+                count_before = timing.FUNCTION_DURATION.get_count(function=name)
+                sum_before = timing.FUNCTION_DURATION.get_sum(function=name)
+
+                result = method()
+                if name.endswith('async'):
+                    await result
+
+                self.assertEqual(count_before + 1, timing.FUNCTION_DURATION.get_count(function=name))
+                self.assertEqual(sum_before + 5, timing.FUNCTION_DURATION.get_sum(function=name))
+
     @patch('utilities.timing.datetime')
     def test_get_time(self, mock_datetime):
         mock_datetime.datetime.utcnow.return_value = datetime.datetime(2019, 1, 5, 12, 13, 14, 567)
@@ -172,6 +189,10 @@ class FakeRequestHandler(RequestHandler):
         finally:
             self.write("put")
 
+    @timing.time_request
+    def patch(self):
+        self.write(str(timing.REQUESTS_IN_PROGRESS.get()))
+
 
 @patch.object(timing, 'logger')
 class TestHTTPWrapperTimeUtilities(AsyncHTTPTestCase):
@@ -216,3 +237,24 @@ class TestHTTPWrapperTimeUtilities(AsyncHTTPTestCase):
         response = self.fetch(f"/", method="PUT", body="{'test': 'tested'}")
 
         self._assert_handler_data(response, 500, None, 'put', log_mock)
+
+    @patch('utilities.timing.Stopwatch.stop_timer')
+    def test_request_duration_recorded_in_metrics(self, time_mock, log_mock):
+        time_mock.return_value = self.duration
+        sub_tests = [('POST', 'post', 200), ('PUT', 'put', 500)]
+        for method, method_label, status in sub_tests:
+            with self.subTest(method):
+                labels = {'handler': 'FakeRequestHandler', 'method': method_label, 'status': status}
+                count_before = timing.REQUEST_DURATION.get_count(**labels)
+
+                self.fetch(f"/", method=method, body="{'test': 'tested'}")
+
+                self.assertEqual(count_before + 1, timing.REQUEST_DURATION.get_count(**labels))
+
+    def test_requests_in_progress_recorded_in_metrics(self, log_mock):
+        in_progress_before = timing.REQUESTS_IN_PROGRESS.get()
+
+        response = self.fetch(f"/", method="PATCH", body="{'test': 'tested'}")
+
+        self.assertEqual(in_progress_before + 1, float(response.body.decode()))
+        self.assertEqual(in_progress_before, timing.REQUESTS_IN_PROGRESS.get())
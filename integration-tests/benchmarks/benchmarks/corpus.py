@@ -0,0 +1,54 @@
+"""This module builds the messages benchmarks are run with, from the templates the integration tests send and the
+responses fake Spine replies with."""
+from typing import List
+
+from integration_tests.helpers.build_message import build_message
+
+from benchmarks import paths
+
+FAKE_SPINE_RESPONSES_DIR = paths.REPO_ROOT / 'integration-tests' / 'fake_spine' / 'fake_spine' / 'configured_responses'
+
+# The size of each attachment, which is kept small so that the cost of handling many attachments is not hidden by the
+# cost of copying their payloads
+ATTACHMENT_SIZE = 1000
+
+
+def build_payload(interaction_id: str, message_size: int, message_id: str = None) -> str:
+    """Render the integration tests' template for an interaction, padded to a size.
+
+    :param interaction_id: The interaction to render the template of.
+    :param message_size: The size (in bytes) to pad the payload to. Payloads already larger than this are not padded.
+    :param message_id: The message id to render the template with, or None for a new message id.
+    :return: The payload.
+    """
+    payload, _ = build_message(interaction_id, message_id=message_id)
+    return pad_payload(payload, message_size)
+
+
+def pad_payload(payload: str, message_size: int) -> str:
+    # The padding is a trailing XML comment, so the payload is still valid XML that Spine (and fake Spine) accept
+    padding = message_size - len(payload.encode()) - len('<!---->')
+    if padding <= 0:
+        return payload
+    return payload + '<!--' + 'x' * padding + '-->'
+
+
+def build_attachments(count: int) -> List[dict]:
+    """
+    :param count: The number of attachments to build.
+    :return: Text attachments, in the form they are sent to the outbound service in.
+    """
+    return [{'is_base64': False,
+             'content_type': 'text/plain',
+             'payload': f'Attachment {index} '.ljust(ATTACHMENT_SIZE, 'x'),
+             'description': f'Attachment {index}'}
+            for index in range(count)]
+
+
+def load_fake_spine_response(file_name: str) -> str:
+    """
+    :param file_name: The name of one of the responses fake Spine is configured with, such as
+    `soap_fault_single_error.xml`.
+    :return: The response.
+    """
+    return (FAKE_SPINE_RESPONSES_DIR / file_name).read_text()
@@ -0,0 +1,164 @@
+"""This module defines the CPU benchmark cases: the envelope serialisation, parsing and validation the services do for
+every message, run with payloads and attachments of a range of sizes."""
+import json
+from dataclasses import dataclass
+from typing import Callable, Iterable, List
+
+from comms.http_headers import HttpHeaders
+from mhs_common.errors import ebxml_handler, soap_handler
+from mhs_common.messages import common_ack_envelope, ebxml_ack_envelope, ebxml_envelope, ebxml_nack_envelope, \
+    ebxml_request_envelope, soap_envelope
+from mhs_common.request import request_body_schema
+from utilities import message_utilities
+
+from benchmarks import corpus
+
+# The interactions whose templates the payloads are rendered from. Forward reliable messages are the ones sent with
+# attachments.
+ASYNC_INTERACTION_ID = 'COPC_IN000001UK01'
+SYNC_INTERACTION_ID = 'QUPA_IN040000UK32'
+ASYNC_SERVICE = 'urn:nhs:names:services:mm'
+SYNC_SERVICE = 'urn:nhs:names:services:pdsquery'
+
+FROM_PARTY_ID = 'A91424-9199121'
+TO_PARTY_ID = 'YES-0000806'
+CPA_ID = 'S1001A1630'
+FROM_ASID = '918999198738'
+TO_ASID = '928942012545'
+
+# Sizes from 1KB up to the largest payload the outbound service accepts
+DEFAULT_MESSAGE_SIZES = [1_000, 100_000, 1_000_000, 5_000_000]
+# From no attachments up to the most the outbound service accepts
+DEFAULT_ATTACHMENT_COUNTS = [0, 10, 98]
+
+
+@dataclass(frozen=True)
+class CpuCase:
+    name: str
+    function: Callable[[], object]
+
+
+def build_cases(message_sizes: Iterable[int] = None, attachment_counts: Iterable[int] = None) -> List[CpuCase]:
+    """Build the benchmark cases. Each case's inputs are built up front, so only the code being benchmarked is timed.
+
+    :param message_sizes: The sizes (in bytes) to pad payloads to.
+    :param attachment_counts: The numbers of attachments to send with asynchronous messages.
+    :return: The cases, each named after the code it benchmarks and the size of its inputs.
+    """
+    message_sizes = DEFAULT_MESSAGE_SIZES if message_sizes is None else list(message_sizes)
+    attachment_counts = DEFAULT_ATTACHMENT_COUNTS if attachment_counts is None else list(attachment_counts)
+
+    cases = []
+    for message_size in message_sizes:
+        async_payload = corpus.build_payload(ASYNC_INTERACTION_ID, message_size)
+        for attachment_count in attachment_counts:
+            parameters = f'[size={message_size},attachments={attachment_count}]'
+            attachments = corpus.build_attachments(attachment_count)
+            cases.extend(_request_body_cases(parameters, async_payload, attachments))
+            cases.extend(_ebxml_request_cases(parameters, async_payload, attachments))
+
+        sync_payload = corpus.build_payload(SYNC_INTERACTION_ID, message_size)
+        cases.extend(_soap_cases(f'[size={message_size}]', sync_payload))
+
+    cases.extend(_ack_cases())
+    cases.extend(_error_handler_cases())
+    return cases
+
+
+def _request_body_cases(parameters: str, payload: str, attachments: List[dict]) -> List[CpuCase]:
+    body = json.dumps({'payload': payload, 'attachments': attachments}).encode()
+    return [CpuCase(f'request_body_schema.loads{parameters}',
+                    lambda: request_body_schema.RequestBodySchema().loads(body))]
+
+
+def _ebxml_request_cases(parameters: str, payload: str, attachments: List[dict]) -> List[CpuCase]:
+    message_dictionary = {
+        ebxml_envelope.FROM_PARTY_ID: FROM_PARTY_ID,
+        ebxml_envelope.TO_PARTY_ID: TO_PARTY_ID,
+        ebxml_envelope.CPA_ID: CPA_ID,
+        ebxml_envelope.CONVERSATION_ID: message_utilities.get_uuid(),
+        ebxml_envelope.SERVICE: ASYNC_SERVICE,
+        ebxml_envelope.ACTION: ASYNC_INTERACTION_ID,
+        ebxml_request_envelope.DUPLICATE_ELIMINATION: True,
+        ebxml_request_envelope.ACK_REQUESTED: True,
+        ebxml_request_envelope.ACK_SOAP_ACTOR: 'urn:oasis:names:tc:ebxml-msg:actor:toPartyMSH',
+        ebxml_request_envelope.SYNC_REPLY: True,
+        ebxml_request_envelope.MESSAGE: payload,
+        ebxml_envelope.ATTACHMENTS: attachments,
+        ebxml_envelope.EXTERNAL_ATTACHMENTS: []
+    }
+    envelope = ebxml_request_envelope.EbxmlRequestEnvelope(message_dictionary)
+    _, headers, message = envelope.serialize()
+    # The inbound service is given the raw bytes of the message
+    message = message.encode()
+
+    return [
+        # The workflows serialise outbound messages as a HttpBody, which is written without being joined into a string
+        CpuCase(f'ebxml_request_envelope.serialize{parameters}', lambda: envelope.serialize(as_http_body=True)),
+        CpuCase(f'ebxml_request_envelope.from_string{parameters}',
+                lambda: ebxml_request_envelope.EbxmlRequestEnvelope.from_string(headers, message))
+    ]
+
+
+def _soap_cases(parameters: str, payload: str) -> List[CpuCase]:
+    envelope = soap_envelope.SoapEnvelope({
+        soap_envelope.TO_ASID: TO_ASID,
+        soap_envelope.FROM_ASID: FROM_ASID,
+        soap_envelope.SERVICE: SYNC_SERVICE,
+        soap_envelope.ACTION: f'{SYNC_SERVICE}/{SYNC_INTERACTION_ID}',
+        soap_envelope.MESSAGE: payload
+    })
+    message = envelope.serialize()[2]
+
+    return [
+        CpuCase(f'soap_envelope.serialize{parameters}', lambda: envelope.serialize(as_http_body=True)),
+        CpuCase(f'soap_envelope.from_string{parameters}',
+                lambda: soap_envelope.SoapEnvelope.from_string({}, message))
+    ]
+
+
+def _ack_cases() -> List[CpuCase]:
+    # The context the inbound service acknowledges a request with
+    message_dictionary = {
+        ebxml_envelope.FROM_PARTY_ID: TO_PARTY_ID,
+        ebxml_envelope.TO_PARTY_ID: FROM_PARTY_ID,
+        ebxml_envelope.CPA_ID: CPA_ID,
+        ebxml_envelope.CONVERSATION_ID: message_utilities.get_uuid(),
+        common_ack_envelope.RECEIVED_MESSAGE_TIMESTAMP: message_utilities.get_timestamp(),
+        ebxml_envelope.RECEIVED_MESSAGE_ID: message_utilities.get_uuid()
+    }
+    nack_dictionary = {**message_dictionary,
+                       ebxml_envelope.ERROR_CODE: '5000',
+                       ebxml_envelope.SEVERITY: 'Error',
+                       ebxml_envelope.DESCRIPTION: 'Failed to process message'}
+
+    ack = ebxml_ack_envelope.EbxmlAckEnvelope(message_dictionary)
+    nack = ebxml_nack_envelope.EbxmlNackEnvelope(nack_dictionary)
+    ack_headers, ack_message = ack.serialize()[1:]
+    nack_headers, nack_message = nack.serialize()[1:]
+
+    return [
+        CpuCase('ebxml_ack_envelope.serialize', ack.serialize),
+        CpuCase('ebxml_ack_envelope.from_string',
+                lambda: ebxml_ack_envelope.EbxmlAckEnvelope.from_string(ack_headers, ack_message)),
+        CpuCase('ebxml_nack_envelope.serialize', nack.serialize),
+        CpuCase('ebxml_nack_envelope.from_string',
+                lambda: ebxml_nack_envelope.EbxmlNackEnvelope.from_string(nack_headers, nack_message))
+    ]
+
+
+def _error_handler_cases() -> List[CpuCase]:
+    headers = {HttpHeaders.CONTENT_TYPE: 'text/xml'}
+    ebxml_error = corpus.load_fake_spine_response('ebxml_fault_single_error.xml')
+    soap_fault = corpus.load_fake_spine_response('soap_fault_single_error.xml')
+    # Most responses are not errors, but are still parsed to find that out
+    success = corpus.load_fake_spine_response('async_reliable_success_response.xml')
+
+    return [
+        CpuCase('ebxml_handler.handle_ebxml_error[error]',
+                lambda: ebxml_handler.handle_ebxml_error(200, headers, ebxml_error)),
+        CpuCase('ebxml_handler.handle_ebxml_error[success]',
+                lambda: ebxml_handler.handle_ebxml_error(200, headers, success)),
+        CpuCase('soap_handler.handle_soap_error[fault]',
+                lambda: soap_handler.handle_soap_error(500, headers, soap_fault))
+    ]
@@ -0,0 +1,72 @@
+"""This module sends requests to the outbound service at a fixed concurrency, and records how long each takes."""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from tornado import httpclient
+
+from benchmarks.patterns import RequestFactory
+
+
+@dataclass
+class LoadResult:
+    latencies: List[float] = field(default_factory=list)
+    status_codes: Dict[int, int] = field(default_factory=dict)
+    errors: int = 0
+    duration: float = 0.0
+
+
+class LoadGenerator(object):
+    """Sends requests from a number of concurrent workers. Each worker sends its next request as soon as its last one
+    has been answered (a closed loop), so the number of requests in progress never exceeds the concurrency."""
+
+    def __init__(self, url: str, request_factory: RequestFactory, concurrency: int, request_timeout: float):
+        """
+        :param url: The URL of the outbound service.
+        :param request_factory: Builds the requests to send.
+        :param concurrency: The number of requests to keep in progress at once.
+        :param request_timeout: How long (in seconds) to wait for each request before counting it as an error.
+        """
+        self.url = url
+        self.request_factory = request_factory
+        self.concurrency = concurrency
+        self.request_timeout = request_timeout
+        # A client of its own, so that the requests being measured do not queue for the same connections as the
+        # requests the services make
+        self._http_client = httpclient.AsyncHTTPClient(force_instance=True, max_clients=concurrency)
+
+    async def run(self, request_count: int) -> LoadResult:
+        """Send the given number of requests.
+
+        :param request_count: The number of requests to send, spread across the workers.
+        :return: The latency of each request that got the expected response, and counts of the responses received.
+        """
+        result = LoadResult()
+        remaining = [request_count]
+        start_time = time.perf_counter()
+        await asyncio.gather(*[self._worker(remaining, result) for _ in range(self.concurrency)])
+        result.duration = time.perf_counter() - start_time
+        return result
+
+    async def _worker(self, remaining: List[int], result: LoadResult) -> None:
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            _, body, headers = self.request_factory.build()
+            request_start_time = time.perf_counter()
+            try:
+                response = await self._http_client.fetch(self.url, method='POST', body=body, headers=headers,
+                                                          request_timeout=self.request_timeout, raise_error=False)
+            except Exception:
+                result.errors += 1
+                continue
+
+            latency = time.perf_counter() - request_start_time
+            result.status_codes[response.code] = result.status_codes.get(response.code, 0) + 1
+            if response.code == self.request_factory.pattern.expected_status:
+                result.latencies.append(latency)
+            else:
+                result.errors += 1
+
+    def close(self) -> None:
+        self._http_client.close()
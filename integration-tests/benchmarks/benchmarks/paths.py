@@ -0,0 +1,24 @@
+"""This module makes the source of the services, and of the fakes they are benchmarked against, importable."""
+import pathlib
+import sys
+
+REPO_ROOT = pathlib.Path(__file__).resolve().parents[3]
+
+# The directories the services and fakes are run from, so that their packages (`outbound`, `inbound`, `fake_spine`
+# and so on) can be imported in the same way as when they run on their own
+SOURCE_DIRS = [
+    'common',
+    'mhs/common',
+    'mhs/outbound',
+    'mhs/inbound',
+    'integration-tests/fake_spine',
+    'integration-tests/fake_spineroutelookup',
+    'integration-tests/integration_tests'
+]
+
+
+def add_source_dirs() -> None:
+    for source_dir in SOURCE_DIRS:
+        path = str(REPO_ROOT / source_dir)
+        if path not in sys.path:
+            sys.path.append(path)
@@ -0,0 +1,74 @@
+"""This module defines the messaging patterns that can be benchmarked, and builds the requests sent for each."""
+import json
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from comms.http_headers import HttpHeaders
+from utilities import message_utilities
+
+from benchmarks import corpus
+
+# The message id the templates are rendered with, which is replaced by a new message id for each request
+_TEMPLATE_MESSAGE_ID = '00000000-0000-0000-0000-000000000000'
+
+FROM_ASID = '918999198738'
+ODS_CODE = 'YES'
+
+
+@dataclass(frozen=True)
+class MessagingPattern:
+    name: str
+    interaction_id: str
+    wait_for_response: bool
+    expected_status: int
+
+
+PATTERNS: Dict[str, MessagingPattern] = {pattern.name: pattern for pattern in [
+    MessagingPattern('sync', 'QUPA_IN040000UK32', wait_for_response=False, expected_status=200),
+    MessagingPattern('async-express', 'QUPC_IN160101UK05', wait_for_response=False, expected_status=202),
+    MessagingPattern('async-reliable', 'REPC_IN150016UK05', wait_for_response=False, expected_status=202),
+    MessagingPattern('forward-reliable', 'COPC_IN000001UK01', wait_for_response=False, expected_status=202),
+    # Asynchronous interactions are handled by the sync-async workflow when the supplier waits for the response
+    MessagingPattern('sync-async', 'QUPC_IN160101UK05', wait_for_response=True, expected_status=200)
+]}
+
+
+class RequestFactory(object):
+    """Builds the body and headers of each request for a messaging pattern. The message template is rendered, padded
+    to the required size and encoded once, so that only the message id has to be substituted for each request."""
+
+    def __init__(self, pattern: MessagingPattern, message_size: int):
+        """
+        :param pattern: The messaging pattern to build requests for.
+        :param message_size: The size (in bytes) to pad the payload of each message to. Payloads already larger than
+        this are not padded.
+        """
+        self.pattern = pattern
+        payload = corpus.build_payload(pattern.interaction_id, message_size, message_id=_TEMPLATE_MESSAGE_ID)
+        self._body_template = json.dumps({'payload': payload}).encode()
+
+    def build(self) -> Tuple[str, bytes, Dict[str, str]]:
+        """Build a request with a new message id.
+
+        :return: A tuple of the message id, the request body and the request headers.
+        """
+        message_id = message_utilities.get_uuid()
+        body = self._body_template.replace(_TEMPLATE_MESSAGE_ID.encode(), message_id.encode())
+        headers = {
+            HttpHeaders.INTERACTION_ID: self.pattern.interaction_id,
+            HttpHeaders.MESSAGE_ID: message_id,
+            HttpHeaders.CORRELATION_ID: message_utilities.get_uuid(),
+            HttpHeaders.WAIT_FOR_RESPONSE: str(self.pattern.wait_for_response).lower(),
+            HttpHeaders.FROM_ASID: FROM_ASID,
+            HttpHeaders.ODS_CODE: ODS_CODE,
+            HttpHeaders.CONTENT_TYPE: 'application/json'
+        }
+        return message_id, body, headers
+
+
+def get_patterns(names: List[str]) -> List[MessagingPattern]:
+    unknown = [name for name in names if name not in PATTERNS]
+    if unknown:
+        raise ValueError(f'Unknown messaging patterns {unknown}. Expected some of {list(PATTERNS)}')
+    return [PATTERNS[name] for name in names]
+
@@ -0,0 +1,119 @@
+"""This module summarises the results of benchmark runs, and compares them against a baseline."""
+import math
+import resource
+import sys
+from typing import Dict, List, Optional, Sequence
+
+PERCENTILES = (50, 95, 99)
+
+# Each scenario is identified by these fields when it is compared against the same scenario in a baseline
+SCENARIO_KEY_FIELDS = ('pattern', 'concurrency', 'message_size')
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Get a percentile of some values, interpolating linearly between the two nearest values.
+
+    :param sorted_values: The values, in increasing order. Must not be empty.
+    :param percent: The percentile to get, from 0 to 100.
+    :return: The percentile.
+    """
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = math.ceil(position)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def summarise_latencies(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """
+    :param latencies: The time (in seconds) each request took.
+    :return: The mean, maximum and percentiles of the latencies, rounded to the microsecond.
+    """
+    if not latencies:
+        return {'mean': None, 'max': None, **{f'p{p}': None for p in PERCENTILES}}
+
+    sorted_latencies = sorted(latencies)
+    summary = {'mean': sum(sorted_latencies) / len(sorted_latencies), 'max': sorted_latencies[-1]}
+    for p in PERCENTILES:
+        summary[f'p{p}'] = percentile(sorted_latencies, p)
+    return {name: round(value, 6) for name, value in summary.items()}
+
+
+def get_rss_bytes() -> Optional[int]:
+    """The resident set size of this process, or None where it cannot be read (it is read from /proc)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * resource.getpagesize()
+    except (OSError, IndexError, ValueError):
+        return None
+
+
+def get_max_rss_bytes() -> int:
+    """The largest resident set size this process has had."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS and kilobytes elsewhere
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def find_regressions(baseline: dict, results: dict, max_regression_percent: float) -> List[str]:
+    """Compare the throughput and latency of each scenario in some results against the same scenario in a baseline.
+
+    :param baseline: The results of an earlier run.
+    :param results: The results of this run.
+    :param max_regression_percent: How much worse (as a percentage) a scenario may be before it is reported.
+    :return: A description of each regression found. Scenarios not in the baseline are ignored.
+    """
+    baseline_scenarios = {_scenario_key(scenario): scenario for scenario in baseline['scenarios']}
+    tolerance = max_regression_percent / 100
+    regressions = []
+    for scenario in results['scenarios']:
+        baseline_scenario = baseline_scenarios.get(_scenario_key(scenario))
+        if baseline_scenario is None:
+            continue
+
+        name = ' '.join(f'{field}={scenario[field]}' for field in SCENARIO_KEY_FIELDS)
+        baseline_throughput = baseline_scenario['throughput_per_second']
+        if scenario['throughput_per_second'] < baseline_throughput * (1 - tolerance):
+            regressions.append(f'{name}: throughput fell from {baseline_throughput} to '
+                               f'{scenario["throughput_per_second"]} requests per second')
+        for p in PERCENTILES:
+            baseline_latency = baseline_scenario['latency_seconds'][f'p{p}']
+            latency = scenario['latency_seconds'][f'p{p}']
+            if baseline_latency is not None and latency is not None and latency > baseline_latency * (1 + tolerance):
+                regressions.append(f'{name}: p{p} latency rose from {baseline_latency} to {latency} seconds')
+        if scenario['errors'] > baseline_scenario['errors']:
+            regressions.append(f'{name}: errors rose from {baseline_scenario["errors"]} to {scenario["errors"]}')
+    return regressions
+
+
+def _scenario_key(scenario: dict) -> tuple:
+    return tuple(scenario[field] for field in SCENARIO_KEY_FIELDS)
+
+
+def find_timing_regressions(thresholds: dict, timings: Dict[str, float], calibration_seconds: float,
+                            max_regression_percent: float) -> List[str]:
+    """Compare the time each CPU benchmark case took against the time stored for it in some thresholds.
+
+    Timings are compared relative to the time the calibration workload took on the machine each was measured on, so
+    that thresholds stored on one machine can be checked on another.
+
+    :param thresholds: The stored thresholds, with the `calibration_seconds` they were measured with and the time each
+    of their `cases` took.
+    :param timings: The time (in seconds) each case took in this run.
+    :param calibration_seconds: The time the calibration workload took in this run.
+    :param max_regression_percent: How much slower (as a percentage) a case may be before it is reported.
+    :return: A description of each regression found. Cases without a threshold are ignored.
+    """
+    scale = calibration_seconds / thresholds['calibration_seconds']
+    tolerance = max_regression_percent / 100
+    regressions = []
+    for name, seconds in timings.items():
+        threshold_seconds = thresholds['cases'].get(name)
+        if threshold_seconds is None:
+            continue
+
+        expected_seconds = threshold_seconds * scale
+        if seconds > expected_seconds * (1 + tolerance):
+            regressions.append(f'{name}: took {seconds:.6g} seconds, {(seconds / expected_seconds - 1) * 100:.1f}% '
+                               f'slower than its threshold of {expected_seconds:.6g} seconds on this machine')
+    return regressions
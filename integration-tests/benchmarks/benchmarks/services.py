@@ -0,0 +1,171 @@
+"""This module starts the outbound and inbound services in-process, against fake Spine, fake Spine route lookup, the
+in-memory state store and an in-process stand-in for the inbound queue.
+
+The services are composed in the same way as by their `main.py` scripts, and read the same `MHS_` environment
+variables, so a benchmark can be run with any configuration the services support.
+"""
+import importlib.util
+import os
+from typing import Iterable, List, Tuple
+
+import tornado.httpserver
+import tornado.netutil
+import tornado.web
+
+import definitions
+import inbound.request.handler as inbound_handler
+import outbound.request.synchronous.handler as outbound_handler
+from benchmarks import paths, stand_ins
+from benchmarks.patterns import MessagingPattern
+from fake_spine import fake_spine_configuration
+from fake_spine.request_handler import SpineRequestHandler
+from fake_spine.request_matching import SpineRequestResponseMapper
+from fake_spine.vnp_test_responses import vnp_test_responses
+from fake_spineroutelookup.reliability_response import ReliabilityResponse
+from fake_spineroutelookup.request_handler import RoutingRequestHandler
+from fake_spineroutelookup.request_matcher_wrappers import query_argument_contains_string
+from fake_spineroutelookup.request_matching import RequestMatcher, SpineRouteLookupRequestResponseMapper
+from fake_spineroutelookup.routing_reliability_response import RoutingReliabilityResponse
+from fake_spineroutelookup.routing_response import RoutingResponse
+from mhs_common import workflow
+from mhs_common.configuration import configuration_manager
+from mhs_common.handler import base_handler
+from mhs_common.routing import spine_route_lookup_client
+from mhs_common.workflow import sync_async_notifier
+from outbound.transmission import outbound_transmission
+from persistence.in_memory_persistence_adaptor import InMemoryPersistenceAdaptor
+from utilities import config
+
+PARTY_KEY = 'benchmark-party-key'
+SPINE_ORG_CODE = 'YES'
+WORK_DESCRIPTION_TABLE_NAME = 'benchmark_state'
+SYNC_ASYNC_TABLE_NAME = 'benchmark_sync_async_state'
+
+
+def _load_outbound_main():
+    # The outbound service's main.py is loaded under its own name, as the inbound service also has a `main` module
+    main_path = paths.REPO_ROOT / 'mhs' / 'outbound' / 'main.py'
+    spec = importlib.util.spec_from_file_location('outbound_main', str(main_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _listen(application: tornado.web.Application,
+            max_body_size: int = None) -> Tuple[tornado.httpserver.HTTPServer, int]:
+    sockets = tornado.netutil.bind_sockets(0, 'localhost')
+    server = tornado.httpserver.HTTPServer(application, max_body_size=max_body_size)
+    server.add_sockets(sockets)
+    return server, sockets[0].getsockname()[1]
+
+
+def _build_route_lookup_application(patterns: Iterable[MessagingPattern],
+                                    spine_url: str) -> tornado.web.Application:
+    routing, reliability, routing_reliability = {}, {}, {}
+    for interaction_id in sorted({pattern.interaction_id for pattern in patterns}):
+        def matches(request, interaction_id=interaction_id):
+            return query_argument_contains_string(request, 'service-id', interaction_id)
+
+        routing_response = RoutingResponse().override_mhs_end_point(spine_url)
+        routing[RequestMatcher(f'routing-{interaction_id}', matches)] = routing_response
+        reliability[RequestMatcher(f'reliability-{interaction_id}', matches)] = ReliabilityResponse()
+        routing_reliability[RequestMatcher(f'routing-reliability-{interaction_id}', matches)] = \
+            RoutingReliabilityResponse(routing_response)
+
+    return tornado.web.Application([
+        (r'/routing', RoutingRequestHandler,
+         dict(fake_response_handler=SpineRouteLookupRequestResponseMapper(routing))),
+        (r'/reliability', RoutingRequestHandler,
+         dict(fake_response_handler=SpineRouteLookupRequestResponseMapper(reliability))),
+        (r'/routing-reliability', RoutingRequestHandler,
+         dict(fake_response_handler=SpineRouteLookupRequestResponseMapper(routing_reliability)))
+    ])
+
+
+class Services(object):
+    """The outbound and inbound services, and the fakes and stand-ins they depend on, running on the current IOLoop."""
+
+    def __init__(self, patterns: List[MessagingPattern]):
+        """
+        :param patterns: The messaging patterns the fake Spine route lookup service should answer lookups for.
+        """
+        self.patterns = patterns
+        self.work_description_store = InMemoryPersistenceAdaptor(WORK_DESCRIPTION_TABLE_NAME)
+        self.sync_async_store = InMemoryPersistenceAdaptor(SYNC_ASYNC_TABLE_NAME)
+        self.inbound_queue = stand_ins.CountingQueueAdaptor()
+        self.outbound_url = None
+        self._servers = []
+
+    def start(self) -> None:
+        """Configure the services and start listening for requests, each on a free port."""
+        outbound_main = _load_outbound_main()
+        outbound_main.configure_http_client()
+        max_request_size = int(config.get_config('OUTBOUND_MAX_REQUEST_SIZE',
+                                                  default=str(base_handler.DEFAULT_MAX_REQUEST_SIZE)))
+        interactions = configuration_manager.ConfigurationManager(
+            os.path.join(definitions.ROOT_DIR, 'data', 'interactions', 'interactions.json'))
+        # The inbound service would announce stored sync-async responses over Redis. In a single process the
+        # announcement is made in memory.
+        config.config.setdefault('SYNC_ASYNC_NOTIFIER', sync_async_notifier.NOTIFIER_IN_PROCESS)
+        notifier = sync_async_notifier.create_sync_async_notifier(receive_notifications=True)
+
+        inbound_workflows = workflow.get_workflow_map(inbound_async_queue=self.inbound_queue,
+                                                      work_description_store=self.work_description_store,
+                                                      sync_async_store=self.sync_async_store,
+                                                      sync_async_notifier=notifier)
+        inbound_port = self._listen(tornado.web.Application([
+            (r'/.*', inbound_handler.InboundHandler, dict(workflows=inbound_workflows, party_id=PARTY_KEY,
+                                                          work_description_store=self.work_description_store,
+                                                          config_manager=interactions,
+                                                          max_request_size=max_request_size))]),
+            max_body_size=max_request_size)
+
+        # Fake Spine reads its configuration from the environment. Its replies are sent straight to the inbound
+        # service, rather than through its proxy, which is only there to add client certificates.
+        os.environ['INBOUND_PROXY_PORT'] = str(inbound_port)
+        os.environ['MHS_SECRET_PARTY_KEY'] = PARTY_KEY
+        for name in ['FAKE_SPINE_PRIVATE_KEY', 'FAKE_SPINE_CERTIFICATE', 'FAKE_SPINE_CA_STORE',
+                     'INBOUND_SERVER_BASE_URL']:
+            os.environ.setdefault(name, '')
+        # Fail now, rather than on the first request, if fake Spine's configuration is invalid
+        fake_spine_configuration.FakeSpineConfiguration()
+        spine_port = self._listen(tornado.web.Application([
+            (r'/', SpineRequestHandler,
+             dict(fake_response_handler=SpineRequestResponseMapper(vnp_test_responses())))]))
+        spine_url = f'http://localhost:{spine_port}/'
+        config.config.setdefault('FORWARD_RELIABLE_ENDPOINT_URL', spine_url)
+
+        route_lookup_port = self._listen(_build_route_lookup_application(self.patterns, spine_url))
+        routing = spine_route_lookup_client.SpineRouteLookupClient(f'http://localhost:{route_lookup_port}',
+                                                                   SPINE_ORG_CODE, validate_cert=False)
+        routing = outbound_main.add_routing_cache(routing)
+
+        transmission = outbound_transmission.OutboundTransmission(
+            None, None, None,
+            int(config.get_config('OUTBOUND_TRANSMISSION_MAX_RETRIES', default='3')),
+            int(config.get_config('OUTBOUND_TRANSMISSION_RETRY_DELAY', default='100')),
+            validate_cert=False)
+        outbound_workflows = outbound_main.initialise_workflows(transmission, PARTY_KEY, self.work_description_store,
+                                                                self.sync_async_store, max_request_size, routing,
+                                                                notifier)
+        outbound_port = self._listen(tornado.web.Application([
+            (r'/', outbound_handler.SynchronousHandler, dict(config_manager=interactions,
+                                                             workflows=outbound_workflows,
+                                                             max_request_size=max_request_size))]),
+            max_body_size=max_request_size)
+        self.outbound_url = f'http://localhost:{outbound_port}/'
+
+    def _listen(self, application: tornado.web.Application, max_body_size: int = None) -> int:
+        server, port = _listen(application, max_body_size)
+        self._servers.append(server)
+        return port
+
+    def clear_stores(self) -> None:
+        """Remove the records of the messages handled so far, so they do not build up from one scenario to the next."""
+        self.work_description_store.clear()
+        self.sync_async_store.clear()
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.stop()
+        self._servers = []
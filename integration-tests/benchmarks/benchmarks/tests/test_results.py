@@ -0,0 +1,100 @@
+from unittest import TestCase
+
+from benchmarks import results
+
+
+def _results(throughput=100.0, p50=0.01, p95=0.02, p99=0.03, errors=0, concurrency=10):
+    return {'scenarios': [{
+        'pattern': 'sync',
+        'concurrency': concurrency,
+        'message_size': 1024,
+        'errors': errors,
+        'throughput_per_second': throughput,
+        'latency_seconds': {'mean': p50, 'max': p99, 'p50': p50, 'p95': p95, 'p99': p99}
+    }]}
+
+
+class TestPercentile(TestCase):
+
+    def test_percentile_of_single_value(self):
+        self.assertEqual(5, results.percentile([5], 99))
+
+    def test_percentile_interpolates_between_values(self):
+        values = [1, 2, 3, 4, 5]
+
+        self.assertEqual(1, results.percentile(values, 0))
+        self.assertEqual(3, results.percentile(values, 50))
+        self.assertEqual(5, results.percentile(values, 100))
+        self.assertAlmostEqual(4.8, results.percentile(values, 95))
+
+
+class TestSummariseLatencies(TestCase):
+
+    def test_summarise_latencies(self):
+        summary = results.summarise_latencies([0.3, 0.1, 0.2])
+
+        self.assertEqual({'mean': 0.2, 'max': 0.3, 'p50': 0.2, 'p95': 0.29, 'p99': 0.298}, summary)
+
+    def test_summarise_no_latencies(self):
+        summary = results.summarise_latencies([])
+
+        self.assertEqual({'mean': None, 'max': None, 'p50': None, 'p95': None, 'p99': None}, summary)
+
+
+class TestFindRegressions(TestCase):
+
+    def test_no_regressions_within_tolerance(self):
+        regressions = results.find_regressions(_results(), _results(throughput=95.0, p99=0.032), 10)
+
+        self.assertEqual([], regressions)
+
+    def test_throughput_regression(self):
+        regressions = results.find_regressions(_results(), _results(throughput=80.0), 10)
+
+        self.assertEqual(1, len(regressions))
+        self.assertIn('throughput fell from 100.0 to 80.0', regressions[0])
+
+    def test_latency_regression(self):
+        regressions = results.find_regressions(_results(), _results(p95=0.03, p99=0.05), 10)
+
+        self.assertEqual(2, len(regressions))
+        self.assertIn('p95 latency rose', regressions[0])
+        self.assertIn('p99 latency rose', regressions[1])
+
+    def test_error_regression(self):
+        regressions = results.find_regressions(_results(), _results(errors=1), 10)
+
+        self.assertEqual(['pattern=sync concurrency=10 message_size=1024: errors rose from 0 to 1'], regressions)
+
+    def test_scenarios_not_in_baseline_are_ignored(self):
+        regressions = results.find_regressions(_results(concurrency=1), _results(throughput=1.0, concurrency=50), 10)
+
+        self.assertEqual([], regressions)
+
+
+class TestFindTimingRegressions(TestCase):
+
+    THRESHOLDS = {'calibration_seconds': 0.001, 'cases': {'fast': 0.0001, 'slow': 0.1}}
+
+    def test_no_regressions_within_tolerance(self):
+        regressions = results.find_timing_regressions(self.THRESHOLDS, {'fast': 0.00011, 'slow': 0.09}, 0.001, 20)
+
+        self.assertEqual([], regressions)
+
+    def test_regression(self):
+        regressions = results.find_timing_regressions(self.THRESHOLDS, {'fast': 0.00015, 'slow': 0.1}, 0.001, 20)
+
+        self.assertEqual(['fast: took 0.00015 seconds, 50.0% slower than its threshold of 0.0001 seconds on this '
+                          'machine'], regressions)
+
+    def test_timings_are_scaled_by_calibration(self):
+        # This machine is twice as slow as the one the thresholds were stored on
+        regressions = results.find_timing_regressions(self.THRESHOLDS, {'fast': 0.0002, 'slow': 0.3}, 0.002, 20)
+
+        self.assertEqual(1, len(regressions))
+        self.assertIn('slow: took 0.3 seconds, 50.0% slower than its threshold of 0.2 seconds', regressions[0])
+
+    def test_cases_without_thresholds_are_ignored(self):
+        regressions = results.find_timing_regressions(self.THRESHOLDS, {'new': 10.0}, 0.001, 20)
+
+        self.assertEqual([], regressions)
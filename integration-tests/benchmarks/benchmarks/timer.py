@@ -0,0 +1,38 @@
+"""This module times CPU benchmark cases, and a fixed calibration workload that timings are normalised against so
+that they can be compared across machines."""
+import json
+import timeit
+from typing import Callable
+from xml.etree import ElementTree
+
+_CALIBRATION_DOCUMENT = {f'key{index}': [index, str(index), {'nested': index * 1.5}] for index in range(200)}
+_CALIBRATION_XML = '<root>' + ''.join(f'<item id="{index}">value {index}</item>' for index in range(200)) + '</root>'
+
+
+def measure(function: Callable[[], object], repeats: int) -> float:
+    """Time how long a function takes to run.
+
+    The function is run enough times for each repeat to take at least 0.2 seconds, and the fastest repeat is used, as
+    the slower repeats are slowed by other processes rather than by the function itself.
+
+    :param function: The function to time.
+    :param repeats: The number of times to repeat the timing.
+    :return: The time (in seconds) one run of the function took.
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeats, number=number)) / number
+
+
+def _calibration_workload() -> None:
+    json.loads(json.dumps(_CALIBRATION_DOCUMENT))
+    ElementTree.fromstring(_CALIBRATION_XML)
+    sorted(str(index) for index in range(1000))
+
+
+def calibrate(repeats: int) -> float:
+    """
+    :param repeats: The number of times to repeat the timing.
+    :return: The time (in seconds) the calibration workload takes on this machine.
+    """
+    return measure(_calibration_workload, repeats)
@@ -0,0 +1,119 @@
+"""A script that benchmarks the CPU time taken to serialise, parse and validate messages, and fails if any of them has
+become slower than its stored threshold."""
+import argparse
+import json
+import os
+import pathlib
+import platform
+import sys
+from typing import List
+
+from benchmarks import paths
+
+paths.add_source_dirs()
+
+import utilities.integration_adaptors_logger as log  # noqa: E402
+from benchmarks import cpu_cases, results, timer  # noqa: E402
+from utilities import config, timing  # noqa: E402
+
+DEFAULT_THRESHOLDS_FILE = pathlib.Path(__file__).resolve().parent / 'cpu-thresholds.json'
+DEFAULT_MAX_REGRESSION_PERCENT = 20
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark the CPU time taken to serialise, parse and validate '
+                                                 'messages')
+
+    parser.add_argument('--cases', help='Comma separated prefixes of the names of the cases to run, such as '
+                                        'ebxml_request_envelope.serialize. All cases are run by default')
+    parser.add_argument('--message-sizes', type=_parse_int_list, default=cpu_cases.DEFAULT_MESSAGE_SIZES,
+                        help='Comma separated sizes (in bytes) to pad message payloads to')
+    parser.add_argument('--attachment-counts', type=_parse_int_list, default=cpu_cases.DEFAULT_ATTACHMENT_COUNTS,
+                        help='Comma separated numbers of attachments to send with asynchronous messages')
+    parser.add_argument('--repeats', type=int, default=5,
+                        help='The number of times each case is timed, of which the fastest is used')
+    parser.add_argument('--output', default='cpu-benchmark-results.json', help='The file to write the results to')
+    parser.add_argument('--thresholds', default=str(DEFAULT_THRESHOLDS_FILE),
+                        help='The file the time each case should take is stored in')
+    parser.add_argument('--max-regression', type=float,
+                        help='How much slower (as a percentage) than its threshold a case may be before the run '
+                             'fails. Defaults to the max_regression_percent stored with the thresholds')
+    parser.add_argument('--update-thresholds', action='store_true',
+                        help='Store the times taken in this run as the thresholds, rather than comparing against them')
+
+    return parser.parse_args()
+
+
+def _configure() -> None:
+    # Envelopes log as they are built and parsed, and the error handlers log each error they find. Nothing is logged by
+    # default, so that the time taken to write log lines is not measured, but the usual environment variable can be set
+    # to include it.
+    os.environ.setdefault('MHS_LOG_LEVEL', 'CRITICAL')
+    config.setup_config('MHS')
+    log.configure_logging('benchmark')
+
+
+def _select_cases(cases: List[cpu_cases.CpuCase], prefixes: str) -> List[cpu_cases.CpuCase]:
+    if not prefixes:
+        return cases
+    prefixes = tuple(prefix.strip() for prefix in prefixes.split(',') if prefix.strip())
+    return [case for case in cases if case.name.startswith(prefixes)]
+
+
+def main(args) -> int:
+    _configure()
+    cases = _select_cases(cpu_cases.build_cases(args.message_sizes, args.attachment_counts), args.cases)
+
+    started_at = timing.get_time()
+    calibration_seconds = timer.calibrate(args.repeats)
+    timings = {}
+    for case in cases:
+        timings[case.name] = timer.measure(case.function, args.repeats)
+        print(f'{case.name}: {timings[case.name] * 1000:.3f}ms')
+
+    run_results = {
+        'started_at': started_at,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'repeats': args.repeats,
+        'calibration_seconds': calibration_seconds,
+        'cases': timings
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(run_results, output_file, indent=2)
+    print(f'Results written to {args.output}')
+
+    thresholds_path = pathlib.Path(args.thresholds)
+    thresholds = json.loads(thresholds_path.read_text()) if thresholds_path.exists() else None
+
+    if args.update_thresholds:
+        max_regression = args.max_regression or (thresholds or {}).get('max_regression_percent',
+                                                                        DEFAULT_MAX_REGRESSION_PERCENT)
+        thresholds = {'max_regression_percent': max_regression,
+                      'python_version': run_results['python_version'],
+                      'calibration_seconds': calibration_seconds,
+                      'cases': timings}
+        thresholds_path.write_text(json.dumps(thresholds, indent=2) + '\n')
+        print(f'Thresholds written to {thresholds_path}')
+        return 0
+
+    if thresholds is None:
+        print(f'No thresholds found at {thresholds_path}. Run with --update-thresholds to store them')
+        return 1
+
+    max_regression = args.max_regression or thresholds['max_regression_percent']
+    regressions = results.find_timing_regressions(thresholds, timings, calibration_seconds, max_regression)
+    for regression in regressions:
+        print(f'Regression: {regression}')
+    if regressions:
+        return 1
+    print(f'No case regressed by more than {max_regression}% against {thresholds_path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(_parse_arguments()))
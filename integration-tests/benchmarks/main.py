@@ -0,0 +1,146 @@
+"""A script that benchmarks the throughput and latency of the MHS services for each messaging pattern, writing the
+results as JSON so that they can be compared from one release to the next."""
+import argparse
+import json
+import os
+import platform
+import sys
+from typing import List
+
+from benchmarks import paths
+
+paths.add_source_dirs()
+
+import tornado.ioloop  # noqa: E402
+
+import utilities.integration_adaptors_logger as log  # noqa: E402
+from benchmarks import load, patterns, results, services  # noqa: E402
+from comms import common_https  # noqa: E402
+from utilities import config, timing  # noqa: E402
+
+
+def _parse_int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(',') if item.strip()]
+
+
+def _parse_arguments():
+    parser = argparse.ArgumentParser(description='Benchmark the MHS outbound and inbound services in-process, against '
+                                                 'fake Spine and fake Spine route lookup')
+
+    parser.add_argument('--patterns', default=','.join(patterns.PATTERNS),
+                        help=f'Comma separated messaging patterns to benchmark, from {", ".join(patterns.PATTERNS)}')
+    parser.add_argument('--concurrency', type=_parse_int_list, default=[1, 10, 50],
+                        help='Comma separated numbers of requests to keep in progress at once')
+    parser.add_argument('--message-sizes', type=_parse_int_list, default=[1024, 100 * 1024],
+                        help='Comma separated sizes (in bytes) to pad message payloads to')
+    parser.add_argument('--requests', type=int, default=500, help='The number of requests measured in each scenario')
+    parser.add_argument('--warmup-requests', type=int, default=50,
+                        help='The number of requests sent, and not measured, before each scenario')
+    parser.add_argument('--request-timeout', type=float, default=30, help='The timeout (in seconds) for each request')
+    parser.add_argument('--label', help='A label for this run, such as the release being benchmarked')
+    parser.add_argument('--output', default='benchmark-results.json', help='The file to write the results to')
+    parser.add_argument('--baseline', help='The results of an earlier run to compare this run against')
+    parser.add_argument('--max-regression', type=float, default=10,
+                        help='How much worse (as a percentage) than the baseline a scenario may be before the run '
+                             'fails')
+
+    return parser.parse_args()
+
+
+def _configure(max_concurrency: int) -> None:
+    # Defaults for the services' configuration, any of which can be overridden with the usual environment variables.
+    # The services and the fakes share one HTTP client, so it must allow a request to Spine and a reply to the inbound
+    # service for each message in progress.
+    os.environ.setdefault('MHS_LOG_LEVEL', 'ERROR')
+    os.environ.setdefault('MHS_OUTBOUND_HTTP_MAX_CLIENTS', str(max_concurrency * 2 + 10))
+    try:
+        import pycurl  # noqa: F401
+        os.environ.setdefault('MHS_OUTBOUND_HTTP_CLIENT', common_https.HTTP_CLIENT_CURL)
+    except ImportError:
+        os.environ.setdefault('MHS_OUTBOUND_HTTP_CLIENT', common_https.HTTP_CLIENT_SIMPLE)
+    os.environ.setdefault('INTEGRATION_TEST_ASID', patterns.FROM_ASID)
+
+    config.setup_config('MHS')
+    log.configure_logging('benchmark')
+
+
+async def _run_scenarios(args, mhs: services.Services,
+                         scenario_patterns: List[patterns.MessagingPattern]) -> List[dict]:
+    scenarios = []
+    for pattern in scenario_patterns:
+        for message_size in args.message_sizes:
+            request_factory = patterns.RequestFactory(pattern, message_size)
+            for concurrency in args.concurrency:
+                load_generator = load.LoadGenerator(mhs.outbound_url, request_factory, concurrency,
+                                                    args.request_timeout)
+                try:
+                    await load_generator.run(args.warmup_requests)
+                    mhs.clear_stores()
+                    queued_before = mhs.inbound_queue.messages_sent
+                    result = await load_generator.run(args.requests)
+                finally:
+                    load_generator.close()
+
+                scenario = {
+                    'pattern': pattern.name,
+                    'interaction_id': pattern.interaction_id,
+                    'concurrency': concurrency,
+                    'message_size': message_size,
+                    'requests': args.requests,
+                    'errors': result.errors,
+                    'status_codes': {str(code): count for code, count in sorted(result.status_codes.items())},
+                    'duration_seconds': round(result.duration, 3),
+                    'throughput_per_second': round(len(result.latencies) / result.duration, 2),
+                    'latency_seconds': results.summarise_latencies(result.latencies),
+                    'inbound_messages_queued': mhs.inbound_queue.messages_sent - queued_before,
+                    'rss_bytes': results.get_rss_bytes(),
+                    'max_rss_bytes': results.get_max_rss_bytes()
+                }
+                scenarios.append(scenario)
+                print(f'{pattern.name} size={message_size} concurrency={concurrency}: '
+                      f'{scenario["throughput_per_second"]} requests/s, '
+                      f'p50={scenario["latency_seconds"]["p50"]}s p95={scenario["latency_seconds"]["p95"]}s '
+                      f'p99={scenario["latency_seconds"]["p99"]}s, {result.errors} errors')
+    return scenarios
+
+
+def main(args) -> int:
+    scenario_patterns = patterns.get_patterns([name.strip() for name in args.patterns.split(',') if name.strip()])
+    _configure(max(args.concurrency))
+
+    mhs = services.Services(scenario_patterns)
+    mhs.start()
+    started_at = timing.get_time()
+    try:
+        scenarios = tornado.ioloop.IOLoop.current().run_sync(lambda: _run_scenarios(args, mhs, scenario_patterns))
+    finally:
+        mhs.stop()
+
+    run_results = {
+        'label': args.label,
+        'started_at': started_at,
+        'python_version': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'http_client': config.get_config('OUTBOUND_HTTP_CLIENT'),
+        'warmup_requests': args.warmup_requests,
+        'scenarios': scenarios
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(run_results, output_file, indent=2)
+    print(f'Results written to {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = results.find_regressions(baseline, run_results, args.max_regression)
+        for regression in regressions:
+            print(f'Regression: {regression}')
+        if regressions:
+            return 1
+        print(f'No scenario regressed by more than {args.max_regression}% against {args.baseline}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(_parse_arguments()))
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from fake_spineroutelookup.reliability_response import ReliabilityResponse
+from fake_spineroutelookup.routing_response import RoutingResponse
+
+
+class RoutingReliabilityResponse(object):
+
+    def __init__(self, routing_response: RoutingResponse = None, reliability_response: ReliabilityResponse = None):
+        self.routing_response = routing_response or RoutingResponse()
+        self.reliability_response = reliability_response or ReliabilityResponse()
+
+    def get_response(self) -> dict:
+        return {**self.routing_response.get_response(), **self.reliability_response.get_response()}
@@ -11,6 +11,7 @@ from fake_spineroutelookup.request_matching import SpineRouteLookupRequestRespon
 from fake_spineroutelookup.request_matcher_wrappers import query_argument_contains_string
 from fake_spineroutelookup.routing_response import RoutingResponse
 from fake_spineroutelookup.reliability_response import ReliabilityResponse
+from fake_spineroutelookup.routing_reliability_response import RoutingReliabilityResponse
 
 
 root = logging.getLogger()
@@ -26,11 +27,14 @@ logger = logging.getLogger(__name__)
 
 
 def build_application(fake_routing_response_handler: SpineRouteLookupRequestResponseMapper,
-                      fake_reliability_response_handler: SpineRouteLookupRequestResponseMapper
+                      fake_reliability_response_handler: SpineRouteLookupRequestResponseMapper,
+                      fake_routing_reliability_response_handler: SpineRouteLookupRequestResponseMapper
                       ):
     return tornado.web.Application([
         (r"/routing", RoutingRequestHandler, dict(fake_response_handler=fake_routing_response_handler)),
-        (r"/reliability", RoutingRequestHandler, dict(fake_response_handler=fake_reliability_response_handler))
+        (r"/reliability", RoutingRequestHandler, dict(fake_response_handler=fake_reliability_response_handler)),
+        (r"/routing-reliability", RoutingRequestHandler,
+         dict(fake_response_handler=fake_routing_reliability_response_handler))
     ])
 
 
@@ -71,6 +75,23 @@ def build_reliability_configuration() -> SpineRouteLookupRequestResponseMapper:
     })
 
 
+def build_routing_reliability_configuration() -> SpineRouteLookupRequestResponseMapper:
+    return SpineRouteLookupRequestResponseMapper({
+        RequestMatcher(
+            'routing-reliability-REPC_IN150016UK05',
+            lambda x: query_argument_contains_string(x, "service-id", "REPC_IN150016UK05")):
+            RoutingReliabilityResponse(),
+        RequestMatcher(
+            'routing-reliability-COPC_IN000001UK01',
+            lambda x: query_argument_contains_string(x, "service-id", "COPC_IN000001UK01")):
+            RoutingReliabilityResponse(),
+        RequestMatcher(
+            'routing-reliability-PRSC_IN080000UK07',
+            lambda x: query_argument_contains_string(x, 'service-id', 'PRSC_IN080000UK07')):
+            RoutingReliabilityResponse()
+    })
+
+
 if __name__ == "__main__":
     parse_command_line()
 
@@ -78,7 +99,9 @@ if __name__ == "__main__":
 
     routing_configuration = build_routing_configuration()
     reliability_configuration = build_reliability_configuration()
-    application = build_application(routing_configuration, reliability_configuration)
+    routing_reliability_configuration = build_routing_reliability_configuration()
+    application = build_application(routing_configuration, reliability_configuration,
+                                    routing_reliability_configuration)
     server = tornado.httpserver.HTTPServer(application)
     spine_route_lookup_port = os.environ.get('SPINE_ROUTE_LOOKUP_PORT', default='80')
     logger.info('Fake spine route lookup starting on port %s', spine_route_lookup_port)
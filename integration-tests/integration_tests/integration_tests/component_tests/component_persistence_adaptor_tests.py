@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 import uuid
@@ -9,6 +11,7 @@ from utilities import test_utilities
 
 MONGODB_ENDPOINT_URL = 'mongodb://mongodb:27017'
 DYNAMODB_ENDPOINT_URL = 'http://dynamodb:8000'
+SQLITE_FILE_PATH = os.path.join(tempfile.gettempdir(), 'component-tests-state.db')
 TEST_TABLE_NAME = "mhs_state"
 SAMPLE_DATA = {
     "test-key1": "test-value1",
@@ -30,6 +33,8 @@ OTHER_DATA = {
 DB_KEY_FIELDS = {
     'dynamodb': 'key',
     'mongodb': '_id',
+    'sqlite': 'key',
+    'memory': 'key',
 }
 
 
@@ -140,7 +145,8 @@ class DbAdaptorsTests(unittest.TestCase):
     def get_adaptor(adaptor_type, max_retries=0, retry_delay=0):
         with patch('persistence.persistence_adaptor_factory.config') as factory_config,\
              patch('persistence.mongo_persistence_adaptor.config') as mongo_config,\
-             patch('persistence.dynamo_persistence_adaptor.config') as dynamo_config:
+             patch('persistence.dynamo_persistence_adaptor.config') as dynamo_config,\
+             patch('persistence.sqlite_persistence_adaptor.config') as sqlite_config:
 
             def get_dynamodb_config_side_effect(*args, **kwargs):
                 if len(args) == 0:
@@ -148,7 +154,8 @@ class DbAdaptorsTests(unittest.TestCase):
 
                 if args[0] == 'DB_ENDPOINT_URL':
                     return DYNAMODB_ENDPOINT_URL
-                elif args[0] == 'CLOUD_REGION':
+                elif len(args) > 1:
+                    # Any other config, such as CLOUD_REGION or the connection pool settings, takes its default
                     return args[1]
                 else:
                     raise RuntimeError()
@@ -156,5 +163,7 @@ class DbAdaptorsTests(unittest.TestCase):
             factory_config.get_config.return_value = adaptor_type
             mongo_config.get_config.return_value = MONGODB_ENDPOINT_URL
             dynamo_config.get_config.side_effect = get_dynamodb_config_side_effect
+            sqlite_config.get_config.side_effect = \
+                lambda key, default=None: SQLITE_FILE_PATH if key == 'DB_FILE_PATH' else default
 
             return get_persistence_adaptor(table_name=TEST_TABLE_NAME, max_retries=max_retries, retry_delay=retry_delay)
@@ -0,0 +1 @@
+"""Modules related to configuration management for the application."""
@@ -0,0 +1,94 @@
+from typing import Any, Dict
+
+import tornado.web
+import utilities.message_utilities as message_utilities
+import utilities.integration_adaptors_logger as log
+from comms.http_headers import HttpHeaders
+
+from mhs_common import workflow
+from mhs_common.configuration import configuration_manager
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+# The same as Tornado's own default limit on the size of a request body
+DEFAULT_MAX_REQUEST_SIZE = 100 * 1024 * 1024
+
+
+@tornado.web.stream_request_body
+class BaseHandler(tornado.web.RequestHandler):
+    """A base Tornado request handler with common functionality used by handlers in MHS outbound and MHS inbound.
+
+    Request bodies are streamed to the handler as they are received, rather than being buffered by Tornado, so that
+    oversized requests are rejected before they are read and subclasses can process bodies a chunk at a time. By
+    default the chunks are collected in `request_body`.
+    """
+
+    def initialize(self, workflows: Dict[str, workflow.CommonWorkflow],
+                   config_manager: configuration_manager.ConfigurationManager,
+                   max_request_size: int = DEFAULT_MAX_REQUEST_SIZE):
+        """Initialise this request handler with the provided dependencies.
+
+        :param workflows: The workflows to use to send messages.
+        :param config_manager: The object that can be used to obtain configuration details.
+        :param max_request_size: The maximum size, in bytes, of a request body this handler will accept.
+        """
+        self.workflows = workflows
+        self.config_manager = config_manager
+        self.max_request_size = max_request_size
+        self.request_body = bytearray()
+
+    def prepare(self):
+        content_length = self.request.headers.get(HttpHeaders.CONTENT_LENGTH)
+        if content_length is not None and content_length.isdigit() and int(content_length) > self.max_request_size:
+            logger.error('Request body too large. {ContentLength} {MaxRequestSize}',
+                         fparams={'ContentLength': content_length, 'MaxRequestSize': self.max_request_size})
+            raise tornado.web.HTTPError(413, 'Request body too large', reason='Request body too large')
+
+        # Bodies sent without a Content-Length are cut off by Tornado once this many bytes have been streamed
+        self.request.connection.set_max_body_size(self.max_request_size)
+
+    def data_received(self, chunk: bytes):
+        self._receive_chunk(chunk)
+
+    def _receive_chunk(self, chunk: bytes):
+        """Process the next chunk of the request body.
+
+        :param chunk: The chunk of the request body.
+        """
+        self.request_body += chunk
+
+    def write_error(self, status_code: int, **kwargs: Any):
+        reason = self._reason  # Don't inline this, as self.set_status changes self._reason
+        self.set_status(status_code)
+        self.set_header(HttpHeaders.CONTENT_TYPE, 'text/plain')
+        self.set_header(HttpHeaders.CORRELATION_ID, self._extract_correlation())
+        self.finish(f'{status_code}: {reason}')
+
+    def _extract_default_workflow(self, interaction_details, interaction_id):
+        try:
+            wf = self.workflows[interaction_details['workflow']]
+        except KeyError as e:
+            logger.error("Wasn't able to determine workflow for {InteractionId} . This likely is due to a "
+                         "misconfiguration in interactions.json",
+                         fparams={"InteractionId": interaction_id})
+            raise tornado.web.HTTPError(500,
+                                        f"Couldn't determine workflow to invoke for interaction ID: {interaction_id}",
+                                        reason=f"Couldn't determine workflow to invoke for interaction ID: "
+                                        f"{interaction_id}") from e
+        return wf
+
+    def _get_interaction_details(self, interaction_id):
+        interaction_details = self.config_manager.get_interaction_details(interaction_id)
+
+        if interaction_details is None:
+            logger.error('Unknown {InteractionId} in request', fparams={'InteractionId': interaction_id})
+            raise tornado.web.HTTPError(404, f'Unknown interaction ID: {interaction_id}',
+                                        reason=f'Unknown interaction ID: {interaction_id}')
+
+        return interaction_details
+
+    def _extract_correlation(self):
+        correlation_id = self.request.headers.get(HttpHeaders.CORRELATION_ID, None)
+        if correlation_id is None:
+            return message_utilities.get_uuid()
+        return correlation_id
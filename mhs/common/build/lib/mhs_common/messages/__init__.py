@@ -0,0 +1 @@
+"""Modules related to the building and parsing of messages."""
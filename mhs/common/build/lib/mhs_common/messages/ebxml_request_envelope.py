@@ -0,0 +1,298 @@
+"""This module defines the envelope used to wrap asynchronous request messages to be sent to a remote MHS."""
+
+from __future__ import annotations
+
+import codecs
+from typing import Dict, Tuple, Union, List, Sequence, Generator
+from xml.etree.ElementTree import Element
+
+from builder import pystache_message_builder
+from defusedxml import ElementTree
+
+from comms.http_body import HttpBody
+from comms.http_headers import HttpHeaders
+from utilities import integration_adaptors_logger as log, message_utilities
+
+from mhs_common.messages import ebxml_envelope, multipart_parser
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+EBXML_TEMPLATE = "ebxml_request"
+
+MESSAGE = "hl7_message"
+
+EBXML = "ebxml"
+
+DUPLICATE_ELIMINATION = "duplicate_elimination"
+ACK_REQUESTED = "ack_requested"
+ACK_SOAP_ACTOR = "ack_soap_actor"
+SYNC_REPLY = "sync_reply"
+
+ATTACHMENTS = 'attachments'
+EXTERNAL_ATTACHMENTS = 'external_attachments'
+ATTACHMENT_CONTENT_ID = 'content_id'
+ATTACHMENT_CONTENT_TYPE = 'content_type'
+ATTACHMENT_BASE64 = 'is_base64'
+ATTACHMENT_CONTENT_TRANSFER_ENCODING = 'content_transfer_encoding'
+ATTACHMENT_PAYLOAD = 'payload'
+ATTACHMENT_DESCRIPTION = 'description'
+EBXML_CONTENT_TYPE_VALUE = 'multipart/related; boundary="--=_MIME-Boundary"; type=text/xml; ' \
+                           'start=ebXMLHeader@spine.nhs.uk'
+
+
+class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
+    """An envelope that contains a request to be sent asynchronously to a remote MHS."""
+
+    def __init__(self, message_dictionary: Dict[str, Union[str, bool, List[Dict[str, Union[str, bool]]]]]):
+        """Create a new EbxmlRequestEnvelope that populates the message with the provided dictionary.
+
+        :param message_dictionary: The dictionary of values to use when populating the template.
+
+        Example `message_dictionary`::
+
+            {
+                'from_party_id': 'TESTGEN-201324',
+                'to_party_id': 'YEA-0000806',
+                'cpa_id': 'S1001A1630',
+                'conversation_id': '79F49A34-9798-404C-AEC4-FD38DD81C138',
+                'service': 'urn:nhs:names:services:pdsquery',
+                'action': 'QUPA_IN000006UK02',
+                'duplicate_elimination': True,
+                'ack_requested': True,
+                'ack_soap_actor': 'urn:oasis:names:tc:ebxml-msg:actor:toPartyMSH',
+                'sync_reply': True,
+                'hl7_message': '<QUPA_IN000006UK02 xmlns="urn:hl7-org:v3"></QUPA_IN000006UK02>',
+                'attachments': [ # Optional, defaults to empty list if not set
+                    {
+                        'content_type': 'text/plain',
+                        'payload': 'Some text here',
+                        'is_base64': False,
+                        'description': 'Attachment description'
+                    },
+                    {
+                        'content_type': 'image/png',
+                        'payload': 'base64-encoded content here',
+                        'is_base64': True,
+                        'description': 'Another attachment description'
+                    }
+                ],
+                'external_attachments': [ # Optional, defaults to empty list if not set
+                    {
+                        'document_id' : '6a7b4c68-8be8-46ba-8fbc-9b8313569380',
+                        'message_id': '4dd554f1-2827-4b98-adf3-7cefab763fff',
+                        'description': 'attachment description'
+                    }
+                ]
+            }
+        """
+        super().__init__(EBXML_TEMPLATE, message_dictionary)
+
+    def serialize(self, _message_dictionary=None,
+                  as_http_body: bool = False) -> Tuple[str, Dict[str, str], Union[str, HttpBody]]:
+        message_dictionary = dict(self.message_dictionary)
+
+        self._set_headers_for_attachments(message_dictionary)
+
+        message_id, http_headers, message = super().serialize(_message_dictionary=message_dictionary,
+                                                              as_http_body=as_http_body)
+
+        http_headers[HttpHeaders.CONTENT_TYPE] = EBXML_CONTENT_TYPE_VALUE
+        return message_id, http_headers, message
+
+    @staticmethod
+    def _set_headers_for_attachments(message_dictionary):
+        """
+        Generate a content ID for each attachment and set the content transfer encoding based on whether the
+        attachment is Base64-encoded or not.
+        :param message_dictionary: message dictionary that has the attachments
+        """
+        message_dictionary.setdefault(EXTERNAL_ATTACHMENTS, [])
+
+        # The attachments are updated below, so each is copied first. The copies share the (possibly large) payloads
+        attachments = [dict(attachment) for attachment in message_dictionary.get(ATTACHMENTS, [])]
+        message_dictionary[ATTACHMENTS] = attachments
+
+        attachment: dict
+        for attachment in attachments:
+            attachment[ATTACHMENT_CONTENT_ID] = f'{message_utilities.get_uuid()}@spine.nhs.uk'
+            try:
+                attachment[ATTACHMENT_CONTENT_TRANSFER_ENCODING] = 'base64' if attachment.pop(ATTACHMENT_BASE64) \
+                    else '8bit'
+            except KeyError as e:
+                logger.error('Failed to find {Key} when generating message from {TemplateFile} . {ErrorMessage}',
+                             fparams={
+                                 'Key': f'{ATTACHMENTS}[].{ATTACHMENT_BASE64}',
+                                 'TemplateFile': EBXML_TEMPLATE,
+                                 'ErrorMessage': e
+                             })
+                raise pystache_message_builder.MessageGenerationError(f'Failed to find '
+                                                                      f'key:{ATTACHMENTS}[].{ATTACHMENT_BASE64} when '
+                                                                      f'generating message from template '
+                                                                      f'file:{EBXML_TEMPLATE}') from e
+
+    @classmethod
+    def from_string(cls, headers: Dict[str, str], message: Union[str, bytes]) -> EbxmlRequestEnvelope:
+        """Parse the provided message string and create an instance of an EbxmlRequestEnvelope.
+
+        :param headers A dictionary of headers received with the message.
+        :param message: The message to be parsed. Passing the raw bytes of the message avoids decoding all of it,
+        when only some parts are text.
+        :return: An instance of an EbxmlAckEnvelope constructed from the message.
+        """
+        if isinstance(message, str):
+            message = message.encode()
+        message_parts = EbxmlRequestEnvelope._parse_mime_message(headers, message)
+        return cls._from_message_parts(message_parts)
+
+    @classmethod
+    def from_multipart_parser(cls, parser: multipart_parser.MultipartParser) -> EbxmlRequestEnvelope:
+        """Create an instance of an EbxmlRequestEnvelope from a message which has been fed, as it was received, into
+        the provided parser.
+
+        :param parser: The parser the whole of the message has been fed into.
+        :return: An instance of an EbxmlRequestEnvelope constructed from the message.
+        """
+        try:
+            message_parts = parser.close()
+        except multipart_parser.MultipartParsingError as e:
+            logger.error('Non-multipart message received')
+            raise ebxml_envelope.EbXmlParsingError("Non-multipart message received") from e
+        return cls._from_message_parts(message_parts)
+
+    @classmethod
+    def _from_message_parts(cls, message_parts: Sequence[multipart_parser.MimePart]) -> EbxmlRequestEnvelope:
+        ebxml_part, payload_part, attachments = EbxmlRequestEnvelope._extract_message_parts(message_parts)
+        xml_tree: Element = ElementTree.fromstring(ebxml_part)
+        extracted_values = super().parse_message(xml_tree)
+
+        cls._extract_more_values_from_xml_tree(xml_tree, extracted_values)
+
+        extracted_values[EBXML] = ebxml_part
+        extracted_values[ATTACHMENTS] = attachments
+
+        if payload_part:
+            extracted_values[MESSAGE] = payload_part
+
+        return EbxmlRequestEnvelope(extracted_values)
+
+    @classmethod
+    def _extract_more_values_from_xml_tree(cls, xml_tree: Element,
+                                           extracted_values: Dict[str, Union[str, bool]]):
+        """
+        Extract more values from XML tree (DuplicateElimination, SyncReply, AckRequested and SOAP actor). Some of the
+        values extracted are booleans (ie if the element is present or not).
+        :param xml_tree: XML tree to extract values from.
+        :param extracted_values: Values extracted so far. The additional extracted values will be added to this dict.
+        """
+        cls._add_flag(extracted_values, DUPLICATE_ELIMINATION,
+                      cls._extract_ebxml_value(xml_tree, "DuplicateElimination"))
+        cls._add_flag(extracted_values, SYNC_REPLY, cls._extract_ebxml_value(xml_tree, "SyncReply"))
+        cls._add_flag(extracted_values, ACK_REQUESTED, cls._extract_ebxml_value(xml_tree, "AckRequested"))
+        cls._extract_attribute(xml_tree, "AckRequested", ebxml_envelope.SOAP_NAMESPACE, "actor", extracted_values,
+                               ACK_SOAP_ACTOR)
+
+    @staticmethod
+    def _parse_mime_message(headers: Dict[str, str], message: bytes) -> List[multipart_parser.MimePart]:
+        """ Take the provided message (and set of HTTP headers received with it) and split it into its MIME parts.
+
+        :param headers: The HTTP headers received with the message.
+        :param message: The message (as bytes) to be parsed.
+        :return: The parts of the message received.
+        """
+        try:
+            return multipart_parser.parse_multipart_message(headers[HttpHeaders.CONTENT_TYPE], message)
+        except multipart_parser.MultipartParsingError as e:
+            logger.error('Non-multipart message received')
+            raise ebxml_envelope.EbXmlParsingError("Non-multipart message received") from e
+
+    @staticmethod
+    def _extract_message_parts(message_parts: Sequence[multipart_parser.MimePart]) \
+            -> Tuple[str, str, List[Dict[str, Union[str, bool]]]]:
+        """Extract the ebXML and payload parts of the message and return them as a tuple.
+
+        :param message_parts: The MIME parts of the message to extract parts from.
+        :return: A tuple containing the ebXML and payload (if present, otherwise None) parts of the message provided.
+        """
+        # EIS section 2.5.4 defines that the first MIME part must contain the ebML SOAP message and the message payload
+        # (if present) must be the first additional attachment.
+
+        EbxmlRequestEnvelope._report_any_defects_in_message_parts(message_parts)
+
+        # ebXML part is the first part of the message
+        ebxml_part = EbxmlRequestEnvelope._extract_ebxml_part(message_parts[0])
+
+        payload_part = None
+        attachments = []
+        if len(message_parts) > 1:
+            # HL7 payload part is the second part of the message
+            payload_part = EbxmlRequestEnvelope._extract_hl7_payload_part(message_parts[1])
+
+            # Any additional attachments are from the third part of the message onwards
+            attachments.extend(EbxmlRequestEnvelope._extract_additional_attachments_parts(message_parts[2:]))
+
+        return ebxml_part, payload_part, attachments
+
+    @staticmethod
+    def _report_any_defects_in_message_parts(message_parts: Sequence[multipart_parser.MimePart]):
+        for i, part in enumerate(message_parts):
+            if part.defects:
+                logger.warning('Found defects in {PartIndex} of MIME message during parsing. {Defects}',
+                               fparams={'PartIndex': i, 'Defects': part.defects})
+
+    @staticmethod
+    def _extract_ebxml_part(message_part: multipart_parser.MimePart) -> str:
+        ebxml_part, is_base64_ebxml_part = EbxmlRequestEnvelope._convert_message_part_to_str(message_part)
+        if is_base64_ebxml_part:
+            logger.error('Failed to decode ebXML header part of message as text')
+            raise ebxml_envelope.EbXmlParsingError("Failed to decode ebXML header part of message as text")
+        return ebxml_part
+
+    @staticmethod
+    def _extract_hl7_payload_part(message_part: multipart_parser.MimePart) -> str:
+        payload_part, is_base64_payload = EbxmlRequestEnvelope._convert_message_part_to_str(message_part)
+        if is_base64_payload:
+            logger.error('Failed to decode HL7 payload part of message as text')
+            raise ebxml_envelope.EbXmlParsingError("Failed to decode HL7 payload part of message as text")
+        return payload_part
+
+    @staticmethod
+    def _extract_additional_attachments_parts(message_parts: Sequence[multipart_parser.MimePart]) \
+            -> Generator[Dict[Union[str, bool]]]:
+        for attachment_message in message_parts:
+            payload, is_base64 = EbxmlRequestEnvelope._convert_message_part_to_str(attachment_message)
+            attachment = {
+                ATTACHMENT_PAYLOAD: payload,
+                ATTACHMENT_BASE64: is_base64,
+                # The [1:-1] is to remove angle brackets (<>) that surround the content ID
+                ATTACHMENT_CONTENT_ID: str(attachment_message['Content-Id'][1:-1]),
+                ATTACHMENT_CONTENT_TYPE: attachment_message.get_content_type()
+            }
+            yield attachment
+
+    @staticmethod
+    def _convert_message_part_to_str(message_part: multipart_parser.MimePart) -> Tuple[str, bool]:
+        content_type = message_part.get_content_type()
+        content_transfer_encoding = message_part['Content-Transfer-Encoding']
+        logger_dict = {'ContentType': content_type, 'ContentTransferEncoding': content_transfer_encoding}
+
+        if message_part.is_text():
+            content = message_part.get_text()
+            logger.info('Successfully decoded message part with {ContentType} {ContentTransferEncoding} as string',
+                        fparams=logger_dict)
+            return content, False
+        try:
+            if content_type == 'application/xml':
+                decoded_content = codecs.decode(message_part.get_bytes(), 'utf-8')
+                logger.info('Successfully decoded message part with {ContentType} {ContentTransferEncoding} '
+                            'as a string', fparams=logger_dict)
+                return decoded_content, False
+            encoded_content = message_part.get_base64()
+            logger.info('Successfully encoded binary message part with {ContentType} {ContentTransferEncoding} as '
+                        'a base64 string', fparams=logger_dict)
+            return encoded_content, True
+        except UnicodeDecodeError as e:
+            logger.error('Failed to decode ebXML message part with {ContentType} {ContentTransferEncoding}.',
+                         fparams=logger_dict)
+            raise ebxml_envelope.EbXmlParsingError(f'Failed to decode ebXML message part with '
+                                                   f'Content-Type: {content_type} and '
+                                                   f'Content-Transfer-Encoding: {content_transfer_encoding}') from e
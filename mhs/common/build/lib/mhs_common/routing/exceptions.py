@@ -0,0 +1,7 @@
+class SDSException(Exception):
+    """
+    A RoutingException is thrown when an issue arises with the LDAP response,
+    particularly when no response is returned from the LDAP query.
+    """
+
+    pass
@@ -0,0 +1,26 @@
+import abc
+import asyncio
+from typing import Dict
+
+
+class RouteLookupClient(abc.ABC):
+
+    @abc.abstractmethod
+    async def get_end_point(self, interaction_id: str, ods_code: str = None) -> Dict:
+        pass
+
+    @abc.abstractmethod
+    async def get_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        pass
+
+    async def get_routing_and_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        """Get both the endpoint and the reliability information for the MHS registered for the specified org code and
+        service ID, as a single dictionary containing the keys returned by :meth:`get_end_point` and
+        :meth:`get_reliability`.
+
+        Implementations should override this to fetch both in one round trip. By default the two lookups are made
+        concurrently.
+        """
+        endpoint_details, reliability_details = await asyncio.gather(self.get_end_point(interaction_id, ods_code),
+                                                                     self.get_reliability(interaction_id, ods_code))
+        return {**endpoint_details, **reliability_details}
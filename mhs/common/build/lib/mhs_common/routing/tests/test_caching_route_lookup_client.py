@@ -0,0 +1,145 @@
+import unittest
+from unittest import mock
+
+from utilities import test_utilities
+
+from mhs_common.routing import caching_route_lookup_client
+from mhs_common.routing.exceptions import SDSException
+
+SERVICE_ID = "SERVICE ID"
+OTHER_SERVICE_ID = "OTHER SERVICE ID"
+ORG_CODE = "ORG CODE"
+ENDPOINT_DETAILS = {"nhsMHSEndPoint": ["https://example.com"]}
+RELIABILITY_DETAILS = {"nhsMHSRetries": "2"}
+MAX_SIZE = 2
+EXPIRY_TIME = 60
+NEGATIVE_EXPIRY_TIME = 10
+
+
+class TestCachingRouteLookupClient(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.client = mock.MagicMock()
+        self.client.get_end_point.side_effect = lambda *args: test_utilities.awaitable(ENDPOINT_DETAILS)
+        self.client.get_reliability.side_effect = lambda *args: test_utilities.awaitable(RELIABILITY_DETAILS)
+        self.client.get_routing_and_reliability.side_effect = \
+            lambda *args: test_utilities.awaitable({**ENDPOINT_DETAILS, **RELIABILITY_DETAILS})
+        self.now = 0
+        self.routing = caching_route_lookup_client.CachingRouteLookupClient(self.client, MAX_SIZE, EXPIRY_TIME,
+                                                                            NEGATIVE_EXPIRY_TIME,
+                                                                            clock=lambda: self.now)
+
+    @test_utilities.async_test
+    async def test_repeated_lookup_is_served_from_cache(self):
+        for lookup, client_lookup, expected in [
+            (self.routing.get_end_point, self.client.get_end_point, ENDPOINT_DETAILS),
+            (self.routing.get_reliability, self.client.get_reliability, RELIABILITY_DETAILS),
+            (self.routing.get_routing_and_reliability, self.client.get_routing_and_reliability,
+             {**ENDPOINT_DETAILS, **RELIABILITY_DETAILS})
+        ]:
+            with self.subTest(lookup.__name__):
+                self.assertEqual(expected, await lookup(SERVICE_ID, ORG_CODE))
+                self.assertEqual(expected, await lookup(SERVICE_ID, ORG_CODE))
+
+                client_lookup.assert_called_once_with(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(3, self.routing.hits)
+        self.assertEqual(3, self.routing.misses)
+
+    @test_utilities.async_test
+    async def test_lookups_are_counted_in_metrics(self):
+        def count(result):
+            return caching_route_lookup_client.LOOKUPS.get(lookup_type='end_point', result=result)
+        hits_before, misses_before = count('hit'), count('miss')
+
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(hits_before + 2, count('hit'))
+        self.assertEqual(misses_before + 1, count('miss'))
+
+    @test_utilities.async_test
+    async def test_lookups_for_different_org_codes_are_cached_separately(self):
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        await self.routing.get_end_point(SERVICE_ID)
+
+        self.assertEqual([mock.call(SERVICE_ID, ORG_CODE), mock.call(SERVICE_ID, None)],
+                         self.client.get_end_point.call_args_list)
+
+    @test_utilities.async_test
+    async def test_expired_result_is_looked_up_again(self):
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        self.now = EXPIRY_TIME
+
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(2, self.client.get_end_point.call_count)
+
+    @test_utilities.async_test
+    async def test_least_recently_used_result_is_evicted(self):
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        await self.routing.get_reliability(SERVICE_ID, ORG_CODE)
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        await self.routing.get_end_point(OTHER_SERVICE_ID, ORG_CODE)
+        self.assertEqual(1, self.routing.evictions)
+
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        await self.routing.get_reliability(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(2, self.client.get_end_point.call_count)
+        self.assertEqual(2, self.client.get_reliability.call_count)
+
+    @test_utilities.async_test
+    async def test_not_found_result_is_cached(self):
+        self.client.get_end_point.side_effect = lambda *args: test_utilities.awaitable_exception(SDSException())
+
+        for _ in range(2):
+            with self.assertRaises(SDSException):
+                await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.client.get_end_point.assert_called_once()
+        self.assertEqual(1, self.routing.negative_hits)
+
+        self.now = NEGATIVE_EXPIRY_TIME
+        with self.assertRaises(SDSException):
+            await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+        self.assertEqual(2, self.client.get_end_point.call_count)
+
+    @test_utilities.async_test
+    async def test_other_errors_are_not_cached(self):
+        self.client.get_end_point.side_effect = lambda *args: test_utilities.awaitable_exception(IOError())
+
+        for _ in range(2):
+            with self.assertRaises(IOError):
+                await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(2, self.client.get_end_point.call_count)
+        self.assertEqual(0, self.routing.stats()['size'])
+
+    @test_utilities.async_test
+    async def test_negative_caching_can_be_disabled(self):
+        routing = caching_route_lookup_client.CachingRouteLookupClient(self.client, MAX_SIZE, EXPIRY_TIME, 0)
+        self.client.get_end_point.side_effect = lambda *args: test_utilities.awaitable_exception(SDSException())
+
+        for _ in range(2):
+            with self.assertRaises(SDSException):
+                await routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(2, self.client.get_end_point.call_count)
+
+    @test_utilities.async_test
+    async def test_invalidate(self):
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.routing.invalidate()
+        await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(2, self.client.get_end_point.call_count)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            caching_route_lookup_client.CachingRouteLookupClient(self.client, 0, EXPIRY_TIME, NEGATIVE_EXPIRY_TIME)
+        with self.assertRaises(ValueError):
+            caching_route_lookup_client.CachingRouteLookupClient(self.client, MAX_SIZE, -1, NEGATIVE_EXPIRY_TIME)
@@ -0,0 +1 @@
+"""Modules related to the persistence of state information."""
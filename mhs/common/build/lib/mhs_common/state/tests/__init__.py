@@ -0,0 +1 @@
+"""Modules for performing tests against state persistence functionality."""
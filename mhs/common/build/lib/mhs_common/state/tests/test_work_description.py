@@ -0,0 +1,332 @@
+import copy
+import unittest
+from unittest.mock import MagicMock, patch
+
+from mhs_common import workflow
+from mhs_common.state import work_description as wd
+from persistence import persistence_adaptor as pa
+from utilities import spans, test_utilities
+from utilities.test_utilities import async_test
+
+input_data = {
+    wd.MESSAGE_ID: 'aaa-aaa-aaa',
+    wd.CREATED_TIMESTAMP: '11:59',
+    wd.INBOUND_STATUS: None,
+    wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+    wd.WORKFLOW: workflow.SYNC,
+    wd.VERSION: 1
+}
+
+
+old_data = {
+    wd.MESSAGE_ID: 'aaa-aaa-aaa',
+    wd.CREATED_TIMESTAMP: '11:59',
+    wd.INBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+    wd.OUTBOUND_STATUS: None,
+    wd.WORKFLOW: workflow.SYNC,
+    wd.VERSION: 1
+}
+
+
+class TestWorkDescription(unittest.TestCase):
+
+    def test_constructor(self):
+        persistence = MagicMock()
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        self.assertEqual(work_description.message_id, input_data[wd.MESSAGE_ID])
+        self.assertEqual(work_description.workflow, input_data[wd.WORKFLOW])
+        self.assertEqual(work_description.inbound_status, input_data[wd.INBOUND_STATUS])
+        self.assertEqual(work_description.outbound_status, input_data[wd.OUTBOUND_STATUS])
+        self.assertEqual(work_description.created_timestamp, input_data[wd.CREATED_TIMESTAMP])
+
+    @async_test
+    async def test_publish_saves_new_data(self):
+        future = test_utilities.awaitable(old_data)
+
+        persistence = MagicMock()
+        persistence.add.return_value = future
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.publish()
+        persistence.add.assert_called_with(input_data[wd.MESSAGE_ID], input_data)
+
+    @async_test
+    async def test_set_outbound_status(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD},
+                                                        wd.VERSION, 1)
+
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        self.assertEqual(work_description.version, 2)
+        persistence.get.assert_not_called()
+
+    @async_test
+    async def test_set_inbound_status(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED},
+                                                        wd.VERSION, 1)
+
+        self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        self.assertEqual(work_description.version, 2)
+
+    @async_test
+    async def test_set_status_on_record_without_version(self):
+        unversioned_data = copy.deepcopy(input_data)
+        del unversioned_data[wd.VERSION]
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(1)
+        work_description = wd.WorkDescription(persistence, unversioned_data)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD},
+                                                        wd.VERSION, None)
+        self.assertEqual(work_description.version, 1)
+
+    @async_test
+    async def test_set_status_retries_after_other_field_changed_elsewhere(self):
+        remote_data = copy.deepcopy(input_data)
+        remote_data[wd.INBOUND_STATUS] = wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED
+        remote_data[wd.VERSION] = 2
+        persistence = MagicMock()
+        persistence.update_versioned.side_effect = [
+            test_utilities.awaitable_exception(pa.RecordVersionConflictError()),
+            test_utilities.awaitable(3)]
+        persistence.get.return_value = test_utilities.awaitable(remote_data)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        persistence.get.assert_called_once_with(input_data[wd.MESSAGE_ID], strongly_consistent_read=True)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD},
+                                                        wd.VERSION, 2)
+        self.assertEqual(work_description.version, 3)
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED)
+
+    @async_test
+    async def test_set_status_raises_error_when_same_field_changed_elsewhere(self):
+        remote_data = copy.deepcopy(input_data)
+        remote_data[wd.OUTBOUND_STATUS] = wd.MessageStatus.OUTBOUND_MESSAGE_NACKD
+        remote_data[wd.VERSION] = 2
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = \
+            test_utilities.awaitable_exception(pa.RecordVersionConflictError())
+        persistence.get.return_value = test_utilities.awaitable(remote_data)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        with self.assertRaises(wd.OutOfDateVersionError):
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        persistence.update_versioned.assert_called_once()
+
+    @async_test
+    async def test_set_status_raises_error_when_record_keeps_changing(self):
+        persistence = MagicMock()
+        persistence.update_versioned.side_effect = \
+            lambda *args: test_utilities.awaitable_exception(pa.RecordVersionConflictError())
+        persistence.get.side_effect = lambda *args, **kwargs: test_utilities.awaitable(copy.deepcopy(input_data))
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        with self.assertRaises(wd.OutOfDateVersionError):
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        self.assertEqual(1 + wd.MAX_VERSION_CONFLICT_RETRIES, persistence.update_versioned.call_count)
+
+    @async_test
+    async def test_set_status_raises_error_when_record_deleted(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = \
+            test_utilities.awaitable_exception(pa.RecordVersionConflictError())
+        persistence.get.return_value = test_utilities.awaitable(None)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        with self.assertRaises(wd.EmptyWorkDescriptionError):
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+    @async_test
+    async def test_deferred_status_is_held_locally(self):
+        persistence = MagicMock()
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        persistence.update_versioned.assert_not_called()
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+    @async_test
+    async def test_deferred_statuses_are_written_with_next_status(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data, deferred_statuses=frozenset({
+            wd.MessageStatus.OUTBOUND_MESSAGE_ACKD, wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED)
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
+
+        persistence.update_versioned.assert_called_once_with(input_data[wd.MESSAGE_ID], {
+            wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED,
+            wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED
+        }, wd.VERSION, 1)
+        self.assertEqual(work_description.outbound_status,
+                         wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
+
+    @async_test
+    async def test_flush_writes_deferred_statuses(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        await work_description.flush()
+        await work_description.flush()
+
+        persistence.update_versioned.assert_called_once_with(
+            input_data[wd.MESSAGE_ID], {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}, wd.VERSION, 1)
+
+    @async_test
+    async def test_writes_are_recorded_in_message_trace(self):
+        persistence = MagicMock()
+        persistence.add.return_value = test_utilities.awaitable(None)
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        with patch.object(spans, 'logger'), spans.message_trace() as trace:
+            await work_description.publish()
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+            await work_description.flush()
+
+        self.assertEqual(2, trace.counts[wd.WRITE_STAGE])
+
+    @async_test
+    async def test_failed_write_keeps_pending_statuses(self):
+        persistence = MagicMock()
+        persistence.update_versioned.side_effect = [test_utilities.awaitable_exception(OSError()),
+                                                    test_utilities.awaitable(2)]
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        with self.assertRaises(OSError):
+            await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        await work_description.flush()
+
+        expected_update = {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD,
+                           wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED}
+        self.assertEqual([((input_data[wd.MESSAGE_ID], expected_update, wd.VERSION, 1),)] * 2,
+                         persistence.update_versioned.call_args_list)
+
+    def test_null_persistence(self):
+        with self.assertRaises(ValueError):
+            wd.WorkDescription(None, {'None': 'None'})
+
+
+class TestWorkDescriptionFactory(unittest.TestCase):
+
+    @patch('mhs_common.state.work_description.WorkDescription')
+    @async_test
+    async def test_get_from_store(self, work_mock):
+        persistence = MagicMock()
+        persistence.get.return_value = test_utilities.awaitable(old_data)
+        await wd.get_work_description_from_store(persistence, 'aaa-aaa-aaa')
+
+        persistence.get.assert_called_with('aaa-aaa-aaa', strongly_consistent_read=True)
+        work_mock.assert_called_with(persistence, old_data)
+
+    @async_test
+    async def test_get_from_store_no_result_found(self):
+        persistence = MagicMock()
+        persistence.get.return_value = test_utilities.awaitable(None)
+
+        self.assertIsNone(await wd.get_work_description_from_store(persistence, 'aaa-aaa-aaa'))
+
+    @async_test
+    async def test_get_from_store_empty_store(self):
+        with self.assertRaises(ValueError):
+            await wd.get_work_description_from_store(None, 'aaa')
+
+    @async_test
+    async def test_get_from_store_empty_message_id(self):
+        with self.assertRaises(ValueError):
+            await wd.get_work_description_from_store(MagicMock(), None)
+
+    @patch('utilities.timing.get_time')
+    @patch('mhs_common.state.work_description.WorkDescription')
+    def test_create_work_description(self, work_mock, time_mock):
+        time_mock.return_value = '12'
+        persistence = MagicMock()
+        wd.create_new_work_description(persistence,
+                                       message_id='aaa-aaa',
+                                       outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                                       workflow=workflow.SYNC
+                                       )
+        work_mock.assert_called_with(
+            persistence,
+            wd.build_store_data(
+                'aaa-aaa',
+                '12',
+                workflow.SYNC,
+                outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED),
+            frozenset())
+
+    def test_create_wd_null_parameters(self):
+        persistence = MagicMock()
+        with self.subTest('Null key'):
+            with self.assertRaises(ValueError):
+                wd.create_new_work_description(
+                    persistence,
+                    message_id=None,
+                    outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                    workflow=workflow.SYNC
+                )
+        with self.subTest('Null persistence'):
+            with self.assertRaises(ValueError):
+                wd.create_new_work_description(
+                    None,
+                    message_id='aaa',
+                    outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                    workflow=workflow.SYNC
+                )
+        with self.subTest('Null workflow'):
+            with self.assertRaises(ValueError):
+                wd.create_new_work_description(
+                    persistence,
+                    message_id='aaa',
+                    outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                    workflow=None
+                )
+        with self.subTest('Null statuses'):
+            with self.assertRaises(ValueError):
+                wd.create_new_work_description(
+                    persistence,
+                    message_id='aaa',
+                    outbound_status=None,
+                    inbound_status=None,
+                    workflow=workflow.SYNC_ASYNC
+                )
+
+        with self.subTest('Single null status should not raise error'):
+            wd.create_new_work_description(
+                persistence,
+                message_id='aaa',
+                outbound_status=wd.MessageStatus.INBOUND_RESPONSE_FAILED,
+                inbound_status=None,
+                workflow=workflow.SYNC_ASYNC
+            )
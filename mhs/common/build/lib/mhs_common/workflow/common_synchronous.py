@@ -0,0 +1,8 @@
+"""This module defines the common base for all synchronous workflows."""
+
+import mhs_common.workflow.common as common
+
+
+class CommonSynchronousWorkflow(common.CommonWorkflow):
+    """Common functionality across all synchronous workflows."""
+    pass
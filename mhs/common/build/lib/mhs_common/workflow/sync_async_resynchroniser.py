@@ -0,0 +1,90 @@
+import asyncio
+from typing import Optional
+
+from utilities import integration_adaptors_logger as log
+
+from retry import retriable_action
+from persistence import persistence_adaptor
+from mhs_common.workflow import sync_async_notifier
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+
+class SyncAsyncResponseException(Exception):
+    pass
+
+
+class SyncAsyncResynchroniser(object):
+
+    def __init__(self, sync_async_store: persistence_adaptor.PersistenceAdaptor,
+                 max_retries: int,
+                 retry_interval: float,
+                 initial_delay: float,
+                 notifier: Optional[sync_async_notifier.SyncAsyncNotifier] = None
+                 ):
+        """
+        :param sync_async_store: The store where the sync-async messages are placed from the inbound service
+        :param max_retries: The total number of polling attempts to the sync async store while attempting to resynchronise
+        :param retry_interval: The time between polling requests to the sync-async store in seconds
+        :param initial_delay: The time to wait before making the first request to the sync async store in seconds
+        :param notifier: An optional channel on which the inbound service announces stored responses. When given, a
+        notification cuts short the current wait so the store is read straight away. Polling remains as a fallback.
+        """
+        self.max_retries = max_retries
+        self.retry_interval = retry_interval
+        self.sync_async_store = sync_async_store
+        self.initial_delay = initial_delay
+        self.notifier = notifier
+
+    async def pause_request(self, message_id: str) -> dict:
+        logger.info('Beginning async retrieval from sync-async store')
+
+        if self.notifier is not None:
+            return await self._wait_for_notification_or_poll(message_id)
+
+        await asyncio.sleep(self.initial_delay)
+
+        retry_result = await retriable_action.RetriableAction(lambda: self.sync_async_store.get(message_id),
+                                                              self.max_retries, self.retry_interval) \
+            .with_success_check(lambda i: i is not None) \
+            .with_retriable_exception_check(lambda e: e is None) \
+            .execute()
+
+        if not retry_result.is_successful:
+            logger.error('Resync retries exceeded. {max_retries}', fparams={'max_retries': self.max_retries})
+            raise SyncAsyncResponseException('Polling on the sync async store timed out')
+
+        return retry_result.result
+
+    async def _wait_for_notification_or_poll(self, message_id: str) -> dict:
+        # Subscribe before the first read, so a response stored in between is either seen by that read or notified
+        notification = self.notifier.subscribe(message_id)
+        try:
+            wait_time = self.initial_delay
+            for _ in range(1 + self.max_retries):
+                await self._wait_for_notification(notification, wait_time)
+                notification.clear()
+
+                try:
+                    result = await self.sync_async_store.get(message_id)
+                except Exception as e:
+                    logger.exception('Failed to read from sync-async store')
+                    raise SyncAsyncResponseException('Failed to read from the sync async store') from e
+
+                if result is not None:
+                    return result
+                wait_time = self.retry_interval
+        finally:
+            self.notifier.unsubscribe(message_id, notification)
+
+        logger.error('Resync retries exceeded. {max_retries}', fparams={'max_retries': self.max_retries})
+        raise SyncAsyncResponseException('Polling on the sync async store timed out')
+
+    @staticmethod
+    async def _wait_for_notification(notification: asyncio.Event, timeout: float) -> None:
+        if notification.is_set() or timeout <= 0:
+            return
+        try:
+            await asyncio.wait_for(notification.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
@@ -0,0 +1,128 @@
+import unittest
+from typing import Optional, Tuple
+from unittest import mock
+
+import mhs_common.state.work_description as wd
+from mhs_common.request import request_body_schema
+from mhs_common.workflow import common_asynchronous
+from mhs_common.workflow.common import MessageData
+from utilities import test_utilities
+from utilities.test_utilities import async_test
+
+SERVICE = 'service'
+ACTION = 'action'
+ODS_CODE = 'some-code'
+SERVICE_ID = SERVICE + ":" + ACTION
+INTERACTION_DETAILS = {
+    'service': SERVICE,
+    'action': ACTION
+}
+
+EXPECTED_RELIABILITY_DETAILS = {
+    "nhsMHSSyncReplyMode": "MSHSignalsOnly"
+}
+ENDPOINT_DETAILS = {
+    'nhsMHSEndPoint': ['https://example.com'],
+    'nhsMHSPartyKey': 'to-party-key',
+    'nhsMhsCPAId': 'cpa-id',
+    'uniqueIdentifier': ['123456']
+}
+EXPECTED_ENDPOINT_DETAILS = {
+    'service_id': SERVICE_ID,
+    'url': 'https://example.com',
+    'party_key': 'to-party-key',
+    'cpa_id': 'cpa-id',
+    'to_asid': '123456'
+}
+
+
+class DummyCommonAsynchronousWorkflow(common_asynchronous.CommonAsynchronousWorkflow):
+    async def handle_outbound_message(self, asid: str,  message_id: str, correlation_id: str, interaction_details: dict,
+                                      request_body: request_body_schema.RequestBody,
+                                      work_description_object: Optional[wd.WorkDescription]
+                                      ) -> Tuple[int, str]:
+        pass
+
+    async def handle_inbound_message(self,
+                                     message_id: str,
+                                     correlation_id: str,
+                                     work_description: wd.WorkDescription,
+                                     message_data: MessageData):
+        pass
+
+    async def set_successful_message_response(self, wdo: wd.WorkDescription):
+        pass
+
+    async def set_failure_message_response(self, wdo: wd.WorkDescription):
+        pass
+
+
+class TestCommonAsynchronousWorkflow(unittest.TestCase):
+    def setUp(self):
+        party_key = 'PARTY_KEY'
+        persistence_store = mock.MagicMock()
+        transmission = mock.MagicMock()
+        queue_adaptor = mock.MagicMock()
+        max_request_size = 5000
+        self.mock_routing_reliability = mock.MagicMock()
+
+        self.workflow = DummyCommonAsynchronousWorkflow(party_key,
+                                                        persistence_store,
+                                                        transmission,
+                                                        queue_adaptor,
+                                                        max_request_size,
+                                                        self.mock_routing_reliability)
+
+    @async_test
+    async def test_lookup_reliability_details(self):
+        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable(
+            EXPECTED_RELIABILITY_DETAILS)
+
+        reliability_details = await self.workflow._lookup_reliability_details(INTERACTION_DETAILS, ODS_CODE)
+
+        self.mock_routing_reliability.get_reliability.assert_called_with(SERVICE_ID, ODS_CODE)
+        self.assertEqual(reliability_details, EXPECTED_RELIABILITY_DETAILS)
+
+    @async_test
+    async def test_lookup_reliability_details_error(self):
+        self.mock_routing_reliability.get_reliability.side_effect = Exception()
+
+        with self.assertRaises(Exception):
+            await self.workflow._lookup_reliability_details(INTERACTION_DETAILS)
+
+    @async_test
+    async def test_lookup_endpoint_and_reliability_details_in_one_lookup(self):
+        self.mock_routing_reliability.get_routing_and_reliability.return_value = test_utilities.awaitable(
+            {**ENDPOINT_DETAILS, **EXPECTED_RELIABILITY_DETAILS})
+
+        endpoint_details, reliability_details = await self.workflow._lookup_endpoint_and_reliability_details(
+            {'ods-code': ODS_CODE, **INTERACTION_DETAILS}, ODS_CODE)
+
+        self.mock_routing_reliability.get_routing_and_reliability.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.mock_routing_reliability.get_end_point.assert_not_called()
+        self.mock_routing_reliability.get_reliability.assert_not_called()
+        self.assertEqual(EXPECTED_ENDPOINT_DETAILS, endpoint_details)
+        self.assertEqual(EXPECTED_RELIABILITY_DETAILS['nhsMHSSyncReplyMode'],
+                         reliability_details['nhsMHSSyncReplyMode'])
+
+    @async_test
+    async def test_lookup_endpoint_and_reliability_details_for_different_org_codes(self):
+        self.mock_routing_reliability.get_end_point.return_value = test_utilities.awaitable(ENDPOINT_DETAILS)
+        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable(
+            EXPECTED_RELIABILITY_DETAILS)
+
+        endpoint_details, reliability_details = await self.workflow._lookup_endpoint_and_reliability_details(
+            {'ods-code': ODS_CODE, **INTERACTION_DETAILS}, None)
+
+        self.mock_routing_reliability.get_end_point.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.mock_routing_reliability.get_reliability.assert_called_once_with(SERVICE_ID, None)
+        self.mock_routing_reliability.get_routing_and_reliability.assert_not_called()
+        self.assertEqual(EXPECTED_ENDPOINT_DETAILS, endpoint_details)
+        self.assertEqual(EXPECTED_RELIABILITY_DETAILS, reliability_details)
+
+    @async_test
+    async def test_lookup_endpoint_and_reliability_details_error(self):
+        self.mock_routing_reliability.get_routing_and_reliability.side_effect = Exception()
+
+        with self.assertRaises(Exception):
+            await self.workflow._lookup_endpoint_and_reliability_details(INTERACTION_DETAILS)
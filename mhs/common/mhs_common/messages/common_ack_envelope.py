@@ -3,7 +3,6 @@ response to an asynchronous request."""
 
 from __future__ import annotations
 
-import copy
 from abc import abstractmethod
 from typing import Dict, Tuple
 
@@ -25,7 +24,7 @@ class CommonEbxmlAckEnvelope(ebxml_envelope.EbxmlEnvelope):
         :param message_dictionary: The dictionary of values to use when populating the template.
         :param template_file: The mustache template for the ack
         """
-        message_dictionary = copy.deepcopy(message_dictionary)
+        message_dictionary = dict(message_dictionary)
         message_dictionary[ebxml_envelope.SERVICE] = 'urn:oasis:names:tc:ebxml-msg:service'
 
         super().__init__(template_file, message_dictionary)
@@ -1,9 +1,9 @@
 """This module defines the envelope used to wrap asynchronous messages to be sent to a remote MHS."""
-import copy
-from typing import Dict, Tuple, Any, Optional, NamedTuple
+from typing import Dict, Tuple, Any, Optional, NamedTuple, Union
 from xml.etree.ElementTree import Element
 
 import utilities.message_utilities as message_utilities
+from comms.http_body import HttpBody
 from utilities import integration_adaptors_logger as log
 
 from mhs_common.messages import envelope
@@ -60,16 +60,20 @@ class EbxmlEnvelope(envelope.Envelope):
     def __init__(self, template_file: str, message_dictionary: Dict[str, Any]):
         super().__init__(template_file, message_dictionary)
 
-    def serialize(self, _message_dictionary: Dict[str, Any] = None) -> Tuple[str, Dict[str, str], str]:
+    def serialize(self, _message_dictionary: Dict[str, Any] = None,
+                  as_http_body: bool = False) -> Tuple[str, Dict[str, str], Union[str, HttpBody]]:
         """Produce a serialised representation of this ebXML message by populating a Mustache template with this
         object's properties.
 
         :type _message_dictionary: An optional `message_dictionary` to use instead of the one supplied when this
         instance was constructed. For use by subclasses.
+        :param as_http_body: Whether to return the message as a HttpBody, which refers to the values it was built from
+        rather than copying them into a single string.
         :return: A tuple string containing the message ID, HTTP headers to be sent with the message and the message
         itself.
         """
-        ebxml_message_dictionary = copy.deepcopy(_message_dictionary or self.message_dictionary)
+        # Only top-level values are changed, so a shallow copy is enough and payloads are never copied
+        ebxml_message_dictionary = dict(_message_dictionary or self.message_dictionary)
 
         message_id = ebxml_message_dictionary.get(MESSAGE_ID)
         if not message_id:
@@ -80,7 +84,10 @@ class EbxmlEnvelope(envelope.Envelope):
         logger.info('Creating ebXML message with {MessageId} and {Timestamp}',
                     fparams={'MessageId': message_id, 'Timestamp': timestamp})
 
-        message = self.message_builder.build_message(ebxml_message_dictionary)
+        if as_http_body:
+            message = HttpBody(self.message_builder.build_message_parts(ebxml_message_dictionary))
+        else:
+            message = self.message_builder.build_message(ebxml_message_dictionary)
         http_headers = {
             'charset': 'UTF-8',
             'SOAPAction': f'{ebxml_message_dictionary[SERVICE]}/{ebxml_message_dictionary[ACTION]}'
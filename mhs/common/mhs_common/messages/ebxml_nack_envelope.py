@@ -3,7 +3,6 @@ response to an asynchronous request."""
 
 from __future__ import annotations
 
-import copy
 from typing import Dict
 
 from defusedxml import ElementTree
@@ -22,7 +21,7 @@ class EbxmlNackEnvelope(common_ack_envelope.CommonEbxmlAckEnvelope):
 
         :param message_dictionary: The dictionary of values to use when populating the template.
         """
-        message_dictionary = copy.deepcopy(message_dictionary)
+        message_dictionary = dict(message_dictionary)
         message_dictionary[ebxml_envelope.ACTION] = 'MessageError'
         super().__init__(EBXML_TEMPLATE, message_dictionary)
 
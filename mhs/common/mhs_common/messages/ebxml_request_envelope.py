@@ -2,21 +2,18 @@
 
 from __future__ import annotations
 
-import base64
-import copy
-import email
-import email.message
-import email.policy
+import codecs
 from typing import Dict, Tuple, Union, List, Sequence, Generator
 from xml.etree.ElementTree import Element
 
 from builder import pystache_message_builder
 from defusedxml import ElementTree
 
+from comms.http_body import HttpBody
 from comms.http_headers import HttpHeaders
 from utilities import integration_adaptors_logger as log, message_utilities
 
-from mhs_common.messages import ebxml_envelope
+from mhs_common.messages import ebxml_envelope, multipart_parser
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -90,12 +87,14 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
         """
         super().__init__(EBXML_TEMPLATE, message_dictionary)
 
-    def serialize(self, _message_dictionary=None) -> Tuple[str, Dict[str, str], str]:
-        message_dictionary = copy.deepcopy(self.message_dictionary)
+    def serialize(self, _message_dictionary=None,
+                  as_http_body: bool = False) -> Tuple[str, Dict[str, str], Union[str, HttpBody]]:
+        message_dictionary = dict(self.message_dictionary)
 
         self._set_headers_for_attachments(message_dictionary)
 
-        message_id, http_headers, message = super().serialize(_message_dictionary=message_dictionary)
+        message_id, http_headers, message = super().serialize(_message_dictionary=message_dictionary,
+                                                              as_http_body=as_http_body)
 
         http_headers[HttpHeaders.CONTENT_TYPE] = EBXML_CONTENT_TYPE_VALUE
         return message_id, http_headers, message
@@ -109,8 +108,12 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
         """
         message_dictionary.setdefault(EXTERNAL_ATTACHMENTS, [])
 
+        # The attachments are updated below, so each is copied first. The copies share the (possibly large) payloads
+        attachments = [dict(attachment) for attachment in message_dictionary.get(ATTACHMENTS, [])]
+        message_dictionary[ATTACHMENTS] = attachments
+
         attachment: dict
-        for attachment in message_dictionary.setdefault(ATTACHMENTS, []):
+        for attachment in attachments:
             attachment[ATTACHMENT_CONTENT_ID] = f'{message_utilities.get_uuid()}@spine.nhs.uk'
             try:
                 attachment[ATTACHMENT_CONTENT_TRANSFER_ENCODING] = 'base64' if attachment.pop(ATTACHMENT_BASE64) \
@@ -128,15 +131,37 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
                                                                       f'file:{EBXML_TEMPLATE}') from e
 
     @classmethod
-    def from_string(cls, headers: Dict[str, str], message: str) -> EbxmlRequestEnvelope:
+    def from_string(cls, headers: Dict[str, str], message: Union[str, bytes]) -> EbxmlRequestEnvelope:
         """Parse the provided message string and create an instance of an EbxmlRequestEnvelope.
 
         :param headers A dictionary of headers received with the message.
-        :param message: The message to be parsed.
+        :param message: The message to be parsed. Passing the raw bytes of the message avoids decoding all of it,
+        when only some parts are text.
         :return: An instance of an EbxmlAckEnvelope constructed from the message.
         """
-        msg = EbxmlRequestEnvelope._parse_mime_message(headers, message)
-        ebxml_part, payload_part, attachments = EbxmlRequestEnvelope._extract_message_parts(msg)
+        if isinstance(message, str):
+            message = message.encode()
+        message_parts = EbxmlRequestEnvelope._parse_mime_message(headers, message)
+        return cls._from_message_parts(message_parts)
+
+    @classmethod
+    def from_multipart_parser(cls, parser: multipart_parser.MultipartParser) -> EbxmlRequestEnvelope:
+        """Create an instance of an EbxmlRequestEnvelope from a message which has been fed, as it was received, into
+        the provided parser.
+
+        :param parser: The parser the whole of the message has been fed into.
+        :return: An instance of an EbxmlRequestEnvelope constructed from the message.
+        """
+        try:
+            message_parts = parser.close()
+        except multipart_parser.MultipartParsingError as e:
+            logger.error('Non-multipart message received')
+            raise ebxml_envelope.EbXmlParsingError("Non-multipart message received") from e
+        return cls._from_message_parts(message_parts)
+
+    @classmethod
+    def _from_message_parts(cls, message_parts: Sequence[multipart_parser.MimePart]) -> EbxmlRequestEnvelope:
+        ebxml_part, payload_part, attachments = EbxmlRequestEnvelope._extract_message_parts(message_parts)
         xml_tree: Element = ElementTree.fromstring(ebxml_part)
         extracted_values = super().parse_message(xml_tree)
 
@@ -167,40 +192,30 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
                                ACK_SOAP_ACTOR)
 
     @staticmethod
-    def _parse_mime_message(headers: Dict[str, str], message: str) -> email.message.EmailMessage:
-        """ Take the provided message string (and set of HTTP headers received with it) and parse it to obtain a Message
-        object.
+    def _parse_mime_message(headers: Dict[str, str], message: bytes) -> List[multipart_parser.MimePart]:
+        """ Take the provided message (and set of HTTP headers received with it) and split it into its MIME parts.
 
         :param headers: The HTTP headers received with the message.
-        :param message: The message (as a string) to be parsed.
-        :return: a Message that represents the message received.
+        :param message: The message (as bytes) to be parsed.
+        :return: The parts of the message received.
         """
-        content_type_header = f'{HttpHeaders.CONTENT_TYPE}: {headers[HttpHeaders.CONTENT_TYPE]}\r\n\r\n'
-
-        msg = email.message_from_string(content_type_header + message, policy=email.policy.HTTP)
-
-        if msg.defects:
-            logger.warning('Found defects in MIME message during parsing. {Defects}',
-                           fparams={'Defects': msg.defects})
-
-        return msg
+        try:
+            return multipart_parser.parse_multipart_message(headers[HttpHeaders.CONTENT_TYPE], message)
+        except multipart_parser.MultipartParsingError as e:
+            logger.error('Non-multipart message received')
+            raise ebxml_envelope.EbXmlParsingError("Non-multipart message received") from e
 
     @staticmethod
-    def _extract_message_parts(msg: email.message.EmailMessage) -> Tuple[str, str, List[Dict[str, Union[str, bool]]]]:
+    def _extract_message_parts(message_parts: Sequence[multipart_parser.MimePart]) \
+            -> Tuple[str, str, List[Dict[str, Union[str, bool]]]]:
         """Extract the ebXML and payload parts of the message and return them as a tuple.
 
-        :param msg: The message to extract parts from.
+        :param message_parts: The MIME parts of the message to extract parts from.
         :return: A tuple containing the ebXML and payload (if present, otherwise None) parts of the message provided.
         """
         # EIS section 2.5.4 defines that the first MIME part must contain the ebML SOAP message and the message payload
         # (if present) must be the first additional attachment.
 
-        if not msg.is_multipart():
-            logger.error('Non-multipart message received')
-            raise ebxml_envelope.EbXmlParsingError("Non-multipart message received")
-
-        message_parts: Sequence[email.message.EmailMessage] = tuple(msg.iter_parts())
-
         EbxmlRequestEnvelope._report_any_defects_in_message_parts(message_parts)
 
         # ebXML part is the first part of the message
@@ -218,14 +233,14 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
         return ebxml_part, payload_part, attachments
 
     @staticmethod
-    def _report_any_defects_in_message_parts(message_parts: Sequence[email.message.EmailMessage]):
+    def _report_any_defects_in_message_parts(message_parts: Sequence[multipart_parser.MimePart]):
         for i, part in enumerate(message_parts):
             if part.defects:
                 logger.warning('Found defects in {PartIndex} of MIME message during parsing. {Defects}',
                                fparams={'PartIndex': i, 'Defects': part.defects})
 
     @staticmethod
-    def _extract_ebxml_part(message_part: email.message.EmailMessage) -> str:
+    def _extract_ebxml_part(message_part: multipart_parser.MimePart) -> str:
         ebxml_part, is_base64_ebxml_part = EbxmlRequestEnvelope._convert_message_part_to_str(message_part)
         if is_base64_ebxml_part:
             logger.error('Failed to decode ebXML header part of message as text')
@@ -233,7 +248,7 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
         return ebxml_part
 
     @staticmethod
-    def _extract_hl7_payload_part(message_part: email.message.EmailMessage) -> str:
+    def _extract_hl7_payload_part(message_part: multipart_parser.MimePart) -> str:
         payload_part, is_base64_payload = EbxmlRequestEnvelope._convert_message_part_to_str(message_part)
         if is_base64_payload:
             logger.error('Failed to decode HL7 payload part of message as text')
@@ -241,7 +256,7 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
         return payload_part
 
     @staticmethod
-    def _extract_additional_attachments_parts(message_parts: Sequence[email.message.EmailMessage]) \
+    def _extract_additional_attachments_parts(message_parts: Sequence[multipart_parser.MimePart]) \
             -> Generator[Dict[Union[str, bool]]]:
         for attachment_message in message_parts:
             payload, is_base64 = EbxmlRequestEnvelope._convert_message_part_to_str(attachment_message)
@@ -255,26 +270,26 @@ class EbxmlRequestEnvelope(ebxml_envelope.EbxmlEnvelope):
             yield attachment
 
     @staticmethod
-    def _convert_message_part_to_str(message_part: email.message.EmailMessage) -> Tuple[str, bool]:
-        content: Union[str, bytes] = message_part.get_content()
+    def _convert_message_part_to_str(message_part: multipart_parser.MimePart) -> Tuple[str, bool]:
         content_type = message_part.get_content_type()
         content_transfer_encoding = message_part['Content-Transfer-Encoding']
         logger_dict = {'ContentType': content_type, 'ContentTransferEncoding': content_transfer_encoding}
 
-        if isinstance(content, str):
+        if message_part.is_text():
+            content = message_part.get_text()
             logger.info('Successfully decoded message part with {ContentType} {ContentTransferEncoding} as string',
                         fparams=logger_dict)
             return content, False
         try:
             if content_type == 'application/xml':
-                decoded_content = content.decode()
+                decoded_content = codecs.decode(message_part.get_bytes(), 'utf-8')
                 logger.info('Successfully decoded message part with {ContentType} {ContentTransferEncoding} '
                             'as a string', fparams=logger_dict)
                 return decoded_content, False
-            decoded_content = base64.b64encode(content).decode()
+            encoded_content = message_part.get_base64()
             logger.info('Successfully encoded binary message part with {ContentType} {ContentTransferEncoding} as '
                         'a base64 string', fparams=logger_dict)
-            return decoded_content, True
+            return encoded_content, True
         except UnicodeDecodeError as e:
             logger.error('Failed to decode ebXML message part with {ContentType} {ContentTransferEncoding}.',
                          fparams=logger_dict)
@@ -6,7 +6,7 @@ import abc
 import pathlib
 from typing import Dict, Tuple, Any
 
-from builder import pystache_message_builder
+from builder import compiled_message_builder
 
 from definitions import ROOT_DIR
 
@@ -35,7 +35,7 @@ class Envelope(abc.ABC):
         self.message_dictionary = message_dictionary
 
         ebxml_template_dir = str(pathlib.Path(ROOT_DIR) / TEMPLATES_DIR)
-        self.message_builder = pystache_message_builder.PystacheMessageBuilder(ebxml_template_dir, template_file)
+        self.message_builder = compiled_message_builder.get_message_builder(ebxml_template_dir, template_file)
 
     @abc.abstractmethod
     def serialize(self) -> Tuple[str, Dict[str, str], str]:
@@ -0,0 +1,287 @@
+"""This module defines a parser for multipart MIME messages, such as the multipart/related messages used for ebXML.
+
+Unlike the standard library's email parser, it works on the raw bytes of the message. Part boundaries are found with
+`bytes.find` and part bodies are returned as memoryviews of the original message, rather than being split into lines
+and copied. Parts are only decoded when, and if, their content is asked for.
+"""
+import base64
+import binascii
+import codecs
+import email.message
+import functools
+import quopri
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+DEFAULT_CONTENT_TYPE = 'text/plain'
+DEFAULT_CHARSET = 'ASCII'
+
+MISSING_HEADER_BODY_SEPARATOR_DEFECT = 'MissingHeaderBodySeparatorDefect'
+CLOSE_BOUNDARY_NOT_FOUND_DEFECT = 'CloseBoundaryNotFoundDefect'
+
+# The same pattern the standard library's email parser uses to recognise the start of a header line
+_HEADER_NAME = re.compile(rb'([\041-\071\073-\176]+):')
+_CANONICAL_BASE64 = re.compile(rb'(?:[A-Za-z0-9+/]{4})*(?:[A-Za-z0-9+/]{2}==|[A-Za-z0-9+/]{3}=)?')
+_BASE64_WHITESPACE = b' \t\r\n'
+
+
+class MultipartParsingError(Exception):
+    """Raised when a message is not a multipart MIME message."""
+    pass
+
+
+class MimePart(object):
+    """A single part of a multipart MIME message."""
+
+    def __init__(self, headers: Dict[str, str], body: memoryview, defects: List[str]):
+        """
+        :param headers: The part's headers. Names are lower case.
+        :param body: The part's body, still in its content transfer encoding.
+        :param defects: The names of any defects found when parsing the part.
+        """
+        self.headers = headers
+        self.body = body
+        self.defects = defects
+
+    def __getitem__(self, name: str) -> Optional[str]:
+        return self.headers.get(name.lower())
+
+    def get_content_type(self) -> str:
+        """The part's content type, in lower case, in the same way as `email.message.Message.get_content_type`."""
+        return _parse_content_type(self['Content-Type'])[0]
+
+    def get_param(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Get a parameter of the part's Content-Type header.
+
+        :param name: The name of the parameter, such as 'charset'.
+        :param default: The value to return if the parameter is not present.
+        :return: The parameter's value.
+        """
+        return _parse_content_type(self['Content-Type'])[1].get(name.lower(), default)
+
+    def is_text(self) -> bool:
+        return self.get_content_type().startswith('text/')
+
+    def get_text(self) -> str:
+        """Decode the part's body as text, using the charset given in its Content-Type header. Undecodable bytes are
+        replaced, as they are by `email.message.EmailMessage.get_content`.
+
+        :return: The part's body, as a string.
+        """
+        charset = self.get_param('charset', DEFAULT_CHARSET)
+        return codecs.decode(self.get_bytes(), charset, 'replace')
+
+    def get_bytes(self) -> Union[bytes, memoryview]:
+        """Remove any content transfer encoding from the part's body. Parts that are not base64 or quoted-printable
+        encoded are returned without being copied.
+
+        :return: The part's decoded body.
+        """
+        encoding = self._get_content_transfer_encoding()
+        if encoding == 'base64':
+            return binascii.a2b_base64(bytes(self.body).translate(None, _BASE64_WHITESPACE))
+        if encoding == 'quoted-printable':
+            return quopri.decodestring(bytes(self.body))
+        return self.body
+
+    def get_base64(self) -> str:
+        """Get the part's body as a base64 string with no line breaks. If the body is already base64 encoded, it is
+        passed through rather than being decoded and encoded again.
+
+        :return: The part's body, base64 encoded.
+        """
+        if self._get_content_transfer_encoding() == 'base64':
+            compact = bytes(self.body).translate(None, _BASE64_WHITESPACE)
+            if _CANONICAL_BASE64.fullmatch(compact):
+                return compact.decode('ascii')
+        return base64.b64encode(self.get_bytes()).decode('ascii')
+
+    def _get_content_transfer_encoding(self) -> str:
+        return (self['Content-Transfer-Encoding'] or '').strip().lower()
+
+
+class MultipartParser(object):
+    """Splits a multipart MIME message into its parts as it is received. Boundaries are searched for in each chunk as
+    it arrives, so that once the last chunk has been fed in the parts are ready. The chunks are held in a single
+    buffer, which the bodies of the parts are views of."""
+
+    def __init__(self, content_type: str):
+        """
+        :param content_type: The value of the message's Content-Type header, which gives the boundary between parts.
+        """
+        self._content_type = content_type
+        self._separator = _get_separator(content_type)
+        self.data = bytearray()
+        self._boundaries: List[Tuple[int, int, bool]] = []
+        self._scan_position = 0
+
+    def feed(self, chunk: bytes) -> None:
+        """Add the next chunk of the message.
+
+        :param chunk: The chunk of the message.
+        """
+        self.data += chunk
+        if self._separator is not None:
+            self._scan_position = _scan_boundaries(self.data, self._separator, self._scan_position, False,
+                                                   self._boundaries)
+
+    def close(self) -> List[MimePart]:
+        """Finish parsing the message, once all of it has been fed in. No more chunks may be added afterwards.
+
+        :return: The parts of the message.
+        :raises MultipartParsingError: if the message is not a multipart message, or none of its parts could be found.
+        """
+        if self._separator is None:
+            raise MultipartParsingError(f'Message with Content-Type {self._content_type} is not a multipart message')
+        _scan_boundaries(self.data, self._separator, self._scan_position, True, self._boundaries)
+        return _split_parts(self.data, self._boundaries)
+
+
+def parse_multipart_message(content_type: str, message: bytes) -> List[MimePart]:
+    """Split a multipart MIME message into its parts. The preamble and epilogue are ignored.
+
+    :param content_type: The value of the message's Content-Type header, which gives the boundary between parts.
+    :param message: The body of the message.
+    :return: The parts of the message.
+    :raises MultipartParsingError: if the message is not a multipart message, or none of its parts could be found.
+    """
+    separator = _get_separator(content_type)
+    if separator is None:
+        raise MultipartParsingError(f'Message with Content-Type {content_type} is not a multipart message')
+
+    boundaries = []
+    _scan_boundaries(message, separator, 0, True, boundaries)
+    return _split_parts(message, boundaries)
+
+
+def _get_separator(content_type: str) -> Optional[bytes]:
+    message_type, params = _parse_content_type(content_type)
+    boundary = params.get('boundary')
+    if not message_type.startswith('multipart/') or not boundary:
+        return None
+    return b'--' + boundary.encode('ascii')
+
+
+def _scan_boundaries(raw: Union[bytes, bytearray], separator: bytes, position: int, final: bool,
+                     boundaries: List[Tuple[int, int, bool]]) -> int:
+    """Find the boundaries in `raw` from `position` onwards, up to the close boundary, and add them to `boundaries`.
+
+    :param final: Whether `raw` holds the whole message. If not, only complete lines are searched, and the last line
+    is searched once the rest of it has been received.
+    :return: The position to resume the search from once more of the message has been received.
+    """
+    limit = len(raw) if final else raw.rfind(b'\n', max(position - 1, 0)) + 1
+    while not (boundaries and boundaries[-1][2]):
+        start, end, is_close = _find_boundary(raw, separator, position, limit)
+        if start is None:
+            return max(position, limit)
+        boundaries.append((start, end, is_close))
+        position = end
+    return position
+
+
+def _split_parts(raw: Union[bytes, bytearray], boundaries: List[Tuple[int, int, bool]]) -> List[MimePart]:
+    if not boundaries:
+        raise MultipartParsingError('Start boundary not found in multipart message')
+
+    part_ranges = [(part_start, next_boundary_start, [])
+                   for (_, part_start, _), (next_boundary_start, _, _) in zip(boundaries, boundaries[1:])]
+    _, last_boundary_end, last_is_close = boundaries[-1]
+    if not last_is_close:
+        part_ranges.append((last_boundary_end, len(raw), [CLOSE_BOUNDARY_NOT_FOUND_DEFECT]))
+
+    data = memoryview(raw)
+    parts = []
+    for part_start, boundary_start, defects in part_ranges:
+        part_end = _strip_line_ending(raw, boundary_start, part_start)
+        headers, body_start = _parse_headers(raw, part_start, part_end, defects)
+        parts.append(MimePart(headers, data[body_start:part_end], defects))
+    return parts
+
+
+def _find_boundary(raw: Union[bytes, bytearray], separator: bytes, start: int,
+                   limit: int) -> Tuple[Optional[int], Optional[int], bool]:
+    """Find the next boundary line at or after `start` and before `limit`.
+
+    :return: A tuple of the index the boundary line starts at, the index just after it (including its line ending)
+    and whether it is the close boundary. The indexes are None if there are no more boundaries.
+    """
+    position = start
+    while True:
+        if position == 0 and raw.startswith(separator, 0, limit):
+            index = 0
+        else:
+            index = raw.find(b'\n' + separator, max(position - 1, 0), limit)
+            if index == -1:
+                return None, None, False
+            index += 1
+
+        end = index + len(separator)
+        is_close = raw.startswith(b'--', end, limit)
+        if is_close:
+            end += 2
+        while end < limit and raw[end] in b' \t':
+            end += 1
+
+        if end == limit:
+            return index, end, is_close
+        if raw.startswith(b'\r\n', end, limit):
+            return index, end + 2, is_close
+        if raw[end] in b'\r\n':
+            return index, end + 1, is_close
+
+        # The separator is only the start of a longer line, so this is not a boundary
+        position = index + 1
+
+
+def _strip_line_ending(raw: Union[bytes, bytearray], boundary_start: int, part_start: int) -> int:
+    # The line ending before a boundary (or, if the close boundary is missing, the end of the message) belongs to the
+    # boundary rather than the part's body
+    end = boundary_start
+    if end > part_start and raw[end - 1] == ord('\n'):
+        end -= 1
+    if end > part_start and raw[end - 1] == ord('\r'):
+        end -= 1
+    return end
+
+
+def _parse_headers(raw: Union[bytes, bytearray], start: int, end: int, defects: List[str]) -> Tuple[Dict[str, str], int]:
+    """Parse the headers at the start of a part.
+
+    :return: The headers, and the index the part's body starts at.
+    """
+    headers = {}
+    last_name = None
+    position = start
+    while position < end:
+        line_end = raw.find(b'\n', position, end)
+        next_line = end if line_end == -1 else line_end + 1
+        line = raw[position:next_line].rstrip(b'\r\n')
+
+        if not line:
+            return headers, next_line
+        if line[:1] in (b' ', b'\t') and last_name is not None:
+            headers[last_name] += ' ' + line.strip().decode('latin-1')
+        else:
+            match = _HEADER_NAME.match(line)
+            if not match:
+                # As with the standard library's parser, a line that is not a header starts the body
+                defects.append(MISSING_HEADER_BODY_SEPARATOR_DEFECT)
+                return headers, position
+            last_name = match.group(1).decode('ascii').lower()
+            headers[last_name] = line[match.end():].strip().decode('latin-1')
+        position = next_line
+
+    return headers, end
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_content_type(value: Optional[str]) -> Tuple[str, Dict[str, str]]:
+    if value is None:
+        return DEFAULT_CONTENT_TYPE, {}
+
+    # Content-Type parameters have awkward quoting rules, so the standard library is used to parse them. Values are
+    # cached, since the same few content types are seen again and again.
+    header = email.message.Message()
+    header['Content-Type'] = value
+    return header.get_content_type(), dict(header.get_params()[1:])
@@ -1,11 +1,11 @@
 """This module defines the envelope used to wrap synchronous messages to be sent to a remote MHS."""
-import copy
 import json
 from pathlib import Path
 from typing import Dict, Tuple, Union
 
 import lxml.etree as ET
 
+from comms.http_body import HttpBody
 from comms.http_headers import HttpHeaders
 from utilities import integration_adaptors_logger as log, message_utilities
 
@@ -46,14 +46,16 @@ class SoapEnvelope(envelope.Envelope):
         """
         super().__init__(SOAP_TEMPLATE, message_dictionary)
 
-    def serialize(self) -> Tuple[str, Dict[str, str], str]:
+    def serialize(self, as_http_body: bool = False) -> Tuple[str, Dict[str, str], Union[str, HttpBody]]:
         """Produce a serialised representation of this SOAP message by populating a Mustache template with this
         object's properties.
 
+        :param as_http_body: Whether to return the message as a HttpBody, which refers to the values it was built from
+        rather than copying them into a single string.
         :return: A tuple string containing the message ID, HTTP headers to be sent with the message and the message
         itself.
         """
-        soap_message_dictionary = copy.deepcopy(self.message_dictionary)
+        soap_message_dictionary = dict(self.message_dictionary)
 
         message_id = soap_message_dictionary.get(MESSAGE_ID)
         if not message_id:
@@ -65,7 +67,10 @@ class SoapEnvelope(envelope.Envelope):
         logger.info('Creating SOAP message with {MessageId} and {Timestamp}',
                     fparams={'MessageId': message_id, 'Timestamp': timestamp})
 
-        message = self.message_builder.build_message(soap_message_dictionary)
+        if as_http_body:
+            message = HttpBody(self.message_builder.build_message_parts(soap_message_dictionary))
+        else:
+            message = self.message_builder.build_message(soap_message_dictionary)
         http_headers = {'charset': 'UTF-8',
                         'SOAPAction': soap_message_dictionary[ACTION],
                         HttpHeaders.CONTENT_TYPE: SOAP_CONTENT_TYPE_VALUE,
@@ -7,6 +7,7 @@ from utilities import message_utilities
 
 import mhs_common.messages.ebxml_envelope as ebxml_envelope
 import mhs_common.messages.ebxml_request_envelope as ebxml_request_envelope
+from mhs_common.messages import multipart_parser
 import mhs_common.messages.tests.test_ebxml_envelope as test_ebxml_envelope
 
 EXPECTED_EBXML = "ebxml_request.xml"
@@ -148,6 +149,34 @@ class TestEbxmlRequestEnvelope(test_ebxml_envelope.BaseTestEbxmlEnvelope):
         self.assertEqual(EXPECTED_HTTP_HEADERS, http_headers)
         self.assertEqual(normalized_expected_message, normalized_message)
 
+    @patch.object(message_utilities, "get_timestamp")
+    @patch.object(message_utilities, "get_uuid")
+    def test_serialize_as_http_body(self, mock_get_uuid, mock_get_timestamp):
+        mock_get_uuid.side_effect = ["8F1D7DE1-02AB-48D7-A797-A947B09F347F", test_ebxml_envelope.MOCK_UUID]
+        mock_get_timestamp.return_value = test_ebxml_envelope.MOCK_TIMESTAMP
+
+        payload = 'Some payload'
+        attachment = {
+            ebxml_request_envelope.ATTACHMENT_CONTENT_TYPE: 'text/plain',
+            ebxml_request_envelope.ATTACHMENT_BASE64: False,
+            ebxml_request_envelope.ATTACHMENT_DESCRIPTION: 'Some description',
+            ebxml_request_envelope.ATTACHMENT_PAYLOAD: payload
+        }
+        message_dictionary = get_test_message_dictionary()
+        message_dictionary[ebxml_request_envelope.ATTACHMENTS] = [attachment]
+        envelope = ebxml_request_envelope.EbxmlRequestEnvelope(message_dictionary)
+
+        message_id, http_headers, message = envelope.serialize(as_http_body=True)
+
+        normalized_expected_message = self._get_expected_file_string('ebxml_request_one_attachment.xml')
+        self.assertEqual(test_ebxml_envelope.MOCK_UUID, message_id)
+        self.assertEqual(EXPECTED_HTTP_HEADERS, http_headers)
+        self.assertEqual(normalized_expected_message, file_utilities.normalize_line_endings(str(message)))
+        self.assertEqual(len(str(message).encode()), len(message))
+        self.assertTrue(any(part is payload for part in message._parts))
+        self.assertEqual(False, attachment[ebxml_request_envelope.ATTACHMENT_BASE64])
+        self.assertNotIn(ebxml_request_envelope.ATTACHMENT_CONTENT_ID, attachment)
+
     @patch.object(message_utilities, "get_timestamp")
     @patch.object(message_utilities, "get_uuid")
     def test_serialize_message_id_not_generated(self, mock_get_uuid, mock_get_timestamp):
@@ -320,6 +349,41 @@ class TestEbxmlRequestEnvelope(test_ebxml_envelope.BaseTestEbxmlEnvelope):
 
             self.assertEqual(expected_values_with_payload, parsed_message.message_dictionary)
 
+    def test_from_string_parses_message_bytes(self):
+        message, ebxml = message_utilities.load_test_data(self.message_dir, 'ebxml_request_one_attachment')
+        payload = '<hl7:MCCI_IN010000UK13 xmlns:hl7="urn:hl7-org:v3">Café £5 €</hl7:MCCI_IN010000UK13>'
+        message = message.replace(EXPECTED_MESSAGE, payload)
+        attachments = [{
+            ebxml_request_envelope.ATTACHMENT_CONTENT_ID: '8F1D7DE1-02AB-48D7-A797-A947B09F347F@spine.nhs.uk',
+            ebxml_request_envelope.ATTACHMENT_CONTENT_TYPE: 'text/plain',
+            ebxml_request_envelope.ATTACHMENT_BASE64: False,
+            ebxml_request_envelope.ATTACHMENT_PAYLOAD: 'Some payload'
+        }]
+
+        parsed_message = ebxml_request_envelope.EbxmlRequestEnvelope.from_string(MULTIPART_MIME_HEADERS,
+                                                                                 message.encode())
+
+        self.assertEqual(expected_values(ebxml=ebxml, payload=payload, attachments=attachments),
+                         parsed_message.message_dictionary)
+
+    def test_from_multipart_parser_parses_message_fed_in_chunks(self):
+        message, ebxml = message_utilities.load_test_data(self.message_dir, 'ebxml_request')
+        parser = multipart_parser.MultipartParser(MULTIPART_MIME_HEADERS[CONTENT_TYPE_HEADER_NAME])
+        message_bytes = message.encode()
+        for start in range(0, len(message_bytes), 100):
+            parser.feed(message_bytes[start:start + 100])
+
+        parsed_message = ebxml_request_envelope.EbxmlRequestEnvelope.from_multipart_parser(parser)
+
+        self.assertEqual(expected_values(ebxml=ebxml, payload=EXPECTED_MESSAGE), parsed_message.message_dictionary)
+
+    def test_from_multipart_parser_errors_on_non_multipart_message(self):
+        parser = multipart_parser.MultipartParser('text/plain')
+        parser.feed(b'A message')
+
+        with self.assertRaises(ebxml_envelope.EbXmlParsingError):
+            ebxml_request_envelope.EbxmlRequestEnvelope.from_multipart_parser(parser)
+
     def test_from_string_errors_on_invalid_request(self):
         with self.subTest("A message that is not a multi-part MIME message"):
             with self.assertRaises(ebxml_envelope.EbXmlParsingError):
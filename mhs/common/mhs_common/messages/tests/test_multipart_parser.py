@@ -0,0 +1,179 @@
+import base64
+from unittest import TestCase
+
+from mhs_common.messages import multipart_parser
+
+CONTENT_TYPE = 'multipart/related; boundary="--=_MIME-Boundary"; type=text/xml'
+BOUNDARY = b'----=_MIME-Boundary'
+BINARY_CONTENT = bytes(range(256))
+
+
+def build_message(*parts: bytes, line_ending: bytes = b'\r\n', close: bool = True) -> bytes:
+    message = b'preamble' + line_ending
+    for part in parts:
+        message += BOUNDARY + line_ending + part + line_ending
+    if close:
+        message += BOUNDARY + b'--' + line_ending + b'epilogue'
+    return message
+
+
+class TestParseMultipartMessage(TestCase):
+
+    def test_parses_parts(self):
+        for line_ending in [b'\r\n', b'\n']:
+            with self.subTest(line_ending=line_ending):
+                message = build_message(
+                    b'Content-Id: <ebXMLHeader@spine.nhs.uk>' + line_ending +
+                    b'Content-Type: text/xml; charset=UTF-8' + line_ending + line_ending +
+                    b'<xml>' + line_ending + b'</xml>',
+                    b'Content-Type: image/png' + line_ending + b'Content-Transfer-Encoding: 8bit' + line_ending +
+                    line_ending + BINARY_CONTENT,
+                    line_ending=line_ending)
+
+                parts = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+                self.assertEqual(2, len(parts))
+                self.assertEqual('<ebXMLHeader@spine.nhs.uk>', parts[0]['Content-ID'])
+                self.assertEqual('text/xml', parts[0].get_content_type())
+                self.assertEqual('UTF-8', parts[0].get_param('charset'))
+                self.assertEqual('<xml>' + line_ending.decode() + '</xml>', parts[0].get_text())
+                self.assertEqual('image/png', parts[1].get_content_type())
+                self.assertEqual(BINARY_CONTENT, parts[1].get_bytes())
+                self.assertEqual([], parts[0].defects)
+
+    def test_part_bodies_are_not_copied(self):
+        message = build_message(b'Content-Type: image/png\r\n\r\n' + BINARY_CONTENT)
+
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        self.assertIsInstance(part.body, memoryview)
+        self.assertIs(message, part.body.obj)
+        self.assertIs(part.body, part.get_bytes())
+
+    def test_decodes_text_using_charset(self):
+        text = 'Café £5 €'
+        message = build_message(b'Content-Type: text/plain; charset="utf-8"\r\n\r\n' + text.encode())
+
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        self.assertEqual(text, part.get_text())
+
+    def test_headers_are_unfolded(self):
+        message = build_message(b'Content-Type: text/plain;\r\n charset=utf-8\r\n\r\nbody')
+
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        self.assertEqual('utf-8', part.get_param('charset'))
+
+    def test_missing_content_type_defaults_to_text_plain(self):
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, build_message(b'\r\nbody'))
+
+        self.assertEqual('text/plain', part.get_content_type())
+        self.assertEqual('body', part.get_text())
+
+    def test_base64_parts(self):
+        wrapped = base64.encodebytes(BINARY_CONTENT).replace(b'\n', b'\r\n').rstrip()
+        message = build_message(b'Content-Type: image/png\r\nContent-Transfer-Encoding: base64\r\n\r\n' + wrapped)
+
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        self.assertEqual(BINARY_CONTENT, part.get_bytes())
+        self.assertEqual(base64.b64encode(BINARY_CONTENT).decode(), part.get_base64())
+
+    def test_binary_parts_are_base64_encoded(self):
+        message = build_message(b'Content-Type: image/png\r\nContent-Transfer-Encoding: binary\r\n\r\n' + BINARY_CONTENT)
+
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        self.assertEqual(base64.b64encode(BINARY_CONTENT).decode(), part.get_base64())
+
+    def test_lines_starting_with_boundary_are_not_boundaries(self):
+        message = build_message(b'\r\n' + BOUNDARY + b'-not-a-boundary')
+
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        self.assertEqual(BOUNDARY.decode() + '-not-a-boundary', part.get_text())
+
+    def test_empty_part_body(self):
+        part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, build_message(b'Content-Type: text/xml\r\n'))
+
+        self.assertEqual('', part.get_text())
+
+    def test_records_defects(self):
+        with self.subTest('Missing blank line after headers'):
+            message = build_message(b'Content-Type: text/xml\r\nbody')
+
+            part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+            self.assertEqual([multipart_parser.MISSING_HEADER_BODY_SEPARATOR_DEFECT], part.defects)
+            self.assertEqual('body', part.get_text())
+
+        with self.subTest('Missing close boundary'):
+            message = build_message(b'Content-Type: text/xml\r\n\r\nbody', close=False)
+
+            part, = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+            self.assertEqual([multipart_parser.CLOSE_BOUNDARY_NOT_FOUND_DEFECT], part.defects)
+            self.assertEqual('body', part.get_text())
+
+    def test_errors_on_non_multipart_messages(self):
+        sub_tests = [
+            ('Not a multipart content type', 'text/plain', build_message(b'\r\nbody')),
+            ('No boundary', 'multipart/related', build_message(b'\r\nbody')),
+            ('Boundary not found in message', CONTENT_TYPE, b'A message')
+        ]
+        for sub_test_name, content_type, message in sub_tests:
+            with self.subTest(sub_test_name):
+                with self.assertRaises(multipart_parser.MultipartParsingError):
+                    multipart_parser.parse_multipart_message(content_type, message)
+
+
+class TestMultipartParser(TestCase):
+
+    def _parse_in_chunks(self, content_type: str, message: bytes, chunk_size: int):
+        parser = multipart_parser.MultipartParser(content_type)
+        for start in range(0, len(message), chunk_size):
+            parser.feed(message[start:start + chunk_size])
+        return parser.close()
+
+    def test_chunked_message_is_parsed_the_same_as_whole_message(self):
+        message = build_message(b'Content-Type: text/xml\r\n\r\n<xml/>',
+                                b'Content-Type: image/png\r\n\r\n' + BINARY_CONTENT,
+                                b'Content-Type: text/plain\r\n\r\n' + BOUNDARY + b'-not-a-boundary')
+        expected = multipart_parser.parse_multipart_message(CONTENT_TYPE, message)
+
+        # Every chunk size up to beyond the length of a boundary line, so that boundaries are split at every point
+        for chunk_size in range(1, len(BOUNDARY) + 8):
+            with self.subTest(chunk_size=chunk_size):
+                parts = self._parse_in_chunks(CONTENT_TYPE, message, chunk_size)
+
+                self.assertEqual([(part.headers, bytes(part.body), part.defects) for part in expected],
+                                 [(part.headers, bytes(part.body), part.defects) for part in parts])
+
+    def test_part_bodies_are_views_of_buffered_message(self):
+        message = build_message(b'Content-Type: image/png\r\n\r\n' + BINARY_CONTENT)
+        parser = multipart_parser.MultipartParser(CONTENT_TYPE)
+        parser.feed(message)
+
+        part, = parser.close()
+
+        self.assertEqual(message, parser.data)
+        self.assertIs(parser.data, part.body.obj)
+
+    def test_records_missing_close_boundary(self):
+        message = build_message(b'Content-Type: text/xml\r\n\r\nbody', close=False)
+
+        part, = self._parse_in_chunks(CONTENT_TYPE, message, 7)
+
+        self.assertEqual([multipart_parser.CLOSE_BOUNDARY_NOT_FOUND_DEFECT], part.defects)
+        self.assertEqual('body', part.get_text())
+
+    def test_errors_on_non_multipart_messages(self):
+        sub_tests = [
+            ('Not a multipart content type', 'text/plain', build_message(b'\r\nbody')),
+            ('Boundary not found in message', CONTENT_TYPE, b'A message')
+        ]
+        for sub_test_name, content_type, message in sub_tests:
+            with self.subTest(sub_test_name):
+                with self.assertRaises(multipart_parser.MultipartParsingError):
+                    self._parse_in_chunks(content_type, message, 4)
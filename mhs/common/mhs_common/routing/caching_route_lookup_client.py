@@ -0,0 +1,131 @@
+"""This module defines a route lookup client that caches the results of another route lookup client in process."""
+import collections
+import time
+from typing import Awaitable, Callable, Dict, Tuple, Type
+
+from mhs_common.routing.exceptions import SDSNotFoundException
+from mhs_common.routing.route_lookup_client import RouteLookupClient
+from utilities import integration_adaptors_logger as log, metrics
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+LOOKUPS = metrics.counter('routing_cache_lookups_total',
+                          'The number of routing and reliability lookups made through the in-process cache, by result '
+                          '(hit, negative_hit or miss)',
+                          ['lookup_type', 'result'])
+EVICTIONS = metrics.counter('routing_cache_evictions_total',
+                            'The number of results evicted from the in-process routing and reliability cache')
+
+_Key = Tuple[str, str, str]
+
+
+class _CacheEntry(object):
+
+    def __init__(self, expires_at: float, value: Dict = None, error: Exception = None):
+        self.expires_at = expires_at
+        self.value = value
+        self.error = error
+
+
+class CachingRouteLookupClient(RouteLookupClient):
+    """Wraps a :class:`RouteLookupClient`, holding its results in a bounded, in-process LRU cache for a fixed time.
+
+    Lookups that fail because the requested details do not exist (an :class:`SDSNotFoundException`, by default) are
+    cached too (for a separate, usually shorter, time), and re-raised to callers. Any other error, including an
+    unexpected response from SDS, is passed to the caller without being cached.
+
+    Values returned from the cache are the cached objects themselves and must be treated as read-only by callers.
+    """
+
+    def __init__(self, client: RouteLookupClient, max_size: int, expiry_time: float, negative_expiry_time: float,
+                 not_found_exceptions: Tuple[Type[Exception], ...] = (SDSNotFoundException,),
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        :param client: The route lookup client to cache the results of.
+        :param max_size: The maximum number of results to hold. The least recently used result is evicted once this is
+        exceeded.
+        :param expiry_time: The time (in seconds) a successful lookup result is cached for.
+        :param negative_expiry_time: The time (in seconds) a "not found" result is cached for. 0 disables negative
+        caching.
+        :param not_found_exceptions: The exception types raised by the client to signal that the details requested do
+        not exist.
+        :param clock: The monotonic clock used to expire results.
+        """
+        if max_size < 1:
+            raise ValueError('Max size must be at least 1')
+        if expiry_time < 0 or negative_expiry_time < 0:
+            raise ValueError('Expiry times must not be negative')
+
+        self.client = client
+        self.max_size = max_size
+        self.expiry_time = expiry_time
+        self.negative_expiry_time = negative_expiry_time
+        self.not_found_exceptions = not_found_exceptions
+        self._clock = clock
+        self._entries: 'collections.OrderedDict[_Key, _CacheEntry]' = collections.OrderedDict()
+
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get_end_point(self, interaction_id: str, ods_code: str = None) -> Dict:
+        return await self._get_cached('end_point', self.client.get_end_point, interaction_id, ods_code)
+
+    async def get_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        return await self._get_cached('reliability', self.client.get_reliability, interaction_id, ods_code)
+
+    async def get_routing_and_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        return await self._get_cached('routing_and_reliability', self.client.get_routing_and_reliability,
+                                      interaction_id, ods_code)
+
+    def invalidate(self) -> None:
+        """Drop all cached results."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: The counters for this cache: hits, negative hits, misses, evictions and current size.
+        """
+        return {'hits': self.hits, 'negative_hits': self.negative_hits, 'misses': self.misses,
+                'evictions': self.evictions, 'size': len(self._entries)}
+
+    async def _get_cached(self, lookup_type: str, lookup: Callable[[str, str], Awaitable[Dict]],
+                          interaction_id: str, ods_code: str) -> Dict:
+        key = (lookup_type, interaction_id, ods_code)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if self._clock() < entry.expires_at:
+                self._entries.move_to_end(key)
+                if entry.error is not None:
+                    self.negative_hits += 1
+                    LOOKUPS.inc(lookup_type=lookup_type, result='negative_hit')
+                    # Drop the traceback of the previous raise so it doesn't grow with every hit
+                    raise entry.error.with_traceback(None)
+                self.hits += 1
+                LOOKUPS.inc(lookup_type=lookup_type, result='hit')
+                return entry.value
+            del self._entries[key]
+
+        self.misses += 1
+        LOOKUPS.inc(lookup_type=lookup_type, result='miss')
+        try:
+            value = await lookup(interaction_id, ods_code)
+        except self.not_found_exceptions as e:
+            if self.negative_expiry_time > 0:
+                logger.info('Caching not found {lookup_type} result for {interaction_id} & {ods_code}',
+                            fparams={'lookup_type': lookup_type, 'interaction_id': interaction_id,
+                                     'ods_code': ods_code})
+                self._store(key, _CacheEntry(self._clock() + self.negative_expiry_time, error=e))
+            raise
+
+        self._store(key, _CacheEntry(self._clock() + self.expiry_time, value=value))
+        return value
+
+    def _store(self, key: _Key, entry: _CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            EVICTIONS.inc()
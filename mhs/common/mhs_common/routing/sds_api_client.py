@@ -4,7 +4,7 @@ from typing import Dict
 
 from comms import common_https
 from comms.http_headers import HttpHeaders
-from mhs_common.routing.exceptions import SDSException
+from mhs_common.routing.exceptions import SDSException, SDSNotFoundException
 from mhs_common.routing.route_lookup_client import RouteLookupClient
 from utilities.mdc import build_tracking_headers
 from utilities import integration_adaptors_logger as log, timing
@@ -22,8 +22,20 @@ class SdsApiClient(RouteLookupClient):
     @timing.time_function
     async def get_end_point(self, interaction_id: str, ods_code: str = None) -> Dict:
         endpoint_resource = await self._get_endpoint_resource(interaction_id, ods_code)
+        return self._build_end_point(endpoint_resource)
 
-        result = {
+    @timing.time_function
+    async def get_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        endpoint_resource = await self._get_endpoint_resource(interaction_id, ods_code)
+        return self._build_reliability(endpoint_resource)
+
+    @timing.time_function
+    async def get_routing_and_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        endpoint_resource = await self._get_endpoint_resource(interaction_id, ods_code)
+        return {**self._build_end_point(endpoint_resource), **self._build_reliability(endpoint_resource)}
+
+    def _build_end_point(self, endpoint_resource: Dict) -> Dict:
+        return {
             "nhsMhsFQDN": self._get_identifier_value(endpoint_resource, "https://fhir.nhs.uk/Id/nhsMhsFQDN"),
             "nhsMHSEndPoint": [
                 endpoint_resource['address']
@@ -34,13 +46,9 @@ class SdsApiClient(RouteLookupClient):
                 self._get_identifier_value(endpoint_resource, "https://fhir.nhs.uk/Id/nhsMHSId")
             ]
         }
-        return result
 
-    @timing.time_function
-    async def get_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
-        endpoint_resource = await self._get_endpoint_resource(interaction_id, ods_code)
-
-        result = {
+    def _build_reliability(self, endpoint_resource: Dict) -> Dict:
+        return {
             "nhsMHSSyncReplyMode": self._get_extension(endpoint_resource, 'nhsMHSSyncReplyMode', 'valueString'),
             "nhsMHSRetryInterval": self._get_extension(endpoint_resource, 'nhsMHSRetryInterval', 'valueString'),
             "nhsMHSRetries": self._get_extension(endpoint_resource, 'nhsMHSRetries', 'valueInteger'),
@@ -48,7 +56,6 @@ class SdsApiClient(RouteLookupClient):
             "nhsMHSDuplicateElimination": self._get_extension(endpoint_resource, 'nhsMHSDuplicateElimination', 'valueString'),
             "nhsMHSAckRequested": self._get_extension(endpoint_resource, 'nhsMHSAckRequested', 'valueString')
         }
-        return result
 
     def _build_headers(self):
         tracking_headers = build_tracking_headers()
@@ -118,10 +125,14 @@ class SdsApiClient(RouteLookupClient):
         
         http_response = await common_https.CommonHttps.make_request(url=device_url, method="GET", headers=self._build_headers(), body=None)
         device_result = json.loads(http_response.body.decode())
+
+        if 'resourceType' not in device_result or device_result['resourceType'] != 'Bundle':
+            raise SDSException('Unexpected SDS API response: ', str(http_response))
+
         resources = list(map(lambda kv: kv['resource'], device_result['entry'])) if 'entry' in device_result else []
 
         if len(resources) == 0:
-            raise SDSException('Empty response for /Device')
+            raise SDSNotFoundException('Empty response for /Device')
         if len(resources) > 1:
             logger.warning("More than one resource returned for /Device call:: {ods_code} & "
                            "{interaction_id}", fparams={"ods_code": ods_code, "interaction_id": interaction_id})
@@ -140,7 +151,7 @@ class SdsApiClient(RouteLookupClient):
         resources = list(map(lambda kv: kv['resource'], sds_api_result['entry'])) if 'entry' in sds_api_result else []
 
         if len(resources) == 0:
-            raise SDSException('Empty response from accredited system lookup')
+            raise SDSNotFoundException('Empty response from accredited system lookup')
         if len(resources) > 1:
             logger.warning("More than one accredited system details returned on inputs: {interaction_id} & "
                            "{party_key}", fparams={"interaction_id": interaction_id, "party_key": party_key})
@@ -1,13 +1,17 @@
 import json
 from typing import Dict
 
+from tornado import httpclient
+
 from comms import common_https
+from mhs_common.routing.exceptions import SDSNotFoundException
 from mhs_common.routing.route_lookup_client import RouteLookupClient
 from utilities.mdc import build_tracking_headers
 from utilities import integration_adaptors_logger as log, timing
 
 ROUTING_PATH = "routing"
 RELIABILITY_PATH = "reliability"
+ROUTING_RELIABILITY_PATH = "routing-reliability"
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -64,16 +68,7 @@ class SpineRouteLookupClient(RouteLookupClient):
             logger.info("Proxy setup: {proxy_host} & {proxy_port}.",
                         fparams={"proxy_host": self._proxy_host, "proxy_port": self._proxy_port})
 
-            http_response = await common_https.CommonHttps.make_request(url=url, method="GET",
-                                                                        headers=build_tracking_headers(),
-                                                                        body=None,
-                                                                        validate_cert=self.validate_cert,
-                                                                        client_cert=self._client_cert,
-                                                                        client_key=self._client_key,
-                                                                        ca_certs=self._ca_certs,
-                                                                        http_proxy_host=self._proxy_host,
-                                                                        http_proxy_port=self._proxy_port)
-            endpoint_details = json.loads(http_response.body)
+            endpoint_details = await self._request_details(url)
 
             logger.info("Received endpoint details from Spine route lookup service for {org_code} & "
                         "{service_id}. {endpoint_details}",
@@ -105,16 +100,7 @@ class SpineRouteLookupClient(RouteLookupClient):
             logger.info("Requesting reliability details from Spine route lookup service for {org_code} & "
                         "{service_id}.",
                         fparams={"org_code": ods_code, "service_id": interaction_id})
-            http_response = await common_https.CommonHttps.make_request(url=url, method="GET",
-                                                                        headers=build_tracking_headers(),
-                                                                        body=None,
-                                                                        validate_cert=self.validate_cert,
-                                                                        client_cert=self._client_cert,
-                                                                        client_key=self._client_key,
-                                                                        ca_certs=self._ca_certs,
-                                                                        http_proxy_host=self._proxy_host,
-                                                                        http_proxy_port=self._proxy_port)
-            reliability_details = json.loads(http_response.body)
+            reliability_details = await self._request_details(url)
 
             logger.info("Received reliability details from Spine route lookup service for {org_code} & "
                         "{service_id}. {reliability_details}",
@@ -130,5 +116,66 @@ class SpineRouteLookupClient(RouteLookupClient):
                              fparams={"org_code": ods_code, "service_id": interaction_id}, exc_info=True)
             raise
 
+    @timing.time_function
+    async def get_routing_and_reliability(self, interaction_id: str, ods_code: str = None) -> Dict:
+        """Get the endpoint and reliability information for the MHS registered for the specified org code and service
+        ID in a single request.
+
+        :param interaction_id: The ID of the service to get MHS details for.
+        :param ods_code: The org code of the MHS to get details for. If not provided, the org code configured for Spine
+        is used.
+        :return: A dictionary containing both the end point and the reliability information.
+        """
+        if ods_code is None:
+            ods_code = self.spine_org_code
+            logger.info("No org code provided when obtaining routing and reliability details. Using {spine_org_code}",
+                        fparams={"spine_org_code": ods_code})
+
+        url = self._build_request_url(ROUTING_RELIABILITY_PATH, ods_code, interaction_id)
+
+        try:
+            logger.info("Requesting routing and reliability details from Spine route lookup service for {org_code} & "
+                        "{service_id}.",
+                        fparams={"org_code": ods_code, "service_id": interaction_id})
+            routing_reliability_details = await self._request_details(url)
+
+            logger.info("Received routing and reliability details from Spine route lookup service for {org_code} & "
+                        "{service_id}. {routing_reliability_details}",
+                        fparams={
+                            "org_code": ods_code,
+                            "service_id": interaction_id,
+                            "routing_reliability_details": routing_reliability_details
+                        })
+            return routing_reliability_details
+        except Exception:
+            logger.exception("Couldn't obtain routing and reliability details from Spine route lookup service for "
+                             "{org_code} & {service_id}.",
+                             fparams={"org_code": ods_code, "service_id": interaction_id})
+            raise
+
+    async def _request_details(self, url: str) -> Dict:
+        """Request details from the Spine route lookup service.
+
+        :param url: The URL to request the details from.
+        :return: The details returned.
+        :raises SDSNotFoundException: if the service responds with a 404, as SDS holds no details for the org code and
+        service ID requested.
+        """
+        try:
+            http_response = await common_https.CommonHttps.make_request(url=url, method="GET",
+                                                                        headers=build_tracking_headers(),
+                                                                        body=None,
+                                                                        validate_cert=self.validate_cert,
+                                                                        client_cert=self._client_cert,
+                                                                        client_key=self._client_key,
+                                                                        ca_certs=self._ca_certs,
+                                                                        http_proxy_host=self._proxy_host,
+                                                                        http_proxy_port=self._proxy_port)
+        except httpclient.HTTPClientError as e:
+            if e.code == 404:
+                raise SDSNotFoundException(f'No MHS details found for {url}') from e
+            raise
+        return json.loads(http_response.body)
+
     def _build_request_url(self, path: str, org_code: str, service_id: str) -> str:
         return self.url + "/" + path + "?org-code=" + org_code + "&service-id=" + service_id
@@ -8,7 +8,7 @@ from unittest.mock import call
 
 from tornado import httpclient
 
-from mhs_common.routing.exceptions import SDSException
+from mhs_common.routing.exceptions import SDSException, SDSNotFoundException
 from utilities import test_utilities, mdc
 
 from mhs_common.routing import sds_api_client
@@ -115,7 +115,7 @@ class TestSdsApiClient(unittest.TestCase):
 
         for function_to_test in [self.routing.get_end_point, self.routing.get_reliability]:
             with self.subTest(function_to_test.__name__):
-                with self.assertRaises(SDSException):
+                with self.assertRaises(SDSNotFoundException):
                     await function_to_test(SERVICE_ID, ORG_CODE)
 
     @test_utilities.async_test
@@ -125,8 +125,23 @@ class TestSdsApiClient(unittest.TestCase):
 
         for function_to_test in [self.routing.get_end_point, self.routing.get_reliability]:
             with self.subTest(function_to_test.__name__):
-                with self.assertRaises(SDSException):
+                with self.assertRaises(SDSException) as context:
                     await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+                # An unexpected response is an error, not a sign that the details do not exist
+                self.assertNotIsInstance(context.exception, SDSNotFoundException)
+
+    @test_utilities.async_test
+    async def test_should_retrieve_combined_routing_and_reliability_details_with_one_device_and_endpoint_request(self):
+        self.routing = sds_api_client.SdsApiClient(BASE_URL, API_KEY, SPINE_ORG_CODE)
+        self._given_http_client_returns_a_json_response(SDS_DEVICE_JSON_RESPONSE, SDS_ENDPOINT_JSON_RESPONSE)
+
+        routing_reliability_details = await self.routing.get_routing_and_reliability(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual({**EXPECTED_ROUTING, **EXPECTED_RELIABILITY}, routing_reliability_details)
+        expected_device_url = self._build_url(path=DEVICE_PATH, org_code=ORG_CODE, interaction_id=SERVICE_ID)
+        expected_endpoint_url = self._build_url(path=ENDPOINT_PATH, interaction_id=SERVICE_ID, party_key=PARTY_KEY)
+        self._assert_http_client_called_with_expected_args([expected_device_url, expected_endpoint_url])
+        self.assertEqual(2, self.mock_http_client.fetch.call_count)
 
     def _given_http_client_returns_a_json_response(self, device_response, endpoint_response):
         mock_device_response = mock.Mock()
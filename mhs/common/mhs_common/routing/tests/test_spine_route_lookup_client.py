@@ -5,10 +5,12 @@ from tornado import httpclient
 from utilities import test_utilities
 
 from mhs_common.routing import spine_route_lookup_client
+from mhs_common.routing.exceptions import SDSNotFoundException
 
 BASE_URL = "https://example.com"
 ROUTING_PATH = "routing"
 RELIABILITY_PATH = "reliability"
+ROUTING_RELIABILITY_PATH = "routing-reliability"
 SPINE_ORG_CODE = "SPINE ORG CODE"
 CLIENT_CERT_PATH = "client/cert/path"
 CLIENT_KEY_PATH = "client/key/path"
@@ -146,6 +148,55 @@ class TestSpineRouteLookupClient(unittest.TestCase):
         self._assert_http_client_called_with_expected_args(expected_url, proxy_host=HTTP_PROXY_HOST,
                                                            proxy_port=HTTP_PROXY_PORT)
 
+    @test_utilities.async_test
+    async def test_should_retrieve_routing_and_reliability_details_in_one_request(self):
+        self.routing = spine_route_lookup_client.SpineRouteLookupClient(BASE_URL, SPINE_ORG_CODE)
+        self._given_http_client_returns_a_json_response()
+
+        routing_reliability_details = await self.routing.get_routing_and_reliability(SERVICE_ID, ORG_CODE)
+
+        self.assertEqual(EXPECTED_RESPONSE, routing_reliability_details)
+        self.mock_http_client.fetch.assert_called_once()
+        expected_url = self._build_url(path=ROUTING_RELIABILITY_PATH)
+        self._assert_http_client_called_with_expected_args(expected_url)
+
+    @test_utilities.async_test
+    async def test_should_retrieve_routing_and_reliability_details_with_default_org_code(self):
+        self.routing = spine_route_lookup_client.SpineRouteLookupClient(BASE_URL, SPINE_ORG_CODE)
+        self._given_http_client_returns_a_json_response()
+
+        await self.routing.get_routing_and_reliability(SERVICE_ID)
+
+        expected_url = self._build_url(path=ROUTING_RELIABILITY_PATH, org_code=SPINE_ORG_CODE)
+        self._assert_http_client_called_with_expected_args(expected_url)
+
+    @test_utilities.async_test
+    async def test_should_pass_through_exception_if_raised_when_retrieving_routing_and_reliability_details(self):
+        self.routing = spine_route_lookup_client.SpineRouteLookupClient(BASE_URL, SPINE_ORG_CODE)
+        self.mock_http_client.fetch.side_effect = IOError("Something went wrong!")
+
+        with self.assertRaises(IOError):
+            await self.routing.get_routing_and_reliability(SERVICE_ID, ORG_CODE)
+
+    @test_utilities.async_test
+    async def test_should_raise_not_found_exception_if_no_details_found(self):
+        self.routing = spine_route_lookup_client.SpineRouteLookupClient(BASE_URL, SPINE_ORG_CODE)
+        self.mock_http_client.fetch.side_effect = httpclient.HTTPClientError(404)
+
+        for function_to_test in [self.routing.get_end_point, self.routing.get_reliability,
+                                 self.routing.get_routing_and_reliability]:
+            with self.subTest(function_to_test.__name__):
+                with self.assertRaises(SDSNotFoundException):
+                    await function_to_test(SERVICE_ID, ORG_CODE)
+
+    @test_utilities.async_test
+    async def test_should_pass_through_error_responses_other_than_not_found(self):
+        self.routing = spine_route_lookup_client.SpineRouteLookupClient(BASE_URL, SPINE_ORG_CODE)
+        self.mock_http_client.fetch.side_effect = httpclient.HTTPClientError(500)
+
+        with self.assertRaises(httpclient.HTTPClientError):
+            await self.routing.get_end_point(SERVICE_ID, ORG_CODE)
+
     def _given_http_client_returns_a_json_response(self):
         mock_response = mock.Mock()
         mock_response.body = JSON_RESPONSE
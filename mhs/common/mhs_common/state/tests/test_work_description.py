@@ -4,7 +4,8 @@ from unittest.mock import MagicMock, patch
 
 from mhs_common import workflow
 from mhs_common.state import work_description as wd
-from utilities import test_utilities
+from persistence import persistence_adaptor as pa
+from utilities import spans, test_utilities
 from utilities.test_utilities import async_test
 
 input_data = {
@@ -12,7 +13,8 @@ input_data = {
     wd.CREATED_TIMESTAMP: '11:59',
     wd.INBOUND_STATUS: None,
     wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
-    wd.WORKFLOW: workflow.SYNC
+    wd.WORKFLOW: workflow.SYNC,
+    wd.VERSION: 1
 }
 
 
@@ -21,7 +23,8 @@ old_data = {
     wd.CREATED_TIMESTAMP: '11:59',
     wd.INBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
     wd.OUTBOUND_STATUS: None,
-    wd.WORKFLOW: workflow.SYNC
+    wd.WORKFLOW: workflow.SYNC,
+    wd.VERSION: 1
 }
 
 
@@ -50,35 +53,185 @@ class TestWorkDescription(unittest.TestCase):
 
     @async_test
     async def test_set_outbound_status(self):
-        updated_data = copy.deepcopy(input_data)
-        updated_data[wd.OUTBOUND_STATUS] = wd.MessageStatus.OUTBOUND_MESSAGE_ACKD
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD},
+                                                        wd.VERSION, 1)
+
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        self.assertEqual(work_description.version, 2)
+        persistence.get.assert_not_called()
+
+    @async_test
+    async def test_set_inbound_status(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED},
+                                                        wd.VERSION, 1)
+
+        self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        self.assertEqual(work_description.version, 2)
+
+    @async_test
+    async def test_set_status_on_record_without_version(self):
+        unversioned_data = copy.deepcopy(input_data)
+        del unversioned_data[wd.VERSION]
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(1)
+        work_description = wd.WorkDescription(persistence, unversioned_data)
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
 
-        future = test_utilities.awaitable(updated_data)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD},
+                                                        wd.VERSION, None)
+        self.assertEqual(work_description.version, 1)
 
+    @async_test
+    async def test_set_status_retries_after_other_field_changed_elsewhere(self):
+        remote_data = copy.deepcopy(input_data)
+        remote_data[wd.INBOUND_STATUS] = wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED
+        remote_data[wd.VERSION] = 2
         persistence = MagicMock()
-        persistence.update.return_value = future
+        persistence.update_versioned.side_effect = [
+            test_utilities.awaitable_exception(pa.RecordVersionConflictError()),
+            test_utilities.awaitable(3)]
+        persistence.get.return_value = test_utilities.awaitable(remote_data)
         work_description = wd.WorkDescription(persistence, input_data)
 
         await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
-        persistence.update.assert_called_with(input_data[wd.MESSAGE_ID], {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD})
 
+        persistence.get.assert_called_once_with(input_data[wd.MESSAGE_ID], strongly_consistent_read=True)
+        persistence.update_versioned.assert_called_with(input_data[wd.MESSAGE_ID],
+                                                        {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD},
+                                                        wd.VERSION, 2)
+        self.assertEqual(work_description.version, 3)
         self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED)
 
     @async_test
-    async def test_set_inbound_status(self):
-        updated_data = copy.deepcopy(input_data)
-        updated_data[wd.INBOUND_STATUS] = wd.MessageStatus.INBOUND_RESPONSE_FAILED
+    async def test_set_status_raises_error_when_same_field_changed_elsewhere(self):
+        remote_data = copy.deepcopy(input_data)
+        remote_data[wd.OUTBOUND_STATUS] = wd.MessageStatus.OUTBOUND_MESSAGE_NACKD
+        remote_data[wd.VERSION] = 2
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = \
+            test_utilities.awaitable_exception(pa.RecordVersionConflictError())
+        persistence.get.return_value = test_utilities.awaitable(remote_data)
+        work_description = wd.WorkDescription(persistence, input_data)
 
-        future = test_utilities.awaitable(updated_data)
+        with self.assertRaises(wd.OutOfDateVersionError):
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
 
+        persistence.update_versioned.assert_called_once()
+
+    @async_test
+    async def test_set_status_raises_error_when_record_keeps_changing(self):
         persistence = MagicMock()
-        persistence.update.return_value = future
+        persistence.update_versioned.side_effect = \
+            lambda *args: test_utilities.awaitable_exception(pa.RecordVersionConflictError())
+        persistence.get.side_effect = lambda *args, **kwargs: test_utilities.awaitable(copy.deepcopy(input_data))
         work_description = wd.WorkDescription(persistence, input_data)
 
-        await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
-        persistence.update.assert_called_with(input_data[wd.MESSAGE_ID], {wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED})
+        with self.assertRaises(wd.OutOfDateVersionError):
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
 
-        self.assertEqual(work_description.inbound_status, wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        self.assertEqual(1 + wd.MAX_VERSION_CONFLICT_RETRIES, persistence.update_versioned.call_count)
+
+    @async_test
+    async def test_set_status_raises_error_when_record_deleted(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = \
+            test_utilities.awaitable_exception(pa.RecordVersionConflictError())
+        persistence.get.return_value = test_utilities.awaitable(None)
+        work_description = wd.WorkDescription(persistence, input_data)
+
+        with self.assertRaises(wd.EmptyWorkDescriptionError):
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+    @async_test
+    async def test_deferred_status_is_held_locally(self):
+        persistence = MagicMock()
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+        persistence.update_versioned.assert_not_called()
+        self.assertEqual(work_description.outbound_status, wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+
+    @async_test
+    async def test_deferred_statuses_are_written_with_next_status(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data, deferred_statuses=frozenset({
+            wd.MessageStatus.OUTBOUND_MESSAGE_ACKD, wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED)
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
+
+        persistence.update_versioned.assert_called_once_with(input_data[wd.MESSAGE_ID], {
+            wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_SUCCESSFULLY_PROCESSED,
+            wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED
+        }, wd.VERSION, 1)
+        self.assertEqual(work_description.outbound_status,
+                         wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
+
+    @async_test
+    async def test_flush_writes_deferred_statuses(self):
+        persistence = MagicMock()
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        await work_description.flush()
+        await work_description.flush()
+
+        persistence.update_versioned.assert_called_once_with(
+            input_data[wd.MESSAGE_ID], {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}, wd.VERSION, 1)
+
+    @async_test
+    async def test_writes_are_recorded_in_message_trace(self):
+        persistence = MagicMock()
+        persistence.add.return_value = test_utilities.awaitable(None)
+        persistence.update_versioned.return_value = test_utilities.awaitable(2)
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        with patch.object(spans, 'logger'), spans.message_trace() as trace:
+            await work_description.publish()
+            await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+            await work_description.flush()
+
+        self.assertEqual(2, trace.counts[wd.WRITE_STAGE])
+
+    @async_test
+    async def test_failed_write_keeps_pending_statuses(self):
+        persistence = MagicMock()
+        persistence.update_versioned.side_effect = [test_utilities.awaitable_exception(OSError()),
+                                                    test_utilities.awaitable(2)]
+        work_description = wd.WorkDescription(persistence, input_data,
+                                               deferred_statuses=frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD}))
+
+        await work_description.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_ACKD)
+        with self.assertRaises(OSError):
+            await work_description.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
+        await work_description.flush()
+
+        expected_update = {wd.OUTBOUND_STATUS: wd.MessageStatus.OUTBOUND_MESSAGE_ACKD,
+                           wd.INBOUND_STATUS: wd.MessageStatus.INBOUND_RESPONSE_FAILED}
+        self.assertEqual([((input_data[wd.MESSAGE_ID], expected_update, wd.VERSION, 1),)] * 2,
+                         persistence.update_versioned.call_args_list)
 
     def test_null_persistence(self):
         with self.assertRaises(ValueError):
@@ -130,7 +283,8 @@ class TestWorkDescriptionFactory(unittest.TestCase):
                 'aaa-aaa',
                 '12',
                 workflow.SYNC,
-                outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED))
+                outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED),
+            frozenset())
 
     def test_create_wd_null_parameters(self):
         persistence = MagicMock()
@@ -1,5 +1,5 @@
 """Modules related to management of the workflow for supported messaging patterns."""
-from typing import Dict
+from typing import Collection, Dict
 
 from comms import queue_adaptor
 from mhs_common.routing import route_lookup_client
@@ -11,6 +11,7 @@ from mhs_common.workflow.asynchronous_reliable import AsynchronousReliableWorkfl
 from mhs_common.workflow.common import CommonWorkflow
 from mhs_common.workflow.asynchronous_forward_reliable import AsynchronousForwardReliableWorkflow
 from mhs_common.workflow.sync_async import SyncAsyncWorkflow
+from mhs_common.workflow.sync_async_notifier import SyncAsyncNotifier
 from mhs_common.workflow.sync_async_resynchroniser import SyncAsyncResynchroniser
 from mhs_common.workflow.synchronous import SynchronousWorkflow
 
@@ -28,14 +29,18 @@ def get_workflow_map(party_key: str = None,
                      inbound_async_queue: queue_adaptor.QueueAdaptor = None,
                      max_request_size: int = None,
                      resynchroniser: SyncAsyncResynchroniser = None,
-                     routing: route_lookup_client.RouteLookupClient = None
+                     routing: route_lookup_client.RouteLookupClient = None,
+                     sync_async_notifier: SyncAsyncNotifier = None,
+                     coalesced_workflows: Collection[str] = ()
                      ) -> Dict[str, CommonWorkflow]:
     """
     Get a map of workflows. Keys for each workflow should correspond with keys used in interactions.json
 
+    :param coalesced_workflows: names of the workflows whose intermediate work description statuses are written
+    together with the following status, rather than each in its own state store write
     :return: a map of workflows
     """
-    return {
+    workflows = {
         ASYNC_EXPRESS: AsynchronousExpressWorkflow(party_key, work_description_store, transmission,
                                                    inbound_async_queue,
                                                    max_request_size,
@@ -48,10 +53,15 @@ def get_workflow_map(party_key: str = None,
                                                               routing=routing),
         SYNC_ASYNC: SyncAsyncWorkflow(sync_async_store=sync_async_store,
                                       resynchroniser=resynchroniser,
-                                      work_description_store=work_description_store),
+                                      work_description_store=work_description_store,
+                                      notifier=sync_async_notifier),
         SYNC: SynchronousWorkflow(party_key=party_key,
                                   work_description_store=work_description_store,
                                   transmission=transmission,
                                   max_request_size=max_request_size,
                                   routing=routing)
     }
+
+    for workflow_name in coalesced_workflows:
+        workflows[workflow_name].coalesce_work_description_writes()
+    return workflows
@@ -49,7 +49,8 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
         wdo = await self._create_new_work_description_if_required(message_id, wdo, self.workflow_name)
 
         try:
-            details = await self._lookup_endpoint_details(interaction_details)
+            details, reliability_details = await self._lookup_endpoint_and_reliability_details(
+                interaction_details, interaction_details.get('ods-code'))
             url = config.get_config("FORWARD_RELIABLE_ENDPOINT_URL")
             to_party_key = details[self.ENDPOINT_PARTY_KEY]
             cpa_id = details[self.ENDPOINT_CPA_ID]
@@ -58,8 +59,6 @@ class AsynchronousForwardReliableWorkflow(asynchronous_reliable.AsynchronousReli
             await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)
             return 500, 'Error obtaining outbound URL', None
 
-        reliability_details = await self._lookup_reliability_details(interaction_details,
-                                                                     interaction_details.get('ods-code'))
         retry_interval_xml_datetime = reliability_details[common_asynchronous.MHS_RETRY_INTERVAL]
         try:
             retry_interval = DateUtilities.convert_xml_date_time_format_to_seconds(retry_interval_xml_datetime)
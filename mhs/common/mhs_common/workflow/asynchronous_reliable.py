@@ -54,7 +54,7 @@ class AsynchronousReliableWorkflow(common_asynchronous.CommonAsynchronousWorkflo
         logger.audit('Outbound {WorkflowName} workflow invoked.', fparams={'WorkflowName': self.workflow_name})
 
         try:
-            details = await self._lookup_endpoint_details(interaction_details)
+            details, reliability_details = await self._lookup_endpoint_and_reliability_details(interaction_details)
             url = config.get_config("ASYNCHRONOUS_RELIABLE_ENDPOINT_URL", details[self.ENDPOINT_URL])
             to_party_key = details[self.ENDPOINT_PARTY_KEY]
             cpa_id = details[self.ENDPOINT_CPA_ID]
@@ -63,7 +63,6 @@ class AsynchronousReliableWorkflow(common_asynchronous.CommonAsynchronousWorkflo
             await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)
             return 500, 'Error obtaining outbound URL', None
 
-        reliability_details = await self._lookup_reliability_details(interaction_details)
         retry_interval_xml_datetime = reliability_details[common_asynchronous.MHS_RETRY_INTERVAL]
         try:
             retry_interval = DateUtilities.convert_xml_date_time_format_to_seconds(retry_interval_xml_datetime)
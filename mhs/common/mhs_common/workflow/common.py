@@ -1,9 +1,10 @@
 """This module defines the common base of all workflows."""
 import abc
 from dataclasses import dataclass
-from typing import Tuple, Optional, Dict, List
+from typing import Tuple, Optional, Dict, List, FrozenSet
 
 import utilities.integration_adaptors_logger as log
+from utilities import spans
 
 import mhs_common.state.work_description as wd
 from mhs_common.messages import ebxml_envelope
@@ -34,11 +35,21 @@ class CommonWorkflow(abc.ABC):
     ENDPOINT_SERVICE_ID = 'service_id'
     ENDPOINT_CPA_ID = 'cpa_id'
 
+    # Statuses that are only intermediate steps of this workflow, always followed by a final status. Their work
+    # description writes may be deferred and combined with the final status write.
+    INTERMEDIATE_STATUSES: FrozenSet[wd.MessageStatus] = frozenset()
+
     workflow_name: str
 
     def __init__(self, routing: route_lookup_client.RouteLookupClient = None):
         self.routing_reliability = routing
         self.workflow_specific_interaction_details = dict()
+        self.deferred_statuses: FrozenSet[wd.MessageStatus] = frozenset()
+
+    def coalesce_work_description_writes(self) -> None:
+        """Hold this workflow's intermediate statuses in the local work description, so they are written together with
+        the next durable status rather than in a state store round trip of their own."""
+        self.deferred_statuses = self.INTERMEDIATE_STATUSES
 
     @abc.abstractmethod
     async def handle_outbound_message(self, from_asid: Optional[str],
@@ -94,6 +105,7 @@ class CommonWorkflow(abc.ABC):
         """
         pass
 
+    @spans.span('endpoint_lookup')
     async def _lookup_endpoint_details(self, interaction_details: Dict) -> Dict:
         try:
             service_id = await self._build_service_id(interaction_details)
@@ -105,22 +117,25 @@ class CommonWorkflow(abc.ABC):
             logger.info('Looking up endpoint details for {service_id}.', fparams={'service_id': service_id})
             endpoint_details = await self.routing_reliability.get_end_point(service_id, ods_code)
 
-            url = CommonWorkflow._extract_endpoint_url(endpoint_details)
-            to_party_key = endpoint_details[MHS_TO_PARTY_KEY_KEY]
-            cpa_id = endpoint_details[MHS_CPA_ID_KEY]
-            to_asid = self._extract_asid(endpoint_details)
-            details = {self.ENDPOINT_SERVICE_ID: service_id,
-                       self.ENDPOINT_URL: url,
-                       self.ENDPOINT_PARTY_KEY: to_party_key,
-                       self.ENDPOINT_CPA_ID: cpa_id,
-                       self.ENDPOINT_TO_ASID: to_asid
-                       }
-            logger.info('Retrieved endpoint details for {details}', fparams={'details': details})
-            return details
+            return self._extract_endpoint_details(service_id, endpoint_details)
         except Exception:
             logger.exception('Error encountered whilst retrieving endpoint details.')
             raise
 
+    def _extract_endpoint_details(self, service_id: str, endpoint_details: Dict) -> Dict:
+        url = CommonWorkflow._extract_endpoint_url(endpoint_details)
+        to_party_key = endpoint_details[MHS_TO_PARTY_KEY_KEY]
+        cpa_id = endpoint_details[MHS_CPA_ID_KEY]
+        to_asid = self._extract_asid(endpoint_details)
+        details = {self.ENDPOINT_SERVICE_ID: service_id,
+                   self.ENDPOINT_URL: url,
+                   self.ENDPOINT_PARTY_KEY: to_party_key,
+                   self.ENDPOINT_CPA_ID: cpa_id,
+                   self.ENDPOINT_TO_ASID: to_asid
+                   }
+        logger.info('Retrieved endpoint details for {details}', fparams={'details': details})
+        return details
+
     @staticmethod
     def _extract_endpoint_url(endpoint_details: Dict[str, List[str]]) -> str:
         endpoint_urls = endpoint_details[MHS_END_POINT_KEY]
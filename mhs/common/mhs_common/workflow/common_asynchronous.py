@@ -1,10 +1,11 @@
 """This module defines the common base for all asynchronous workflows."""
-from typing import Dict, Callable, Tuple, Optional
+from typing import Dict, Callable, Tuple, Optional, Union
 
 from tornado import httpclient
 
 import utilities.integration_adaptors_logger as log
 from comms import queue_adaptor
+from comms.http_body import HttpBody
 from comms.http_headers import HttpHeaders
 from mhs_common.messages import ebxml_request_envelope, ebxml_envelope
 from mhs_common.routing import route_lookup_client
@@ -12,7 +13,7 @@ from mhs_common.state import work_description as wd
 from mhs_common.transmission import transmission_adaptor
 from mhs_common.workflow.common import CommonWorkflow, MessageData
 from persistence import persistence_adaptor
-from utilities import timing, mdc
+from utilities import timing, mdc, spans
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -51,6 +52,7 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
             await wdo.publish()
         return wdo
 
+    @spans.span('serialisation')
     async def _serialize_outbound_message(self, message_id, correlation_id, interaction_details, request_body, wdo,
                                           to_party_key, cpa_id):
         try:
@@ -64,7 +66,8 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
                 list(map(lambda it: it.__dict__, request_body.attachments))
             interaction_details[ebxml_envelope.EXTERNAL_ATTACHMENTS] = \
                 list(map(lambda it: it.__dict__, request_body.external_attachments))
-            _, http_headers, message = ebxml_request_envelope.EbxmlRequestEnvelope(interaction_details).serialize()
+            _, http_headers, message = ebxml_request_envelope.EbxmlRequestEnvelope(interaction_details) \
+                .serialize(as_http_body=True)
         except Exception:
             logger.exception('Failed to serialise outbound message.')
             await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_MESSAGE_PREPARATION_FAILED)
@@ -85,7 +88,7 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
         return None, http_headers, message
 
     async def _make_outbound_request_and_handle_response(
-            self, url: str, http_headers: Dict[str, str], message: str, wdo: wd.WorkDescription,
+            self, url: str, http_headers: Dict[str, str], message: Union[str, HttpBody], wdo: wd.WorkDescription,
             handle_error_response: Callable[[httpclient.HTTPResponse], Tuple[int, str, Optional[wd.WorkDescription]]]):
 
         logger.info('About to make outbound request')
@@ -141,6 +144,7 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
             await wdo.set_inbound_status(wd.MessageStatus.INBOUND_RESPONSE_FAILED)
             raise e
 
+    @spans.span('reliability_lookup')
     async def _lookup_reliability_details(self, interaction_details: Dict, org_code: str = None) -> Dict:
         try:
             service_id = await self._build_service_id(interaction_details)
@@ -155,6 +159,37 @@ class CommonAsynchronousWorkflow(CommonWorkflow):
             logger.exception('Error encountered whilst obtaining outbound URL.')
             raise
 
+    async def _lookup_endpoint_and_reliability_details(self, interaction_details: Dict,
+                                                       reliability_org_code: str = None) -> Tuple[Dict, Dict]:
+        """Look up the endpoint details (for the ODS code in the interaction details, if any) and the reliability
+        details (for the given org code). Where both are for the same org code, they are fetched with a single
+        routing and reliability lookup.
+
+        :return: A tuple of the endpoint details, in the form returned by `_lookup_endpoint_details`, and the
+        reliability details.
+        """
+        ods_code = interaction_details.get('ods-code')
+        if ods_code != reliability_org_code:
+            endpoint_details = await self._lookup_endpoint_details(interaction_details)
+            reliability_details = await self._lookup_reliability_details(interaction_details, reliability_org_code)
+            return endpoint_details, reliability_details
+
+        try:
+            service_id = await self._build_service_id(interaction_details)
+
+            logger.info('Looking up endpoint and reliability details for {service_id}.',
+                        fparams={'service_id': service_id})
+            with spans.span('routing_and_reliability_lookup'):
+                routing_reliability_details = await self.routing_reliability.get_routing_and_reliability(service_id,
+                                                                                                          ods_code)
+
+            logger.info('Retrieved endpoint and reliability details for {service_id}. {routing_reliability_details}',
+                        fparams={'service_id': service_id, 'routing_reliability_details': routing_reliability_details})
+            return self._extract_endpoint_details(service_id, routing_reliability_details), routing_reliability_details
+        except Exception:
+            logger.exception('Error encountered whilst retrieving endpoint and reliability details.')
+            raise
+
     async def _put_message_onto_queue_with(self, message_id, correlation_id, message_data: MessageData):
         await self.queue_adaptor.send_async(
             {
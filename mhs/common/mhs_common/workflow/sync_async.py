@@ -6,10 +6,11 @@ from mhs_common.request import request_body_schema
 from mhs_common.state import work_description as wd
 from mhs_common.workflow import common
 from mhs_common.workflow import common_synchronous
+from mhs_common.workflow import sync_async_notifier
 from mhs_common.workflow import sync_async_resynchroniser
 from mhs_common.workflow.common import MessageData
 from persistence import persistence_adaptor as pa
-from utilities import integration_adaptors_logger as log
+from utilities import integration_adaptors_logger as log, spans
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -27,10 +28,13 @@ class SyncAsyncStoreFailure(RuntimeError):
 class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
     """Handles the workflow for the sync-async messaging pattern."""
 
+    INTERMEDIATE_STATUSES = frozenset({wd.MessageStatus.OUTBOUND_MESSAGE_ACKD})
+
     def __init__(self,
                  sync_async_store: pa.PersistenceAdaptor = None,
                  work_description_store: pa.PersistenceAdaptor = None,
                  resynchroniser: sync_async_resynchroniser.SyncAsyncResynchroniser = None,
+                 notifier: sync_async_notifier.SyncAsyncNotifier = None
                  ):
         """Create a new SyncAsyncWorkflow that uses the specified dependencies to load config, build a message and
         send it.
@@ -38,11 +42,13 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
         :param work_description_store: The persistence store instance that holds the work description data
         :param sync_async_store_retry_delay: time between sync async store publish attempts
         :param persistence_store_max_retries: number of times to retry publishing something to a persistence store
+        :param notifier: optional channel used to tell the waiting outbound request that its response has been stored
         """
         super().__init__()
         self.sync_async_store = sync_async_store
         self.work_description_store = work_description_store
         self.resynchroniser = resynchroniser
+        self.notifier = notifier
         self.workflow_name = workflow.SYNC_ASYNC
 
     async def handle_outbound_message(self, from_asid: Optional[str],
@@ -62,7 +68,8 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
         logger.info('Entered sync-async workflow to handle outbound message')
         wdo = wd.create_new_work_description(self.work_description_store, message_id,
                                              workflow.SYNC_ASYNC,
-                                             outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
+                                             outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                                             deferred_statuses=self.deferred_statuses)
         await wdo.publish()
 
         status_code, response, _ = await async_workflow.handle_outbound_message(from_asid, message_id, correlation_id,
@@ -77,7 +84,8 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
     async def _retrieve_async_response(self, message_id, wdo: wd.WorkDescription):
         logger.info('Attempting to retrieve the async response from the async store')
         try:
-            response = await self.resynchroniser.pause_request(message_id)
+            with spans.span('async_response_wait'):
+                response = await self.resynchroniser.pause_request(message_id)
             logger.info('Retrieved async response from sync-async store')
             return 200, response[MESSAGE_DATA]
         except sync_async_resynchroniser.SyncAsyncResponseException:
@@ -97,6 +105,9 @@ class SyncAsyncWorkflow(common_synchronous.CommonSynchronousWorkflow):
             await wdo.set_inbound_status(wd.MessageStatus.INBOUND_SYNC_ASYNC_MESSAGE_FAILED_TO_BE_STORED)
             raise e
 
+        if self.notifier is not None:
+            await self.notifier.notify(message_id)
+
     async def set_successful_message_response(self, wdo: wd.WorkDescription):
         await wdo.set_outbound_status(wd.MessageStatus.OUTBOUND_SYNC_ASYNC_MESSAGE_SUCCESSFULLY_RESPONDED)
 
@@ -0,0 +1,186 @@
+"""This module defines notifiers that tell a waiting sync-async request its asynchronous response has been stored."""
+import abc
+import asyncio
+import functools
+import ssl
+from typing import Dict, Optional, Set
+
+import aioredis
+
+from utilities import config, integration_adaptors_logger as log
+from utilities.string_utilities import str2bool
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+DEFAULT_CHANNEL = 'mhs-sync-async-responses'
+
+NOTIFIER_NONE = 'NONE'
+NOTIFIER_IN_PROCESS = 'IN_PROCESS'
+NOTIFIER_REDIS = 'REDIS'
+
+
+class SyncAsyncNotifier(abc.ABC):
+    """A channel over which the inbound service announces that the response to a message has been placed in the
+    sync-async store, so that the outbound request waiting on it does not have to wait for its next poll.
+
+    Notifications are best effort. A waiter must still read the sync-async store, both to fetch the response and
+    because a notification may be lost.
+    """
+
+    def __init__(self):
+        self._subscriptions: Dict[str, Set[asyncio.Event]] = {}
+
+    async def start(self) -> None:
+        """Open any resources the notifier needs."""
+        pass
+
+    async def close(self) -> None:
+        """Release any resources opened by the notifier."""
+        pass
+
+    def subscribe(self, message_id: str) -> asyncio.Event:
+        """Register interest in notifications for the given message.
+
+        :param message_id: The id of the message whose response is awaited.
+        :return: An event that is set each time a notification for the message is received. The caller must pass it to
+        :meth:`unsubscribe` once it is no longer waiting.
+        """
+        event = asyncio.Event()
+        self._subscriptions.setdefault(message_id, set()).add(event)
+        return event
+
+    def unsubscribe(self, message_id: str, event: asyncio.Event) -> None:
+        """Remove a subscription created by :meth:`subscribe`.
+
+        :param message_id: The id of the message the subscription was made for.
+        :param event: The event returned by :meth:`subscribe`.
+        """
+        events = self._subscriptions.get(message_id)
+        if events is None:
+            return
+        events.discard(event)
+        if not events:
+            del self._subscriptions[message_id]
+
+    @abc.abstractmethod
+    async def notify(self, message_id: str) -> None:
+        """Announce that the response to the given message has been placed in the sync-async store. Failures are
+        logged rather than raised, since waiters fall back to polling the store.
+
+        :param message_id: The id of the message whose response has been stored.
+        """
+        pass
+
+    def _wake(self, message_id: str) -> None:
+        for event in self._subscriptions.get(message_id, ()):
+            event.set()
+
+
+class InProcessSyncAsyncNotifier(SyncAsyncNotifier):
+    """Delivers notifications to waiters in the same process. Suitable when the inbound and outbound workflows share a
+    process, for example in tests and benchmarks."""
+
+    async def notify(self, message_id: str) -> None:
+        self._wake(message_id)
+
+
+class RedisSyncAsyncNotifier(SyncAsyncNotifier):
+    """Delivers notifications between processes using Redis pub/sub."""
+
+    def __init__(self, redis_host: str, redis_port: int, use_tls: bool = True, channel: str = DEFAULT_CHANNEL,
+                 receive_notifications: bool = True):
+        """
+        :param redis_host: The Redis host to publish notifications through.
+        :param redis_port: The port on which to connect to the Redis host.
+        :param use_tls: Whether or not to use TLS when connecting to the Redis host.
+        :param channel: The pub/sub channel notifications are published on.
+        :param receive_notifications: Whether to subscribe to the channel. A notifier that only publishes (such as the
+        inbound service's) does not need to.
+        """
+        super().__init__()
+        self.channel = channel
+        self.receive_notifications = receive_notifications
+        self._address = (redis_host, redis_port)
+        self._ssl_context = ssl.create_default_context() if use_tls else None
+        self._redis = None
+        self._listener: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Connect to Redis and, if receiving notifications, start listening on the channel."""
+        logger.info('Connecting sync-async notifier to Redis. {address}, {channel}',
+                    fparams={'address': self._address, 'channel': self.channel})
+        self._redis = await aioredis.create_redis(self._address, ssl=self._ssl_context, encoding='utf-8')
+        if self.receive_notifications:
+            subscriber = await aioredis.create_redis(self._address, ssl=self._ssl_context, encoding='utf-8')
+            channel, = await subscriber.subscribe(self.channel)
+            self._listener = asyncio.ensure_future(self._listen(subscriber, channel))
+
+    async def close(self) -> None:
+        """Stop listening on the channel and close the Redis connections."""
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        if self._redis is not None:
+            self._redis.close()
+            await self._redis.wait_closed()
+            self._redis = None
+
+    async def notify(self, message_id: str) -> None:
+        if self._redis is None:
+            logger.warning('Sync-async notifier not started, not publishing notification for {message_id}',
+                           fparams={'message_id': message_id})
+            return
+
+        try:
+            await self._redis.publish(self.channel, message_id)
+        except Exception:
+            logger.exception('Failed to publish sync-async notification for {message_id}',
+                             fparams={'message_id': message_id})
+
+    async def _listen(self, subscriber, channel) -> None:
+        try:
+            while await channel.wait_message():
+                message_id = await channel.get()
+                self._wake(message_id)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception('Sync-async notification listener stopped unexpectedly. Waiters will poll the store.')
+        finally:
+            subscriber.close()
+            await subscriber.wait_closed()
+
+
+@functools.lru_cache(maxsize=None)
+def _get_in_process_notifier() -> InProcessSyncAsyncNotifier:
+    return InProcessSyncAsyncNotifier()
+
+
+def create_sync_async_notifier(receive_notifications: bool) -> Optional[SyncAsyncNotifier]:
+    """Build the sync-async notifier selected by the SYNC_ASYNC_NOTIFIER config value, or None if notifications are
+    disabled (the default), in which case the sync-async store is only polled.
+
+    `IN_PROCESS` notifiers are only useful when the inbound and outbound workflows run in the same process, so every
+    call returns the same notifier, through which both sets of workflows are connected.
+
+    :param receive_notifications: Whether the notifier should listen for notifications as well as publish them.
+    :return: The configured notifier, or None.
+    """
+    notifier_type = config.get_config('SYNC_ASYNC_NOTIFIER', default=NOTIFIER_NONE).upper()
+    if notifier_type == NOTIFIER_NONE:
+        return None
+    if notifier_type == NOTIFIER_IN_PROCESS:
+        logger.info('Using in-process sync-async notifier')
+        return _get_in_process_notifier()
+    if notifier_type != NOTIFIER_REDIS:
+        raise ValueError(f'Unknown sync-async notifier type: {notifier_type}')
+
+    redis_host = config.get_config('SYNC_ASYNC_NOTIFIER_REDIS_HOST')
+    redis_port = int(config.get_config('SYNC_ASYNC_NOTIFIER_REDIS_PORT', default='6379'))
+    use_tls = not str2bool(config.get_config('SYNC_ASYNC_NOTIFIER_REDIS_DISABLE_TLS', default=str(False)))
+    channel = config.get_config('SYNC_ASYNC_NOTIFIER_CHANNEL', default=DEFAULT_CHANNEL)
+    logger.info('Using Redis sync-async notifier. {redis_host}, {redis_port}, {use_tls}, {channel}',
+                fparams={'redis_host': redis_host, 'redis_port': redis_port, 'use_tls': use_tls, 'channel': channel})
+    return RedisSyncAsyncNotifier(redis_host, redis_port, use_tls, channel,
+                                  receive_notifications=receive_notifications)
@@ -14,7 +14,7 @@ from mhs_common.state import work_description as wd
 from mhs_common.transmission import transmission_adaptor
 from mhs_common.workflow import common_synchronous
 from mhs_common.workflow.common import MessageData
-from utilities import timing, mdc, config
+from utilities import timing, mdc, config, spans
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -22,6 +22,8 @@ logger = log.IntegrationAdaptorsLogger(__name__)
 class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
     """Handles the workflow for the synchronous messaging pattern."""
 
+    INTERMEDIATE_STATUSES = frozenset({wd.MessageStatus.OUTBOUND_SYNC_MESSAGE_RESPONSE_RECEIVED})
+
     def __init__(self,
                  party_key: str = None,
                  work_description_store: pa.PersistenceAdaptor = None,
@@ -52,7 +54,8 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
         wdo = wd.create_new_work_description(self.wd_store,
                                              message_id,
                                              workflow.SYNC,
-                                             outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
+                                             outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                                             deferred_statuses=self.deferred_statuses)
         await wdo.publish()
 
         if not from_asid:
@@ -121,6 +124,7 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
 
         return 500, f'Error(s) received from Spine: {exception}'
 
+    @spans.span('serialisation')
     async def _prepare_outbound_message(self, message_id: Optional[str], to_asid: str, from_asid: str,
                                         request_body: request_body_schema.RequestBody,
                                         interaction_details: dict):
@@ -136,7 +140,7 @@ class SynchronousWorkflow(common_synchronous.CommonSynchronousWorkflow):
         }
 
         envelope = soap_envelope.SoapEnvelope(message_details)
-        return envelope.serialize()
+        return envelope.serialize(as_http_body=True)
 
     async def handle_inbound_message(self, message_id: str, correlation_id: str, work_description: wd.WorkDescription, message_data: MessageData):
         raise NotImplementedError('This method is not supported for the synchronous message workflow as there is no '
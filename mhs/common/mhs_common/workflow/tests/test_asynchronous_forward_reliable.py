@@ -149,7 +149,7 @@ class TestForwardReliableWorkflow(unittest.TestCase):
         self.assertEqual(
             [mock.call(MessageStatus.OUTBOUND_MESSAGE_ACKD)],
             self.mock_work_description.set_outbound_status.call_args_list)
-        self.mock_routing_reliability.get_end_point.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.mock_routing_reliability.get_routing_and_reliability.assert_called_once_with(SERVICE_ID, ODS_CODE)
         self.mock_ebxml_request_envelope.assert_called_once_with(expected_interaction_details)
         self.mock_transmission_adaptor.make_request.assert_called_once_with(mock_url, HTTP_HEADERS, SERIALIZED_MESSAGE,
                                                                             raise_error_response=False)
@@ -235,7 +235,7 @@ class TestForwardReliableWorkflow(unittest.TestCase):
     @async_test
     async def test_handle_outbound_message_error_when_looking_up_spine_url(self):
         self.setup_mock_work_description()
-        self.mock_routing_reliability.get_end_point.side_effect = Exception()
+        self.mock_routing_reliability.get_routing_and_reliability.side_effect = Exception()
 
         status, message, _ = await self.workflow.handle_outbound_message(None, MESSAGE_ID, CORRELATION_ID,
                                                                          INTERACTION_DETAILS,
@@ -401,11 +401,7 @@ class TestForwardReliableWorkflow(unittest.TestCase):
     @async_test
     async def test_retry_interval_contract_property_is_invalid(self):
         self.setup_mock_work_description()
-        self._setup_routing_mock()
-
-        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable({
-            workflow.common_asynchronous.MHS_RETRY_INTERVAL: MHS_RETRY_INTERVAL_INVALID_VAL,
-            workflow.common_asynchronous.MHS_RETRIES: MHS_RETRY_VAL})
+        self._setup_routing_mock(retry_interval=MHS_RETRY_INTERVAL_INVALID_VAL)
 
         self.mock_ebxml_request_envelope.return_value.serialize.return_value = (MESSAGE_ID, {}, SERIALIZED_MESSAGE)
 
@@ -625,13 +621,11 @@ class TestForwardReliableWorkflow(unittest.TestCase):
         self.mock_work_description.set_inbound_status.return_value = test_utilities.awaitable(None)
         self.mock_work_description.update.return_value = test_utilities.awaitable(None)
 
-    def _setup_routing_mock(self):
-        self.mock_routing_reliability.get_end_point.return_value = test_utilities.awaitable({
+    def _setup_routing_mock(self, retry_interval=MHS_RETRY_INTERVAL_VAL):
+        self.mock_routing_reliability.get_routing_and_reliability.return_value = test_utilities.awaitable({
             MHS_END_POINT_KEY: [URL],
             MHS_TO_PARTY_KEY_KEY: TO_PARTY_KEY,
             MHS_CPA_ID_KEY: CPA_ID,
-            MHS_ASID: [ASID]
-        })
-        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable({
-            workflow.common_asynchronous.MHS_RETRY_INTERVAL: MHS_RETRY_INTERVAL_VAL,
+            MHS_ASID: [ASID],
+            workflow.common_asynchronous.MHS_RETRY_INTERVAL: retry_interval,
             workflow.common_asynchronous.MHS_RETRIES: MHS_RETRY_VAL})
@@ -21,6 +21,19 @@ INTERACTION_DETAILS = {
 EXPECTED_RELIABILITY_DETAILS = {
     "nhsMHSSyncReplyMode": "MSHSignalsOnly"
 }
+ENDPOINT_DETAILS = {
+    'nhsMHSEndPoint': ['https://example.com'],
+    'nhsMHSPartyKey': 'to-party-key',
+    'nhsMhsCPAId': 'cpa-id',
+    'uniqueIdentifier': ['123456']
+}
+EXPECTED_ENDPOINT_DETAILS = {
+    'service_id': SERVICE_ID,
+    'url': 'https://example.com',
+    'party_key': 'to-party-key',
+    'cpa_id': 'cpa-id',
+    'to_asid': '123456'
+}
 
 
 class DummyCommonAsynchronousWorkflow(common_asynchronous.CommonAsynchronousWorkflow):
@@ -76,3 +89,40 @@ class TestCommonAsynchronousWorkflow(unittest.TestCase):
 
         with self.assertRaises(Exception):
             await self.workflow._lookup_reliability_details(INTERACTION_DETAILS)
+
+    @async_test
+    async def test_lookup_endpoint_and_reliability_details_in_one_lookup(self):
+        self.mock_routing_reliability.get_routing_and_reliability.return_value = test_utilities.awaitable(
+            {**ENDPOINT_DETAILS, **EXPECTED_RELIABILITY_DETAILS})
+
+        endpoint_details, reliability_details = await self.workflow._lookup_endpoint_and_reliability_details(
+            {'ods-code': ODS_CODE, **INTERACTION_DETAILS}, ODS_CODE)
+
+        self.mock_routing_reliability.get_routing_and_reliability.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.mock_routing_reliability.get_end_point.assert_not_called()
+        self.mock_routing_reliability.get_reliability.assert_not_called()
+        self.assertEqual(EXPECTED_ENDPOINT_DETAILS, endpoint_details)
+        self.assertEqual(EXPECTED_RELIABILITY_DETAILS['nhsMHSSyncReplyMode'],
+                         reliability_details['nhsMHSSyncReplyMode'])
+
+    @async_test
+    async def test_lookup_endpoint_and_reliability_details_for_different_org_codes(self):
+        self.mock_routing_reliability.get_end_point.return_value = test_utilities.awaitable(ENDPOINT_DETAILS)
+        self.mock_routing_reliability.get_reliability.return_value = test_utilities.awaitable(
+            EXPECTED_RELIABILITY_DETAILS)
+
+        endpoint_details, reliability_details = await self.workflow._lookup_endpoint_and_reliability_details(
+            {'ods-code': ODS_CODE, **INTERACTION_DETAILS}, None)
+
+        self.mock_routing_reliability.get_end_point.assert_called_once_with(SERVICE_ID, ODS_CODE)
+        self.mock_routing_reliability.get_reliability.assert_called_once_with(SERVICE_ID, None)
+        self.mock_routing_reliability.get_routing_and_reliability.assert_not_called()
+        self.assertEqual(EXPECTED_ENDPOINT_DETAILS, endpoint_details)
+        self.assertEqual(EXPECTED_RELIABILITY_DETAILS, reliability_details)
+
+    @async_test
+    async def test_lookup_endpoint_and_reliability_details_error(self):
+        self.mock_routing_reliability.get_routing_and_reliability.side_effect = Exception()
+
+        with self.assertRaises(Exception):
+            await self.workflow._lookup_endpoint_and_reliability_details(INTERACTION_DETAILS)
@@ -40,7 +40,8 @@ class TestSyncAsyncWorkflowOutbound(TestCase):
         wd_mock.assert_called_with(self.work_description_store,
                                    'id123',
                                    workflow.SYNC_ASYNC,
-                                   outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
+                                   outbound_status=wd.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                                   deferred_statuses=frozenset())
 
         async_workflow.handle_outbound_message.assert_called_once()
         async_workflow.handle_outbound_message.assert_called_with(None, 'id123', 'cor123', {}, 'payload',
@@ -139,3 +140,27 @@ class TestSyncAsyncWorkflowInbound(TestCase):
         })
 
         self.work_description.set_inbound_status.assert_called_with(wd.MessageStatus.INBOUND_SYNC_ASYNC_MESSAGE_STORED)
+
+    @test_utilities.async_test
+    async def test_inbound_workflow_notifies_waiting_request(self):
+        notifier = MagicMock()
+        notifier.notify.return_value = test_utilities.awaitable(None)
+        self.workflow.notifier = notifier
+        self.persistence.add.return_value = test_utilities.awaitable(True)
+        self.work_description.set_inbound_status.return_value = test_utilities.awaitable(True)
+
+        await self.workflow.handle_inbound_message('1', 'cor_id', self.work_description, self.message_data)
+
+        notifier.notify.assert_called_once_with('1')
+
+    @test_utilities.async_test
+    async def test_inbound_workflow_does_not_notify_when_store_fails(self):
+        notifier = MagicMock()
+        self.workflow.notifier = notifier
+        self.persistence.add.return_value = test_utilities.awaitable_exception(OSError())
+        self.work_description.set_inbound_status.return_value = test_utilities.awaitable(True)
+
+        with self.assertRaises(OSError):
+            await self.workflow.handle_inbound_message('1', 'cor_id', self.work_description, self.message_data)
+
+        notifier.notify.assert_not_called()
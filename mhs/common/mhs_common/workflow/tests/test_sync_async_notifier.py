@@ -0,0 +1,167 @@
+import asyncio
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from utilities import test_utilities
+
+from mhs_common.workflow import sync_async_notifier
+
+MESSAGE_ID = 'message-id'
+OTHER_MESSAGE_ID = 'other-message-id'
+
+
+class FakeChannel:
+    def __init__(self):
+        self.messages = asyncio.Queue()
+
+    async def wait_message(self):
+        while self.messages.empty():
+            await asyncio.sleep(0)
+        return True
+
+    async def get(self):
+        return await self.messages.get()
+
+
+class FakeRedis:
+    def __init__(self, channel: FakeChannel):
+        self.channel = channel
+        self.published = []
+        self.closed = False
+
+    async def subscribe(self, channel_name):
+        return [self.channel]
+
+    async def publish(self, channel_name, message):
+        self.published.append((channel_name, message))
+        await self.channel.messages.put(message)
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+class TestInProcessSyncAsyncNotifier(TestCase):
+
+    @test_utilities.async_test
+    async def test_notify_wakes_subscribers_of_the_message_only(self):
+        notifier = sync_async_notifier.InProcessSyncAsyncNotifier()
+        first = notifier.subscribe(MESSAGE_ID)
+        second = notifier.subscribe(MESSAGE_ID)
+        other = notifier.subscribe(OTHER_MESSAGE_ID)
+
+        await notifier.notify(MESSAGE_ID)
+
+        self.assertTrue(first.is_set())
+        self.assertTrue(second.is_set())
+        self.assertFalse(other.is_set())
+
+    @test_utilities.async_test
+    async def test_unsubscribed_events_are_not_woken(self):
+        notifier = sync_async_notifier.InProcessSyncAsyncNotifier()
+        event = notifier.subscribe(MESSAGE_ID)
+        notifier.unsubscribe(MESSAGE_ID, event)
+        notifier.unsubscribe(MESSAGE_ID, event)
+
+        await notifier.notify(MESSAGE_ID)
+
+        self.assertFalse(event.is_set())
+        self.assertEqual({}, notifier._subscriptions)
+
+
+class TestRedisSyncAsyncNotifier(TestCase):
+
+    def setUp(self):
+        self.channel = None
+        self.connections = []
+        self.aioredis = MagicMock()
+        self.aioredis.create_redis.side_effect = self._create_redis
+        patcher = patch.object(sync_async_notifier, 'aioredis', self.aioredis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def _create_redis(self, *args, **kwargs):
+        if self.channel is None:
+            self.channel = FakeChannel()
+        connection = FakeRedis(self.channel)
+        self.connections.append(connection)
+        return connection
+
+    @test_utilities.async_test
+    async def test_published_notifications_wake_subscribers(self):
+        notifier = sync_async_notifier.RedisSyncAsyncNotifier('host', 6379, use_tls=False)
+        await notifier.start()
+        event = notifier.subscribe(MESSAGE_ID)
+
+        await notifier.notify(MESSAGE_ID)
+        await asyncio.wait_for(event.wait(), 1)
+
+        self.assertEqual([(sync_async_notifier.DEFAULT_CHANNEL, MESSAGE_ID)], self.connections[0].published)
+
+        await notifier.close()
+
+        self.assertTrue(all(connection.closed for connection in self.connections))
+
+    @test_utilities.async_test
+    async def test_publish_only_notifier_does_not_subscribe(self):
+        notifier = sync_async_notifier.RedisSyncAsyncNotifier('host', 6379, use_tls=False,
+                                                              receive_notifications=False)
+        await notifier.start()
+
+        self.assertEqual(1, len(self.connections))
+        self.assertIsNone(notifier._listener)
+
+        await notifier.close()
+
+    @test_utilities.async_test
+    async def test_notify_failure_is_not_raised(self):
+        notifier = sync_async_notifier.RedisSyncAsyncNotifier('host', 6379, use_tls=False,
+                                                              receive_notifications=False)
+        await notifier.start()
+        self.connections[0].publish = MagicMock(return_value=test_utilities.awaitable_exception(OSError()))
+
+        await notifier.notify(MESSAGE_ID)
+
+        await notifier.close()
+
+
+class TestCreateSyncAsyncNotifier(TestCase):
+
+    @patch('mhs_common.workflow.sync_async_notifier.config.get_config')
+    def test_notifications_are_disabled_by_default(self, config_mock):
+        config_mock.side_effect = lambda key, default=None: default
+
+        self.assertIsNone(sync_async_notifier.create_sync_async_notifier(receive_notifications=True))
+
+    @patch('mhs_common.workflow.sync_async_notifier.config.get_config')
+    def test_redis_notifier_is_built_from_config(self, config_mock):
+        config_values = {'SYNC_ASYNC_NOTIFIER': 'redis',
+                         'SYNC_ASYNC_NOTIFIER_REDIS_HOST': 'redis-host',
+                         'SYNC_ASYNC_NOTIFIER_REDIS_DISABLE_TLS': 'True'}
+        config_mock.side_effect = lambda key, default=None: config_values.get(key, default)
+
+        notifier = sync_async_notifier.create_sync_async_notifier(receive_notifications=False)
+
+        self.assertIsInstance(notifier, sync_async_notifier.RedisSyncAsyncNotifier)
+        self.assertEqual(('redis-host', 6379), notifier._address)
+        self.assertIsNone(notifier._ssl_context)
+        self.assertFalse(notifier.receive_notifications)
+
+    @patch('mhs_common.workflow.sync_async_notifier.config.get_config')
+    def test_in_process_notifier_is_shared(self, config_mock):
+        config_mock.side_effect = lambda key, default=None: 'in_process' if key == 'SYNC_ASYNC_NOTIFIER' else default
+
+        inbound_notifier = sync_async_notifier.create_sync_async_notifier(receive_notifications=False)
+        outbound_notifier = sync_async_notifier.create_sync_async_notifier(receive_notifications=True)
+
+        self.assertIsInstance(inbound_notifier, sync_async_notifier.InProcessSyncAsyncNotifier)
+        self.assertIs(inbound_notifier, outbound_notifier)
+
+    @patch('mhs_common.workflow.sync_async_notifier.config.get_config')
+    def test_unknown_notifier_type_raises_error(self, config_mock):
+        config_mock.side_effect = lambda key, default=None: 'carrier-pigeon' if key == 'SYNC_ASYNC_NOTIFIER' else default
+
+        with self.assertRaises(ValueError):
+            sync_async_notifier.create_sync_async_notifier(receive_notifications=True)
@@ -1,8 +1,10 @@
+import asyncio
 from unittest import TestCase
 from unittest.mock import MagicMock, patch
 
 from utilities import test_utilities
 
+from mhs_common.workflow import sync_async_notifier
 from mhs_common.workflow import sync_async_resynchroniser as resync
 
 PARTY_ID = "PARTY-ID"
@@ -90,3 +92,63 @@ class TestSyncAsyncReSynchroniser(TestCase):
         # Assert
         self.assertEqual(sleep_mock.call_count, 1)
         self.assertEqual(sleep_mock.call_args[0][0], 5)
+
+
+class TestSyncAsyncReSynchroniserWithNotifier(TestCase):
+
+    @test_utilities.async_test
+    async def test_notification_cuts_short_the_wait_between_polls(self):
+        store = MagicMock()
+        store.get.side_effect = [test_utilities.awaitable(None), test_utilities.awaitable(True)]
+        notifier = sync_async_notifier.InProcessSyncAsyncNotifier()
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 60, 0, notifier)
+
+        pause = asyncio.ensure_future(resynchroniser.pause_request('Message'))
+        await asyncio.sleep(0)
+        await notifier.notify('Message')
+
+        result = await asyncio.wait_for(pause, 1)
+
+        self.assertTrue(result)
+        self.assertEqual(store.get.call_count, 2)
+        self.assertEqual({}, notifier._subscriptions)
+
+    @test_utilities.async_test
+    async def test_notification_cuts_short_the_initial_delay(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable(True)
+        notifier = sync_async_notifier.InProcessSyncAsyncNotifier()
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 60, 60, notifier)
+
+        pause = asyncio.ensure_future(resynchroniser.pause_request('Message'))
+        await asyncio.sleep(0)
+        await notifier.notify('Message')
+
+        self.assertTrue(await asyncio.wait_for(pause, 1))
+        self.assertEqual(store.get.call_count, 1)
+
+    @test_utilities.async_test
+    async def test_falls_back_to_polling_without_notification(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable(None)
+        notifier = sync_async_notifier.InProcessSyncAsyncNotifier()
+        max_retries = 3
+        resynchroniser = resync.SyncAsyncResynchroniser(store, max_retries, 0.01, 0, notifier)
+
+        with self.assertRaises(resync.SyncAsyncResponseException):
+            await resynchroniser.pause_request('Message')
+
+        self.assertEqual(1 + max_retries, store.get.call_count)
+        self.assertEqual({}, notifier._subscriptions)
+
+    @test_utilities.async_test
+    async def test_store_failure_raises_response_exception(self):
+        store = MagicMock()
+        store.get.return_value = test_utilities.awaitable_exception(OSError())
+        notifier = sync_async_notifier.InProcessSyncAsyncNotifier()
+        resynchroniser = resync.SyncAsyncResynchroniser(store, 20, 1, 0, notifier)
+
+        with self.assertRaises(resync.SyncAsyncResponseException):
+            await resynchroniser.pause_request('Message')
+
+        self.assertEqual(store.get.call_count, 1)
@@ -52,7 +52,8 @@ class TestSynchronousWorkflow(unittest.TestCase):
             pass
 
         wd_mock.assert_called_with(self.wd_store, "123", workflow.SYNC,
-                                   outbound_status=work_description.MessageStatus.OUTBOUND_MESSAGE_RECEIVED)
+                                   outbound_status=work_description.MessageStatus.OUTBOUND_MESSAGE_RECEIVED,
+                                   deferred_statuses=frozenset())
         wdo_mock.publish.assert_called_once()
 
     @mock.patch.object(sync, 'logger')
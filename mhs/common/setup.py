@@ -17,5 +17,6 @@ setup(
         'tornado~=6.0',
         'isodate~=0.6',
         'marshmallow~=3.2',
+        'aioredis~=1.3',
     ]
 )
@@ -9,6 +9,8 @@ import mhs_common.messages.ebxml_request_envelope as ebxml_request_envelope
 import mhs_common.workflow as workflow
 import tornado.web
 
+from comms.http_headers import HttpHeaders
+from mhs_common.messages import multipart_parser
 from mhs_common.workflow.common import MessageData
 from utilities import mdc
 from mhs_common.configuration import configuration_manager
@@ -33,22 +35,34 @@ class InboundHandler(base_handler.BaseHandler):
 
     def initialize(self, workflows: Dict[str, workflow.CommonWorkflow],
                    config_manager: configuration_manager.ConfigurationManager,
-                   work_description_store: pa.PersistenceAdaptor, party_id: str):
+                   work_description_store: pa.PersistenceAdaptor, party_id: str,
+                   max_request_size: int = base_handler.DEFAULT_MAX_REQUEST_SIZE):
         """Initialise this request handler with the provided dependencies.
         :param workflows:
         :param config_manager: The object that can be used to obtain interaction details.
         :param work_description_store: The state store
         :param party_id: The party ID of this MHS. Sent in ebXML acknowledgements.
+        :param max_request_size: The maximum size, in bytes, of a message this handler will accept.
         """
-        super().initialize(workflows, config_manager)
+        super().initialize(workflows, config_manager, max_request_size)
         self.party_id = party_id
         self.work_description_store = work_description_store
 
+    def prepare(self):
+        super().prepare()
+        # The message's boundaries are found as each chunk of it is received, so it is ready to parse once received
+        self.multipart_parser = multipart_parser.MultipartParser(
+            self.request.headers.get(HttpHeaders.CONTENT_TYPE, ''))
+
+    def _receive_chunk(self, chunk: bytes):
+        self.multipart_parser.feed(chunk)
+
     @time_request
     async def post(self):
         logger.info('Inbound POST received: {request}', fparams={'request': self.request})
         if logger.isEnabledFor(logging.DEBUG):
-            logger.debug('Request body: %s', self.request.body.decode() if self.request.body else None)
+            body = self.multipart_parser.data
+            logger.debug('Request body: %s', body.decode(errors='replace') if body else None)
 
         request_message = self._extract_incoming_ebxml_request_message()
 
@@ -203,8 +217,8 @@ class InboundHandler(base_handler.BaseHandler):
 
     def _extract_incoming_ebxml_request_message(self):
         try:
-            request_message = ebxml_request_envelope.EbxmlRequestEnvelope.from_string(self.request.headers,
-                                                                                      self.request.body.decode())
+            request_message = ebxml_request_envelope.EbxmlRequestEnvelope.from_multipart_parser(
+                self.multipart_parser)
         except ebxml_envelope.EbXmlParsingError as e:
             logger.exception('Failed to parse response')
             raise tornado.web.HTTPError(500, 'Error occurred during message parsing',
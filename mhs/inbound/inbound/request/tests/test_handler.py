@@ -285,3 +285,28 @@ class TestInboundHandler(tornado.testing.AsyncHTTPTestCase):
 
         self.assertEqual(response.code, 500)
         self.assertIn("Exception in workflow", response.body.decode())
+
+
+class TestInboundHandlerRequestSizeLimit(tornado.testing.AsyncHTTPTestCase):
+    """A simple integration test for the request size limit enforced by the inbound request handler."""
+
+    def get_app(self):
+        self.mocked_workflows = {workflow.ASYNC_EXPRESS: unittest.mock.MagicMock()}
+        self.config_manager = unittest.mock.Mock()
+        self.state = unittest.mock.MagicMock()
+        return tornado.web.Application([
+            (r".*", handler.InboundHandler, dict(workflows=self.mocked_workflows,
+                                                 config_manager=self.config_manager,
+                                                 work_description_store=self.state, party_id=FROM_PARTY_ID,
+                                                 max_request_size=100))
+        ])
+
+    def test_post_larger_than_max_request_size_is_rejected(self):
+        request_body = 'a' * 101
+
+        response = self.fetch("/", method="POST", body=request_body, headers=ASYNC_CONTENT_TYPE_HEADERS)
+
+        self.assertEqual(response.code, 413)
+        self.assertEqual('413: Request body too large', response.body.decode())
+        self.state.get.assert_not_called()
+        self.config_manager.get_interaction_details.assert_not_called()
@@ -1,6 +1,7 @@
+import asyncio
 import pathlib
 import ssl
-from typing import Dict
+from typing import Dict, List, Union
 
 import definitions
 import tornado.httpserver
@@ -8,13 +9,15 @@ import tornado.ioloop
 import tornado.web
 import utilities.config as config
 import utilities.integration_adaptors_logger as log
-from comms import proton_queue_adaptor
+from comms import proton_queue_adaptor, queue_adaptor
 from mhs_common import workflow
 from mhs_common.configuration import configuration_manager
-from handlers import healthcheck_handler
+from mhs_common.handler import base_handler
+from mhs_common.workflow import sync_async_notifier
+from handlers import healthcheck_handler, metrics_handler
 from persistence import persistence_adaptor
 from persistence.persistence_adaptor_factory import get_persistence_adaptor
-from utilities import secrets, certs
+from utilities import secrets, certs, event_loop, workers
 
 import inbound.request.handler as async_request_handler
 from utilities.string_utilities import str2bool
@@ -44,13 +47,28 @@ def build_ssl_context(local_certs_file: str, ca_certs_file: str, key_file: str,
     return ssl_ctx
 
 
+Adaptor = Union[persistence_adaptor.PersistenceAdaptor, queue_adaptor.QueueAdaptor,
+                sync_async_notifier.SyncAsyncNotifier]
+
+
+async def start_adaptors(adaptors: List[Adaptor]) -> None:
+    await asyncio.gather(*[adaptor.start() for adaptor in adaptors])
+
+
+async def close_adaptors(adaptors: List[Adaptor]) -> None:
+    await asyncio.gather(*[adaptor.close() for adaptor in adaptors])
+
+
 def start_inbound_server(local_certs_file: str, ca_certs_file: str, key_file: str, party_key: str,
                          workflows: Dict[str, workflow.CommonWorkflow],
                          persistence_store: persistence_adaptor.PersistenceAdaptor,
-                         config_manager: configuration_manager.ConfigurationManager
+                         config_manager: configuration_manager.ConfigurationManager,
+                         adaptors: List[Adaptor]
                          ) -> None:
     """
     :param persistence_store: persistence store adaptor for message information
+    :param adaptors: The persistence and queue adaptors and sync-async notifier to open before and close after
+    serving requests.
     :param local_certs_file: The filename of the certificate to present for authentication.
     :param ca_certs_file: The filename of the CA certificates as passed to ssl.SSLContext.load_verify_locations
     :param key_file: The filename of the private key for the certificate identified by local_certs_file.
@@ -58,36 +76,58 @@ def start_inbound_server(local_certs_file: str, ca_certs_file: str, key_file: st
     :param config_manager: The config manager used to obtain interaction details
     :param party_key: The party key to use to identify this MHS.
     """
+    tornado_io_loop = tornado.ioloop.IOLoop.current()
+    tornado_io_loop.run_sync(lambda: start_adaptors(adaptors))
 
+    max_request_size = int(config.get_config('INBOUND_MAX_REQUEST_SIZE',
+                                              default=str(base_handler.DEFAULT_MAX_REQUEST_SIZE)))
     inbound_application = tornado.web.Application(
         [(r"/.*", async_request_handler.InboundHandler, dict(workflows=workflows, party_id=party_key,
                                                              work_description_store=persistence_store,
-                                                             config_manager=config_manager))])
+                                                             config_manager=config_manager,
+                                                             max_request_size=max_request_size))])
 
     ssl_ctx = build_ssl_context(local_certs_file, ca_certs_file, key_file) \
         if str2bool(config.get_config('INBOUND_USE_SSL', default=str(True))) \
         else None
 
-    inbound_server = tornado.httpserver.HTTPServer(inbound_application, ssl_options=ssl_ctx)
+    inbound_server = tornado.httpserver.HTTPServer(inbound_application, ssl_options=ssl_ctx,
+                                                   max_body_size=max_request_size)
     inbound_server_port = int(config.get_config('INBOUND_SERVER_PORT', default='443'))
-    inbound_server.listen(inbound_server_port)
-
-    healthcheck_application = tornado.web.Application([
-        ("/healthcheck", healthcheck_handler.HealthcheckHandler)
-    ])
+    workers.listen(inbound_server, inbound_server_port)
+
+    healthcheck_handlers = [("/healthcheck", healthcheck_handler.HealthcheckHandler)]
+    # Each worker process serves its own metrics on its own port
+    metrics_port = workers.get_metrics_port()
+    if metrics_port is None:
+        healthcheck_handlers.append(("/metrics", metrics_handler.MetricsHandler))
+    healthcheck_application = tornado.web.Application(healthcheck_handlers)
+    healthcheck_server = tornado.httpserver.HTTPServer(healthcheck_application)
     healthcheck_server_port = int(config.get_config('INBOUND_HEALTHCHECK_SERVER_PORT', default='80'))
-    healthcheck_application.listen(healthcheck_server_port)
+    workers.listen(healthcheck_server, healthcheck_server_port)
+    servers = [inbound_server, healthcheck_server]
+
+    if metrics_port is not None:
+        metrics_server = tornado.httpserver.HTTPServer(tornado.web.Application([
+            ("/metrics", metrics_handler.MetricsHandler)
+        ]))
+        metrics_server.listen(metrics_port)
+        servers.append(metrics_server)
+        logger.info('Serving metrics at port {metrics_port}', fparams={'metrics_port': metrics_port})
+    workers.shut_down_on_signal(servers, workers.get_shutdown_timeout())
 
     logger.info('Starting inbound server at port {server_port} and healthcheck at {healthcheck_server_port}',
                 fparams={'server_port': inbound_server_port, 'healthcheck_server_port': healthcheck_server_port})
-    tornado_io_loop = tornado.ioloop.IOLoop.current()
+    loop_lag_monitor = event_loop.start_loop_lag_monitor()
     try:
         tornado_io_loop.start()
     except KeyboardInterrupt:
         logger.warning('Keyboard interrupt')
         pass
     finally:
-        tornado_io_loop.stop()
+        if loop_lag_monitor is not None:
+            loop_lag_monitor.stop()
+        tornado_io_loop.run_sync(lambda: close_adaptors(adaptors))
         tornado_io_loop.close(True)
     logger.info('Server shut down, exiting...')
 
@@ -100,7 +140,12 @@ def create_queue_adaptor():
         password=secrets.get_secret_config('INBOUND_QUEUE_PASSWORD', default=None),
         max_retries=int(config.get_config('INBOUND_QUEUE_MAX_RETRIES', default='3')),
         retry_delay=int(config.get_config('INBOUND_QUEUE_RETRY_DELAY', default='100')) / 1000,
-        ttl_in_seconds=int(config.get_config('INBOUND_QUEUE_MESSAGE_TTL_IN_SECONDS', default='0')))
+        ttl_in_seconds=int(config.get_config('INBOUND_QUEUE_MESSAGE_TTL_IN_SECONDS', default='0')),
+        use_sender_pool=str2bool(config.get_config('INBOUND_QUEUE_USE_SENDER_POOL', default=str(False))),
+        sender_links_per_connection=int(config.get_config('INBOUND_QUEUE_SENDER_LINKS', default='1')),
+        settlement_timeout=float(config.get_config('INBOUND_QUEUE_SETTLEMENT_TIMEOUT', default='30')),
+        batch_max_size=int(config.get_config('INBOUND_QUEUE_BATCH_MAX_SIZE', default='1')),
+        batch_max_delay=int(config.get_config('INBOUND_QUEUE_BATCH_MAX_DELAY', default='5')) / 1000)
 
 
 def create_sync_async_store():
@@ -118,25 +163,34 @@ def create_work_description_store():
 
 
 def main():
+    event_loop.configure_event_loop()
+
     certificates = certs.Certs.create_certs_files(definitions.ROOT_DIR,
                                                   private_key=secrets.get_secret_config('CLIENT_KEY'),
                                                   local_cert=secrets.get_secret_config('CLIENT_CERT'),
                                                   ca_certs=secrets.get_secret_config('CA_CERTS'))
     party_key = secrets.get_secret_config('PARTY_KEY')
 
+    # Everything that holds a connection or uses the event loop is created after this point, in each worker process
+    workers.fork_workers(workers.get_worker_count('INBOUND_WORKERS'), workers.get_shutdown_timeout())
+
     queue_adaptor = create_queue_adaptor()
     work_description_store = create_work_description_store()
     sync_async_store = create_sync_async_store()
+    notifier = sync_async_notifier.create_sync_async_notifier(receive_notifications=False)
 
     workflows = workflow.get_workflow_map(inbound_async_queue=queue_adaptor,
                                           work_description_store=work_description_store,
-                                          sync_async_store=sync_async_store)
+                                          sync_async_store=sync_async_store,
+                                          sync_async_notifier=notifier)
 
     interactions_config_file = pathlib.Path(definitions.ROOT_DIR) / 'data' / "interactions" / "interactions.json"
     config_manager = configuration_manager.ConfigurationManager(str(interactions_config_file))
 
     start_inbound_server(certificates.local_cert_path, certificates.ca_certs_path, certificates.private_key_path,
-                         party_key, workflows, work_description_store, config_manager)
+                         party_key, workflows, work_description_store, config_manager,
+                         [work_description_store, sync_async_store, queue_adaptor]
+                         + ([notifier] if notifier is not None else []))
 
 
 if __name__ == "__main__":
@@ -1,7 +1,7 @@
+import asyncio
 import pathlib
-from typing import Dict
+from typing import Dict, List, Optional, Union
 
-import tornado.httpclient
 import tornado.httpserver
 import tornado.ioloop
 import tornado.web
@@ -10,14 +10,19 @@ import definitions
 import mhs_common.configuration.configuration_manager as configuration_manager
 import outbound.request.synchronous.handler as client_request_handler
 import utilities.integration_adaptors_logger as log
-from handlers import healthcheck_handler
+from comms import common_https
+from handlers import healthcheck_handler, metrics_handler
 from mhs_common import workflow
-from mhs_common.routing import route_lookup_client, spine_route_lookup_client, sds_api_client
+from mhs_common.handler import base_handler
+from mhs_common.routing import route_lookup_client, spine_route_lookup_client, sds_api_client, \
+    caching_route_lookup_client
+from mhs_common.routing.exceptions import SDSNotFoundException
 from persistence import persistence_adaptor
 from persistence.persistence_adaptor_factory import get_persistence_adaptor
+from mhs_common.workflow import sync_async_notifier
 from mhs_common.workflow import sync_async_resynchroniser as resync
 from outbound.transmission import outbound_transmission
-from utilities import config, certs
+from utilities import config, certs, event_loop, workers
 from utilities import secrets
 from utilities.string_utilities import str2bool
 
@@ -26,16 +31,29 @@ logger = log.IntegrationAdaptorsLogger(__name__)
 
 def configure_http_client():
     """
-    Configure Tornado to use the curl HTTP client.
+    Configure the Tornado HTTP client used for requests to Spine and to the routing service. Defaults to the curl HTTP
+    client, with connections kept alive and shared across requests. The simple HTTP client gives no keep-alive, so opens
+    a new connection (and performs a new TLS handshake) for every request, and cannot be used with an HTTP proxy.
+
+    :raises ValueError: If the simple HTTP client is configured along with an HTTP proxy.
     """
-    tornado.httpclient.AsyncHTTPClient.configure('tornado.curl_httpclient.CurlAsyncHTTPClient')
+    client_type = config.get_config('OUTBOUND_HTTP_CLIENT', default=common_https.HTTP_CLIENT_CURL)
+    if client_type == common_https.HTTP_CLIENT_SIMPLE:
+        proxies = [proxy for proxy in ('OUTBOUND_HTTP_PROXY', 'SPINE_ROUTE_LOOKUP_HTTP_PROXY')
+                   if config.get_config(proxy, default=None) is not None]
+        if proxies:
+            raise ValueError(f'The {common_https.HTTP_CLIENT_SIMPLE} HTTP client does not support proxies, but '
+                             f'{proxies} are configured')
+    max_clients = int(config.get_config('OUTBOUND_HTTP_MAX_CLIENTS', default='10'))
+    common_https.configure_http_client(client_type, max_clients)
 
 
 def initialise_workflows(transmission: outbound_transmission.OutboundTransmission, party_key: str,
                          work_description_store: persistence_adaptor.PersistenceAdaptor,
                          sync_async_store: persistence_adaptor.PersistenceAdaptor,
                          max_request_size: int,
-                         routing: route_lookup_client.RouteLookupClient) \
+                         routing: route_lookup_client.RouteLookupClient,
+                         notifier: Optional[sync_async_notifier.SyncAsyncNotifier] = None) \
         -> Dict[str, workflow.CommonWorkflow]:
     """Initialise the workflows
     :param transmission: The transmission object to be used to make requests to the spine endpoints
@@ -47,20 +65,27 @@ def initialise_workflows(transmission: outbound_transmission.OutboundTransmissio
     databases.
     :param routing: The routing and reliability component to use to request routing/reliability details
     from.
+    :param notifier: An optional channel on which the inbound service announces stored sync-async responses.
     :return: The workflows that can be used to handle messages.
     """
 
     resynchroniser = resync.SyncAsyncResynchroniser(sync_async_store,
                                                     int(config.get_config('RESYNC_RETRIES', '20')),
                                                     float(config.get_config('RESYNC_INTERVAL', '1.0')),
-                                                    float(config.get_config('RESYNC_INITIAL_DELAY', '0')))
+                                                    float(config.get_config('RESYNC_INITIAL_DELAY', '0')),
+                                                    notifier)
+
+    coalesced_workflows = [name.strip()
+                           for name in config.get_config('STATE_WRITE_COALESCING_WORKFLOWS', default='').split(',')
+                           if name.strip()]
 
     return workflow.get_workflow_map(party_key,
                                      work_description_store=work_description_store,
                                      transmission=transmission,
                                      resynchroniser=resynchroniser,
                                      max_request_size=max_request_size,
-                                     routing=routing
+                                     routing=routing,
+                                     coalesced_workflows=coalesced_workflows
                                      )
 
 
@@ -104,35 +129,90 @@ def initialise_sds_api_client():
     return sds_api_client.SdsApiClient(sds_url, sds_api_key, spine_org_code)
 
 
-def start_tornado_server(data_dir: pathlib.Path, workflows: Dict[str, workflow.CommonWorkflow]) -> None:
+def add_routing_cache(routing: route_lookup_client.RouteLookupClient) -> route_lookup_client.RouteLookupClient:
+    """Cache the results of the given route lookup client in process, unless disabled by configuration.
+
+    :param routing: The route lookup client to cache the results of.
+    :return: The route lookup client to be used by the workflows.
+    """
+    max_size = int(config.get_config('OUTBOUND_ROUTING_CACHE_MAX_SIZE', default='1000'))
+    if max_size <= 0:
+        logger.info('Outbound routing cache disabled')
+        return routing
+
+    expiry_time = int(config.get_config('OUTBOUND_ROUTING_CACHE_EXPIRY_TIME', default='300'))
+    negative_expiry_time = int(config.get_config('OUTBOUND_ROUTING_CACHE_NEGATIVE_EXPIRY_TIME', default='30'))
+    logger.info('Using outbound routing cache with {max_size}, {expiry_time}, {negative_expiry_time}',
+                fparams={'max_size': max_size, 'expiry_time': expiry_time,
+                         'negative_expiry_time': negative_expiry_time})
+    return caching_route_lookup_client.CachingRouteLookupClient(routing, max_size, expiry_time, negative_expiry_time,
+                                                                not_found_exceptions=(SDSNotFoundException,))
+
+
+Adaptor = Union[persistence_adaptor.PersistenceAdaptor, sync_async_notifier.SyncAsyncNotifier]
+
+
+async def start_adaptors(adaptors: List[Adaptor]) -> None:
+    await asyncio.gather(*[adaptor.start() for adaptor in adaptors])
+
+
+async def close_adaptors(adaptors: List[Adaptor]) -> None:
+    await asyncio.gather(*[adaptor.close() for adaptor in adaptors])
+
+
+def start_tornado_server(data_dir: pathlib.Path, workflows: Dict[str, workflow.CommonWorkflow],
+                         adaptors: List[Adaptor]) -> None:
     """
     Start Tornado server
     :param data_dir: The directory to load interactions configuration from.
     :param workflows: The workflows to be used to handle messages.
+    :param adaptors: The persistence adaptors and sync-async notifier to open before and close after serving requests.
     """
+    tornado_io_loop = tornado.ioloop.IOLoop.current()
+    tornado_io_loop.run_sync(lambda: start_adaptors(adaptors))
+
     interactions_config_file = str(data_dir / "interactions" / "interactions.json")
     config_manager = configuration_manager.ConfigurationManager(interactions_config_file)
 
     # Note that the paths in generate_openapi.py should be updated if these
     # paths are changed
-    supplier_application = tornado.web.Application(
-        [
-            (r"/", client_request_handler.SynchronousHandler, dict(config_manager=config_manager, workflows=workflows)),
-            (r"/healthcheck", healthcheck_handler.HealthcheckHandler)
-        ])
-    supplier_server = tornado.httpserver.HTTPServer(supplier_application)
+    max_request_size = int(config.get_config('OUTBOUND_MAX_REQUEST_SIZE',
+                                              default=str(base_handler.DEFAULT_MAX_REQUEST_SIZE)))
+    supplier_handlers = [
+        (r"/", client_request_handler.SynchronousHandler, dict(config_manager=config_manager, workflows=workflows,
+                                                               max_request_size=max_request_size)),
+        (r"/healthcheck", healthcheck_handler.HealthcheckHandler)
+    ]
+    # Each worker process serves its own metrics on its own port
+    metrics_port = workers.get_metrics_port()
+    if metrics_port is None:
+        supplier_handlers.append((r"/metrics", metrics_handler.MetricsHandler))
+    supplier_application = tornado.web.Application(supplier_handlers)
+    supplier_server = tornado.httpserver.HTTPServer(supplier_application, max_body_size=max_request_size)
     server_port = int(config.get_config('OUTBOUND_SERVER_PORT', default='80'))
-    supplier_server.listen(server_port)
+    workers.listen(supplier_server, server_port)
+    servers = [supplier_server]
+
+    if metrics_port is not None:
+        metrics_server = tornado.httpserver.HTTPServer(tornado.web.Application([
+            (r"/metrics", metrics_handler.MetricsHandler)
+        ]))
+        metrics_server.listen(metrics_port)
+        servers.append(metrics_server)
+        logger.info('Serving metrics at port {metrics_port}', fparams={'metrics_port': metrics_port})
+    workers.shut_down_on_signal(servers, workers.get_shutdown_timeout())
 
     logger.info('Starting outbound server at port {server_port}', fparams={'server_port': server_port})
-    tornado_io_loop = tornado.ioloop.IOLoop.current()
+    loop_lag_monitor = event_loop.start_loop_lag_monitor()
     try:
         tornado_io_loop.start()
     except KeyboardInterrupt:
         logger.warning('Keyboard interrupt')
         pass
     finally:
-        tornado_io_loop.stop()
+        if loop_lag_monitor is not None:
+            loop_lag_monitor.stop()
+        tornado_io_loop.run_sync(lambda: close_adaptors(adaptors))
         tornado_io_loop.close(True)
     logger.info('Server shut down, exiting...')
 
@@ -141,11 +221,10 @@ def main():
     config.setup_config("MHS")
     secrets.setup_secret_config("MHS")
     log.configure_logging("outbound")
+    event_loop.configure_event_loop()
 
     data_dir = pathlib.Path(definitions.ROOT_DIR) / "data"
 
-    configure_http_client()
-
     routing_lookup_method = config.get_config('OUTBOUND_ROUTING_LOOKUP_METHOD', default='SPINE_ROUTE_LOOKUP')
     if routing_lookup_method == 'SPINE_ROUTE_LOOKUP':
         routing = initialise_spine_route_lookup()
@@ -153,6 +232,7 @@ def main():
         routing = initialise_sds_api_client()
     else:
         raise KeyError
+    routing = add_routing_cache(routing)
 
     certificates = certs.Certs.create_certs_files(data_dir / '..',
                                                   private_key=secrets.get_secret_config('CLIENT_KEY'),
@@ -171,6 +251,10 @@ def main():
                                                               http_proxy_port)
 
     party_key = secrets.get_secret_config('PARTY_KEY')
+    configure_http_client()
+
+    # Everything that holds a connection or uses the event loop is created after this point, in each worker process
+    workers.fork_workers(workers.get_worker_count('OUTBOUND_WORKERS'), workers.get_shutdown_timeout())
 
     work_description_store = get_persistence_adaptor(
         table_name=config.get_config('STATE_TABLE_NAME'),
@@ -183,9 +267,13 @@ def main():
         retry_delay=int(config.get_config('SYNC_ASYNC_STORE_RETRY_DELAY', default='100')) / 1000)
 
     max_request_size = int(config.get_config('SPINE_REQUEST_MAX_SIZE'))
+    notifier = sync_async_notifier.create_sync_async_notifier(receive_notifications=True)
     workflows = initialise_workflows(transmission, party_key, work_description_store, sync_async_store,
-                                     max_request_size, routing)
-    start_tornado_server(data_dir, workflows)
+                                     max_request_size, routing, notifier)
+    adaptors = [work_description_store, sync_async_store]
+    if notifier is not None:
+        adaptors.append(notifier)
+    start_tornado_server(data_dir, workflows, adaptors)
 
 
 if __name__ == "__main__":
@@ -1,5 +1,6 @@
 """This module defines the outbound synchronous request handler component."""
 import json
+import logging
 
 import marshmallow
 import mhs_common.state.work_description as wd
@@ -13,7 +14,7 @@ from comms.http_headers import HttpHeaders
 from utilities import mdc
 from mhs_common.handler import base_handler
 from mhs_common.messages import ebxml_envelope
-from utilities import integration_adaptors_logger as log, message_utilities, timing
+from utilities import integration_adaptors_logger as log, message_utilities, spans, timing
 
 from mhs_common.request import request_body_schema
 
@@ -30,27 +31,33 @@ class SynchronousHandler(base_handler.BaseHandler):
         mdc.message_id.set(message_id)
         mdc.correlation_id.set(correlation_id)
 
-        interaction_id = self._extract_interaction_id()
-        wait_for_response_header = self._extract_wait_for_response_header()
-        from_asid = self._extract_from_asid()
-        ods_code = self._extract_ods_code()
+        # The time taken by each stage of handling the message is logged once it has been handled
+        with spans.message_trace():
+            interaction_id = self._extract_interaction_id()
+            wait_for_response_header = self._extract_wait_for_response_header()
+            from_asid = self._extract_from_asid()
+            ods_code = self._extract_ods_code()
 
-        logger.info('Outbound POST received. {Request}', fparams={'Request': str(self.request)})
-        logger.debug('Outbound POST request body: {Body}', fparams={'Body': self.request.body.decode()})
+            logger.info('Outbound POST received. {Request}', fparams={'Request': str(self.request)})
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug('Outbound POST request body: {Body}',
+                             fparams={'Body': self.request_body.decode(errors='replace')})
 
-        request_body = self._parse_body()
+            request_body = self._parse_body()
 
-        interaction_details = self._retrieve_interaction_details(interaction_id)
-        wf = self._extract_default_workflow(interaction_details, interaction_id)
-        self._extend_interaction_details(wf, interaction_details)
+            interaction_details = self._retrieve_interaction_details(interaction_id)
+            wf = self._extract_default_workflow(interaction_details, interaction_id)
+            self._extend_interaction_details(wf, interaction_details)
 
-        interaction_details['ods-code'] = ods_code
-        sync_async_interaction_config = self._extract_sync_async_from_interaction_details(interaction_details)
+            interaction_details['ods-code'] = ods_code
+            sync_async_interaction_config = self._extract_sync_async_from_interaction_details(interaction_details)
 
-        if self._should_invoke_sync_async_workflow(sync_async_interaction_config, wait_for_response_header):
-            await self._invoke_sync_async(from_asid, message_id, correlation_id, interaction_details, request_body, wf)
-        else:
-            await self.invoke_default_workflow(from_asid, message_id, correlation_id, interaction_details, request_body, wf)
+            if self._should_invoke_sync_async_workflow(sync_async_interaction_config, wait_for_response_header):
+                await self._invoke_sync_async(from_asid, message_id, correlation_id, interaction_details, request_body,
+                                              wf)
+            else:
+                await self.invoke_default_workflow(from_asid, message_id, correlation_id, interaction_details,
+                                                   request_body, wf)
 
     def _parse_body(self) -> request_body_schema.RequestBody:
         try:
@@ -65,14 +72,15 @@ class SynchronousHandler(base_handler.BaseHandler):
                                         'Unsupported content type. Only application/json request bodies are supported.',
                                         reason='Unsupported content type. Only application/json request bodies are '
                                                'supported.')
-        body = self.request.body.decode()
-        if not body:
+        if not self.request_body:
             logger.error('Body missing from request')
             raise tornado.web.HTTPError(400, 'Body missing from request', reason='Body missing from request')
         try:
-            # Parse the body as JSON and validate it against RequestBodySchema
-            parsed_body: request_body_schema.RequestBody = request_body_schema.RequestBodySchema().loads(body)
-        except json.JSONDecodeError as e:
+            # Parse the body as JSON and validate it against RequestBodySchema. The JSON parser decodes the streamed
+            # bytes itself, so no decoded copy of the whole body is made first.
+            parsed_body: request_body_schema.RequestBody = \
+                request_body_schema.RequestBodySchema().loads(self.request_body)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
             logger.error('Invalid JSON request body')
             raise tornado.web.HTTPError(400, 'Invalid JSON request body', reason='Invalid JSON request body') from e
         except marshmallow.ValidationError as e:
@@ -347,6 +347,14 @@ class TestSynchronousHandler(BaseHandlerTest):
         self.assertEqual(response.headers["Correlation-Id"], CORRELATION_ID)
         self.assertIn("Invalid JSON request body", response.body.decode())
 
+    def test_post_with_body_not_encoded_as_utf8(self):
+        self.config_manager.get_interaction_details.return_value = None
+
+        response = self.call_handler(body=b'{"payload": "\xff"}')
+
+        self.assertEqual(response.code, 400)
+        self.assertIn("Invalid JSON request body", response.body.decode())
+
     def test_handler_updates_store_for_wait_for_response(self):
         expected_response = "Hello world!"
         wdo = unittest.mock.MagicMock()
@@ -626,6 +634,24 @@ class TestSynchronousHandlerRequestBodyValidation(BaseHandlerTest):
         return response_body
 
 
+class TestSynchronousHandlerRequestSizeLimit(BaseHandlerTest):
+
+    def get_app(self):
+        self.config_manager = unittest.mock.Mock()
+        return tornado.web.Application([
+            (r"/", handler.SynchronousHandler,
+             dict(config_manager=self.config_manager, workflows={}, max_request_size=len(REQUEST_BODY) - 1))
+        ])
+
+    def test_post_larger_than_max_request_size_is_rejected(self):
+        response = self.call_handler()
+
+        self.assertEqual(response.code, 413)
+        self.assertEqual(response.headers["Correlation-Id"], CORRELATION_ID)
+        self.assertEqual("413: Request body too large", response.body.decode())
+        self.config_manager.get_interaction_details.assert_not_called()
+
+
 class TestSynchronousHandlerSyncMessage(BaseHandlerTest):
 
     def get_app(self):
@@ -1,13 +1,14 @@
 """This module defines the outbound transmission component."""
 
 from ssl import SSLError
-from typing import Dict
+from typing import Dict, Union
 
 from comms.common_https import CommonHttps
+from comms.http_body import HttpBody
 from retry import retriable_action
 from mhs_common.transmission import transmission_adaptor
 from tornado import httpclient
-from utilities import integration_adaptors_logger as log
+from utilities import integration_adaptors_logger as log, spans
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
@@ -46,7 +47,7 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
         self._proxy_host = http_proxy_host
         self._proxy_port = http_proxy_port
 
-    async def make_request(self, url: str, headers: Dict[str, str], message: str,
+    async def make_request(self, url: str, headers: Dict[str, str], message: Union[str, HttpBody],
                            raise_error_response: bool = True) -> httpclient.HTTPResponse:
 
         async def make_http_request():
@@ -57,12 +58,15 @@ class OutboundTransmission(transmission_adaptor.TransmissionAdaptor):
                             "proxy_host": self._proxy_host,
                             "proxy_port": self._proxy_port
                         })
-            response = await CommonHttps.make_request(url=url, method="POST", headers=headers, body=message,
-                                                      client_cert=self._client_cert, client_key=self._client_key,
-                                                      ca_certs=self._ca_certs, validate_cert=self._validate_cert,
-                                                      http_proxy_host=self._proxy_host,
-                                                      http_proxy_port=self._proxy_port,
-                                                      raise_error_response=raise_error_response)
+            # Each attempt is a span of its own, so that the delays between retries (spans of their own) are not
+            # counted as transmission time
+            with spans.span('transmission'):
+                response = await CommonHttps.make_request(url=url, method="POST", headers=headers, body=message,
+                                                          client_cert=self._client_cert, client_key=self._client_key,
+                                                          ca_certs=self._ca_certs, validate_cert=self._validate_cert,
+                                                          http_proxy_host=self._proxy_host,
+                                                          http_proxy_port=self._proxy_port,
+                                                          raise_error_response=raise_error_response)
             logger.info("Sent message with {headers} to {url} using {proxy_host} & {proxy_port} and "
                         "received status code {code}",
                         fparams={
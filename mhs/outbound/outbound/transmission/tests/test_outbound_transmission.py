@@ -5,6 +5,7 @@ from unittest.mock import patch, sentinel, call
 
 import definitions
 from tornado import httpclient
+from utilities import spans
 from utilities.test_utilities import async_test, awaitable
 
 from outbound.transmission import outbound_transmission
@@ -159,3 +160,20 @@ class TestOutboundTransmission(TestCase):
             self.assertEqual(mock_fetch.call_count, EXPECTED_MAX_HTTP_REQUESTS)
             expected_sleep_arguments = [call(RETRY_DELAY_IN_SECONDS) for _ in range(MAX_RETRIES)]
             self.assertEqual(expected_sleep_arguments, mock_sleep.call_args_list)
+
+    @patch("asyncio.sleep")
+    @async_test
+    async def test_each_attempt_is_a_separate_transmission_span(self, mock_sleep):
+        transmission = outbound_transmission.OutboundTransmission(CLIENT_CERT_PATH, CLIENT_KEY_PATH, CA_CERTS_PATH, 1,
+                                                                  RETRY_DELAY, VALIDATE_CERT)
+        mock_sleep.return_value = awaitable(None)
+
+        with patch.object(httpclient.AsyncHTTPClient(), "fetch") as mock_fetch, patch.object(spans, 'logger'), \
+                spans.message_trace() as trace:
+            mock_fetch.side_effect = Exception
+
+            with self.assertRaises(Exception):
+                await transmission.make_request(URL_VALUE, HEADERS, MESSAGE)
+
+        self.assertEqual(2, trace.counts['transmission'])
+        self.assertEqual(1, trace.counts['retry_delay'])
@@ -0,0 +1,56 @@
+import unittest.mock
+
+from comms import common_https
+from utilities import config
+
+import main
+
+CONFIG_PREFIX = "MHS"
+HTTP_CLIENT_KEY = "MHS_OUTBOUND_HTTP_CLIENT"
+MAX_CLIENTS_KEY = "MHS_OUTBOUND_HTTP_MAX_CLIENTS"
+OUTBOUND_PROXY_KEY = "MHS_OUTBOUND_HTTP_PROXY"
+ROUTE_LOOKUP_PROXY_KEY = "MHS_SPINE_ROUTE_LOOKUP_HTTP_PROXY"
+PROXY_HOST = "proxy"
+
+
+@unittest.mock.patch.object(common_https, "configure_http_client")
+@unittest.mock.patch("os.environ", new_callable=dict)
+@unittest.mock.patch.dict(config.config)
+class TestConfigureHttpClient(unittest.TestCase):
+
+    def test_configure_curl_client_by_default(self, mock_environment, mock_configure):
+        config.setup_config(CONFIG_PREFIX)
+
+        main.configure_http_client()
+
+        mock_configure.assert_called_once_with(common_https.HTTP_CLIENT_CURL, 10)
+
+    def test_configure_simple_client(self, mock_environment, mock_configure):
+        mock_environment[HTTP_CLIENT_KEY] = common_https.HTTP_CLIENT_SIMPLE
+        mock_environment[MAX_CLIENTS_KEY] = "20"
+        config.setup_config(CONFIG_PREFIX)
+
+        main.configure_http_client()
+
+        mock_configure.assert_called_once_with(common_https.HTTP_CLIENT_SIMPLE, 20)
+
+    def test_configure_curl_client_with_proxy(self, mock_environment, mock_configure):
+        mock_environment[OUTBOUND_PROXY_KEY] = PROXY_HOST
+        config.setup_config(CONFIG_PREFIX)
+
+        main.configure_http_client()
+
+        mock_configure.assert_called_once_with(common_https.HTTP_CLIENT_CURL, 10)
+
+    def test_simple_client_with_proxy_is_rejected(self, mock_environment, mock_configure):
+        for proxy_key in [OUTBOUND_PROXY_KEY, ROUTE_LOOKUP_PROXY_KEY]:
+            with self.subTest(proxy_key):
+                mock_environment.clear()
+                mock_environment[HTTP_CLIENT_KEY] = common_https.HTTP_CLIENT_SIMPLE
+                mock_environment[proxy_key] = PROXY_HOST
+                config.setup_config(CONFIG_PREFIX)
+
+                with self.assertRaises(ValueError):
+                    main.configure_http_client()
+
+        mock_configure.assert_not_called()
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import ssl
+from typing import Dict, Optional
+
+import aioredis
+from utilities import integration_adaptors_logger as log, timing
+
+from lookup import cache_adaptor
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+
+class AsyncRedisCache(cache_adaptor.CacheAdaptor):
+    """A cache adaptor that talks to Redis using a pool of asyncio connections.
+
+    Unlike :class:`lookup.redis_cache.RedisCache`, no executor threads are used. Commands issued concurrently on a
+    pooled connection are pipelined by the client, so many in-flight lookups share a small number of connections.
+    """
+
+    def __init__(self, redis_host: str, redis_port: int, expiry_time: float = cache_adaptor.FIFTEEN_MINUTES_IN_SECONDS,
+                 use_tls: bool = True, min_pool_size: int = 1, max_pool_size: int = 10,
+                 connect_timeout: Optional[float] = None):
+        """Initialise a new AsyncRedisCache.
+
+        :param redis_host: The Redis host to use for caching.
+        :param redis_port: The port on which to connect to the Redis host.
+        :param expiry_time: The expiry time (in seconds) to set for cache entries.
+        :param use_tls: Whether or not to use TLS when connecting to the Redis host.
+        :param min_pool_size: The number of connections to open when the pool is created.
+        :param max_pool_size: The maximum number of connections the pool may open.
+        :param connect_timeout: The time (in seconds) to wait when opening a new connection. None waits indefinitely.
+        """
+        if expiry_time < 0:
+            raise ValueError('Expiry time must not be non-negative')
+        if min_pool_size < 0 or max_pool_size < 1 or min_pool_size > max_pool_size:
+            raise ValueError('Pool sizes must satisfy 0 <= min_pool_size <= max_pool_size and max_pool_size >= 1')
+
+        self.expiry_time = expiry_time
+        self.min_pool_size = min_pool_size
+        self.max_pool_size = max_pool_size
+        self.connect_timeout = connect_timeout
+
+        self._address = (redis_host, redis_port)
+        self._ssl_context = ssl.create_default_context() if use_tls else None
+        self._pool_creation: Optional[asyncio.Future] = None
+        logger.info("Async Redis client configured. {host}, {port}, {ssl}, {min_pool_size}, {max_pool_size}",
+                    fparams={"host": redis_host, "port": redis_port, "ssl": use_tls,
+                             "min_pool_size": min_pool_size, "max_pool_size": max_pool_size})
+
+    async def start(self) -> None:
+        """Open the connection pool. If not called, the pool is opened on first use."""
+        await self._get_redis()
+
+    async def close(self) -> None:
+        """Close the connection pool and wait for its connections to be released."""
+        pool_creation, self._pool_creation = self._pool_creation, None
+        if pool_creation is None:
+            return
+
+        try:
+            redis_pool = await pool_creation
+        except Exception:
+            return
+        redis_pool.close()
+        await redis_pool.wait_closed()
+        logger.info("Async Redis connection pool closed.")
+
+    @timing.time_function
+    async def retrieve_mhs_attributes_value(self, ods_code: str, interaction_id: str) -> Optional[Dict]:
+        """
+        Returns a value for the given ods code/interaction id. Returns None if the key is expired or not found. Raises
+        an exception if the value cannot be interpreted or there is an error communicating with the Redis cache.
+
+        :param ods_code: The ODS code the value belongs to. Used to construct the Redis key.
+        :param interaction_id: The interaction ID code the value belongs to. Used to construct the Redis key.
+        :return The cached value, or None if it could not be found.
+        """
+        key = AsyncRedisCache._generate_key(ods_code, interaction_id)
+
+        try:
+            logger.info("Attempting to retrieve cache entry for {key}", fparams={"key": key})
+            redis_pool = await self._get_redis()
+            cached_json_value = await redis_pool.get(key)
+
+            if cached_json_value is None:
+                logger.info("No cache entry found for {key}.", fparams={"key": key})
+                return None
+
+            value = json.loads(cached_json_value)
+
+            logger.info("Retrieved cache entry for {key}. {value}", fparams={"key": key, "value": value})
+
+            return value
+        except (aioredis.RedisError, OSError, asyncio.TimeoutError) as e:
+            logger.exception("An error occurred when attempting to load {key}.", fparams={"key": key})
+            raise e
+
+    @timing.time_function
+    async def add_cache_value(self, ods_code: str, interaction_id: str, value: Dict) -> None:
+        """
+        Adds a value to the cache.
+
+        :param ods_code: The ODS code the value belongs to. Used to construct the Redis key.
+        :param interaction_id: The interaction ID code the value belongs to. Used to construct the Redis key.
+        :param value: The value to be cached.
+        """
+        key = AsyncRedisCache._generate_key(ods_code, interaction_id)
+
+        # Store the dictionary as a JSON string, since Redis doesn't support maps with non-string values.
+        json_value = json.dumps(value)
+
+        try:
+            logger.info("Attempting to store {value} in the cache using {key}",
+                        fparams={"value": json_value, "key": key})
+            redis_pool = await self._get_redis()
+            await redis_pool.setex(key, self.expiry_time, json_value)
+            logger.info("Successfully stored {value} in the cache using {key}",
+                        fparams={"value": json_value, "key": key})
+        except (aioredis.RedisError, OSError, asyncio.TimeoutError) as e:
+            logger.exception("An error occurred when caching {value}.", fparams={"value": json_value})
+            raise e
+
+    async def _get_redis(self) -> aioredis.Redis:
+        """Return the shared connection pool, creating it if this is the first use. Concurrent first callers wait on
+        the same creation rather than opening a pool each. A failed creation is retried on the next call."""
+        if self._pool_creation is None:
+            self._pool_creation = asyncio.ensure_future(self._create_pool())
+
+        pool_creation = self._pool_creation
+        try:
+            return await asyncio.shield(pool_creation)
+        except Exception:
+            if self._pool_creation is pool_creation:
+                self._pool_creation = None
+            raise
+
+    async def _create_pool(self) -> aioredis.Redis:
+        logger.info("Opening async Redis connection pool to {address}", fparams={"address": self._address})
+        return await aioredis.create_redis_pool(self._address,
+                                                ssl=self._ssl_context,
+                                                minsize=self.min_pool_size,
+                                                maxsize=self.max_pool_size,
+                                                create_connection_timeout=self.connect_timeout,
+                                                encoding='utf-8')
+
+    @staticmethod
+    def _generate_key(ods_code: str, interaction_id: str) -> str:
+        return ods_code + '-' + interaction_id
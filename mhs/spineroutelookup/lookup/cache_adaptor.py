@@ -26,3 +26,16 @@ class CacheAdaptor(abc.ABC):
         Adds a value to the cache, recording the input time used to determine when values have expired
         """
         raise NotImplementedError()
+
+    async def start(self) -> None:
+        """
+        Open any long-lived resources (such as connection pools) used by this cache. Calling this is optional;
+        implementations that hold no such resources can rely on this default no-op.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release any long-lived resources opened by this cache.
+        """
+        pass
@@ -1,15 +1,21 @@
 """This module defines the component used to orchestrate the retrieval and caching of routing and reliability
 information for a remote MHS."""
 
-from typing import Dict
+import asyncio
+from typing import Dict, Tuple
 
-from utilities import integration_adaptors_logger as log
+from utilities import integration_adaptors_logger as log, metrics
 
 import lookup.cache_adaptor as cache_adaptor
 import lookup.sds_client as sds_client
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
+CACHE_LOOKUPS = metrics.counter('mhs_attribute_cache_lookups_total',
+                                'The number of MHS attribute lookups made through the cache, by result (hit, miss or '
+                                'error)',
+                                ['result'])
+
 
 class MHSAttributeLookup(object):
     """A tool that allows the routing and reliability information for a remote MHS to be retrieved."""
@@ -26,6 +32,7 @@ class MHSAttributeLookup(object):
             raise ValueError('No cache supplied')
         self.cache = cache
         self.sds_client = client
+        self._sds_lookups_in_flight: Dict[Tuple[str, str], asyncio.Future] = {}
 
     async def retrieve_mhs_attributes(self, ods_code, interaction_id) -> Dict:
         """Obtains the attributes of the MHS registered for the given ODS code and interaction ID. These details will
@@ -39,13 +46,54 @@ class MHSAttributeLookup(object):
         try:
             cache_value = await self.cache.retrieve_mhs_attributes_value(ods_code, interaction_id)
             if cache_value:
+                CACHE_LOOKUPS.inc(result='hit')
                 logger.info('MHS details found in cache for {ods_code} & {interaction_id}',
                             fparams={'ods_code': ods_code, 'interaction_id': interaction_id})
                 return cache_value
+            CACHE_LOOKUPS.inc(result='miss')
         except Exception:
+            CACHE_LOOKUPS.inc(result='error')
             logger.error('Failed to retrieve value from cache for {ods_code} & {interaction_id}',
                          fparams={'ods_code': ods_code, 'interaction_id': interaction_id})
 
+        return await self._coalesced_sds_lookup(ods_code, interaction_id)
+
+    async def refresh_mhs_attributes(self, ods_code, interaction_id) -> Dict:
+        """Looks up the attributes of the MHS registered for the given ODS code and interaction ID in SDS, bypassing
+        the cache, and stores the result in the cache.
+
+        :param ods_code:
+        :param interaction_id:
+        :return:
+        """
+        return await self._coalesced_sds_lookup(ods_code, interaction_id)
+
+    async def _coalesced_sds_lookup(self, ods_code, interaction_id) -> Dict:
+        """Look up the MHS details for the given ODS code and interaction ID in SDS, caching the result. Concurrent
+        callers for the same ODS code and interaction ID share a single SDS query, and all receive its result or
+        exception.
+        """
+        key = (ods_code, interaction_id)
+        sds_lookup = self._sds_lookups_in_flight.get(key)
+        if sds_lookup is None:
+            sds_lookup = asyncio.ensure_future(self._sds_lookup(ods_code, interaction_id))
+            self._sds_lookups_in_flight[key] = sds_lookup
+            sds_lookup.add_done_callback(lambda future: self._sds_lookup_done(key, future))
+        else:
+            logger.info('Waiting for SDS lookup already in progress for {ods_code} & {interaction_id}',
+                        fparams={'ods_code': ods_code, 'interaction_id': interaction_id})
+
+        # Shield the shared lookup so that one caller being cancelled does not cancel it for the others
+        return await asyncio.shield(sds_lookup)
+
+    def _sds_lookup_done(self, key: Tuple[str, str], sds_lookup: asyncio.Future) -> None:
+        if self._sds_lookups_in_flight.get(key) is sds_lookup:
+            del self._sds_lookups_in_flight[key]
+        if not sds_lookup.cancelled():
+            # Mark any exception as retrieved, as every caller waiting on it may have been cancelled
+            sds_lookup.exception()
+
+    async def _sds_lookup(self, ods_code, interaction_id) -> Dict:
         endpoint_details = await self.sds_client.get_mhs_details(ods_code, interaction_id)
         logger.info('MHS details obtained from sds, adding to cache for {ods_code} & {interaction_id}. {endpoint_details}',
                     fparams={'ods_code': ods_code, 'interaction_id': interaction_id, 'endpoint_details': endpoint_details})
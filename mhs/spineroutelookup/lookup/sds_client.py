@@ -57,7 +57,7 @@ class SDSClient(object):
         if not accredited_system_lookup:
             logger.error("Failed to find accredited system details for {ods_code} & {interaction_id}",
                          fparams={"ods_code": ods_code, "interaction_id": interaction_id})
-            raise sds_exception.SDSException('No response from accredited system lookup')
+            raise sds_exception.SDSNotFoundException('No response from accredited system lookup')
 
         if len(accredited_system_lookup) > 1:
             logger.warning("More than one accredited system details returned on inputs: {ods_code} & "
@@ -74,8 +74,8 @@ class SDSClient(object):
         if not details:
             logger.error("No mhs details returned for {party_key} & {interaction_id}",
                          fparams={"party_key": party_key, "interaction_id": interaction_id})
-            raise sds_exception.SDSException(f'No mhs details returned for party key: '
-                                             f'{party_key} and interaction id : {interaction_id}')
+            raise sds_exception.SDSNotFoundException(f'No mhs details returned for party key: '
+                                                     f'{party_key} and interaction id : {interaction_id}')
         if len(details) > 1:
             logger.warning("More than one mhs details returned on inputs: {ods_code} & {interaction_id}",
                            fparams={"ods_code": ods_code, "interaction_id": interaction_id})
@@ -5,3 +5,11 @@ class SDSException(Exception):
     """
 
     pass
+
+
+class SDSNotFoundException(SDSException):
+    """
+    An SDSNotFoundException is thrown when SDS holds no details for the requested ODS code and interaction ID.
+    """
+
+    pass
@@ -0,0 +1,158 @@
+import asyncio
+import unittest.mock
+
+import aioredis
+from utilities.test_utilities import async_test, awaitable, awaitable_exception
+
+from lookup import async_redis_cache
+
+REDIS_HOST = "host"
+REDIS_PORT = 1234
+USE_TLS = False
+
+ODS_CODE = "ods"
+INTERACTION_ID = "interaction-id"
+CACHE_KEY = ODS_CODE + "-" + INTERACTION_ID
+
+VALUE_DICTIONARY = {
+    "key1": "value1",
+    "key2": ["list_entry_1", "list_entry_2"],
+    "key3": {
+        "nested_key_1": "nested_value_1",
+        "nested_key_2": "nested_value_2"
+    }
+}
+
+VALUE_DICTIONARY_JSON = '{"key1": "value1", "key2": ["list_entry_1", "list_entry_2"], "key3": {' \
+                        '"nested_key_1": "nested_value_1", "nested_key_2": "nested_value_2"}}'
+
+FIFTEEN_MINUTES_IN_SECONDS = 900
+
+
+class TestAsyncRedisCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        # Mock the aioredis.create_redis_pool() coroutine
+        patcher = unittest.mock.patch.object(aioredis, "create_redis_pool")
+        self.mock_create_redis_pool = patcher.start()
+        self.addCleanup(patcher.stop)
+
+        # Mock the pooled Redis client itself
+        self.mock_redis = unittest.mock.MagicMock()
+        self.mock_redis.wait_closed.side_effect = lambda: awaitable()
+        self.mock_create_redis_pool.side_effect = lambda *args, **kwargs: awaitable(self.mock_redis)
+
+    @async_test
+    async def test_redis_params_are_passed(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT, use_tls=USE_TLS, min_pool_size=2,
+                                                  max_pool_size=5, connect_timeout=3)
+
+        await cache.start()
+
+        self.mock_create_redis_pool.assert_called_once_with((REDIS_HOST, REDIS_PORT), ssl=None, minsize=2,
+                                                            maxsize=5, create_connection_timeout=3,
+                                                            encoding='utf-8')
+
+    @async_test
+    async def test_tls_is_enabled_by_default(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+
+        await cache.start()
+
+        self.assertIsNotNone(self.mock_create_redis_pool.call_args[1]['ssl'])
+
+    @async_test
+    async def test_pool_is_created_once_for_concurrent_requests(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.get.side_effect = lambda key: awaitable(VALUE_DICTIONARY_JSON)
+
+        await asyncio.gather(*[cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID) for _ in range(5)])
+
+        self.mock_create_redis_pool.assert_called_once()
+        self.assertEqual(5, self.mock_redis.get.call_count)
+
+    @async_test
+    async def test_pool_creation_is_retried_after_failure(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_create_redis_pool.side_effect = [awaitable_exception(ConnectionRefusedError()),
+                                                   awaitable(self.mock_redis)]
+        self.mock_redis.get.side_effect = lambda key: awaitable(None)
+
+        with self.assertRaises(ConnectionRefusedError):
+            await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.assertIsNone(await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID))
+        self.assertEqual(2, self.mock_create_redis_pool.call_count)
+
+    @async_test
+    async def test_close_closes_pool(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        await cache.start()
+
+        await cache.close()
+        await cache.close()
+
+        self.mock_redis.close.assert_called_once()
+        self.mock_redis.wait_closed.assert_called_once()
+
+    @async_test
+    async def test_should_retrieve_value_from_store_if_exists(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.get.side_effect = lambda key: awaitable(VALUE_DICTIONARY_JSON)
+
+        value = await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(value, VALUE_DICTIONARY)
+        self.mock_redis.get.assert_called_with(CACHE_KEY)
+
+    @async_test
+    async def test_should_return_none_if_value_does_not_exist(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.get.side_effect = lambda key: awaitable(None)
+
+        value = await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.assertIsNone(value)
+
+    @async_test
+    async def test_should_raise_exception_if_fails_to_retrieve_value(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.get.side_effect = lambda key: awaitable_exception(aioredis.RedisError())
+
+        with self.assertRaises(aioredis.RedisError):
+            await cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+    @async_test
+    async def test_should_store_value_as_json(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.setex.side_effect = lambda *args: awaitable(True)
+
+        await cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE_DICTIONARY)
+
+        self.mock_redis.setex.assert_called_with(CACHE_KEY, FIFTEEN_MINUTES_IN_SECONDS, VALUE_DICTIONARY_JSON)
+
+    @async_test
+    async def test_store_should_use_custom_expiry_time_if_specified(self):
+        custom_expiry_time = 27
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT, expiry_time=custom_expiry_time)
+        self.mock_redis.setex.side_effect = lambda *args: awaitable(True)
+
+        await cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE_DICTIONARY)
+
+        self.mock_redis.setex.assert_called_with(CACHE_KEY, custom_expiry_time, VALUE_DICTIONARY_JSON)
+
+    @async_test
+    async def test_store_should_propagate_redis_error_to_caller(self):
+        cache = async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT)
+        self.mock_redis.setex.side_effect = lambda *args: awaitable_exception(aioredis.RedisError())
+
+        with self.assertRaises(aioredis.RedisError):
+            await cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE_DICTIONARY)
+
+    def test_should_only_accept_positive_expiry_times(self):
+        with self.assertRaises(ValueError):
+            async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT, -1)
+
+    def test_should_only_accept_valid_pool_sizes(self):
+        with self.assertRaises(ValueError):
+            async_redis_cache.AsyncRedisCache(REDIS_HOST, REDIS_PORT, min_pool_size=5, max_pool_size=2)
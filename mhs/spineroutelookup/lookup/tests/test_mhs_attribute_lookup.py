@@ -1,3 +1,4 @@
+import asyncio
 from unittest import TestCase
 from unittest import mock
 
@@ -104,3 +105,85 @@ class TestMHSAttributeLookup(TestCase):
         attributes = await handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
 
         self.assertEqual(expected_mhs_attributes, attributes)
+
+
+class TestMHSAttributeLookupCoalescing(TestCase):
+
+    def setUp(self) -> None:
+        self.cache = mock.MagicMock()
+        self.cache.retrieve_mhs_attributes_value.side_effect = lambda *args: test_utilities.awaitable(None)
+        self.cache.add_cache_value.side_effect = lambda *args: test_utilities.awaitable(None)
+        self.sds_client = mock.MagicMock()
+        self.handler = mhs_attribute_lookup.MHSAttributeLookup(self.sds_client, self.cache)
+
+    @async_test
+    async def test_concurrent_lookups_for_same_key_share_one_sds_query(self):
+        sds_result = asyncio.Future()
+        self.sds_client.get_mhs_details.return_value = sds_result
+
+        lookups = [asyncio.ensure_future(self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID))
+                   for _ in range(3)]
+        await asyncio.sleep(0)
+        sds_result.set_result(expected_mhs_attributes)
+        results = await asyncio.gather(*lookups)
+
+        self.assertEqual([expected_mhs_attributes] * 3, results)
+        self.sds_client.get_mhs_details.assert_called_once_with(ODS_CODE, INTERACTION_ID)
+        self.cache.add_cache_value.assert_called_once_with(ODS_CODE, INTERACTION_ID, expected_mhs_attributes)
+
+    @async_test
+    async def test_concurrent_lookups_for_same_key_share_exception(self):
+        sds_result = asyncio.Future()
+        self.sds_client.get_mhs_details.return_value = sds_result
+
+        lookups = [asyncio.ensure_future(self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID))
+                   for _ in range(2)]
+        await asyncio.sleep(0)
+        sds_result.set_exception(ConnectionError())
+        results = await asyncio.gather(*lookups, return_exceptions=True)
+
+        self.assertEqual(2, len([result for result in results if isinstance(result, ConnectionError)]))
+        self.sds_client.get_mhs_details.assert_called_once()
+
+    @async_test
+    async def test_concurrent_lookups_for_different_keys_are_not_shared(self):
+        self.sds_client.get_mhs_details.side_effect = lambda *args: test_utilities.awaitable(expected_mhs_attributes)
+
+        await asyncio.gather(self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID),
+                             self.handler.retrieve_mhs_attributes("ODSCODE2", INTERACTION_ID))
+
+        self.assertEqual(2, self.sds_client.get_mhs_details.call_count)
+
+    @async_test
+    async def test_lookup_after_completed_query_issues_new_query(self):
+        self.sds_client.get_mhs_details.side_effect = \
+            [test_utilities.awaitable_exception(ConnectionError()), test_utilities.awaitable(expected_mhs_attributes)]
+
+        with self.assertRaises(ConnectionError):
+            await self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(expected_mhs_attributes, await self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID))
+        self.assertEqual(2, self.sds_client.get_mhs_details.call_count)
+
+    @async_test
+    async def test_cancelled_caller_does_not_cancel_shared_query(self):
+        sds_result = asyncio.Future()
+        self.sds_client.get_mhs_details.return_value = sds_result
+
+        cancelled_lookup = asyncio.ensure_future(self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID))
+        other_lookup = asyncio.ensure_future(self.handler.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID))
+        await asyncio.sleep(0)
+        cancelled_lookup.cancel()
+        sds_result.set_result(expected_mhs_attributes)
+
+        self.assertEqual(expected_mhs_attributes, await other_lookup)
+
+    @async_test
+    async def test_refresh_bypasses_cache(self):
+        self.sds_client.get_mhs_details.side_effect = lambda *args: test_utilities.awaitable(expected_mhs_attributes)
+
+        result = await self.handler.refresh_mhs_attributes(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(expected_mhs_attributes, result)
+        self.cache.retrieve_mhs_attributes_value.assert_not_called()
+        self.cache.add_cache_value.assert_called_once_with(ODS_CODE, INTERACTION_ID, expected_mhs_attributes)
@@ -77,6 +77,21 @@ class TestRoutingAndReliability(unittest.TestCase):
         with self.assertRaises(sds_exception.SDSException):
             await router.get_reliability(ODS_CODE, "whew")
 
+    @async_test
+    async def test_get_routing_and_reliability(self):
+        router = self._configure_routing_and_reliability()
+
+        routing_reliability_details = await router.get_routing_and_reliability(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(routing_reliability_details, {**EXPECTED_ROUTING, **EXPECTED_RELIABILITY})
+
+    @async_test
+    async def test_get_routing_and_reliability_bad_ods_code(self):
+        router = self._configure_routing_and_reliability()
+
+        with self.assertRaises(sds_exception.SDSException):
+            await router.get_routing_and_reliability("bad code", INTERACTION_ID)
+
     @async_test
     async def test_empty_handler(self):
         with self.assertRaises(ValueError):
@@ -89,7 +89,7 @@ class TestSDSClient(TestCase):
     @async_test
     async def test_no_results(self):
         client = mocks.mocked_sds_client()
-        with self.assertRaises(re.SDSException):
+        with self.assertRaises(re.SDSNotFoundException):
             await client.get_mhs_details("fake code", "fake interaction")
 
     @async_test
@@ -0,0 +1,120 @@
+import unittest.mock
+
+from utilities.test_utilities import async_test, awaitable, awaitable_exception
+
+from lookup import two_tier_cache
+
+ODS_CODE = "ods"
+OTHER_ODS_CODE = "other-ods"
+INTERACTION_ID = "interaction-id"
+OTHER_INTERACTION_ID = "other-interaction-id"
+VALUE = {"nhsMHSEndPoint": ["https://example.com/"]}
+OTHER_VALUE = {"nhsMHSEndPoint": ["https://example.org/"]}
+MAX_SIZE = 2
+EXPIRY_TIME = 10
+
+
+class TestTwoTierCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.shared_cache = unittest.mock.MagicMock()
+        self.shared_cache.retrieve_mhs_attributes_value.side_effect = lambda ods_code, interaction_id: awaitable(VALUE)
+        self.shared_cache.add_cache_value.side_effect = lambda ods_code, interaction_id, value: awaitable()
+        self.now = 0
+        self.cache = two_tier_cache.TwoTierCache(self.shared_cache, MAX_SIZE, EXPIRY_TIME, clock=lambda: self.now)
+
+    @async_test
+    async def test_local_miss_is_served_from_shared_cache(self):
+        value = await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(VALUE, value)
+        self.shared_cache.retrieve_mhs_attributes_value.assert_called_once_with(ODS_CODE, INTERACTION_ID)
+        self.assertEqual({'hits': 0, 'misses': 1, 'evictions': 0, 'size': 1}, self.cache.stats())
+
+    @async_test
+    async def test_local_hit_does_not_use_shared_cache(self):
+        await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        value = await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(VALUE, value)
+        self.shared_cache.retrieve_mhs_attributes_value.assert_called_once()
+        self.assertEqual(1, self.cache.hits)
+
+    @async_test
+    async def test_shared_cache_miss_is_not_held_locally(self):
+        self.shared_cache.retrieve_mhs_attributes_value.side_effect = lambda ods_code, interaction_id: awaitable(None)
+
+        self.assertIsNone(await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID))
+        self.assertIsNone(await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID))
+
+        self.assertEqual(2, self.shared_cache.retrieve_mhs_attributes_value.call_count)
+        self.assertEqual(0, self.cache.stats()['size'])
+
+    @async_test
+    async def test_expired_local_entry_is_reloaded_from_shared_cache(self):
+        await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME
+
+        await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(2, self.shared_cache.retrieve_mhs_attributes_value.call_count)
+        self.assertEqual(2, self.cache.misses)
+
+    @async_test
+    async def test_least_recently_used_entry_is_evicted(self):
+        await self.cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE)
+        await self.cache.add_cache_value(ODS_CODE, OTHER_INTERACTION_ID, OTHER_VALUE)
+        await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+
+        await self.cache.add_cache_value(OTHER_ODS_CODE, INTERACTION_ID, VALUE)
+
+        self.assertEqual(1, self.cache.evictions)
+        await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID)
+        self.shared_cache.retrieve_mhs_attributes_value.assert_not_called()
+        await self.cache.retrieve_mhs_attributes_value(ODS_CODE, OTHER_INTERACTION_ID)
+        self.shared_cache.retrieve_mhs_attributes_value.assert_called_once_with(ODS_CODE, OTHER_INTERACTION_ID)
+
+    @async_test
+    async def test_add_writes_through_to_shared_cache(self):
+        await self.cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE)
+
+        self.shared_cache.add_cache_value.assert_called_once_with(ODS_CODE, INTERACTION_ID, VALUE)
+        self.assertEqual(VALUE, await self.cache.retrieve_mhs_attributes_value(ODS_CODE, INTERACTION_ID))
+        self.shared_cache.retrieve_mhs_attributes_value.assert_not_called()
+
+    @async_test
+    async def test_add_propagates_shared_cache_error(self):
+        self.shared_cache.add_cache_value.side_effect = \
+            lambda ods_code, interaction_id, value: awaitable_exception(ConnectionError())
+
+        with self.assertRaises(ConnectionError):
+            await self.cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE)
+
+    @async_test
+    async def test_invalidate_matching_entries(self):
+        await self.cache.add_cache_value(ODS_CODE, INTERACTION_ID, VALUE)
+        await self.cache.add_cache_value(OTHER_ODS_CODE, INTERACTION_ID, VALUE)
+
+        self.assertEqual(1, self.cache.invalidate(ods_code=ODS_CODE))
+        self.assertEqual(1, self.cache.stats()['size'])
+
+        self.assertEqual(1, self.cache.invalidate())
+        self.assertEqual(0, self.cache.stats()['size'])
+
+    @async_test
+    async def test_start_and_close_are_delegated(self):
+        self.shared_cache.start.return_value = awaitable()
+        self.shared_cache.close.return_value = awaitable()
+
+        await self.cache.start()
+        await self.cache.close()
+
+        self.shared_cache.start.assert_called_once()
+        self.shared_cache.close.assert_called_once()
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            two_tier_cache.TwoTierCache(self.shared_cache, 0, EXPIRY_TIME)
+        with self.assertRaises(ValueError):
+            two_tier_cache.TwoTierCache(self.shared_cache, MAX_SIZE, -1)
@@ -0,0 +1,130 @@
+"""This module defines a cache adaptor that holds recently used values in process, in front of another (shared) cache
+adaptor."""
+
+import collections
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from utilities import integration_adaptors_logger as log, metrics
+
+from lookup import cache_adaptor
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+LOCAL_LOOKUPS = metrics.counter('two_tier_cache_local_lookups_total',
+                                'The number of lookups made in the in-process tier of the cache, by result (hit or '
+                                'miss)',
+                                ['result'])
+
+_Key = Tuple[str, str]
+
+
+class TwoTierCache(cache_adaptor.CacheAdaptor):
+    """A cache adaptor that serves hot values from a bounded, in-process LRU tier and falls back to a shared cache
+    adaptor (e.g. Redis) on a local miss.
+
+    Values returned from the local tier are the cached objects themselves and must be treated as read-only by callers.
+    """
+
+    def __init__(self, shared_cache: cache_adaptor.CacheAdaptor, max_size: int, expiry_time: float,
+                 clock: Callable[[], float] = time.monotonic):
+        """Initialise a new TwoTierCache.
+
+        :param shared_cache: The cache adaptor to fall back to on a local miss, and to write values through to.
+        :param max_size: The maximum number of entries held in process. The least recently used entry is evicted once
+        this is exceeded.
+        :param expiry_time: The time (in seconds) an entry may be served from the local tier. This should not be longer
+        than the expiry time of the shared cache, so the local tier never serves a value the shared cache has dropped.
+        :param clock: The monotonic clock used to expire local entries.
+        """
+        if max_size < 1:
+            raise ValueError('Max size must be at least 1')
+        if expiry_time < 0:
+            raise ValueError('Expiry time must not be non-negative')
+
+        self.shared_cache = shared_cache
+        self.max_size = max_size
+        self.expiry_time = expiry_time
+        self._clock = clock
+        self._entries: 'collections.OrderedDict[_Key, Tuple[float, Dict]]' = collections.OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def start(self) -> None:
+        await self.shared_cache.start()
+
+    async def close(self) -> None:
+        await self.shared_cache.close()
+
+    async def retrieve_mhs_attributes_value(self, ods_code: str, interaction_id: str) -> Optional[Dict]:
+        """
+        Returns the value for the given ods code/interaction id from the local tier if present and unexpired, otherwise
+        from the shared cache (populating the local tier with it).
+
+        :param ods_code: The ODS code the value belongs to.
+        :param interaction_id: The interaction ID the value belongs to.
+        :return: The cached value, or None if it is not held by either tier.
+        """
+        key = (ods_code, interaction_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if self._clock() < expires_at:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                LOCAL_LOOKUPS.inc(result='hit')
+                return value
+            del self._entries[key]
+
+        self.misses += 1
+        LOCAL_LOOKUPS.inc(result='miss')
+        value = await self.shared_cache.retrieve_mhs_attributes_value(ods_code, interaction_id)
+        if value:
+            self._store_locally(key, value)
+        return value
+
+    async def add_cache_value(self, ods_code: str, interaction_id: str, value: Dict) -> None:
+        """
+        Adds a value to the local tier and writes it through to the shared cache. Errors from the shared cache are
+        propagated to the caller, but the value is still held locally.
+
+        :param ods_code: The ODS code the value belongs to.
+        :param interaction_id: The interaction ID the value belongs to.
+        :param value: The value to be cached.
+        """
+        self._store_locally((ods_code, interaction_id), value)
+        await self.shared_cache.add_cache_value(ods_code, interaction_id, value)
+
+    def invalidate(self, ods_code: Optional[str] = None, interaction_id: Optional[str] = None) -> int:
+        """
+        Drops entries from the local tier, so the next lookup goes back to the shared cache. The shared cache is not
+        modified.
+
+        :param ods_code: Only drop entries for this ODS code. If None, entries for all ODS codes are dropped.
+        :param interaction_id: Only drop entries for this interaction ID. If None, entries for all interaction IDs are
+        dropped.
+        :return: The number of entries dropped.
+        """
+        keys = [key for key in self._entries
+                if (ods_code is None or key[0] == ods_code) and (interaction_id is None or key[1] == interaction_id)]
+        for key in keys:
+            del self._entries[key]
+
+        logger.info('Invalidated {count} local cache entries for {ods_code} & {interaction_id}',
+                    fparams={'count': len(keys), 'ods_code': ods_code, 'interaction_id': interaction_id})
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        :return: The counters for the local tier: hits, misses, evictions and current size.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'size': len(self._entries)}
+
+    def _store_locally(self, key: _Key, value: Dict) -> None:
+        self._entries[key] = (self._clock() + self.expiry_time, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
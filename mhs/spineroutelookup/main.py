@@ -1,17 +1,24 @@
+import asyncio
+from typing import List, Optional, Union
+
 import tornado.httpserver
 import tornado.ioloop
 import tornado.web
 
-from handlers import healthcheck_handler
-from utilities import config, secrets
+from handlers import healthcheck_handler, metrics_handler
+from utilities import config, event_loop, secrets
 from utilities import integration_adaptors_logger as log
+from utilities.string_utilities import str2bool
 
-from lookup import cache_adaptor, redis_cache, sds_client, mhs_attribute_lookup, \
+from lookup import cache_adaptor, redis_cache, two_tier_cache, sds_client, mhs_attribute_lookup, \
     routing_reliability, sds_connection_factory
+from refresh import cache_refresher
 from request import routing_handler, reliability_handler, routing_reliability_handler
 
 logger = log.IntegrationAdaptorsLogger(__name__)
 
+Adaptor = Union[cache_adaptor.CacheAdaptor, cache_refresher.CacheRefresher]
+
 
 def load_cache_implementation():
     cache_expiry_time = int(config.get_config("SDS_CACHE_EXPIRY_TIME", cache_adaptor.FIFTEEN_MINUTES_IN_SECONDS))
@@ -20,6 +27,26 @@ def load_cache_implementation():
     redis_port = int(config.get_config("SDS_REDIS_CACHE_PORT", "6379"))
     disable_tls_flag = config.get_config("SDS_REDIS_DISABLE_TLS", None)
     use_tls = disable_tls_flag != "True"
+    use_async_client = str2bool(config.get_config("SDS_REDIS_USE_ASYNC_CLIENT", default=str(False)))
+
+    if use_async_client:
+        # Imported only when selected, as aioredis is not needed by the default (synchronous) cache
+        from lookup import async_redis_cache
+
+        min_pool_size = int(config.get_config("SDS_REDIS_MIN_POOL_SIZE", "1"))
+        max_pool_size = int(config.get_config("SDS_REDIS_MAX_POOL_SIZE", "10"))
+        logger.info('Using the async Redis cache with {redis_host}, {redis_port}, {cache_expiry_time}, {use_tls}, '
+                    '{min_pool_size}, {max_pool_size}',
+                    fparams={
+                        'redis_host': redis_host,
+                        'redis_port': redis_port,
+                        'cache_expiry_time': cache_expiry_time,
+                        'use_tls': use_tls,
+                        'min_pool_size': min_pool_size,
+                        'max_pool_size': max_pool_size
+                    })
+        return async_redis_cache.AsyncRedisCache(redis_host, redis_port, cache_expiry_time, use_tls,
+                                                 min_pool_size=min_pool_size, max_pool_size=max_pool_size)
 
     logger.info('Using the Redis cache with {redis_host}, {redis_port}, {cache_expiry_time}, {use_tls}',
                 fparams={
@@ -31,48 +58,113 @@ def load_cache_implementation():
     return redis_cache.RedisCache(redis_host, redis_port, cache_expiry_time, use_tls)
 
 
-def initialise_routing(search_base: str) -> routing_reliability.RoutingAndReliability:
-    """Initialise the routing and reliability component to be used for SDS queries.
+def add_local_cache_tier(shared_cache: cache_adaptor.CacheAdaptor) -> cache_adaptor.CacheAdaptor:
+    """Put a bounded in-process cache tier in front of the given (shared) cache, unless disabled by configuration.
+
+    :param shared_cache: The cache adaptor to fall back to on a local miss.
+    :return: The cache adaptor to use for lookups.
+    """
+    max_size = int(config.get_config("SDS_LOCAL_CACHE_MAX_SIZE", "1000"))
+    if max_size <= 0:
+        logger.info('Local SDS cache tier disabled')
+        return shared_cache
+
+    shared_expiry_time = int(config.get_config("SDS_CACHE_EXPIRY_TIME", cache_adaptor.FIFTEEN_MINUTES_IN_SECONDS))
+    expiry_time = int(config.get_config("SDS_LOCAL_CACHE_EXPIRY_TIME", "60"))
+    if expiry_time > shared_expiry_time:
+        logger.warning('Local SDS cache expiry time {expiry_time} is longer than the shared cache expiry time. Using '
+                       '{shared_expiry_time} instead.',
+                       fparams={'expiry_time': expiry_time, 'shared_expiry_time': shared_expiry_time})
+        expiry_time = shared_expiry_time
+
+    logger.info('Using a local SDS cache tier with {max_size}, {expiry_time}',
+                fparams={'max_size': max_size, 'expiry_time': expiry_time})
+    return two_tier_cache.TwoTierCache(shared_cache, max_size, expiry_time)
+
+
+def initialise_attribute_lookup(search_base: str,
+                                cache: cache_adaptor.CacheAdaptor) -> mhs_attribute_lookup.MHSAttributeLookup:
+    """Initialise the MHS attribute lookup component to be used for SDS queries.
 
     :param search_base: The LDAP location to use as the base of SDS searched. e.g. ou=services,o=nhs.
+    :param cache: The cache adaptor to use to cache remote MHS details.
     :return:
     """
 
-    cache = load_cache_implementation()
-
     sds_connection = sds_connection_factory.create_connection()
 
     client = sds_client.SDSClient(sds_connection, search_base)
-    attribute_lookup = mhs_attribute_lookup.MHSAttributeLookup(client=client, cache=cache)
-    routing = routing_reliability.RoutingAndReliability(attribute_lookup)
-    return routing
+    return mhs_attribute_lookup.MHSAttributeLookup(client=client, cache=cache)
+
+
+def load_cache_refresher(
+        attribute_lookup: mhs_attribute_lookup.MHSAttributeLookup) -> Optional[cache_refresher.CacheRefresher]:
+    """Create the component that refreshes cache entries for keys in use before they expire, unless disabled by
+    configuration.
 
+    :param attribute_lookup: The lookup used to re-query SDS.
+    :return: The cache refresher, or None if refreshing is disabled.
+    """
+    if not str2bool(config.get_config("SDS_CACHE_REFRESH_ENABLED", default=str(True))):
+        logger.info('Background refresh of SDS cache entries disabled')
+        return None
+
+    cache_expiry_time = int(config.get_config("SDS_CACHE_EXPIRY_TIME", cache_adaptor.FIFTEEN_MINUTES_IN_SECONDS))
+    refresh_margin = int(config.get_config("SDS_CACHE_REFRESH_MARGIN", "60"))
+    check_interval = int(config.get_config("SDS_CACHE_REFRESH_INTERVAL", "10"))
 
-def start_tornado_server(routing: routing_reliability.RoutingAndReliability) -> None:
+    logger.info('Refreshing SDS cache entries in the background with {cache_expiry_time}, {refresh_margin}, '
+                '{check_interval}',
+                fparams={
+                    'cache_expiry_time': cache_expiry_time,
+                    'refresh_margin': refresh_margin,
+                    'check_interval': check_interval
+                })
+    return cache_refresher.CacheRefresher(attribute_lookup, cache_expiry_time, refresh_margin,
+                                          check_interval=check_interval)
+
+
+async def start_adaptors(adaptors: List[Adaptor]) -> None:
+    await asyncio.gather(*[adaptor.start() for adaptor in adaptors])
+
+
+async def close_adaptors(adaptors: List[Adaptor]) -> None:
+    await asyncio.gather(*[adaptor.close() for adaptor in adaptors])
+
+
+def start_tornado_server(routing: routing_reliability.RoutingAndReliability,
+                         adaptors: List[Adaptor]) -> None:
     """Start the Tornado server
 
     :param routing: The routing/reliability component to be used when servicing requests.
+    :param adaptors: The adaptors to start before the server accepts requests and close once it has stopped.
     """
+    tornado_io_loop = tornado.ioloop.IOLoop.current()
+    tornado_io_loop.run_sync(lambda: start_adaptors(adaptors))
+
     handler_dependencies = {"routing": routing}
     application = tornado.web.Application([
         ("/routing", routing_handler.RoutingRequestHandler, handler_dependencies),
         ("/reliability", reliability_handler.ReliabilityRequestHandler, handler_dependencies),
         ("/routing-reliability", routing_reliability_handler.RoutingReliabilityRequestHandler, handler_dependencies),
-        ("/healthcheck", healthcheck_handler.HealthcheckHandler)
+        ("/healthcheck", healthcheck_handler.HealthcheckHandler),
+        ("/metrics", metrics_handler.MetricsHandler)
     ])
     server = tornado.httpserver.HTTPServer(application)
     server_port = int(config.get_config('SPINE_ROUTE_LOOKUP_SERVER_PORT', default='80'))
     server.listen(server_port)
 
     logger.info('Starting router server at port {server_port}', fparams={'server_port': server_port})
-    tornado_io_loop = tornado.ioloop.IOLoop.current()
+    loop_lag_monitor = event_loop.start_loop_lag_monitor()
     try:
         tornado_io_loop.start()
     except KeyboardInterrupt:
         logger.warning('Keyboard interrupt')
         pass
     finally:
-        tornado_io_loop.stop()
+        if loop_lag_monitor is not None:
+            loop_lag_monitor.stop()
+        tornado_io_loop.run_sync(lambda: close_adaptors(adaptors))
         tornado_io_loop.close(True)
     logger.info('Server shut down, exiting...')
 
@@ -81,9 +173,17 @@ def main():
     config.setup_config("MHS")
     secrets.setup_secret_config("MHS")
     log.configure_logging('spineroutelookup')
+    event_loop.configure_event_loop()
+
+    cache = add_local_cache_tier(load_cache_implementation())
+    attribute_lookup = initialise_attribute_lookup(search_base=config.get_config("SDS_SEARCH_BASE"), cache=cache)
+    refresher = load_cache_refresher(attribute_lookup)
 
-    routing = initialise_routing(search_base=config.get_config("SDS_SEARCH_BASE"))
-    start_tornado_server(routing)
+    adaptors: List[Adaptor] = [cache]
+    if refresher:
+        adaptors.append(refresher)
+    routing = routing_reliability.RoutingAndReliability(refresher or attribute_lookup)
+    start_tornado_server(routing, adaptors)
 
 
 if __name__ == "__main__":
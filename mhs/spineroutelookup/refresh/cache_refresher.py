@@ -0,0 +1,144 @@
+"""This module defines a component that keeps the cache entries for frequently used remote MHS details fresh, so that
+requests do not have to wait for SDS when an entry expires."""
+
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from utilities import integration_adaptors_logger as log
+
+from lookup import cache_adaptor, mhs_attribute_lookup
+
+logger = log.IntegrationAdaptorsLogger(__name__)
+
+_Key = Tuple[str, str]
+
+
+class _TrackedKey(object):
+
+    def __init__(self, last_used: float, refresh_due: float):
+        self.last_used = last_used
+        self.refresh_due = refresh_due
+        self.failed_refreshes = 0
+
+
+class CacheRefresher(object):
+    """Wraps an :class:`MHSAttributeLookup`, tracking which ODS code/interaction ID pairs are in use and re-querying
+    SDS for them in the background shortly before their cache entries expire. Requests continue to be served the
+    still-valid cached value while the refresh is in progress.
+
+    The cache does not report when an entry was written, so the first successful lookup of a key is treated as if its
+    entry had just been cached. Every subsequent refresh resets the entry's expiry. Keys whose lookup fails are not
+    tracked, and a failed refresh is retried after a delay that starts at the check interval and doubles with each
+    consecutive failure.
+    """
+
+    def __init__(self, attribute_lookup: mhs_attribute_lookup.MHSAttributeLookup,
+                 expiry_time: float = cache_adaptor.FIFTEEN_MINUTES_IN_SECONDS,
+                 refresh_margin: float = 60,
+                 idle_time: Optional[float] = None,
+                 check_interval: float = 10,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+
+        :param attribute_lookup: The lookup used to serve requests and to re-query SDS.
+        :param expiry_time: The expiry time (in seconds) of cache entries.
+        :param refresh_margin: How long (in seconds) before an entry expires that it should be refreshed.
+        :param idle_time: How long (in seconds) a key may go unused before it is no longer refreshed. Defaults to the
+        expiry time.
+        :param check_interval: How often (in seconds) to check for entries that are due to be refreshed.
+        :param clock: The monotonic clock used to schedule refreshes.
+        """
+        if not attribute_lookup:
+            raise ValueError('MHS Attribute Lookup Handler not found')
+        if not 0 <= refresh_margin < expiry_time:
+            raise ValueError('Refresh margin must be non-negative and less than the expiry time')
+        if check_interval <= 0:
+            raise ValueError('Check interval must be positive')
+
+        self.lookup = attribute_lookup
+        self.refresh_after = expiry_time - refresh_margin
+        self.idle_time = expiry_time if idle_time is None else idle_time
+        self.check_interval = check_interval
+        self._clock = clock
+        self._tracked_keys: Dict[_Key, _TrackedKey] = {}
+        self._refresh_task: Optional[asyncio.Future] = None
+
+    async def retrieve_mhs_attributes(self, ods_code, interaction_id) -> Dict:
+        """Obtains the attributes of the MHS registered for the given ODS code and interaction ID, recording that the
+        key is in use so that its cache entry is kept fresh. Only keys that are successfully looked up are recorded.
+
+        :param ods_code:
+        :param interaction_id:
+        :return:
+        """
+        attributes = await self.lookup.retrieve_mhs_attributes(ods_code, interaction_id)
+
+        now = self._clock()
+        tracked_key = self._tracked_keys.get((ods_code, interaction_id))
+        if tracked_key is None:
+            self._tracked_keys[(ods_code, interaction_id)] = _TrackedKey(now, now + self.refresh_after)
+        else:
+            tracked_key.last_used = now
+
+        return attributes
+
+    async def start(self) -> None:
+        """Start refreshing cache entries in the background."""
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh_periodically())
+
+    async def close(self) -> None:
+        """Stop refreshing cache entries."""
+        refresh_task, self._refresh_task = self._refresh_task, None
+        if refresh_task is not None:
+            refresh_task.cancel()
+            await asyncio.gather(refresh_task, return_exceptions=True)
+
+    async def refresh_due_entries(self) -> None:
+        """Refresh the cache entries of all in-use keys that are due to expire, and stop tracking idle keys. A failed
+        refresh is retried once its back-off delay has passed."""
+        now = self._clock()
+        due_keys = []
+        for key, tracked_key in list(self._tracked_keys.items()):
+            if now - tracked_key.last_used > self.idle_time:
+                logger.info('No longer refreshing idle cache entry for {ods_code} & {interaction_id}',
+                            fparams={'ods_code': key[0], 'interaction_id': key[1]})
+                del self._tracked_keys[key]
+            elif now >= tracked_key.refresh_due:
+                due_keys.append(key)
+
+        if due_keys:
+            await asyncio.gather(*[self._refresh(key) for key in due_keys])
+
+    async def _refresh_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.refresh_due_entries()
+            except Exception:
+                logger.exception('Unexpected error when refreshing cache entries')
+
+    async def _refresh(self, key: _Key) -> None:
+        ods_code, interaction_id = key
+        try:
+            logger.info('Refreshing cache entry for {ods_code} & {interaction_id}',
+                        fparams={'ods_code': ods_code, 'interaction_id': interaction_id})
+            await self.lookup.refresh_mhs_attributes(ods_code, interaction_id)
+        except Exception:
+            tracked_key = self._tracked_keys.get(key)
+            if tracked_key is None:
+                return
+            retry_delay = min(self.check_interval * 2 ** tracked_key.failed_refreshes, self.refresh_after)
+            tracked_key.failed_refreshes += 1
+            tracked_key.refresh_due = self._clock() + retry_delay
+            logger.exception('Failed to refresh cache entry for {ods_code} & {interaction_id}. Will retry in '
+                             '{retry_delay} seconds.',
+                             fparams={'ods_code': ods_code, 'interaction_id': interaction_id,
+                                      'retry_delay': retry_delay})
+            return
+
+        tracked_key = self._tracked_keys.get(key)
+        if tracked_key is not None:
+            tracked_key.failed_refreshes = 0
+            tracked_key.refresh_due = self._clock() + self.refresh_after
@@ -0,0 +1,147 @@
+import asyncio
+from unittest import TestCase
+from unittest import mock
+
+from utilities import test_utilities
+from utilities.test_utilities import async_test
+
+from refresh import cache_refresher
+
+ODS_CODE = "ODSCODE1"
+OTHER_ODS_CODE = "ODSCODE2"
+INTERACTION_ID = "urn:nhs:names:services:psis:MCCI_IN010000UK13"
+MHS_ATTRIBUTES = {"nhsMHSEndPoint": ["https://example.com/"]}
+EXPIRY_TIME = 900
+REFRESH_MARGIN = 60
+
+
+class TestCacheRefresher(TestCase):
+
+    def setUp(self) -> None:
+        self.lookup = mock.MagicMock()
+        self.lookup.retrieve_mhs_attributes.side_effect = lambda *args: test_utilities.awaitable(MHS_ATTRIBUTES)
+        self.lookup.refresh_mhs_attributes.side_effect = lambda *args: test_utilities.awaitable(MHS_ATTRIBUTES)
+        self.now = 0
+        self.refresher = cache_refresher.CacheRefresher(self.lookup, EXPIRY_TIME, REFRESH_MARGIN,
+                                                        clock=lambda: self.now)
+
+    @async_test
+    async def test_retrieve_delegates_to_lookup(self):
+        result = await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+
+        self.assertEqual(MHS_ATTRIBUTES, result)
+        self.lookup.retrieve_mhs_attributes.assert_called_once_with(ODS_CODE, INTERACTION_ID)
+
+    @async_test
+    async def test_entry_not_refreshed_before_due(self):
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME - REFRESH_MARGIN - 1
+
+        await self.refresher.refresh_due_entries()
+
+        self.lookup.refresh_mhs_attributes.assert_not_called()
+
+    @async_test
+    async def test_entry_in_use_refreshed_before_expiry(self):
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME - REFRESH_MARGIN
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+
+        await self.refresher.refresh_due_entries()
+
+        self.lookup.refresh_mhs_attributes.assert_called_once_with(ODS_CODE, INTERACTION_ID)
+
+    @async_test
+    async def test_refreshed_entry_is_next_refreshed_before_new_expiry(self):
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME - REFRESH_MARGIN
+        await self.refresher.refresh_due_entries()
+
+        self.now += EXPIRY_TIME - REFRESH_MARGIN - 1
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(1, self.lookup.refresh_mhs_attributes.call_count)
+
+        self.now += 1
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(2, self.lookup.refresh_mhs_attributes.call_count)
+
+    @async_test
+    async def test_idle_entry_is_no_longer_refreshed(self):
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME - REFRESH_MARGIN
+        await self.refresher.retrieve_mhs_attributes(OTHER_ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME + 1
+
+        await self.refresher.refresh_due_entries()
+
+        self.lookup.refresh_mhs_attributes.assert_not_called()
+        self.now = 2 * (EXPIRY_TIME - REFRESH_MARGIN)
+        await self.refresher.refresh_due_entries()
+        self.lookup.refresh_mhs_attributes.assert_called_once_with(OTHER_ODS_CODE, INTERACTION_ID)
+
+    @async_test
+    async def test_failed_lookup_is_not_tracked(self):
+        self.lookup.retrieve_mhs_attributes.side_effect = \
+            lambda *args: test_utilities.awaitable_exception(ConnectionError())
+
+        with self.assertRaises(ConnectionError):
+            await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME - REFRESH_MARGIN
+        await self.refresher.refresh_due_entries()
+
+        self.lookup.refresh_mhs_attributes.assert_not_called()
+
+    @async_test
+    async def test_failed_refresh_is_retried_with_back_off(self):
+        self.lookup.refresh_mhs_attributes.side_effect = \
+            [test_utilities.awaitable_exception(ConnectionError()), test_utilities.awaitable_exception(ConnectionError()),
+             test_utilities.awaitable(MHS_ATTRIBUTES)]
+        check_interval = self.refresher.check_interval
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        self.now = EXPIRY_TIME - REFRESH_MARGIN
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(1, self.lookup.refresh_mhs_attributes.call_count)
+
+        # The first retry is delayed by the check interval, and each further retry by twice the previous delay
+        self.now += check_interval - 1
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(1, self.lookup.refresh_mhs_attributes.call_count)
+        self.now += 1
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(2, self.lookup.refresh_mhs_attributes.call_count)
+
+        self.now += 2 * check_interval - 1
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(2, self.lookup.refresh_mhs_attributes.call_count)
+        self.now += 1
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(3, self.lookup.refresh_mhs_attributes.call_count)
+
+        # Once the refresh succeeds, the entry is next refreshed shortly before its new expiry
+        self.now += check_interval
+        await self.refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+        await self.refresher.refresh_due_entries()
+        self.assertEqual(3, self.lookup.refresh_mhs_attributes.call_count)
+
+    @async_test
+    async def test_refreshes_in_background_once_started(self):
+        refresher = cache_refresher.CacheRefresher(self.lookup, expiry_time=1, refresh_margin=0.99, check_interval=0.01)
+        await refresher.retrieve_mhs_attributes(ODS_CODE, INTERACTION_ID)
+
+        await refresher.start()
+        await asyncio.sleep(0.1)
+        await refresher.close()
+
+        self.lookup.refresh_mhs_attributes.assert_called_with(ODS_CODE, INTERACTION_ID)
+        call_count = self.lookup.refresh_mhs_attributes.call_count
+        await asyncio.sleep(0.05)
+        self.assertEqual(call_count, self.lookup.refresh_mhs_attributes.call_count)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            cache_refresher.CacheRefresher(None)
+        with self.assertRaises(ValueError):
+            cache_refresher.CacheRefresher(self.lookup, EXPIRY_TIME, EXPIRY_TIME)
+        with self.assertRaises(ValueError):
+            cache_refresher.CacheRefresher(self.lookup, check_interval=0)
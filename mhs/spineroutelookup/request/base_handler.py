@@ -1,7 +1,9 @@
+from typing import Awaitable, Callable, Dict
+
 import tornado.web
 
 from request.tracking_ids_headers_reader import read_tracking_id_headers
-from lookup import routing_reliability
+from lookup import routing_reliability, sds_exception
 
 
 class BaseHandler(tornado.web.RequestHandler):
@@ -14,3 +16,17 @@ class BaseHandler(tornado.web.RequestHandler):
         """
         self.routing = routing
         read_tracking_id_headers(self.request.headers)
+
+    async def lookup(self, lookup: Callable[[str, str], Awaitable[Dict]], org_code: str, service_id: str) -> Dict:
+        """Look up details of the MHS registered for the specified org code and service ID, responding with a 404 if
+        SDS holds none, so that callers can tell this apart from a failed lookup.
+
+        :param lookup: The method of the routing and reliability component to look the details up with.
+        :param org_code: The org code of the MHS to get details for.
+        :param service_id: The ID of the service to get MHS details for.
+        :return: The details looked up.
+        """
+        try:
+            return await lookup(org_code, service_id)
+        except sds_exception.SDSNotFoundException as e:
+            raise tornado.web.HTTPError(404, 'No MHS details found in SDS for %s & %s', org_code, service_id) from e
@@ -15,7 +15,7 @@ class ReliabilityRequestHandler(BaseHandler):
 
         logger.info("Looking up reliability information. {org_code}, {service_id}",
                     fparams={"org_code": org_code, "service_id": service_id})
-        reliability_info = await self.routing.get_reliability(org_code, service_id)
+        reliability_info = await self.lookup(self.routing.get_reliability, org_code, service_id)
         logger.info("Obtained reliability information. {reliability_information}",
                     fparams={"reliability_information": reliability_info})
 
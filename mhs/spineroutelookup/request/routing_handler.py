@@ -15,7 +15,7 @@ class RoutingRequestHandler(BaseHandler):
 
         logger.info("Looking up routing information. {org_code}, {service_id}",
                     fparams={"org_code": org_code, "service_id": service_id})
-        routing_info = await self.routing.get_end_point(org_code, service_id)
+        routing_info = await self.lookup(self.routing.get_end_point, org_code, service_id)
         logger.info("Obtained routing information. {routing_information}",
                     fparams={"routing_information": routing_info})
 
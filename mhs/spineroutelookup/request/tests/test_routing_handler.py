@@ -5,6 +5,7 @@ import tornado.testing
 import tornado.web
 from utilities import test_utilities
 
+from lookup import sds_exception
 from request import routing_handler
 from request.tests import test_request_handler
 
@@ -35,6 +36,13 @@ class TestRoutingRequestHandler(tornado.testing.AsyncHTTPTestCase):
 
         self.assertEqual(response.code, 500)
 
+    def test_get_returns_not_found_when_sds_has_no_details(self):
+        self.routing.get_end_point.side_effect = sds_exception.SDSNotFoundException
+
+        response = self.fetch(test_request_handler.build_url(), method="GET")
+
+        self.assertEqual(response.code, 404)
+
     def test_get_handles_missing_params(self):
         with self.subTest("Missing Org Code"):
             response = self.fetch(
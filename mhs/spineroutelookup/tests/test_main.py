@@ -3,7 +3,8 @@ import unittest.mock
 from utilities import config
 
 import main
-from lookup import redis_cache
+from lookup import redis_cache, async_redis_cache, two_tier_cache
+from refresh import cache_refresher
 
 CONFIG_PREFIX = "MHS"
 CACHE_EXPIRY_TIME_KEY = "MHS_SDS_CACHE_EXPIRY_TIME"
@@ -15,6 +16,11 @@ CACHE_PORT_KEY = "MHS_SDS_REDIS_CACHE_PORT"
 CACHE_PORT = "6379"
 CACHE_DISABLE_TLS_KEY = "MHS_SDS_REDIS_CACHE_PORT"
 DISABLE_TLS = "True"
+USE_ASYNC_CLIENT_KEY = "MHS_SDS_REDIS_USE_ASYNC_CLIENT"
+MAX_POOL_SIZE_KEY = "MHS_SDS_REDIS_MAX_POOL_SIZE"
+MAX_POOL_SIZE = "20"
+LOCAL_CACHE_MAX_SIZE_KEY = "MHS_SDS_LOCAL_CACHE_MAX_SIZE"
+LOCAL_CACHE_EXPIRY_TIME_KEY = "MHS_SDS_LOCAL_CACHE_EXPIRY_TIME"
 
 
 class TestMain(unittest.TestCase):
@@ -42,3 +48,75 @@ class TestMain(unittest.TestCase):
 
         self.assertIsInstance(loaded_cache, redis_cache.RedisCache)
         self.assertEqual(loaded_cache.expiry_time, DEFAULT_CACHE_EXPIRY_TIME)
+
+    @unittest.mock.patch("os.environ", new_callable=dict)
+    @unittest.mock.patch.dict(config.config)
+    def test_load_async_cache_implementation(self, mock_environment):
+        mock_environment[CACHE_HOST_KEY] = CACHE_HOST
+        mock_environment[USE_ASYNC_CLIENT_KEY] = "True"
+        mock_environment[MAX_POOL_SIZE_KEY] = MAX_POOL_SIZE
+        config.setup_config(CONFIG_PREFIX)
+
+        loaded_cache = main.load_cache_implementation()
+
+        self.assertIsInstance(loaded_cache, async_redis_cache.AsyncRedisCache)
+        self.assertEqual(loaded_cache.expiry_time, DEFAULT_CACHE_EXPIRY_TIME)
+        self.assertEqual(loaded_cache.min_pool_size, 1)
+        self.assertEqual(loaded_cache.max_pool_size, 20)
+
+    @unittest.mock.patch("os.environ", new_callable=dict)
+    @unittest.mock.patch.dict(config.config)
+    def test_add_local_cache_tier(self, mock_environment):
+        mock_environment[LOCAL_CACHE_MAX_SIZE_KEY] = "50"
+        mock_environment[LOCAL_CACHE_EXPIRY_TIME_KEY] = "30"
+        config.setup_config(CONFIG_PREFIX)
+        shared_cache = unittest.mock.Mock()
+
+        cache = main.add_local_cache_tier(shared_cache)
+
+        self.assertIsInstance(cache, two_tier_cache.TwoTierCache)
+        self.assertIs(cache.shared_cache, shared_cache)
+        self.assertEqual(cache.max_size, 50)
+        self.assertEqual(cache.expiry_time, 30)
+
+    @unittest.mock.patch("os.environ", new_callable=dict)
+    @unittest.mock.patch.dict(config.config)
+    def test_local_cache_expiry_time_is_capped_to_shared_cache_expiry_time(self, mock_environment):
+        mock_environment[CACHE_EXPIRY_TIME_KEY] = str(CACHE_EXPIRY_TIME)
+        mock_environment[LOCAL_CACHE_EXPIRY_TIME_KEY] = str(CACHE_EXPIRY_TIME + 1)
+        config.setup_config(CONFIG_PREFIX)
+
+        cache = main.add_local_cache_tier(unittest.mock.Mock())
+
+        self.assertEqual(cache.expiry_time, CACHE_EXPIRY_TIME)
+
+    @unittest.mock.patch("os.environ", new_callable=dict)
+    @unittest.mock.patch.dict(config.config)
+    def test_local_cache_tier_can_be_disabled(self, mock_environment):
+        mock_environment[LOCAL_CACHE_MAX_SIZE_KEY] = "0"
+        config.setup_config(CONFIG_PREFIX)
+        shared_cache = unittest.mock.Mock()
+
+        self.assertIs(main.add_local_cache_tier(shared_cache), shared_cache)
+
+    @unittest.mock.patch("os.environ", new_callable=dict)
+    @unittest.mock.patch.dict(config.config)
+    def test_load_cache_refresher(self, mock_environment):
+        mock_environment[CACHE_EXPIRY_TIME_KEY] = str(CACHE_EXPIRY_TIME)
+        mock_environment["MHS_SDS_CACHE_REFRESH_MARGIN"] = "30"
+        config.setup_config(CONFIG_PREFIX)
+        attribute_lookup = unittest.mock.Mock()
+
+        refresher = main.load_cache_refresher(attribute_lookup)
+
+        self.assertIsInstance(refresher, cache_refresher.CacheRefresher)
+        self.assertIs(refresher.lookup, attribute_lookup)
+        self.assertEqual(refresher.refresh_after, CACHE_EXPIRY_TIME - 30)
+
+    @unittest.mock.patch("os.environ", new_callable=dict)
+    @unittest.mock.patch.dict(config.config)
+    def test_cache_refresher_can_be_disabled(self, mock_environment):
+        mock_environment["MHS_SDS_CACHE_REFRESH_ENABLED"] = "False"
+        config.setup_config(CONFIG_PREFIX)
+
+        self.assertIsNone(main.load_cache_refresher(unittest.mock.Mock()))